@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from .config import get_base_url
+from .models import LeaderBoardUser, TransactionInfo
+from .pagination import DEFAULT_PREFETCH, MAX_PAGE_SIZE, iter_items
+from .pooled_session import PooledSession
+from .request_extensions.registration_request import RegistrationRequest
+from .request_extensions.authentication_request import AuthenticationRequest
+from .request_extensions.deletion_request import DeletionRequest
+from .request_extensions.viewdetails_request import ViewDetailsRequest
+from .request_extensions.currentquotes_request import CurrentQuotesRequest
+from .request_extensions.buyshare_request import BuyShareRequest
+from .request_extensions.sellshare_request import SellShareRequest
+from .request_extensions.viewwatchlist_request import ViewWatchlistRequest
+from .request_extensions.addtowatchlist_request import AddToWatchlistRequest
+from .request_extensions.removefromwatchlist_request import RemoveFromWatchlistRequest
+from .request_extensions.historicalprices_request import HistoricalPricesRequest
+from .request_extensions.viewportfolio_request import ViewPortfolioRequest
+from .request_extensions.viewtransactions_request import ViewTransactionsRequest
+from .request_extensions.leaderboard_request import LeaderboardRequest
+from .request_extensions.resetaccount_request import ResetAccountRequest
+from .request_extensions.edituser_request import EditUserRequest
+from .request_extensions.fundamentals_request import FundamentalsRequest
+from .request_extensions.dividends_request import DividendsRequest
+from .request_extensions.market_request import MarketRequest
+
+class ApiClient:
+	"""Instance-based facade sending every request through one pooled session"""
+
+	def __init__(self, session = None, base_url = None, limiter = None, **pool_options):
+		self.base_url = get_base_url(base_url)
+		self.limiter = limiter
+		if session is None:
+			session = PooledSession(**pool_options)
+			self.owns_session = True
+		else:
+			self.owns_session = False
+		self.session = session
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def close(self):
+		if self.owns_session:
+			self.session.close()
+
+	def send(self, request):
+		"""Sends a request, through the concurrency limiter if there is one"""
+		if self.limiter is None:
+			return request.get_response()
+		return self.limiter.call(request.ENDPOINT, request.get_response)
+
+	def register_user(self, displayName, email, password):
+		request = RegistrationRequest(self.session, displayName, email, password, base_url = self.base_url)
+		return self.send(request)
+
+	def authenticate_user(self, email, password):
+		request = AuthenticationRequest(self.session, email, password, base_url = self.base_url)
+		return self.send(request)
+
+	def delete_user(self, token):
+		request = DeletionRequest(self.session, token, base_url = self.base_url)
+		return self.send(request)
+
+	def view_details(self, token):
+		request = ViewDetailsRequest(self.session, token, base_url = self.base_url)
+		return self.send(request)
+
+	def get_current_quotes(self, token, symbols):
+		request = CurrentQuotesRequest(self.session, token, symbols, base_url = self.base_url)
+		return self.send(request)
+
+	def buy_share(self, token, account_id, symbol, quantity, nonce = None):
+		request = BuyShareRequest(self.session, token, account_id, symbol, quantity,
+			base_url = self.base_url, nonce = nonce)
+		return self.send(request)
+
+	def sell_share(self, token, account_id, symbol, quantity, nonce = None):
+		request = SellShareRequest(self.session, token, account_id, symbol, quantity,
+			base_url = self.base_url, nonce = nonce)
+		return self.send(request)
+
+	def get_watchlist(self, token, watchlist_id):
+		request = ViewWatchlistRequest(self.session, token, watchlist_id, base_url = self.base_url)
+		return self.send(request)
+
+	def add_to_watchlist(self, token, watchlist_id, symbol):
+		request = AddToWatchlistRequest(self.session, token, watchlist_id, symbol, base_url = self.base_url)
+		return self.send(request)
+
+	def remove_from_watchlist(self, token, watchlist_id, symbol):
+		request = RemoveFromWatchlistRequest(self.session, token, watchlist_id, symbol, base_url = self.base_url)
+		return self.send(request)
+
+	def get_historical_prices(self, token, symbol, end_time = None,
+		interval = None, date_range = None):
+		request = HistoricalPricesRequest(self.session, token, symbol, end_time,
+			interval, date_range, base_url = self.base_url)
+		return self.send(request)
+
+	def get_portfolio(self, token, account_id):
+		request = ViewPortfolioRequest(self.session, token, account_id, base_url = self.base_url)
+		return self.send(request)
+
+	def get_transactions(self, token, account_id, page_number = None,
+		page_size = None, start_date = None, end_date = None):
+		request = ViewTransactionsRequest(self.session, token, account_id, page_number,
+			page_size, start_date, end_date, base_url = self.base_url)
+		return self.send(request)
+
+	def get_leaderboard(self, token, page_number = None, page_size = None):
+		request = LeaderboardRequest(self.session, token, page_number, page_size, base_url = self.base_url)
+		return self.send(request)
+
+	def iter_transactions(self, token, account_id, page_size = MAX_PAGE_SIZE, start_date = None, end_date = None,
+		prefetch = DEFAULT_PREFETCH, typed = False):
+		"""Streams the transactions of every page, newest first, fetching the next pages in the background
+
+		With typed the transactions are TransactionInfo models rather than dicts.
+		"""
+		return iter_items(lambda page_number, page_size: self.get_transactions(token, account_id, page_number,
+			page_size, start_date, end_date), page_size, prefetch, model = TransactionInfo if typed else None)
+
+	def iter_leaderboard(self, token, page_size = MAX_PAGE_SIZE, prefetch = DEFAULT_PREFETCH, typed = False):
+		"""Streams the leaderboard entries of every page, by rank, as LeaderBoardUser models with typed"""
+		return iter_items(lambda page_number, page_size: self.get_leaderboard(token, page_number, page_size),
+			page_size, prefetch, model = LeaderBoardUser if typed else None)
+
+	def reset_account(self, token, account_id):
+		request = ResetAccountRequest(self.session, token, account_id, base_url = self.base_url)
+		return self.send(request)
+
+	def edit_user(self, token, displayName, email):
+		request = EditUserRequest(self.session, token, displayName, email, base_url = self.base_url)
+		return self.send(request)
+
+	def get_fundamentals(self, token, symbol):
+		request = FundamentalsRequest(self.session, token, symbol, base_url = self.base_url)
+		return self.send(request)
+
+	def get_dividends(self, token, symbol):
+		request = DividendsRequest(self.session, token, symbol, base_url = self.base_url)
+		return self.send(request)
+
+	def get_market(self, token, symbol = "ASX"):
+		request = MarketRequest(self.session, token, symbol, base_url = self.base_url)
+		return self.send(request)
@@ -1,173 +1,157 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from requests import Session
-from .request_extensions.registration_request import RegistrationRequest
-from .request_extensions.authentication_request import AuthenticationRequest
-from .request_extensions.deletion_request import DeletionRequest
-from .request_extensions.viewdetails_request import ViewDetailsRequest
-from .request_extensions.currentquotes_request import CurrentQuotesRequest
-from .request_extensions.buyshare_request import BuyShareRequest
-from .request_extensions.sellshare_request import SellShareRequest
-from .request_extensions.viewwatchlist_request import ViewWatchlistRequest
-from .request_extensions.addtowatchlist_request import AddToWatchlistRequest
-from .request_extensions.removefromwatchlist_request import RemoveFromWatchlistRequest
-from .request_extensions.historicalprices_request import HistoricalPricesRequest
-from .request_extensions.viewportfolio_request import ViewPortfolioRequest
-from .request_extensions.viewtransactions_request import ViewTransactionsRequest
-from .request_extensions.leaderboard_request import LeaderboardRequest
-from .request_extensions.resetaccount_request import ResetAccountRequest
-from .request_extensions.edituser_request import EditUserRequest
-from .request_extensions.fundamentals_request import FundamentalsRequest
-from .request_extensions.dividends_request import DividendsRequest
+
+import atexit
+import threading
+
+from .api_client import ApiClient
+from .pagination import DEFAULT_PREFETCH, MAX_PAGE_SIZE
 
 class ApiFacade:
+
+	_default_client = None
+	_owns_default_client = False
+	_close_registered = False
+	_limiter = None
+	_default_client_lock = threading.Lock()
+
 	def __init__(self):
 		pass
 
+	@classmethod
+	def get_default_client(cls):
+		if cls._default_client is None:
+			with cls._default_client_lock:
+				if cls._default_client is None:
+					cls._replace_default_client(ApiClient(limiter = cls._limiter), True)
+		return cls._default_client
+
+	@classmethod
+	def _replace_default_client(cls, client, owned):
+		# called with the lock held; only clients made here are closed here, callers close their own
+		previous, owned_previous = cls._default_client, cls._owns_default_client
+		cls._default_client, cls._owns_default_client = client, owned
+		if not cls._close_registered:
+			atexit.register(cls.close_default_client)
+			cls._close_registered = True
+		if owned_previous and previous is not client:
+			previous.close()
+
+	@classmethod
+	def set_default_client(cls, client):
+		with cls._default_client_lock:
+			cls._replace_default_client(client, False)
+
+	@classmethod
+	def set_base_url(cls, base_url, limiter = None):
+		"""Makes a default client for base_url, sending its calls through limiter, or else the one set before"""
+		with cls._default_client_lock:
+			if limiter is not None:
+				cls._limiter = limiter
+			cls._replace_default_client(ApiClient(base_url = base_url, limiter = cls._limiter), True)
+
+	@classmethod
+	def set_limiter(cls, limiter):
+		"""Sends every facade call through a ConcurrencyLimiter shared by its callers, or through none if None"""
+		with cls._default_client_lock:
+			cls._limiter = limiter
+			if cls._default_client is not None:
+				cls._default_client.limiter = limiter
+
+	@classmethod
+	def close_default_client(cls):
+		"""Closes the default client if the facade made it, so that the next call makes a new one"""
+		with cls._default_client_lock:
+			if cls._owns_default_client:
+				cls._default_client.close()
+				cls._default_client, cls._owns_default_client = None, False
+
 	@staticmethod
 	def register_user(displayName, email, password):
-		session = Session()
-		request = RegistrationRequest(session, displayName, email, password)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().register_user(displayName, email, password)
 
 	@staticmethod
 	def authenticate_user(email, password):
-		session = Session()
-		request = AuthenticationRequest(session, email, password)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().authenticate_user(email, password)
 
 	@staticmethod
 	def delete_user(token):
-		session = Session()
-		request = DeletionRequest(session, token)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().delete_user(token)
 
 	@staticmethod
 	def view_details(token):
-		session = Session()
-		request = ViewDetailsRequest(session, token)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().view_details(token)
 
 	@staticmethod
 	def get_current_quotes(token, symbols):
-		session = Session()
-		request = CurrentQuotesRequest(session, token, symbols)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().get_current_quotes(token, symbols)
 
 	@staticmethod
-	def buy_share(token, account_id, symbol, quantity):
-		session = Session()
-		request = BuyShareRequest(session, token, account_id, symbol, quantity)
-		response = request.get_response()
-		session.close()
-		return response
+	def buy_share(token, account_id, symbol, quantity, nonce = None):
+		return ApiFacade.get_default_client().buy_share(token, account_id, symbol, quantity, nonce)
 
 	@staticmethod
-	def sell_share(token, account_id, symbol, quantity):
-		session = Session()
-		request = SellShareRequest(session, token, account_id, symbol, quantity)
-		response = request.get_response()
-		session.close()
-		return response
+	def sell_share(token, account_id, symbol, quantity, nonce = None):
+		return ApiFacade.get_default_client().sell_share(token, account_id, symbol, quantity, nonce)
 
 	@staticmethod
 	def get_watchlist(token, watchlist_id):
-		session = Session()
-		request = ViewWatchlistRequest(session, token, watchlist_id)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().get_watchlist(token, watchlist_id)
 
 	@staticmethod
 	def add_to_watchlist(token, watchlist_id, symbol):
-		session = Session()
-		request = AddToWatchlistRequest(session, token, watchlist_id, symbol)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().add_to_watchlist(token, watchlist_id, symbol)
 
 	@staticmethod
 	def remove_from_watchlist(token, watchlist_id, symbol):
-		session = Session()
-		request = RemoveFromWatchlistRequest(session, token, watchlist_id, symbol)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().remove_from_watchlist(token, watchlist_id, symbol)
 
 	@staticmethod
 	def get_historical_prices(token, symbol, end_time = None,
 		interval = None, date_range = None):
-		session = Session()
-		request = HistoricalPricesRequest(session, token, symbol, end_time, 
+		return ApiFacade.get_default_client().get_historical_prices(token, symbol, end_time,
 			interval, date_range)
-		response = request.get_response()
-		session.close()
-		return response
 
 	@staticmethod
 	def get_portfolio(token, account_id):
-		session = Session()
-		request = ViewPortfolioRequest(session, token, account_id)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().get_portfolio(token, account_id)
 
 	@staticmethod
 	def get_transactions(token, account_id, page_number = None, 
 		page_size = None, start_date = None, end_date = None):
-		session = Session()
-		request = ViewTransactionsRequest(session, token, account_id, page_number, 
+		return ApiFacade.get_default_client().get_transactions(token, account_id, page_number,
 			page_size, start_date, end_date)
-		response = request.get_response()
-		session.close()
-		return response
 
 	@staticmethod
 	def get_leaderboard(token, page_number = None, page_size = None):
-		session = Session()
-		request = LeaderboardRequest(session, token, page_number, page_size)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().get_leaderboard(token, page_number, page_size)
+
+	@staticmethod
+	def iter_transactions(token, account_id, page_size = MAX_PAGE_SIZE, start_date = None, end_date = None,
+		prefetch = DEFAULT_PREFETCH, typed = False):
+		return ApiFacade.get_default_client().iter_transactions(token, account_id, page_size, start_date, end_date,
+			prefetch, typed)
+
+	@staticmethod
+	def iter_leaderboard(token, page_size = MAX_PAGE_SIZE, prefetch = DEFAULT_PREFETCH, typed = False):
+		return ApiFacade.get_default_client().iter_leaderboard(token, page_size, prefetch, typed)
 
 	@staticmethod
 	def reset_account(token, account_id):
-		session = Session()
-		request = ResetAccountRequest(session, token, account_id)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().reset_account(token, account_id)
 
 	@staticmethod
 	def edit_user(token, displayName, email):
-		session = Session()
-		request = EditUserRequest(session, token, displayName, email)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().edit_user(token, displayName, email)
 
 	@staticmethod
 	def get_fundamentals(token, symbol):
-		session = Session()
-		request = FundamentalsRequest(session, token, symbol)
-		response = request.get_response()
-		session.close()
-		return response
+		return ApiFacade.get_default_client().get_fundamentals(token, symbol)
 
 	@staticmethod
 	def get_dividends(token, symbol):
-		session = Session()
-		request = DividendsRequest(session, token, symbol)
-		response = request.get_response()
-		session.close()
-		return response
\ No newline at end of file
+		return ApiFacade.get_default_client().get_dividends(token, symbol)
+
+	@staticmethod
+	def get_market(token, symbol = "ASX"):
+		return ApiFacade.get_default_client().get_market(token, symbol)
\ No newline at end of file
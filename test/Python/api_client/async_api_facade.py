@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import aiohttp
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from yarl import URL
+
+from . import instrumentation
+from .config import get_base_url
+from .request_extensions.registration_request import RegistrationRequest
+from .request_extensions.authentication_request import AuthenticationRequest
+from .request_extensions.deletion_request import DeletionRequest
+from .request_extensions.viewdetails_request import ViewDetailsRequest
+from .request_extensions.currentquotes_request import CurrentQuotesRequest
+from .request_extensions.buyshare_request import BuyShareRequest
+from .request_extensions.sellshare_request import SellShareRequest
+from .request_extensions.viewwatchlist_request import ViewWatchlistRequest
+from .request_extensions.addtowatchlist_request import AddToWatchlistRequest
+from .request_extensions.removefromwatchlist_request import RemoveFromWatchlistRequest
+from .request_extensions.historicalprices_request import HistoricalPricesRequest
+from .request_extensions.viewportfolio_request import ViewPortfolioRequest
+from .request_extensions.viewtransactions_request import ViewTransactionsRequest
+from .request_extensions.leaderboard_request import LeaderboardRequest
+from .request_extensions.resetaccount_request import ResetAccountRequest
+from .request_extensions.edituser_request import EditUserRequest
+from .request_extensions.fundamentals_request import FundamentalsRequest
+from .request_extensions.dividends_request import DividendsRequest
+from .request_extensions.market_request import MarketRequest
+
+class AsyncApiFacade:
+	"""Coroutine versions of the ApiFacade operations on top of aiohttp"""
+
+	DEFAULT_CONNECTION_LIMIT = 1000
+
+	def __init__(self, base_url = None, limit = DEFAULT_CONNECTION_LIMIT, limit_per_host = 0,
+		keep_alive = True, timeout = None, limiter = None):
+		self.base_url = get_base_url(base_url)
+		self.limiter = limiter
+		self.limit = limit
+		self.limit_per_host = limit_per_host
+		self.keep_alive = keep_alive
+		self.timeout = timeout
+		self.session = None
+
+	async def __aenter__(self):
+		self.get_session()
+		return self
+
+	async def __aexit__(self, *args):
+		await self.close()
+
+	def get_session(self):
+		# aiohttp sessions must be created while the event loop is running
+		if self.session is None:
+			connector = aiohttp.TCPConnector(limit = self.limit, limit_per_host = self.limit_per_host,
+				force_close = not self.keep_alive)
+			self.session = aiohttp.ClientSession(connector = connector,
+				timeout = aiohttp.ClientTimeout(total = self.timeout),
+				trace_configs = [instrumentation.get_trace_config()])
+		return self.session
+
+	async def close(self):
+		if self.session is not None:
+			await self.session.close()
+			self.session = None
+
+	async def send(self, request):
+		"""Sends a request, through the AsyncConcurrencyLimiter if there is one"""
+		if self.limiter is None:
+			return await self.send_now(request)
+		return await self.limiter.call(request.ENDPOINT, self.send_now, request)
+
+	async def send_now(self, request):
+		prepared = request.prepare()
+		response, content = await instrumentation.send_async(self.get_session(), prepared, request.ENDPOINT,
+			URL(prepared.url, encoded = True))
+		return request.RESPONSE_WRAPPER(self.make_response(response, content))
+
+	@staticmethod
+	def make_response(client_response, content):
+		# the response wrappers expect a requests.Response
+		response = Response()
+		response.status_code = client_response.status
+		response.reason = client_response.reason
+		response.headers = CaseInsensitiveDict(client_response.headers)
+		response.url = str(client_response.url)
+		response.encoding = client_response.charset
+		response._content = content
+		return response
+
+	async def register_user(self, displayName, email, password):
+		return await self.send(RegistrationRequest(None, displayName, email, password, base_url = self.base_url))
+
+	async def authenticate_user(self, email, password):
+		return await self.send(AuthenticationRequest(None, email, password, base_url = self.base_url))
+
+	async def delete_user(self, token):
+		return await self.send(DeletionRequest(None, token, base_url = self.base_url))
+
+	async def view_details(self, token):
+		return await self.send(ViewDetailsRequest(None, token, base_url = self.base_url))
+
+	async def get_current_quotes(self, token, symbols):
+		return await self.send(CurrentQuotesRequest(None, token, symbols, base_url = self.base_url))
+
+	async def buy_share(self, token, account_id, symbol, quantity, nonce = None):
+		return await self.send(BuyShareRequest(None, token, account_id, symbol, quantity,
+			base_url = self.base_url, nonce = nonce))
+
+	async def sell_share(self, token, account_id, symbol, quantity, nonce = None):
+		return await self.send(SellShareRequest(None, token, account_id, symbol, quantity,
+			base_url = self.base_url, nonce = nonce))
+
+	async def get_watchlist(self, token, watchlist_id):
+		return await self.send(ViewWatchlistRequest(None, token, watchlist_id, base_url = self.base_url))
+
+	async def add_to_watchlist(self, token, watchlist_id, symbol):
+		return await self.send(AddToWatchlistRequest(None, token, watchlist_id, symbol, base_url = self.base_url))
+
+	async def remove_from_watchlist(self, token, watchlist_id, symbol):
+		return await self.send(RemoveFromWatchlistRequest(None, token, watchlist_id, symbol, base_url = self.base_url))
+
+	async def get_historical_prices(self, token, symbol, end_time = None,
+		interval = None, date_range = None):
+		return await self.send(HistoricalPricesRequest(None, token, symbol, end_time,
+			interval, date_range, base_url = self.base_url))
+
+	async def get_portfolio(self, token, account_id):
+		return await self.send(ViewPortfolioRequest(None, token, account_id, base_url = self.base_url))
+
+	async def get_transactions(self, token, account_id, page_number = None,
+		page_size = None, start_date = None, end_date = None):
+		return await self.send(ViewTransactionsRequest(None, token, account_id, page_number,
+			page_size, start_date, end_date, base_url = self.base_url))
+
+	async def get_leaderboard(self, token, page_number = None, page_size = None):
+		return await self.send(LeaderboardRequest(None, token, page_number, page_size, base_url = self.base_url))
+
+	async def reset_account(self, token, account_id):
+		return await self.send(ResetAccountRequest(None, token, account_id, base_url = self.base_url))
+
+	async def edit_user(self, token, displayName, email):
+		return await self.send(EditUserRequest(None, token, displayName, email, base_url = self.base_url))
+
+	async def get_fundamentals(self, token, symbol):
+		return await self.send(FundamentalsRequest(None, token, symbol, base_url = self.base_url))
+
+	async def get_dividends(self, token, symbol):
+		return await self.send(DividendsRequest(None, token, symbol, base_url = self.base_url))
+
+	async def get_market(self, token, symbol = "ASX"):
+		return await self.send(MarketRequest(None, token, symbol, base_url = self.base_url))
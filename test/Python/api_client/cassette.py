@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import datetime
+import gzip
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests import Response, Session
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .pooled_session import PooledHTTPAdapter, PooledSession
+
+MAGIC = "InvestorAPI cassette 1"
+# differ between runs, or describe the connection rather than the response
+SKIPPED_HEADERS = frozenset(["date", "connection", "keep-alive", "transfer-encoding", "content-encoding",
+	"content-length"])
+# replay protection values, which are new on every run, and passwords, which must not end up in committed cassettes
+DEFAULT_IGNORED_FIELDS = ("nonce", "password")
+
+Interaction = collections.namedtuple("Interaction", ["status", "reason", "headers", "content", "elapsed"])
+
+class UnrecordedRequestError(ConnectionError):
+	"""Raised when replaying a request which is not in the cassette"""
+
+def normalise_body(body, ignored_fields = DEFAULT_IGNORED_FIELDS):
+	"""Returns JSON bodies with sorted keys and without the ignored fields, and other bodies as they are"""
+	if not body:
+		return ""
+	if isinstance(body, bytes):
+		body = body.decode("utf-8", "replace")
+	try:
+		value = json.loads(body)
+	except ValueError:
+		return body
+	if isinstance(value, dict):
+		value = {key: item for key, item in value.items() if key not in ignored_fields}
+	return json.dumps(value, sort_keys = True, separators = (",", ":"), ensure_ascii = False)
+
+def make_key(method, url, body = None, ignored_fields = DEFAULT_IGNORED_FIELDS):
+	"""Identifies a request by its method, path, sorted query and normalised body, but not its host or token"""
+	parts = urlsplit(url)
+	query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values = True)
+		if name not in ignored_fields)
+	key = method.upper() + " " + parts.path
+	if query:
+		key += "?" + urlencode(query)
+	body = normalise_body(body, ignored_fields)
+	if body:
+		key += " " + body
+	return key
+
+class Cassette:
+	"""Request/response pairs keyed by make_key, replayed in the order they were recorded
+
+	The file is gzip-compressed: a JSON line per interaction followed by its exact response body. Saving is
+	deterministic, so recordings of the same calls can be compared byte for byte.
+	"""
+
+	def __init__(self, path = None, ignored_fields = DEFAULT_IGNORED_FIELDS):
+		self.path = path
+		self.ignored_fields = tuple(ignored_fields)
+		self.interactions = collections.OrderedDict()
+		self.positions = {}
+		self.lock = threading.Lock()
+
+	def __len__(self):
+		return sum(len(interactions) for interactions in self.interactions.values())
+
+	def get_key(self, request):
+		return make_key(request.method, request.url, request.body, self.ignored_fields)
+
+	def record(self, request, response):
+		headers = [(name, value) for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS]
+		interaction = Interaction(response.status_code, response.reason, headers, response.content,
+			response.elapsed.total_seconds())
+		key = self.get_key(request)
+		with self.lock:
+			self.interactions.setdefault(key, []).append(interaction)
+
+	def play(self, request):
+		"""Returns the next interaction recorded for the request, starting over once all of them were played"""
+		key = self.get_key(request)
+		with self.lock:
+			interactions = self.interactions.get(key)
+			if not interactions:
+				raise UnrecordedRequestError("No recorded response for {0}".format(key), request = request)
+			position = self.positions.get(key, 0)
+			self.positions[key] = position + 1
+		return interactions[position % len(interactions)]
+
+	def rewind(self):
+		with self.lock:
+			self.positions.clear()
+
+	def save(self, path = None):
+		path = path or self.path
+		with self.lock:
+			keys = sorted(self.interactions)
+			with open(path, "wb") as cassette_file:
+				# without a name or mtime the gzip header is the same between runs
+				with gzip.GzipFile(filename = "", fileobj = cassette_file, mode = "wb", mtime = 0) as gzip_file:
+					gzip_file.write((MAGIC + "\n").encode("utf-8"))
+					for key in keys:
+						for interaction in self.interactions[key]:
+							metadata = {"key": key, "status": interaction.status, "reason": interaction.reason,
+								"headers": interaction.headers, "size": len(interaction.content),
+								"elapsed": round(interaction.elapsed, 6)}
+							gzip_file.write(json.dumps(metadata, ensure_ascii = False).encode("utf-8") + b"\n")
+							gzip_file.write(interaction.content)
+
+	@classmethod
+	def load(cls, path, ignored_fields = DEFAULT_IGNORED_FIELDS):
+		cassette = cls(path, ignored_fields)
+		with gzip.open(path, "rb") as gzip_file:
+			if gzip_file.readline().decode("utf-8").rstrip("\n") != MAGIC:
+				raise ValueError("{0} is not a cassette".format(path))
+			while True:
+				line = gzip_file.readline()
+				if not line:
+					break
+				metadata = json.loads(line.decode("utf-8"))
+				content = gzip_file.read(metadata["size"])
+				interaction = Interaction(metadata["status"], metadata["reason"],
+					[tuple(header) for header in metadata["headers"]], content, metadata["elapsed"])
+				cassette.interactions.setdefault(metadata["key"], []).append(interaction)
+		return cassette
+
+def constant_latency(seconds):
+	return lambda interaction: seconds
+
+def recorded_latency(scale = 1.0):
+	"""Waits as long as the server took when the interaction was recorded"""
+	return lambda interaction: interaction.elapsed * scale
+
+def lognormal_latency(median, sigma, seed = None):
+	"""Draws latencies with the long right tail of real response times"""
+	generator = random.Random(seed)
+	lock = threading.Lock()
+	def draw(interaction):
+		with lock:
+			return generator.lognormvariate(0.0, sigma) * median
+	return draw
+
+def normal_latency(mean, deviation, seed = None):
+	generator = random.Random(seed)
+	lock = threading.Lock()
+	def draw(interaction):
+		with lock:
+			return max(0.0, generator.gauss(mean, deviation))
+	return draw
+
+class RecordingAdapter(PooledHTTPAdapter):
+	"""Pooled adapter which also records every response into a cassette"""
+
+	def __init__(self, cassette, **kwargs):
+		self.cassette = cassette
+		super().__init__(**kwargs)
+
+	def send(self, request, **kwargs):
+		response = super().send(request, **kwargs)
+		# reads the body, which a streaming caller would otherwise read later
+		response.content
+		self.cassette.record(request, response)
+		return response
+
+class ReplayAdapter(BaseAdapter):
+	"""Answers requests from a cassette without a server, after an optional latency(interaction) in seconds"""
+
+	def __init__(self, cassette, latency = None):
+		super().__init__()
+		self.cassette = cassette
+		self.latency = latency
+
+	def send(self, request, stream = False, timeout = None, verify = True, cert = None, proxies = None):
+		started = time.perf_counter()
+		interaction = self.cassette.play(request)
+		if self.latency is not None:
+			delay = self.latency(interaction)
+			if delay > 0:
+				time.sleep(delay)
+
+		response = Response()
+		response.status_code = interaction.status
+		response.reason = interaction.reason
+		response.headers = CaseInsensitiveDict(interaction.headers)
+		response.headers["Content-Length"] = str(len(interaction.content))
+		response.encoding = get_encoding_from_headers(response.headers)
+		response._content = interaction.content
+		response._content_consumed = True
+		response.url = request.url
+		response.request = request
+		response.connection = self
+		response.elapsed = datetime.timedelta(seconds = time.perf_counter() - started)
+		return response
+
+	def close(self):
+		pass
+
+class RecordingSession(PooledSession):
+	"""Pooled session recording every response into cassette; save it with cassette.save() afterwards"""
+
+	def __init__(self, cassette, **pool_options):
+		self.cassette = cassette
+		super().__init__(**pool_options)
+
+	def make_adapter(self, pool_maxsize):
+		return RecordingAdapter(self.cassette, keep_alive = self.keep_alive, pool_connections = self.pool_connections,
+			pool_maxsize = pool_maxsize, pool_block = self.pool_block, max_retries = self.max_retries)
+
+class ReplaySession(Session):
+	"""Session answering every request from cassette"""
+
+	def __init__(self, cassette, latency = None):
+		super().__init__()
+		self.cassette = cassette
+		adapter = ReplayAdapter(cassette, latency)
+		for scheme in PooledSession.SCHEMES:
+			self.mount(scheme, adapter)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import collections
+import threading
+import time
+
+DEFAULT_CLASS = "default"
+UPSTREAM_CLASS = "upstream"
+# these fan out to Yahoo on the server, so they are limited apart and cannot take the places of the cheap calls
+DEFAULT_ENDPOINT_CLASSES = {"get_fundamentals": UPSTREAM_CLASS, "get_dividends": UPSTREAM_CLASS,
+	"get_historical_prices": UPSTREAM_CLASS}
+DEFAULT_CLASS_OPTIONS = {DEFAULT_CLASS: {"initial": 8, "maximum": 256}, UPSTREAM_CLASS: {"initial": 2, "maximum": 16}}
+TOO_MANY_REQUESTS = 429
+
+# ticket orders the calls of a limit by start, saturated says whether the call found the limit at least half used
+Permit = collections.namedtuple("Permit", ["limit", "ticket", "saturated"])
+
+def is_overload(status):
+	"""A call which failed without a response, was throttled or met a server error"""
+	return status is None or status == TOO_MANY_REQUESTS or status >= 500
+
+class AimdLimit:
+	"""Concurrency limit of one class of endpoints, raised additively while its calls are healthy and cut
+	multiplicatively on an overload or a latency spike
+
+	The limit grows by increase for every limit calls that complete healthy while it was at least half used, so about
+	once per round trip. A call slower than latency_tolerance times the smoothed latency, and by more than
+	min_latency_spike seconds, is a spike. Calls which were already in flight at a cut neither cut nor raise the limit
+	again.
+	"""
+
+	DEFAULT_SMOOTHING = 0.1
+
+	def __init__(self, initial = 8, minimum = 1, maximum = 256, increase = 1.0, decrease = 0.5, latency_tolerance = 2.0,
+		min_latency_spike = 0.05, smoothing = DEFAULT_SMOOTHING):
+		if not 1 <= minimum <= initial <= maximum:
+			raise ValueError("Expected 1 <= minimum <= initial <= maximum; got {0}, {1}, {2}."
+				.format(minimum, initial, maximum))
+		if not 0 < decrease < 1:
+			raise ValueError("The decrease must be between 0 and 1; got {0}.".format(decrease))
+		self.limit = float(initial)
+		self.minimum = minimum
+		self.maximum = maximum
+		self.increase = increase
+		self.decrease = decrease
+		self.latency_tolerance = latency_tolerance
+		self.min_latency_spike = min_latency_spike
+		self.smoothing = smoothing
+		self.latency = None
+		self.in_flight = 0
+		self.started = 0
+		self.recovery_ticket = 0
+		self.completed = 0
+		self.overloads = 0
+		self.spikes = 0
+		self.backoffs = 0
+
+	def has_room(self):
+		return self.in_flight < int(self.limit)
+
+	def start(self):
+		self.in_flight += 1
+		self.started += 1
+		return Permit(self, self.started, 2 * self.in_flight >= self.limit)
+
+	def finish(self, permit, status, latency):
+		"""Counts a call of the permit out, adjusting the limit by its status (None if it failed) and latency"""
+		self.in_flight -= 1
+		self.completed += 1
+		overload = is_overload(status)
+		spike = False
+		if not overload:
+			spike = (self.latency is not None and latency > self.latency * self.latency_tolerance
+				and latency - self.latency > self.min_latency_spike)
+			# spikes count too, so a lasting slowdown becomes the new normal rather than cutting for ever
+			self.latency = latency if self.latency is None else self.latency + self.smoothing * (latency - self.latency)
+
+		if overload or spike:
+			self.overloads += overload
+			self.spikes += spike
+			if permit.ticket > self.recovery_ticket:
+				self.limit = max(float(self.minimum), self.limit * self.decrease)
+				# the calls already in flight were started under the old limit
+				self.recovery_ticket = self.started
+				self.backoffs += 1
+		elif permit.saturated and permit.ticket > self.recovery_ticket:
+			self.limit = min(float(self.maximum), self.limit + self.increase / self.limit)
+
+	def get_stats(self):
+		return {"limit": self.limit, "inFlight": self.in_flight, "completed": self.completed,
+			"overloads": self.overloads, "spikes": self.spikes, "backoffs": self.backoffs, "latency": self.latency}
+
+class ConcurrencyLimiter:
+	"""Holds back calls from many threads so each class of endpoints stays within its AimdLimit
+
+	classes maps class names to AimdLimit options, replacing those of the default and upstream classes or adding more,
+	and endpoint_classes maps endpoint names to class names; endpoints not listed belong to the default class.
+	"""
+
+	def __init__(self, classes = None, endpoint_classes = None):
+		self.limits = {name: AimdLimit(**options) for name, options in dict(DEFAULT_CLASS_OPTIONS,
+			**(classes or {})).items()}
+		self.endpoint_classes = dict(DEFAULT_ENDPOINT_CLASSES if endpoint_classes is None else endpoint_classes)
+		unknown = set(self.endpoint_classes.values()) - set(self.limits)
+		if unknown:
+			raise ValueError("Unknown endpoint classes: {0}".format(", ".join(sorted(unknown))))
+		self.condition = self.make_condition()
+
+	def make_condition(self):
+		return threading.Condition()
+
+	def get_limit(self, endpoint):
+		return self.limits[self.endpoint_classes.get(endpoint, DEFAULT_CLASS)]
+
+	def acquire(self, endpoint):
+		limit = self.get_limit(endpoint)
+		with self.condition:
+			self.condition.wait_for(limit.has_room)
+			return limit.start()
+
+	def release(self, permit, status, latency):
+		with self.condition:
+			permit.limit.finish(permit, status, latency)
+			# a cut limit holds everyone back, a raised one lets more through
+			self.condition.notify_all()
+
+	def call(self, endpoint, function, *args):
+		"""Calls function(*args), which returns a response wrapper, once the class of endpoint has room"""
+		permit = self.acquire(endpoint)
+		started = time.perf_counter()
+		status = None
+		try:
+			response = function(*args)
+			status = response.get_http_status()
+			return response
+		finally:
+			self.release(permit, status, time.perf_counter() - started)
+
+	def get_stats(self):
+		with self.condition:
+			return {name: limit.get_stats() for name, limit in self.limits.items()}
+
+class AsyncConcurrencyLimiter(ConcurrencyLimiter):
+	"""ConcurrencyLimiter for coroutines sharing an AsyncApiFacade on one event loop"""
+
+	def make_condition(self):
+		return asyncio.Condition()
+
+	async def acquire(self, endpoint):
+		limit = self.get_limit(endpoint)
+		async with self.condition:
+			await self.condition.wait_for(limit.has_room)
+			return limit.start()
+
+	async def release(self, permit, status, latency):
+		async with self.condition:
+			permit.limit.finish(permit, status, latency)
+			self.condition.notify_all()
+
+	async def call(self, endpoint, function, *args):
+		permit = await self.acquire(endpoint)
+		started = time.perf_counter()
+		status = None
+		try:
+			response = await function(*args)
+			status = response.get_http_status()
+			return response
+		finally:
+			await self.release(permit, status, time.perf_counter() - started)
+
+	def get_stats(self):
+		# everything runs on the event loop, so nothing changes while the stats are read
+		return {name: limit.get_stats() for name, limit in self.limits.items()}
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+DEFAULT_BASE_URL = "https://investor-api.herokuapp.com/api/1.0"
+BASE_URL_VARIABLE = "INVESTOR_API_BASE_URL"
+
+def get_base_url(base_url = None):
+	"""Returns the explicit base URL, else the environment override, else the hosted API"""
+	if base_url is None:
+		base_url = os.environ.get(BASE_URL_VARIABLE) or DEFAULT_BASE_URL
+	return base_url.rstrip("/")
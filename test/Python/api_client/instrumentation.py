@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import collections
+import json
+import math
+import os
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# times are in seconds; dns, connect and tls are None when a pooled connection was reused, status when it failed
+RequestEvent = collections.namedtuple("RequestEvent", ["endpoint", "method", "url", "status", "size", "dns",
+	"connect", "tls", "ttfb", "total", "error", "time"])
+
+PHASES = ("dns", "connect", "tls", "ttfb")
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+hooks = []
+local = threading.local()
+
+def add_hook(hook):
+	"""Calls hook(event) with a RequestEvent after every request sent through send"""
+	hooks.append(hook)
+	return hook
+
+def remove_hook(hook):
+	hooks.remove(hook)
+
+class Timings:
+	"""Phase times of the request in flight on the current thread, filled in by the timed connections or, for
+	send_async, by the callbacks of get_trace_config()"""
+
+	def __init__(self):
+		self.dns = None
+		self.connect = None
+		self.tls = None
+		self.ttfb = None
+		self.connected_at = None
+		self.ready_at = None
+		self.sent_at = None
+		# only set by the aiohttp trace callbacks
+		self.dns_started = None
+		self.connection_started = None
+
+def get_timings():
+	return getattr(local, "timings", None)
+
+def send(session, prepared_request, endpoint):
+	"""Sends a prepared request through session, emitting a RequestEvent to the hooks if there are any"""
+	if not hooks:
+		return session.send(prepared_request)
+
+	timings = local.timings = Timings()
+	started_at = time.time()
+	started = time.perf_counter()
+	response, error = None, None
+	try:
+		response = session.send(prepared_request)
+		return response
+	except Exception as exception:
+		error = type(exception).__name__
+		raise
+	finally:
+		total = time.perf_counter() - started
+		local.timings = None
+		status, size = None, None
+		if response is not None:
+			status, size = response.status_code, len(response.content)
+		emit(endpoint, prepared_request, status, size, timings, total, error, started_at)
+
+def emit(endpoint, prepared_request, status, size, timings, total, error, started_at):
+	event = RequestEvent(endpoint, prepared_request.method, prepared_request.url, status, size, timings.dns,
+		timings.connect, timings.tls, timings.ttfb, total, error, started_at)
+	for hook in list(hooks):
+		hook(event)
+
+async def send_async(session, prepared_request, endpoint, url):
+	"""Sends a prepared request through an aiohttp session made with get_trace_config(), returning the response and
+	its content, and emits a RequestEvent to the hooks if there are any
+
+	aiohttp does not time the TLS handshake apart, so tls stays None and connect includes it.
+	"""
+	timings = Timings() if hooks else None
+	started_at = time.time()
+	started = time.perf_counter()
+	response, content, error = None, None, None
+	try:
+		async with session.request(prepared_request.method, url, headers = prepared_request.headers,
+			data = prepared_request.body, trace_request_ctx = timings) as response:
+			content = await response.read()
+		return response, content
+	except Exception as exception:
+		error = type(exception).__name__
+		raise
+	finally:
+		if timings is not None:
+			status, size = (None, None) if content is None else (response.status, len(content))
+			emit(endpoint, prepared_request, status, size, timings, time.perf_counter() - started, error, started_at)
+
+trace_config = None
+
+def get_trace_config():
+	"""An aiohttp TraceConfig filling in the Timings passed as trace_request_ctx, for send_async"""
+	global trace_config
+	if trace_config is None:
+		import aiohttp
+
+		def on(callback):
+			async def record(session, context, params):
+				if isinstance(context.trace_request_ctx, Timings):
+					callback(context.trace_request_ctx, time.perf_counter())
+			return record
+
+		def start_dns(timings, now):
+			timings.dns_started = now
+
+		def end_dns(timings, now):
+			timings.dns = now - timings.dns_started
+
+		def start_connection(timings, now):
+			timings.connection_started = now
+
+		def end_connection(timings, now):
+			timings.connected_at = timings.ready_at = now
+			# aiohttp resolves the host inside the connection
+			timings.connect = now - timings.connection_started - (timings.dns or 0)
+
+		def mark_sent(timings, now):
+			# the wait for the response starts once the headers and body are out
+			timings.sent_at = now
+
+		def end_request(timings, now):
+			if timings.sent_at is not None:
+				timings.ttfb = now - timings.sent_at
+
+		config = aiohttp.TraceConfig()
+		config.on_dns_resolvehost_start.append(on(start_dns))
+		config.on_dns_resolvehost_end.append(on(end_dns))
+		config.on_connection_create_start.append(on(start_connection))
+		config.on_connection_create_end.append(on(end_connection))
+		config.on_request_headers_sent.append(on(mark_sent))
+		config.on_request_chunk_sent.append(on(mark_sent))
+		config.on_request_end.append(on(end_request))
+		trace_config = config
+	return trace_config
+
+class TimedConnectionMixin:
+	"""Records the DNS, connect, TLS and time to first byte phases into the Timings of the current thread
+
+	_new_conn and _dns_host are those of urllib3 2, which requirements.txt pins.
+	"""
+
+	def _new_conn(self):
+		timings = get_timings()
+		if timings is None:
+			return super()._new_conn()
+
+		started = time.perf_counter()
+		host = self._dns_host
+		try:
+			addresses = socket.getaddrinfo(host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+		except socket.gaierror as e:
+			raise NameResolutionError(self.host, self, e) from e
+		resolved = time.perf_counter()
+		timings.dns = resolved - started
+
+		# each resolved address is tried in turn, as urllib3 does, without resolving the host again
+		error = None
+		try:
+			for address in addresses:
+				self._dns_host = address[4][0]
+				try:
+					sock = super()._new_conn()
+					break
+				except NewConnectionError as e:
+					error = e
+			else:
+				raise error or NewConnectionError(self, "getaddrinfo returns an empty list")
+		finally:
+			self._dns_host = host
+		timings.connected_at = time.perf_counter()
+		timings.connect = timings.connected_at - resolved
+		return sock
+
+	def connect(self):
+		super().connect()
+		timings = get_timings()
+		if timings is not None:
+			timings.ready_at = time.perf_counter()
+			if isinstance(self, HTTPSConnection) and timings.connected_at is not None:
+				timings.tls = timings.ready_at - timings.connected_at
+
+	def request(self, *args, **kwargs):
+		timings = get_timings()
+		if timings is not None:
+			timings.sent_at = time.perf_counter()
+		return super().request(*args, **kwargs)
+
+	def getresponse(self, *args, **kwargs):
+		response = super().getresponse(*args, **kwargs)
+		timings = get_timings()
+		if timings is not None and timings.sent_at is not None:
+			# plain HTTP connections connect inside request, so the wait starts once they are ready
+			timings.ttfb = time.perf_counter() - max(timings.sent_at, timings.ready_at or 0)
+		return response
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+	pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+	pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+	ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+	ConnectionCls = TimedHTTPSConnection
+
+POOL_CLASSES_BY_SCHEME = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+class EndpointHistogram:
+	def __init__(self, bucket_count):
+		self.counts = [0] * (bucket_count + 1)
+		self.count = 0
+		self.sum = 0.0
+		self.maximum = 0.0
+		self.size = 0
+		self.errors = 0
+		self.statuses = collections.Counter()
+		self.phase_sums = dict.fromkeys(PHASES, 0.0)
+		self.phase_counts = dict.fromkeys(PHASES, 0)
+
+class HistogramSink:
+	"""Keeps a latency histogram per endpoint in memory"""
+
+	def __init__(self, buckets = DEFAULT_BUCKETS):
+		self.buckets = tuple(sorted(buckets))
+		self.histograms = {}
+		self.lock = threading.Lock()
+
+	def __call__(self, event):
+		with self.lock:
+			histogram = self.histograms.get(event.endpoint)
+			if histogram is None:
+				histogram = self.histograms[event.endpoint] = EndpointHistogram(len(self.buckets))
+			histogram.counts[bisect.bisect_left(self.buckets, event.total)] += 1
+			histogram.count += 1
+			histogram.sum += event.total
+			histogram.maximum = max(histogram.maximum, event.total)
+			if event.status is None:
+				histogram.errors += 1
+			else:
+				histogram.statuses[event.status] += 1
+				histogram.size += event.size
+			for phase in PHASES:
+				value = getattr(event, phase)
+				if value is not None:
+					histogram.phase_sums[phase] += value
+					histogram.phase_counts[phase] += 1
+
+	def get_percentile(self, endpoint, percent):
+		"""Returns the upper bound of the bucket holding the percentile, or the slowest call past the last bucket"""
+		with self.lock:
+			histogram = self.histograms.get(endpoint)
+			if histogram is None or histogram.count == 0:
+				return math.nan
+			rank = max(1, math.ceil(histogram.count * percent / 100.0))
+			cumulative = 0
+			for bound, count in zip(self.buckets, histogram.counts):
+				cumulative += count
+				if cumulative >= rank:
+					return min(bound, histogram.maximum)
+			return histogram.maximum
+
+	def summary(self):
+		"""Returns the count, error count, mean and percentiles of every endpoint"""
+		with self.lock:
+			endpoints = sorted(self.histograms)
+		result = {}
+		for endpoint in endpoints:
+			histogram = self.histograms[endpoint]
+			result[endpoint] = {"count": histogram.count, "errors": histogram.errors,
+				"mean": histogram.sum / histogram.count, "p50": self.get_percentile(endpoint, 50),
+				"p90": self.get_percentile(endpoint, 90), "p99": self.get_percentile(endpoint, 99)}
+		return result
+
+def format_label(value):
+	return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_bound(bound):
+	return repr(float(bound))
+
+class PrometheusSink(HistogramSink):
+	"""Histogram sink which renders its metrics in the Prometheus text exposition format"""
+
+	PREFIX = "investor_api"
+
+	def render(self):
+		lines = []
+		def add_metric(name, metric_type, description):
+			lines.append("# HELP {0}_{1} {2}".format(self.PREFIX, name, description))
+			lines.append("# TYPE {0}_{1} {2}".format(self.PREFIX, name, metric_type))
+
+		with self.lock:
+			histograms = sorted(self.histograms.items())
+
+			add_metric("request_duration_seconds", "histogram", "Time from sending a request to reading its response.")
+			for endpoint, histogram in histograms:
+				label = format_label(endpoint)
+				cumulative = 0
+				for bound, count in zip(self.buckets + (math.inf,), histogram.counts):
+					cumulative += count
+					lines.append("{0}_request_duration_seconds_bucket{{endpoint=\"{1}\",le=\"{2}\"}} {3}".format(
+						self.PREFIX, label, "+Inf" if bound == math.inf else format_bound(bound), cumulative))
+				lines.append("{0}_request_duration_seconds_sum{{endpoint=\"{1}\"}} {2!r}".format(self.PREFIX, label,
+					histogram.sum))
+				lines.append("{0}_request_duration_seconds_count{{endpoint=\"{1}\"}} {2}".format(self.PREFIX, label,
+					histogram.count))
+
+			add_metric("request_phase_seconds_total", "counter", "Time spent in each phase of the requests.")
+			for endpoint, histogram in histograms:
+				for phase in PHASES:
+					lines.append("{0}_request_phase_seconds_total{{endpoint=\"{1}\",phase=\"{2}\"}} {3!r}".format(
+						self.PREFIX, format_label(endpoint), phase, histogram.phase_sums[phase]))
+
+			add_metric("responses_total", "counter", "Responses by HTTP status.")
+			for endpoint, histogram in histograms:
+				for status, count in sorted(histogram.statuses.items()):
+					lines.append("{0}_responses_total{{endpoint=\"{1}\",status=\"{2}\"}} {3}".format(self.PREFIX,
+						format_label(endpoint), status, count))
+
+			add_metric("request_errors_total", "counter", "Requests which failed without a response.")
+			for endpoint, histogram in histograms:
+				lines.append("{0}_request_errors_total{{endpoint=\"{1}\"}} {2}".format(self.PREFIX,
+					format_label(endpoint), histogram.errors))
+
+			add_metric("response_bytes_total", "counter", "Size of the response bodies.")
+			for endpoint, histogram in histograms:
+				lines.append("{0}_response_bytes_total{{endpoint=\"{1}\"}} {2}".format(self.PREFIX,
+					format_label(endpoint), histogram.size))
+		return "\n".join(lines) + "\n"
+
+	def write(self, path):
+		"""Replaces the file at path with the current metrics, as the node exporter textfile collector expects"""
+		temporary_path = path + ".tmp"
+		with open(temporary_path, "w", encoding = "utf-8") as metrics_file:
+			metrics_file.write(self.render())
+		os.replace(temporary_path, path)
+
+class JsonLinesSink:
+	"""Appends every event to a file as one JSON object per line"""
+
+	def __init__(self, path):
+		self.path = path
+		self.file = open(path, "a", encoding = "utf-8")
+		self.lock = threading.Lock()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def __call__(self, event):
+		line = json.dumps(event._asdict()) + "\n"
+		with self.lock:
+			self.file.write(line)
+			self.file.flush()
+
+	def close(self):
+		with self.lock:
+			self.file.close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import operator
+
+class Model:
+	"""Base of the typed models, with one slot per key of the JSON object and no per-instance dict
+
+	KEYS lists the JSON keys in the order of __slots__, and KEY is a key only the objects of the model have.
+	"""
+
+	__slots__ = ()
+	KEYS = ()
+	KEY = None
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		# fetches all the values in C, which is most of the cost of decoding
+		cls.get_values = operator.itemgetter(*cls.KEYS)
+
+	@classmethod
+	def from_dict(cls, item):
+		try:
+			return cls(*cls.get_values(item))
+		except KeyError:
+			# missing keys become None
+			return cls(*[item.get(key) for key in cls.KEYS])
+
+	@classmethod
+	def object_hook(cls, item):
+		"""json object_hook making the objects of this model into models and leaving the others as dicts"""
+		return cls.from_dict(item) if cls.KEY in item else item
+
+	def to_dict(self):
+		return {key: getattr(self, attribute) for key, attribute in zip(self.KEYS, self.__slots__)}
+
+	def __eq__(self, other):
+		if type(other) is not type(self):
+			return NotImplemented
+		return all(getattr(self, attribute) == getattr(other, attribute) for attribute in self.__slots__)
+
+	def __repr__(self):
+		return "{0}({1})".format(type(self).__name__, ", ".join("{0}={1!r}".format(attribute, getattr(self, attribute))
+			for attribute in self.__slots__))
+
+class Quote(Model):
+
+	__slots__ = ("symbol", "ask", "bid", "last", "last_size", "change", "change_percent", "day_low", "day_high")
+	KEYS = ("symbol", "ask", "bid", "last", "lastSize", "change", "changePercent", "dayLow", "dayHigh")
+	KEY = "ask"
+
+	def __init__(self, symbol, ask, bid, last, last_size, change, change_percent, day_low, day_high):
+		self.symbol = symbol
+		self.ask = ask
+		self.bid = bid
+		self.last = last
+		self.last_size = last_size
+		self.change = change
+		self.change_percent = change_percent
+		self.day_low = day_low
+		self.day_high = day_high
+
+class PositionInfo(Model):
+
+	__slots__ = ("symbol", "name", "quantity", "average_price", "last_price", "change", "change_percent")
+	KEYS = ("symbol", "name", "quantity", "averagePrice", "lastPrice", "change", "changePercent")
+	KEY = "averagePrice"
+
+	def __init__(self, symbol, name, quantity, average_price, last_price, change, change_percent):
+		self.symbol = symbol
+		self.name = name
+		self.quantity = quantity
+		self.average_price = average_price
+		self.last_price = last_price
+		self.change = change
+		self.change_percent = change_percent
+
+class TransactionInfo(Model):
+
+	__slots__ = ("timestamp_utc", "type", "description", "amount", "balance")
+	KEYS = ("timestampUtc", "type", "description", "amount", "balance")
+	KEY = "timestampUtc"
+
+	def __init__(self, timestamp_utc, type, description, amount, balance):
+		self.timestamp_utc = timestamp_utc
+		self.type = type
+		self.description = description
+		self.amount = amount
+		self.balance = balance
+
+class LeaderBoardUser(Model):
+
+	__slots__ = ("rank", "is_current_user", "display_name", "gravatar_url", "total_account_value", "profit",
+		"profit_percent")
+	KEYS = ("rank", "isCurrentUser", "displayName", "gravatarUrl", "totalAccountValue", "profit", "profitPercent")
+	KEY = "rank"
+
+	def __init__(self, rank, is_current_user, display_name, gravatar_url, total_account_value, profit,
+		profit_percent):
+		self.rank = rank
+		self.is_current_user = is_current_user
+		self.display_name = display_name
+		self.gravatar_url = gravatar_url
+		self.total_account_value = total_account_value
+		self.profit = profit
+		self.profit_percent = profit_percent
+
+class QuoteList:
+	"""Quotes in the order of the response, looked up by symbol through an index built on the first lookup"""
+
+	__slots__ = ("quotes", "index")
+
+	def __init__(self, quotes):
+		self.quotes = tuple(quotes)
+		self.index = None
+
+	def __len__(self):
+		return len(self.quotes)
+
+	def __iter__(self):
+		return iter(self.quotes)
+
+	def __getitem__(self, position):
+		return self.quotes[position]
+
+	def get(self, symbol, default = None):
+		if self.index is None:
+			# reversed, so the first quote of a symbol wins as in a scan
+			self.index = {quote.symbol: quote for quote in reversed(self.quotes)}
+		return self.index.get(symbol, default)
+
+	def get_symbols(self):
+		return [quote.symbol for quote in self.quotes]
+
+def convert(value, object_hook):
+	"""Applies object_hook to every dict in an already decoded JSON value, innermost first as json.loads does"""
+	if isinstance(value, dict):
+		return object_hook({key: convert(item, object_hook) for key, item in value.items()})
+	if isinstance(value, list):
+		return [convert(item, object_hook) for item in value]
+	return value
+
+def to_plain(value):
+	"""Turns the models in a decoded JSON value back into dicts"""
+	if isinstance(value, Model):
+		return value.to_dict()
+	if isinstance(value, dict):
+		return {key: to_plain(item) for key, item in value.items()}
+	if isinstance(value, list):
+		return [to_plain(item) for item in value]
+	return value
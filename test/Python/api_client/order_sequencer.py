@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+import time
+
+BUY = "Buy"
+SELL = "Sell"
+# Account.CheckNonce rejects a nonce no greater than the last one before the order trades
+NONCE_REJECTION_STATUS = 400
+NONCE_REJECTION_MESSAGE = "nonce value is invalid"
+
+def is_nonce_rejection(response_wrapper):
+	if response_wrapper.get_http_status() != NONCE_REJECTION_STATUS:
+		return False
+	message = response_wrapper.get_message()
+	return message is not None and NONCE_REJECTION_MESSAGE in message.lower()
+
+def get_clock_nonce():
+	return int(time.time() * 1000)
+
+class OrderSequencer:
+	"""Places the orders of one account from many threads, numbering them with increasing nonces
+
+	Up to max_in_flight orders are sent at once, so they can reach the server out of order. An order overtaken by one
+	with a later nonce is rejected before it trades, and is sent again with a fresh nonce until it is accepted, up to
+	max_resubmits times, or without limit if that is None. Nonces start from the time in milliseconds unless first_nonce
+	is given, which keeps them above the nonces of earlier sessions; after a reset the account accepts any nonce from 1.
+	A rejected nonce moves the next ones up to the time in milliseconds too, past those of a sequencer started since.
+	"""
+
+	DEFAULT_MAX_IN_FLIGHT = 8
+	DEFAULT_MAX_RESUBMITS = 20
+
+	def __init__(self, token, account_id, client = None, first_nonce = None, max_in_flight = DEFAULT_MAX_IN_FLIGHT,
+		max_resubmits = DEFAULT_MAX_RESUBMITS):
+		if client is None:
+			from .api_facade import ApiFacade
+			client = ApiFacade.get_default_client()
+		self.client = client
+		self.token = token
+		self.account_id = account_id
+		self.next_nonce = get_clock_nonce() if first_nonce is None else first_nonce
+		self.max_in_flight = max_in_flight
+		self.max_resubmits = max_resubmits
+		self.lock = threading.Lock()
+		self.window = self.make_window()
+		self.orders = 0
+		self.requests = 0
+		self.resubmits = 0
+
+	def make_window(self):
+		return threading.BoundedSemaphore(self.max_in_flight)
+
+	def allocate_nonce(self):
+		with self.lock:
+			nonce = self.next_nonce
+			self.next_nonce += 1
+			self.requests += 1
+		return nonce
+
+	def count_order(self):
+		with self.lock:
+			self.orders += 1
+
+	def count_resubmit(self):
+		with self.lock:
+			self.resubmits += 1
+			# a sequencer started later numbers from a later time, but one order at a time, so the clock overtakes it
+			self.next_nonce = max(self.next_nonce, get_clock_nonce())
+
+	def get_attempts(self):
+		# a nonce rejection comes before the order trades, so sending it again is always safe
+		if self.max_resubmits is None:
+			return itertools.count()
+		return range(self.max_resubmits + 1)
+
+	def get_place_order(self, side):
+		if side == BUY:
+			return self.client.buy_share
+		if side == SELL:
+			return self.client.sell_share
+		raise ValueError("The side must be '{0}' or '{1}'.".format(BUY, SELL))
+
+	def place_order(self, side, symbol, quantity):
+		"""Places one order and returns its response; the nonce is taken once a place in the window is free"""
+		place_order = self.get_place_order(side)
+		self.count_order()
+		with self.window:
+			for attempt in self.get_attempts():
+				response = place_order(self.token, self.account_id, symbol, quantity, self.allocate_nonce())
+				if attempt == self.max_resubmits or not is_nonce_rejection(response):
+					return response
+				self.count_resubmit()
+
+	def buy_share(self, symbol, quantity):
+		return self.place_order(BUY, symbol, quantity)
+
+	def sell_share(self, symbol, quantity):
+		return self.place_order(SELL, symbol, quantity)
+
+	def place_orders(self, orders):
+		"""Pipelines (side, symbol, quantity) orders through the window, returning the responses in order
+
+		The orders trade in whatever order they reach the server, so a sell must not depend on a buy sent with it.
+		"""
+		with concurrent.futures.ThreadPoolExecutor(self.max_in_flight) as executor:
+			return list(executor.map(lambda order: self.place_order(*order), orders))
+
+class AsyncOrderSequencer(OrderSequencer):
+	"""OrderSequencer for coroutines sharing an AsyncApiFacade on one event loop"""
+
+	def __init__(self, token, account_id, facade, first_nonce = None,
+		max_in_flight = OrderSequencer.DEFAULT_MAX_IN_FLIGHT, max_resubmits = OrderSequencer.DEFAULT_MAX_RESUBMITS):
+		super().__init__(token, account_id, facade, first_nonce, max_in_flight, max_resubmits)
+
+	def make_window(self):
+		return asyncio.Semaphore(self.max_in_flight)
+
+	async def place_order(self, side, symbol, quantity):
+		place_order = self.get_place_order(side)
+		# everything runs on the event loop, so the lock is never contended
+		self.count_order()
+		async with self.window:
+			for attempt in self.get_attempts():
+				response = await place_order(self.token, self.account_id, symbol, quantity, self.allocate_nonce())
+				if attempt == self.max_resubmits or not is_nonce_rejection(response):
+					return response
+				self.count_resubmit()
+
+	async def buy_share(self, symbol, quantity):
+		return await self.place_order(BUY, symbol, quantity)
+
+	async def sell_share(self, symbol, quantity):
+		return await self.place_order(SELL, symbol, quantity)
+
+	async def place_orders(self, orders):
+		return await asyncio.gather(*[self.place_order(*order) for order in orders])
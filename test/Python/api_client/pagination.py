@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import concurrent.futures
+
+# limits of the pageSize and pageNumber query parameters
+MAX_PAGE_SIZE = 100
+MAX_PAGE_NUMBER = 1000
+DEFAULT_PREFETCH = 2
+
+def check_page(response_wrapper, page_number):
+	if response_wrapper.get_http_status() != response_wrapper.SUCCESS_STATUS:
+		raise RuntimeError("Could not get page {0}: HTTP{1}".format(page_number, response_wrapper.get_http_status()))
+	return response_wrapper
+
+def decode(response_wrapper, model):
+	return response_wrapper.get_json_body() if model is None else response_wrapper.get_model_body(model)
+
+def iter_pages(fetch_page, page_size = MAX_PAGE_SIZE, prefetch = DEFAULT_PREFETCH, release_content = True,
+	model = None):
+	"""Yields the response wrapper of every page, fetching up to prefetch later pages while the caller works
+
+	fetch_page(page_number, page_size) returns the response wrapper of one page. At most prefetch + 1 pages are
+	held at a time; with release_content the raw bytes of each page are dropped once it is decoded. With a model
+	(from api_client.models) the pages are decoded by get_model_body instead of get_json_body.
+	"""
+	first_page = check_page(fetch_page(1, page_size), 1)
+	if release_content:
+		first_page.release_content = True
+	page_count = min(decode(first_page, model)["totalPageCount"], MAX_PAGE_NUMBER)
+	yield first_page
+	del first_page
+	if page_count <= 1:
+		return
+
+	def fetch(page_number):
+		response_wrapper = check_page(fetch_page(page_number, page_size), page_number)
+		if release_content:
+			response_wrapper.release_content = True
+		# decoded in the worker thread, so the caller only waits for pages which are not in yet
+		decode(response_wrapper, model)
+		return response_wrapper
+
+	prefetch = max(1, prefetch)
+	executor = concurrent.futures.ThreadPoolExecutor(max_workers = prefetch)
+	pending = collections.deque()
+	page_numbers = iter(range(2, page_count + 1))
+
+	def fill():
+		for page_number in page_numbers:
+			pending.append(executor.submit(fetch, page_number))
+			if len(pending) >= prefetch:
+				return
+
+	try:
+		fill()
+		while pending:
+			page = pending.popleft().result()
+			fill()
+			yield page
+			del page
+	finally:
+		# also reached when the caller stops early, so pages it will not read are not fetched
+		for future in pending:
+			future.cancel()
+		executor.shutdown(wait = False)
+
+def iter_items(fetch_page, page_size = MAX_PAGE_SIZE, prefetch = DEFAULT_PREFETCH, release_content = True,
+	model = None):
+	"""Streams the items of every page in order, as models if a model is given"""
+	for page in iter_pages(fetch_page, page_size, prefetch, release_content, model):
+		yield from decode(page, model)["items"]
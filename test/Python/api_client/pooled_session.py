@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import POOL_CLASSES_BY_SCHEME
+
+class PooledHTTPAdapter(HTTPAdapter):
+	"""HTTP adapter which can optionally disable keep-alive on every request, and whose connections time their phases"""
+
+	def __init__(self, keep_alive = True, **kwargs):
+		self.keep_alive = keep_alive
+		super().__init__(**kwargs)
+
+	def init_poolmanager(self, *args, **kwargs):
+		super().init_poolmanager(*args, **kwargs)
+		self.poolmanager.pool_classes_by_scheme = POOL_CLASSES_BY_SCHEME
+
+	def add_headers(self, request, **kwargs):
+		if not self.keep_alive:
+			request.headers["Connection"] = "close"
+
+class PooledSession(Session):
+	"""Thread-safe session holding a keep-alive connection pool per host"""
+
+	DEFAULT_POOL_CONNECTIONS = 10
+	DEFAULT_POOL_MAXSIZE = 10
+	SCHEMES = ("https://", "http://")
+
+	def __init__(self, pool_connections = DEFAULT_POOL_CONNECTIONS, pool_maxsize = DEFAULT_POOL_MAXSIZE,
+		host_pool_sizes = None, pool_block = False, max_retries = 0, keep_alive = True):
+		super().__init__()
+		self.pool_connections = pool_connections
+		self.pool_block = pool_block
+		self.max_retries = max_retries
+		self.keep_alive = keep_alive
+
+		for scheme in self.SCHEMES:
+			self.mount(scheme, self.make_adapter(pool_maxsize))
+
+		# a more specific prefix takes precedence over the scheme-wide adapters
+		if host_pool_sizes is not None:
+			for host, pool_maxsize in host_pool_sizes.items():
+				self.set_host_pool_size(host, pool_maxsize)
+
+	def make_adapter(self, pool_maxsize):
+		return PooledHTTPAdapter(keep_alive = self.keep_alive, pool_connections = self.pool_connections,
+			pool_maxsize = pool_maxsize, pool_block = self.pool_block, max_retries = self.max_retries)
+
+	def set_host_pool_size(self, host, pool_maxsize):
+		if host.startswith(self.SCHEMES):
+			prefixes = [host]
+		else:
+			prefixes = [scheme + host for scheme in self.SCHEMES]
+
+		for prefix in prefixes:
+			previous = self.adapters.get(prefix)
+			self.mount(prefix, self.make_adapter(pool_maxsize))
+			if previous is not None:
+				previous.close()
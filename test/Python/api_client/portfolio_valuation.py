@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+
+import numpy as np
+
+# one element per position, with account_index pointing into the account arrays
+PositionValues = collections.namedtuple("PositionValues", ["account_index", "symbol", "quantity", "average_price",
+	"last_price", "change", "market_value", "cost", "unrealised", "unrealised_percent", "day_change", "weight"])
+# one element per account; weights are of the positions' market value, concentration is their Herfindahl index
+AccountValues = collections.namedtuple("AccountValues", ["id", "balance", "positions_value", "total_value", "cost",
+	"unrealised", "unrealised_percent", "day_change", "day_change_percent", "concentration", "largest_weight"])
+Valuation = collections.namedtuple("Valuation", ["accounts", "positions"])
+
+def get_body(portfolio):
+	return portfolio.get_json_body() if hasattr(portfolio, "get_json_body") else portfolio
+
+def divide(numerators, denominators):
+	"""Element-wise division giving NaN where the denominator is zero"""
+	result = np.full(len(numerators), np.nan)
+	np.divide(numerators, denominators, out = result, where = denominators != 0)
+	return result
+
+def value_portfolios(portfolios, quotes = None):
+	"""Values many accounts at once from their portfolio responses (or bodies) and, optionally, newer quotes
+
+	Without quotes the lastPrice and change of each position are used. With quotes (a list of quote dicts or a
+	dict by symbol) positions without a quote are left out, as AccountService.GetAccountDetails does.
+	"""
+	bodies = [get_body(portfolio) for portfolio in portfolios]
+	account_count = len(bodies)
+	counts = np.fromiter((len(body["positions"]) for body in bodies), dtype = np.int64, count = account_count)
+	positions = [position for body in bodies for position in body["positions"]]
+	position_count = len(positions)
+
+	account_index = np.repeat(np.arange(account_count), counts)
+	symbol = np.array([position["symbol"] for position in positions], dtype = object)
+	quantity = np.fromiter((position["quantity"] for position in positions), dtype = np.float64,
+		count = position_count)
+	average_price = np.fromiter((position["averagePrice"] for position in positions), dtype = np.float64,
+		count = position_count)
+
+	if quotes is None:
+		last_price = np.fromiter((position["lastPrice"] for position in positions), dtype = np.float64,
+			count = position_count)
+		change = np.fromiter((position["change"] for position in positions), dtype = np.float64,
+			count = position_count)
+	else:
+		if not isinstance(quotes, dict):
+			quotes = {quote["symbol"]: quote for quote in quotes}
+		# each quote is looked up once per symbol, not once per position
+		symbols, inverse = np.unique(symbol.astype(str), return_inverse = True)
+		quoted = [quotes.get(value) for value in symbols]
+		symbol_last = np.array([quote["last"] if quote else np.nan for quote in quoted], dtype = np.float64)
+		symbol_change = np.array([quote["change"] if quote else np.nan for quote in quoted], dtype = np.float64)
+
+		found = ~np.isnan(symbol_last[inverse])
+		account_index, symbol, quantity, average_price = (account_index[found], symbol[found], quantity[found],
+			average_price[found])
+		last_price, change = symbol_last[inverse][found], symbol_change[inverse][found]
+
+	market_value = quantity * last_price
+	cost = quantity * average_price
+	unrealised = market_value - cost
+	day_change = quantity * change
+
+	def per_account(values):
+		return np.bincount(account_index, weights = values, minlength = account_count).astype(np.float64)
+
+	balance = np.fromiter((body["balance"] for body in bodies), dtype = np.float64, count = account_count)
+	positions_value = per_account(market_value)
+	account_cost = per_account(cost)
+	account_unrealised = per_account(unrealised)
+	account_day_change = per_account(day_change)
+	total_value = balance + positions_value
+
+	weight = divide(market_value, positions_value[account_index])
+	concentration = per_account(np.nan_to_num(weight) ** 2)
+	largest_weight = np.zeros(account_count)
+	np.maximum.at(largest_weight, account_index, np.nan_to_num(weight))
+
+	accounts = AccountValues(np.array([body.get("id") for body in bodies], dtype = object), balance, positions_value,
+		total_value, account_cost, account_unrealised, divide(account_unrealised, account_cost) * 100,
+		account_day_change, divide(account_day_change, total_value - account_day_change) * 100, concentration,
+		largest_weight)
+	positions = PositionValues(account_index, symbol, quantity, average_price, last_price, change, market_value,
+		cost, unrealised, divide(unrealised, cost) * 100, day_change, weight)
+	return Valuation(accounts, positions)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import datetime
+import json
+import re
+
+import numpy as np
+
+# UTC datetime64[s] timestamps, float64 prices with NaN for nulls and int64 volumes with 0 for nulls
+PriceColumns = collections.namedtuple("PriceColumns", ["timestamps", "open", "high", "low", "close", "volume"])
+
+PRICES_START = re.compile(rb'"prices"\s*:\s*\[', re.IGNORECASE)
+PRICE_KEYS = ("o", "h", "l", "c")
+NULL = b"null"
+
+QUOTE, COLON, COMMA, SPACE, OPEN_BRACE, CLOSE_BRACE = (ord(char) for char in '":, {}')
+WHITESPACE = np.array([ord(char) for char in " \t\n\r"], dtype = np.uint8)
+
+def decode_price_columns(content):
+	"""Reads the bars of a price history response straight into NumPy arrays, without a dictionary per bar"""
+	start = PRICES_START.search(content)
+	if start is None:
+		return None
+	end = content.find(b"]", start.end())
+	chars = np.frombuffer(content, dtype = np.uint8)[start.end():end if end >= 0 else len(content)]
+	if not is_compact(chars):
+		body = json.loads(content.decode("utf-8"))
+		return price_columns_from_points(body.get("prices") if isinstance(body, dict) else None)
+
+	# every bar is a flat object of one letter keys, so the structure can be found with array operations
+	object_starts = np.flatnonzero(chars == OPEN_BRACE)
+	colons = np.flatnonzero(chars == COLON)
+	colons = colons[colons >= 3]
+	colons = colons[(chars[colons - 1] == QUOTE) & (chars[colons - 3] == QUOTE)]
+	keys = chars[colons - 2]
+
+	value_starts = colons + 1
+	value_starts += chars[value_starts] == SPACE
+	value_starts += chars[value_starts] == QUOTE
+	delimiters = np.flatnonzero((chars == COMMA) | (chars == CLOSE_BRACE))
+	value_ends = delimiters[np.minimum(np.searchsorted(delimiters, value_starts), len(delimiters) - 1)]
+	value_ends -= chars[value_ends - 1] == QUOTE
+
+	count = len(object_starts)
+	bars = None
+	columns = []
+	for key in ("t",) + PRICE_KEYS + ("v",):
+		found = np.flatnonzero(keys == ord(key))
+		strings = slice_strings(chars, value_starts[found], value_ends[found])
+		found_bars = None
+		if len(found) != count:
+			# the API leaves out null values, so each value goes to the bar it was found in
+			if bars is None:
+				bars = np.searchsorted(object_starts, colons, side = "right") - 1
+			found_bars = bars[found]
+		columns.append(make_column(key, strings, found_bars, count))
+	return PriceColumns(*columns)
+
+def is_compact(chars):
+	"""Whether the only whitespace is single spaces after colons and commas, which the array parsing expects"""
+	spaces = np.flatnonzero(np.isin(chars, WHITESPACE))
+	if len(spaces) == 0:
+		return True
+	if spaces[0] == 0 or (chars[spaces] != SPACE).any():
+		return False
+	previous = chars[spaces - 1]
+	return bool(((previous == COLON) | (previous == COMMA)).all())
+
+def slice_strings(chars, starts, ends):
+	"""Copies chars[start:end] for every pair into a fixed-width bytes array"""
+	if len(starts) == 0:
+		return np.empty(0, dtype = "S1")
+	lengths = ends - starts
+	width = max(int(lengths.max()), 1)
+	positions = starts[:, np.newaxis] + np.arange(width)
+	matrix = chars[np.minimum(positions, len(chars) - 1)]
+	matrix[np.arange(width) >= lengths[:, np.newaxis]] = 0
+	return matrix.view("S{0}".format(width)).ravel()
+
+def make_column(key, strings, bars, count):
+	if key == "t":
+		converted, missing = parse_timestamps(strings), np.datetime64("NaT")
+	elif key == "v":
+		strings[strings == NULL] = b"0"
+		converted, missing = strings.astype(np.int64), 0
+	else:
+		strings[strings == NULL] = b"nan"
+		converted, missing = strings.astype(np.float64), np.nan
+
+	if bars is None:
+		return converted
+	column = np.full(count, missing, dtype = converted.dtype)
+	column[bars] = converted
+	return column
+
+def parse_timestamps(strings):
+	"""Converts ISO 8601 timestamps with a UTC offset, as Json.NET writes DateTimeOffset, to UTC datetime64[s]"""
+	if len(strings) == 0:
+		return np.empty(0, dtype = "datetime64[s]")
+
+	width = strings.dtype.itemsize
+	if width > 6 and (np.char.str_len(strings) == width).all():
+		# equal widths allow slicing the offset off every timestamp at once
+		chars = strings.view(np.uint8).reshape(len(strings), width)
+		signs = chars[:, -6]
+		if (((signs == ord("+")) | (signs == ord("-"))) & (chars[:, -3] == ord(":"))).all():
+			local = np.ascontiguousarray(chars[:, :-6]).view("S{0}".format(width - 6)).ravel()
+			digits = chars[:, [-5, -4, -2, -1]].astype(np.int64) - ord("0")
+			minutes = (digits[:, 0] * 10 + digits[:, 1]) * 60 + digits[:, 2] * 10 + digits[:, 3]
+			minutes[signs == ord("-")] *= -1
+			return local.astype("datetime64[s]") - minutes.astype("timedelta64[m]")
+
+	return np.array([parse_timestamp(value.decode("ascii")) for value in strings], dtype = "datetime64[s]")
+
+def parse_timestamp(value):
+	if value == "null":
+		return np.datetime64("NaT")
+	timestamp = datetime.datetime.fromisoformat(value)
+	if timestamp.tzinfo is not None:
+		timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo = None)
+	return np.datetime64(timestamp, "s")
+
+def price_columns_from_points(points):
+	"""Builds the same arrays from already decoded bars"""
+	if points is None:
+		return None
+	count = len(points)
+	columns = [np.array([parse_timestamp(point.get("t") or "null") for point in points], dtype = "datetime64[s]")]
+	for key in PRICE_KEYS:
+		columns.append(np.fromiter((np.nan if point.get(key) is None else point[key] for point in points),
+			dtype = np.float64, count = count))
+	columns.append(np.fromiter((point.get("v") or 0 for point in points), dtype = np.int64, count = count))
+	return PriceColumns(*columns)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+import re
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .price_columns import PriceColumns
+
+# one fixed-width record per bar: UTC seconds, open, high, low, close and volume, little-endian
+BAR_DTYPE = np.dtype([("t", "<i8"), ("o", "<f8"), ("h", "<f8"), ("l", "<f8"), ("c", "<f8"), ("v", "<i8")])
+# magic, version, record size and the UNIX time of the last refresh
+HEADER = struct.Struct("<8sIId8x")
+MAGIC = b"IAPRICES"
+VERSION = 1
+
+# the smallest range reaching back over a gap, with the calendar days each range covers at the least
+TAIL_RANGES = [("5d", 4), ("1mo", 28), ("3mo", 89), ("6mo", 180), ("1y", 364), ("2y", 729), ("5y", 1825),
+	("10y", 3651)]
+# intraday intervals only go back a few weeks
+INITIAL_RANGES = {"2m": "1mo", "15m": "1mo", "1h": "1y"}
+SYMBOL = re.compile(r"^[A-Za-z0-9]+$")
+
+def get_tail_range(gap):
+	"""Returns the smallest range which starts before the last stored bar, gap seconds ago"""
+	days = gap / 86400.0 + 1
+	for date_range, covered_days in TAIL_RANGES:
+		if covered_days >= days:
+			return date_range
+	return "max"
+
+def columns_to_bars(columns):
+	bars = np.empty(len(columns.timestamps), dtype = BAR_DTYPE)
+	bars["t"] = columns.timestamps.astype("datetime64[s]").astype(np.int64)
+	for key, column in zip(("o", "h", "l", "c", "v"), columns[1:]):
+		bars[key] = column
+	return bars
+
+def bars_to_columns(bars):
+	return PriceColumns(bars["t"].view("datetime64[s]"), bars["o"], bars["h"], bars["l"], bars["c"], bars["v"])
+
+class PriceStore:
+	"""Keeps price history on disk, one file of fixed-width bars per symbol and interval, read through mmap"""
+
+	DEFAULT_MAX_AGE = 900.0
+
+	def __init__(self, root, client = None, max_age = DEFAULT_MAX_AGE):
+		if client is None:
+			from .api_facade import ApiFacade
+			client = ApiFacade.get_default_client()
+		self.root = root
+		self.client = client
+		self.max_age = max_age
+		self.lock = threading.Lock()
+		self.path_locks = {}
+
+	def get_path(self, symbol, interval):
+		if not SYMBOL.match(symbol) or not SYMBOL.match(interval):
+			raise ValueError("Invalid symbol or interval: {0} {1}".format(symbol, interval))
+		return os.path.join(self.root, symbol.upper(), interval + ".bars")
+
+	def get_path_lock(self, path):
+		with self.lock:
+			return self.path_locks.setdefault(path, threading.Lock())
+
+	def read_header(self, path):
+		"""Returns the time of the last refresh, or None if there is no valid file"""
+		try:
+			with open(path, "rb") as bars_file:
+				header = bars_file.read(HEADER.size)
+		except FileNotFoundError:
+			return None
+		if len(header) < HEADER.size:
+			return None
+		magic, version, record_size, refreshed_at = HEADER.unpack(header)
+		if magic != MAGIC or version != VERSION or record_size != BAR_DTYPE.itemsize:
+			raise ValueError("{0} is not a version {1} price file".format(path, VERSION))
+		return refreshed_at
+
+	def load(self, symbol, interval):
+		"""Maps the stored bars of a symbol into memory as a read-only structured array, oldest first"""
+		path = self.get_path(symbol, interval)
+		if self.read_header(path) is None:
+			return np.empty(0, dtype = BAR_DTYPE)
+		count = (os.path.getsize(path) - HEADER.size) // BAR_DTYPE.itemsize
+		if count == 0:
+			return np.empty(0, dtype = BAR_DTYPE)
+		return np.memmap(path, dtype = BAR_DTYPE, mode = "r", offset = HEADER.size, shape = (count,))
+
+	def get_price_columns(self, symbol, interval, start = None, end = None):
+		"""Returns the stored bars from start up to but excluding end (datetime64 or ISO strings, in UTC)"""
+		bars = self.load(symbol, interval)
+		first, last = 0, len(bars)
+		if start is not None:
+			first = np.searchsorted(bars["t"], np.datetime64(start, "s").astype(np.int64))
+		if end is not None:
+			last = np.searchsorted(bars["t"], np.datetime64(end, "s").astype(np.int64))
+		return bars_to_columns(bars[first:last])
+
+	def write(self, path, bars, keep):
+		"""Stores bars after the first keep stored ones, in place unless the file would shrink"""
+		header = HEADER.pack(MAGIC, VERSION, BAR_DTYPE.itemsize, time.time())
+		end = HEADER.size + (keep + len(bars)) * BAR_DTYPE.itemsize
+		if os.path.exists(path) and end >= os.path.getsize(path):
+			# growing the file in place never cuts off pages that readers have mapped
+			with open(path, "r+b") as bars_file:
+				bars_file.seek(HEADER.size + keep * BAR_DTYPE.itemsize)
+				bars_file.write(bars.tobytes())
+				bars_file.seek(0)
+				bars_file.write(header)
+			return
+
+		kept = np.array(self.load_path(path, keep)) if keep else np.empty(0, dtype = BAR_DTYPE)
+		os.makedirs(os.path.dirname(path), exist_ok = True)
+		temporary_path = path + ".tmp"
+		with open(temporary_path, "wb") as bars_file:
+			bars_file.write(header)
+			bars_file.write(kept.tobytes())
+			bars_file.write(bars.tobytes())
+		os.replace(temporary_path, path)
+
+	@staticmethod
+	def load_path(path, count):
+		return np.memmap(path, dtype = BAR_DTYPE, mode = "r", offset = HEADER.size, shape = (count,))
+
+	def refresh(self, token, symbol, interval, initial_range = None, force = False):
+		"""Downloads the bars missing from the store, returning the number of bars written"""
+		path = self.get_path(symbol, interval)
+		with self.get_path_lock(path):
+			refreshed_at = self.read_header(path)
+			if not force and refreshed_at is not None and time.time() - refreshed_at < self.max_age:
+				return 0
+
+			stored = self.load(symbol, interval)
+			end_time = datetime.datetime.now(datetime.timezone.utc)
+			if len(stored):
+				# the last stored bar may still have been forming, so it is requested again
+				last_time = int(stored["t"][-1])
+				date_range = get_tail_range(end_time.timestamp() - last_time)
+			else:
+				date_range = initial_range or INITIAL_RANGES.get(interval, "max")
+
+			prices_response = self.client.get_historical_prices(token, symbol, end_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+				interval, date_range)
+			if prices_response.get_http_status() != prices_response.SUCCESS_STATUS:
+				raise RuntimeError("Could not get the {0} prices of {1}: HTTP{2}".format(interval, symbol,
+					prices_response.get_http_status()))
+			price_columns = prices_response.get_price_columns()
+			# a body without prices has nothing new
+			bars = np.empty(0, dtype = BAR_DTYPE) if price_columns is None else columns_to_bars(price_columns)
+
+			keep = 0
+			if len(stored):
+				bars = bars[bars["t"] >= last_time]
+				keep = len(stored)
+				if len(bars) and bars["t"][0] == last_time:
+					# the response has a newer version of the last stored bar, which replaces it
+					keep = int(np.searchsorted(stored["t"], last_time))
+			del stored
+			self.write(path, bars, keep)
+			return len(bars)
+
+	def get_historical_prices(self, token, symbol, interval, start = None, end = None):
+		"""Refreshes the stored bars if they are older than max_age and returns them as PriceColumns"""
+		self.refresh(token, symbol, interval)
+		return self.get_price_columns(symbol, interval, start, end)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+
+from .request_extensions.currentquotes_request import CurrentQuotesRequest
+from .response_wrappers.currentquotes_response_wrapper import CurrentQuotesResponseWrapper
+
+# SharesController.GetQuotes rejects symbols strings shorter than this, which a batch would hide
+MIN_SYMBOLS_LENGTH = 3
+
+def parse_symbols(symbols):
+	"""Splits symbols the way the server does, upper-cased and without duplicates"""
+	if isinstance(symbols, str):
+		symbols = symbols.replace(";", CurrentQuotesRequest.SYMBOL_SEPARATOR).split(CurrentQuotesRequest.SYMBOL_SEPARATOR)
+	return list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+
+class QuoteBatch:
+	"""Symbols wanted by concurrent callers with the same token, sent as one request"""
+
+	def __init__(self, token, ready, done):
+		self.token = token
+		self.symbols = {}
+		self.ready = ready
+		self.done = done
+		self.response_wrapper = None
+		self.error = None
+		self.callers = 0
+
+	def fits(self, symbols, max_batch_size):
+		# a call wanting more symbols than a batch holds still goes out, on its own
+		return not self.symbols or len(self.symbols.keys() | set(symbols)) <= max_batch_size
+
+	def add(self, symbols):
+		self.symbols.update(dict.fromkeys(symbols))
+		self.callers += 1
+
+	def get_response(self, symbols):
+		"""Gives a caller a response wrapper holding only the quotes it asked for"""
+		if self.error is not None:
+			raise self.error
+		shared = self.response_wrapper
+		wrapper = CurrentQuotesResponseWrapper(shared.response)
+		body = shared.get_json_body()
+		if shared.get_http_status() == shared.SUCCESS_STATUS and isinstance(body, list):
+			wanted = set(symbols)
+			body = [quote for quote in body if quote.get("symbol") in wanted]
+		wrapper.json_body = body
+		return wrapper
+
+class QuoteBatcher:
+	"""Coalesces get_current_quotes calls made concurrently from many threads into batched requests"""
+
+	DEFAULT_MAX_BATCH_SIZE = 50
+	DEFAULT_MAX_WAIT = 0.005
+
+	def __init__(self, client = None, max_batch_size = DEFAULT_MAX_BATCH_SIZE, max_wait = DEFAULT_MAX_WAIT):
+		if client is None:
+			from .api_facade import ApiFacade
+			client = ApiFacade.get_default_client()
+		self.client = client
+		self.max_batch_size = max_batch_size
+		self.max_wait = max_wait
+		self.lock = threading.Lock()
+		self.pending = {}
+		self.calls = 0
+		self.requests = 0
+
+	def join(self, token, symbols):
+		"""Adds the symbols to the open batch of the token, returning the batch and whether the caller sends it"""
+		with self.lock:
+			self.calls += 1
+			batch = self.pending.get(token)
+			leader = batch is None or not batch.fits(symbols, self.max_batch_size)
+			if leader:
+				if batch is not None:
+					self.close(batch)
+				batch = self.make_batch(token)
+				self.pending[token] = batch
+				self.requests += 1
+			batch.add(symbols)
+			if len(batch.symbols) >= self.max_batch_size:
+				self.close(batch)
+		return batch, leader
+
+	def close(self, batch):
+		# called with the lock held; later callers start a new batch and the leader sends this one now
+		if self.pending.get(batch.token) is batch:
+			del self.pending[batch.token]
+		batch.ready.set()
+
+	def make_batch(self, token):
+		return QuoteBatch(token, threading.Event(), threading.Event())
+
+	def finish(self, batch):
+		"""Releases the callers of a batch, with an error if the leader gave up before it had a response"""
+		with self.lock:
+			self.close(batch)
+		if batch.response_wrapper is None and batch.error is None:
+			batch.error = RuntimeError("The request of the batch was cancelled before it was answered")
+		batch.done.set()
+
+	def get_current_quotes(self, token, symbols):
+		"""Same as ApiClient.get_current_quotes, but waits up to max_wait for other callers to share the request"""
+		requested = parse_symbols(symbols)
+		if len(CurrentQuotesRequest.SYMBOL_SEPARATOR.join(requested)) < MIN_SYMBOLS_LENGTH:
+			return self.client.get_current_quotes(token, symbols)
+
+		batch, leader = self.join(token, requested)
+		if leader:
+			try:
+				batch.ready.wait(self.max_wait)
+				with self.lock:
+					self.close(batch)
+				batch.response_wrapper = self.client.get_current_quotes(token, list(batch.symbols))
+			except Exception as error:
+				batch.error = error
+			finally:
+				self.finish(batch)
+		else:
+			batch.done.wait()
+		return batch.get_response(requested)
+
+class AsyncQuoteBatcher(QuoteBatcher):
+	"""QuoteBatcher for coroutines sharing an AsyncApiFacade on one event loop"""
+
+	def __init__(self, facade, max_batch_size = QuoteBatcher.DEFAULT_MAX_BATCH_SIZE,
+		max_wait = QuoteBatcher.DEFAULT_MAX_WAIT):
+		super().__init__(facade, max_batch_size, max_wait)
+
+	def make_batch(self, token):
+		return QuoteBatch(token, asyncio.Event(), asyncio.Event())
+
+	async def get_current_quotes(self, token, symbols):
+		requested = parse_symbols(symbols)
+		if len(CurrentQuotesRequest.SYMBOL_SEPARATOR.join(requested)) < MIN_SYMBOLS_LENGTH:
+			return await self.client.get_current_quotes(token, symbols)
+
+		# everything runs on the event loop, so the lock is never contended
+		batch, leader = self.join(token, requested)
+		if leader:
+			try:
+				try:
+					await asyncio.wait_for(batch.ready.wait(), self.max_wait)
+				except asyncio.TimeoutError:
+					pass
+				with self.lock:
+					self.close(batch)
+				batch.response_wrapper = await self.client.get_current_quotes(token, list(batch.symbols))
+			except Exception as error:
+				batch.error = error
+			finally:
+				self.finish(batch)
+		else:
+			await batch.done.wait()
+		return batch.get_response(requested)
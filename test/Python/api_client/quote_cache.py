@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import threading
+import time
+
+from requests import Response
+
+from .quote_batcher import parse_symbols
+from .response_wrappers.currentquotes_response_wrapper import CurrentQuotesResponseWrapper
+
+FRESH, STALE, EXPIRED = "fresh", "stale", "expired"
+
+class CacheEntry:
+	__slots__ = ("value", "expires", "stale_until")
+
+	def __init__(self, value, expires, stale_until):
+		self.value = value
+		self.expires = expires
+		self.stale_until = stale_until
+
+	def get_state(self, now):
+		if now < self.expires:
+			return FRESH
+		return STALE if now < self.stale_until else EXPIRED
+
+def make_cached_response():
+	"""A successful response without a body, for wrappers put together from cached values"""
+	response = Response()
+	response.status_code = 200
+	response.encoding = "utf-8"
+	response._content = b""
+	return response
+
+class QuoteCache:
+	"""Caches quotes and fundamentals by symbol, for a short time while the ASX trades and until it opens otherwise"""
+
+	DEFAULT_OPEN_TTL = 15.0
+	DEFAULT_STALE_TTL = 60.0
+	DEFAULT_MAX_ENTRIES = 1000
+	DEFAULT_MAX_MARKET_AGE = 3600.0
+	QUOTES, FUNDAMENTALS = "quotes", "fundamentals"
+
+	def __init__(self, client = None, open_ttl = DEFAULT_OPEN_TTL, stale_ttl = DEFAULT_STALE_TTL,
+		max_entries = DEFAULT_MAX_ENTRIES, max_market_age = DEFAULT_MAX_MARKET_AGE, clock = time.monotonic):
+		if client is None:
+			from .api_facade import ApiFacade
+			client = ApiFacade.get_default_client()
+		self.client = client
+		self.open_ttl = open_ttl
+		self.stale_ttl = stale_ttl
+		self.max_entries = max_entries
+		self.max_market_age = max_market_age
+		self.clock = clock
+		self.lock = threading.Lock()
+		self.entries = collections.OrderedDict()
+		self.refreshing = set()
+		self.market = None
+		self.hits = 0
+		self.misses = 0
+
+	def get_expiry(self, token):
+		"""Returns when values fetched now go stale: after the TTL while the market is open, else at the next open"""
+		now = self.clock()
+		with self.lock:
+			market = self.market
+		if market is None or now >= market[0]:
+			market_response = self.client.get_market(token)
+			until_open = market_response.get_time_until_next_open()
+			until_close = market_response.get_time_until_next_close()
+			if until_open is None or until_close is None:
+				# without the market hours the short TTL is the safe choice
+				return now + self.open_ttl
+			is_open = market_response.is_open()
+			until_open = until_open.total_seconds()
+			until_change = until_close.total_seconds() if is_open else until_open
+			market = (now + max(0.0, min(until_change, self.max_market_age)), is_open, now + until_open)
+			with self.lock:
+				self.market = market
+
+		checked_until, is_open, next_open = market
+		return now + self.open_ttl if is_open else max(next_open, now + self.open_ttl)
+
+	def lookup(self, kind, keys):
+		"""Sorts keys into fresh, stale and missing ones, keeping the values of the first two"""
+		now = self.clock()
+		values, stale, missing = {}, [], []
+		with self.lock:
+			for key in keys:
+				entry = self.entries.get((kind, key))
+				state = entry.get_state(now) if entry is not None else EXPIRED
+				if state == EXPIRED:
+					missing.append(key)
+					continue
+				self.entries.move_to_end((kind, key))
+				values[key] = entry.value
+				if state == STALE and (kind, key) not in self.refreshing:
+					self.refreshing.add((kind, key))
+					stale.append(key)
+			self.hits += len(values)
+			self.misses += len(missing)
+		return values, stale, missing
+
+	def store(self, kind, values, expires):
+		with self.lock:
+			for key, value in values.items():
+				self.entries[(kind, key)] = CacheEntry(value, expires, expires + self.stale_ttl)
+				self.entries.move_to_end((kind, key))
+			while len(self.entries) > self.max_entries:
+				self.entries.popitem(last = False)
+
+	def revalidate(self, kind, token, keys):
+		"""Refreshes stale entries in the background while callers are served the stale values"""
+		def refresh():
+			try:
+				if kind == self.QUOTES:
+					self.fetch_quotes(token, keys)
+				else:
+					self.fetch_fundamentals(token, keys[0])
+			except Exception:
+				pass
+			finally:
+				with self.lock:
+					self.refreshing.difference_update((kind, key) for key in keys)
+
+		threading.Thread(target = refresh, daemon = True).start()
+
+	def fetch_quotes(self, token, symbols):
+		expires = self.get_expiry(token)
+		response_wrapper = self.client.get_current_quotes(token, symbols)
+		if response_wrapper.get_http_status() == response_wrapper.SUCCESS_STATUS:
+			self.store(self.QUOTES, {quote["symbol"]: quote for quote in response_wrapper.get_all_quotes()}, expires)
+		return response_wrapper
+
+	def fetch_fundamentals(self, token, symbol):
+		expires = self.get_expiry(token)
+		response_wrapper = self.client.get_fundamentals(token, symbol)
+		if response_wrapper.get_http_status() == response_wrapper.SUCCESS_STATUS:
+			self.store(self.FUNDAMENTALS, {symbol: response_wrapper}, expires)
+		return response_wrapper
+
+	def get_current_quotes(self, token, symbols):
+		"""Same as ApiClient.get_current_quotes, only asking the API for the symbols which are not cached"""
+		requested = parse_symbols(symbols)
+		values, stale, missing = self.lookup(self.QUOTES, requested)
+		if stale:
+			self.revalidate(self.QUOTES, token, stale)
+		if missing:
+			response_wrapper = self.fetch_quotes(token, missing)
+			if response_wrapper.get_http_status() != response_wrapper.SUCCESS_STATUS:
+				return response_wrapper
+			values.update((quote["symbol"], quote) for quote in response_wrapper.get_all_quotes())
+
+		response_wrapper = CurrentQuotesResponseWrapper(make_cached_response())
+		# the server leaves out unknown symbols, and so does the cache
+		response_wrapper.json_body = [values[symbol] for symbol in requested if symbol in values]
+		return response_wrapper
+
+	def get_fundamentals(self, token, symbol):
+		"""Same as ApiClient.get_fundamentals, answered from the cache when possible"""
+		key = str(symbol).upper()
+		values, stale, missing = self.lookup(self.FUNDAMENTALS, [key])
+		if stale:
+			self.revalidate(self.FUNDAMENTALS, token, stale)
+		if missing:
+			return self.fetch_fundamentals(token, key)
+		return values[key]
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+			self.market = None
@@ -1,35 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-import time
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.addtowatchlist_response_wrapper import AddToWatchlistResponseWrapper
 
-class AddToWatchlistRequest(Request):
+class AddToWatchlistRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/watchlists/WATCHLIST_ID/shares"
+	PATH = "/watchlists/WATCHLIST_ID/shares"
+	ENDPOINT = "add_to_watchlist"
+	RESPONSE_WRAPPER = AddToWatchlistResponseWrapper
+	TEMPLATE = RequestTemplate("POST", PATH)
 
-	def __init__(self, session, token, watchlist_id, symbol):
-		self.token = token
+	def __init__(self, session, token, watchlist_id, symbol, base_url = None):
+		super().__init__(session, token, base_url)
 		self.watchlist_id = watchlist_id
 		self.symbol = symbol
-		self.make_request()
-		self.session = session
 
-	def make_request(self):
-		self.URL = self.URL.replace('WATCHLIST_ID', str(self.watchlist_id))
-		symbol_to_add = {"symbol": self.symbol}
-		payload = json.dumps(symbol_to_add, ensure_ascii = False).encode('utf8')
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('POST', url = self.URL, headers = headers, data = payload)
+	def get_path_values(self):
+		return (self.watchlist_id,)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = AddToWatchlistResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_body(self):
+		return {"symbol": self.symbol}
\ No newline at end of file
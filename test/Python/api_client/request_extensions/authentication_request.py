@@ -1,29 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.authentication_response_wrapper import AuthenticationResponseWrapper
 
-class AuthenticationRequest(Request):
+class AuthenticationRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/token"
+	PATH = "/token"
+	ENDPOINT = "authenticate_user"
+	RESPONSE_WRAPPER = AuthenticationResponseWrapper
+	TEMPLATE = RequestTemplate("POST", PATH, charset = True, authorized = False)
 
-	def __init__(self, session, email, password):
-		self.make_request(email, password)
-		self.session = session
+	def __init__(self, session, email, password, base_url = None):
+		super().__init__(session, base_url = base_url)
 		self.email = email
 		self.password = password
 
-	def make_request(self, email, password):
-		user_info = {"email": email, "password": password}
-		headers = {"Content-Type": "application/json", "charset": "UTF-8"}
-		payload = json.dumps(user_info, ensure_ascii = False).encode('utf8')
-		super().__init__('POST', url = self.URL, headers = headers, data = payload)
-
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = AuthenticationResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_body(self):
+		return {"email": self.email, "password": self.password}
\ No newline at end of file
@@ -1,38 +1,25 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.currentquotes_response_wrapper import CurrentQuotesResponseWrapper
 
-class CurrentQuotesRequest(Request):
+class CurrentQuotesRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/shares/quotes"
+	PATH = "/shares/quotes"
+	ENDPOINT = "get_current_quotes"
+	RESPONSE_WRAPPER = CurrentQuotesResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH, charset = True)
 	SYMBOL_SEPARATOR = ','
 
-	def __init__(self, session, token, symbols):
-		self.token = token
+	def __init__(self, session, token, symbols, base_url = None):
+		super().__init__(session, token, base_url)
 		self.symbols = self.format_symbols(symbols)
-		self.make_request()
-		self.session = session
 
 	def format_symbols(self, symbols):
 		if isinstance(symbols, list):
 			return self.SYMBOL_SEPARATOR.join(symbols)
 		return symbols
 
-	def make_request(self):
-		payload = {"symbols": self.symbols}
-		headers = {
-			"Content-Type": "application/json",
-			"charset": "UTF-8",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('GET', url = self.URL, headers = headers, params = payload)
-
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = CurrentQuotesResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_params(self):
+		return {"symbols": self.symbols}
\ No newline at end of file
@@ -1,35 +1,19 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-from pprint import pprint
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.fundamentals_response_wrapper import FundamentalsResponseWrapper
 
-class FundamentalsRequest(Request):
-
-	URL = "https://investor-api.herokuapp.com/api/1.0/shares/SYMBOL/fundamentals"
+class FundamentalsRequest(TemplateRequest):
 
-	def __init__(self, session, token, symbol):
+	PATH = "/shares/SYMBOL/fundamentals"
+	ENDPOINT = "get_fundamentals"
+	RESPONSE_WRAPPER = FundamentalsResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH)
 
-		self.token = token
+	def __init__(self, session, token, symbol, base_url = None):
+		super().__init__(session, token, base_url)
 		self.symbol = symbol
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('SYMBOL', str(self.symbol))
-		payload_data = {}
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		#pprint(headers)
-		super().__init__('GET', url = self.URL, headers = headers, params = payload_data)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = FundamentalsResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_path_values(self):
+		return (self.symbol,)
\ No newline at end of file
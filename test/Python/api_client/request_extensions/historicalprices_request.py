@@ -1,49 +1,26 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-from pprint import pprint
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.historicalprices_response_wrapper import HistoricalPricesResponseWrapper
 
-class HistoricalPricesRequest(Request):
+class HistoricalPricesRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/shares/SYMBOL/prices"
+	PATH = "/shares/SYMBOL/prices"
+	ENDPOINT = "get_historical_prices"
+	RESPONSE_WRAPPER = HistoricalPricesResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH)
 
 	def __init__(self, session, token, symbol, end_time = None,
-		interval = None, date_range = None):
-
-		self.token = token
+		interval = None, date_range = None, base_url = None):
+		super().__init__(session, token, base_url)
 		self.symbol = symbol
 		self.end_time = end_time
 		self.interval = interval
 		self.date_range = date_range
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('SYMBOL', str(self.symbol))
-		payload_data = {}
-		if self.end_time is not None:
-			payload_data["endTime"] = self.end_time
-		if self.interval is not None:
-			payload_data["interval"] = self.interval
-		if self.date_range is not None:
-			payload_data["range"] = self.date_range
-
-		pprint(self.URL)
-		#pprint(payload_data)
 
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		#pprint(headers)
-		super().__init__('GET', url = self.URL, headers = headers, params = payload_data)
+	def get_path_values(self):
+		return (self.symbol,)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = HistoricalPricesResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_params(self):
+		return {"endTime": self.end_time, "interval": self.interval, "range": self.date_range}
\ No newline at end of file
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from api_client.request_template import RequestTemplate, TemplateRequest
+from api_client.response_wrappers.market_response_wrapper import MarketResponseWrapper
+
+class MarketRequest(TemplateRequest):
+
+	PATH = "/markets/SYMBOL"
+	ENDPOINT = "get_market"
+	RESPONSE_WRAPPER = MarketResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH, charset = True)
+
+	def __init__(self, session, token, symbol = "ASX", base_url = None):
+		super().__init__(session, token, base_url)
+		self.symbol = symbol
+
+	def get_path_values(self):
+		return (self.symbol,)
\ No newline at end of file
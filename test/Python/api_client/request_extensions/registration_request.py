@@ -1,30 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.registration_response_wrapper import RegistrationResponseWrapper
 
-class RegistrationRequest(Request):
+class RegistrationRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/users"
+	PATH = "/users"
+	ENDPOINT = "register_user"
+	RESPONSE_WRAPPER = RegistrationResponseWrapper
+	TEMPLATE = RequestTemplate("POST", PATH, charset = True, authorized = False)
 
-	def __init__(self, session, displayName, email, password):
-		self.make_request(displayName, email, password)
-		self.session = session
+	def __init__(self, session, displayName, email, password, base_url = None):
+		super().__init__(session, base_url = base_url)
 		self.displayName = displayName
 		self.email = email
 		self.password = password
 
-	def make_request(self, displayName, email, password):
-		user_info = {"displayName": displayName, "email": email, "password": password}
-		headers = {"Content-Type": "application/json", "charset": "UTF-8"}
-		payload = json.dumps(user_info, ensure_ascii = False).encode('utf8')
-		super().__init__('POST', url = self.URL, headers = headers, data = payload)
-
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = RegistrationResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_body(self):
+		return {"displayName": self.displayName, "email": self.email, "password": self.password}
\ No newline at end of file
@@ -1,34 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-import time
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.removefromwatchlist_response_wrapper import RemoveFromWatchlistResponseWrapper
 
-class RemoveFromWatchlistRequest(Request):
+class RemoveFromWatchlistRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/watchlists/WATCHLIST_ID/shares/SYMBOL"
+	PATH = "/watchlists/WATCHLIST_ID/shares/SYMBOL"
+	ENDPOINT = "remove_from_watchlist"
+	RESPONSE_WRAPPER = RemoveFromWatchlistResponseWrapper
+	TEMPLATE = RequestTemplate("DELETE", PATH)
 
-	def __init__(self, session, token, watchlist_id, symbol):
-		self.token = token
+	def __init__(self, session, token, watchlist_id, symbol, base_url = None):
+		super().__init__(session, token, base_url)
 		self.watchlist_id = watchlist_id
 		self.symbol = symbol
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('WATCHLIST_ID', str(self.watchlist_id))
-		self.URL = self.URL.replace('SYMBOL', str(self.symbol))
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('DELETE', url = self.URL, headers = headers)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = RemoveFromWatchlistResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_path_values(self):
+		return (self.watchlist_id, self.symbol)
\ No newline at end of file
@@ -1,30 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.viewdetails_response_wrapper import ViewDetailsResponseWrapper
 
-class ViewDetailsRequest(Request):
-
-	URL = "https://investor-api.herokuapp.com/api/1.0/users"
-
-	def __init__(self, session, token):
-		self.token = token
-		self.make_request()
-		self.session = session
+class ViewDetailsRequest(TemplateRequest):
 
-	def make_request(self):
-		headers = {
-			"Content-Type": "application/json",
-			"charset": "UTF-8",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('GET', url = self.URL, headers = headers)
+	PATH = "/users"
+	ENDPOINT = "view_details"
+	RESPONSE_WRAPPER = ViewDetailsResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH, charset = True)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = ViewDetailsResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def __init__(self, session, token, base_url = None):
+		super().__init__(session, token, base_url)
\ No newline at end of file
@@ -1,33 +1,19 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-import time
-from pprint import pprint
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.viewportfolio_response_wrapper import ViewPortfolioResponseWrapper
 
-class ViewPortfolioRequest(Request):
+class ViewPortfolioRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/accounts/ACCOUNT_ID"
+	PATH = "/accounts/ACCOUNT_ID"
+	ENDPOINT = "get_portfolio"
+	RESPONSE_WRAPPER = ViewPortfolioResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH)
 
-	def __init__(self, session, token, account_id):
-		self.token = token
+	def __init__(self, session, token, account_id, base_url = None):
+		super().__init__(session, token, base_url)
 		self.account_id = account_id
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('ACCOUNT_ID', str(self.account_id))
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('GET', url = self.URL, headers = headers)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = ViewPortfolioResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_path_values(self):
+		return (self.account_id,)
\ No newline at end of file
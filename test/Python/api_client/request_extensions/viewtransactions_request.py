@@ -1,48 +1,38 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-import time
-from pprint import pprint
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.viewtransactions_response_wrapper import ViewTransactionsResponseWrapper
 
-class ViewTransactionsRequest(Request):
+class ViewTransactionsRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/accounts/ACCOUNT_ID/transactions"
+	PATH = "/accounts/ACCOUNT_ID/transactions"
+	ENDPOINT = "get_transactions"
+	RESPONSE_WRAPPER = ViewTransactionsResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH)
 
 	def __init__(self, session, token, account_id, page_number = None, page_size = None,
-		start_date = None, end_date = None):
-		self.token = token
+		start_date = None, end_date = None, base_url = None):
+		super().__init__(session, token, base_url)
 		self.account_id = account_id
 		self.page_number = page_number
 		self.page_size = page_size
 		self.start_date = start_date
 		self.end_date = end_date
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('ACCOUNT_ID', str(self.account_id))
-		
-		payload_data = {
-			"pageNumber": self.page_number, 
-			"pageSize": self.page_size, 
-			"startDate": self.start_date, 
-			"endDate": self.end_date
-		}
-
-		payload = json.dumps(payload_data, ensure_ascii = False).encode('utf8')
-		
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('GET', url = self.URL, headers = headers, params = payload)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = ViewTransactionsResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def format_date(self, date):
+		if hasattr(date, "isoformat"):
+			return date.isoformat()
+		return date
+
+	def get_path_values(self):
+		return (self.account_id,)
+
+	def get_params(self):
+		# query parameters set to None are left out
+		return {
+			"pageNumber": self.page_number,
+			"pageSize": self.page_size,
+			"startDate": self.format_date(self.start_date),
+			"endDate": self.format_date(self.end_date)
+		}
\ No newline at end of file
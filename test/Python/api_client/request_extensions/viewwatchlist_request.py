@@ -1,33 +1,19 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from requests import Request
-import json
-import time
-
+from api_client.request_template import RequestTemplate, TemplateRequest
 from api_client.response_wrappers.viewwatchlist_response_wrapper import ViewWatchlistResponseWrapper
 
-class ViewWatchlistRequest(Request):
+class ViewWatchlistRequest(TemplateRequest):
 
-	URL = "https://investor-api.herokuapp.com/api/1.0/watchlists/WATCHLIST_ID"
+	PATH = "/watchlists/WATCHLIST_ID"
+	ENDPOINT = "get_watchlist"
+	RESPONSE_WRAPPER = ViewWatchlistResponseWrapper
+	TEMPLATE = RequestTemplate("GET", PATH)
 
-	def __init__(self, session, token, watchlist_id):
-		self.token = token
+	def __init__(self, session, token, watchlist_id, base_url = None):
+		super().__init__(session, token, base_url)
 		self.watchlist_id = watchlist_id
-		self.nonce = int(time.time())
-		self.make_request()
-		self.session = session
-
-	def make_request(self):
-		self.URL = self.URL.replace('WATCHLIST_ID', str(self.watchlist_id))
-		headers = {
-			"Content-Type": "application/json",
-			"Authorization": "Bearer " + str(self.token)
-		}
-		super().__init__('GET', url = self.URL, headers = headers)
 
-	def get_response(self):
-		response = self.session.send(super().prepare())
-		wrapped_response = ViewWatchlistResponseWrapper(response)
-		response.close()
-		return wrapped_response
\ No newline at end of file
+	def get_path_values(self):
+		return (self.watchlist_id,)
\ No newline at end of file
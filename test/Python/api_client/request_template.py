@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import re
+from urllib.parse import quote, urlencode
+
+from requests.cookies import RequestsCookieJar
+from requests.models import PreparedRequest
+from requests.structures import CaseInsensitiveDict
+
+from .config import get_base_url
+from .instrumentation import send
+
+# upper-case path segments such as ACCOUNT_ID are filled in per call
+PLACEHOLDER = re.compile(r"^[A-Z][A-Z_]*$")
+JSON_ENCODER = json.JSONEncoder(ensure_ascii = False)
+# requests sends a zero Content-Length for bodiless requests of every other method
+NO_CONTENT_LENGTH_METHODS = ("GET", "HEAD")
+
+class RequestTemplate:
+	"""The static parts of the requests to one endpoint, prepared once
+
+	Each call only fills in the path placeholders, query parameters, token and JSON body, giving the same
+	PreparedRequest as requests.Request(...).prepare() without re-parsing the URL and headers.
+	"""
+
+	def __init__(self, method, path, charset = False, authorized = True):
+		self.method = method
+		self.path = path
+		self.authorized = authorized
+		segments = path.split("/")
+		self.placeholders = tuple(segment for segment in segments if PLACEHOLDER.match(segment))
+		placeholder_numbers = {placeholder: number for number, placeholder in enumerate(self.placeholders)}
+		self.path_format = "/".join("{" + str(placeholder_numbers[segment]) + "}" if segment in placeholder_numbers
+			else segment.replace("{", "{{").replace("}", "}}") for segment in segments)
+
+		headers = {"Content-Type": "application/json"}
+		if charset:
+			headers["charset"] = "UTF-8"
+		self.headers = CaseInsensitiveDict(headers)
+		self.url_formats = {}
+
+	def get_url_format(self, base_url):
+		url_format = self.url_formats.get(base_url)
+		if url_format is None:
+			url_format = self.url_formats[base_url] = base_url.replace("{", "{{").replace("}", "}}") + self.path_format
+		return url_format
+
+	def prepare(self, base_url, token = None, path_values = (), params = None, body = None):
+		"""Returns a PreparedRequest; query parameters set to None are left out and body is encoded as JSON"""
+		url = self.get_url_format(base_url).format(*[quote(str(value), safe = "") for value in path_values])
+		if params:
+			query = urlencode([(key, value) for key, value in params.items() if value is not None])
+			if query:
+				url = url + "?" + query
+
+		headers = self.headers.copy()
+		if self.authorized:
+			headers["Authorization"] = "Bearer " + str(token)
+		if body is not None:
+			body = JSON_ENCODER.encode(body).encode("utf8")
+			headers["Content-Length"] = str(len(body))
+		elif self.method not in NO_CONTENT_LENGTH_METHODS:
+			headers["Content-Length"] = "0"
+
+		prepared_request = PreparedRequest()
+		prepared_request.method = self.method
+		prepared_request.url = url
+		prepared_request.headers = headers
+		prepared_request.body = body
+		# read back when following redirects
+		prepared_request._cookies = RequestsCookieJar()
+		return prepared_request
+
+class TemplateRequest:
+	"""Base of the request classes, which prepare their requests from the TEMPLATE of their endpoint"""
+
+	TEMPLATE = None
+	ENDPOINT = None
+	RESPONSE_WRAPPER = None
+
+	def __init__(self, session, token = None, base_url = None):
+		self.session = session
+		self.token = token
+		self.base_url = get_base_url(base_url)
+
+	def get_path_values(self):
+		return ()
+
+	def get_params(self):
+		return None
+
+	def get_body(self):
+		return None
+
+	@property
+	def url(self):
+		return self.prepare().url
+
+	def prepare(self):
+		return self.TEMPLATE.prepare(self.base_url, self.token, self.get_path_values(), self.get_params(),
+			self.get_body())
+
+	def get_response(self):
+		response = send(self.session, self.prepare(), self.ENDPOINT)
+		wrapped_response = self.RESPONSE_WRAPPER(response)
+		response.close()
+		return wrapped_response
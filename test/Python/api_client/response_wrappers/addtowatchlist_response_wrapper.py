@@ -4,19 +4,8 @@
 import json
 from pprint import pprint
 
-class AddToWatchlistResponseWrapper():
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 201
-
-	def __init__(self, response):
-		self.response = response
+class AddToWatchlistResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
-
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 201
@@ -4,27 +4,28 @@
 import json
 from pprint import pprint
 
-class BuyShareResponseWrapper():
+from api_client.models import PositionInfo
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
+class BuyShareResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
+	SUCCESS_STATUS = 200
 
-	def get_json_body(self):
+	def get_message(self):
 		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+			body = self.get_json_body()
+			message = body["message"]
+		except:
+			message = None
+		return message
 
 	def get_positions(self):
-		positions = get_json_body()["positions"]
+		positions = self.get_json_body()["positions"]
 		return positions
 
+	def get_position_infos(self):
+		return self.get_model_body(PositionInfo)["positions"]
+
 	def get_balance(self):
-		balance = get_json_body()["balance"]
+		balance = self.get_json_body()["balance"]
 		return balance
@@ -3,28 +3,30 @@
 
 import json
 
-class CurrentQuotesResponseWrapper():
+from api_client.models import Quote, QuoteList
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
+class CurrentQuotesResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
+	SUCCESS_STATUS = 200
 
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	def __init__(self, response, release_content = None):
+		super().__init__(response, release_content)
+		self.quote_index = None
 
 	def get_all_quotes(self):
 		return self.get_json_body()
 
 	def get_quote_by_symbol(self, symbol):
-		for quote in self.get_all_quotes():
-			if quote["symbol"] == symbol:
-				return quote
-		return None
+		quotes = self.get_all_quotes()
+		if not isinstance(quotes, list):
+			return None
+		if self.quote_index is None:
+			# reversed, so the first quote of a symbol wins as in a scan
+			self.quote_index = {quote["symbol"]: quote for quote in reversed(quotes)}
+		return self.quote_index.get(symbol)
+
+	def get_quotes(self):
+		"""Returns the quotes as a QuoteList of Quote models, indexed by symbol"""
+		quotes = self.get_model_body(Quote)
+		return QuoteList(quotes) if isinstance(quotes, list) else None
@@ -3,12 +3,8 @@
 
 import json
 
-class DeletionResponseWrapper():
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 204
-
-	def __init__(self, response):
-		self.response = response
+class DeletionResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
+	SUCCESS_STATUS = 204
@@ -3,28 +3,31 @@
 
 import json
 
-class HistoricalPricesResponseWrapper():
+from api_client.response_wrappers.response_wrapper import ResponseWrapper, UNDECODED
 
-	SUCCESS_STATUS = 200
+class HistoricalPricesResponseWrapper(ResponseWrapper):
 
-	def __init__(self, response):
-		self.response = response
+	SUCCESS_STATUS = 200
 
-	def get_http_status(self):
-		return self.response.status_code
-
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	price_columns = None
 
 	def get_all_data_points(self):
 		if self.get_json_body() is None:
 			return None
 		return self.get_json_body()["prices"]
 
+	def get_price_columns(self):
+		"""Returns the bars as a PriceColumns tuple of NumPy arrays, decoded from the raw body"""
+		# NumPy is only needed by callers asking for columns
+		from api_client.price_columns import decode_price_columns, price_columns_from_points
+
+		if self.price_columns is None:
+			if self.json_body is UNDECODED:
+				self.price_columns = decode_price_columns(self.response.content)
+			elif isinstance(self.get_json_body(), dict):
+				self.price_columns = price_columns_from_points(self.get_json_body().get("prices"))
+		return self.price_columns
+
 	def get_message(self):
 		try:
 			body = self.get_json_body()
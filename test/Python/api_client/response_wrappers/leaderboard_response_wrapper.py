@@ -3,49 +3,45 @@
 
 import json
 
-class LeaderboardResponseWrapper():
+from api_client.models import LeaderBoardUser
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
+class LeaderboardResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
-
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 200
 
 	def get_all_items(self):
-		if self.get_json_body is None:
+		if self.get_json_body() is None:
 			return None
 
 		return self.get_json_body()["items"]
 
+	def get_leaderboard_users(self):
+		if self.get_model_body(LeaderBoardUser) is None:
+			return None
+
+		return self.get_model_body(LeaderBoardUser)["items"]
+
 	def get_page_number(self):
-		if self.get_json_body is None:
+		if self.get_json_body() is None:
 			return None
 
 		return self.get_json_body()["pageNumber"]
 
 	def get_page_size(self):
-		if self.get_json_body is None:
+		if self.get_json_body() is None:
 			return None
 
 		return self.get_json_body()["pageSize"] 
 
 	def get_page_count(self):
-		if self.get_json_body is None:
+		if self.get_json_body() is None:
 			return None
 
 		return self.get_json_body()["totalPageCount"]
 
 	def get_row_count(self):
-		if self.get_json_body is None:
+		if self.get_json_body() is None:
 			return None
 
-		return self.get_json_body()["totalRowCount"] 
\ No newline at end of file
+		return self.get_json_body()["totalRowCount"]
\ No newline at end of file
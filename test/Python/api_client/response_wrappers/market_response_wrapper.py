@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import re
+
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
+
+# Json.NET writes a TimeSpan as [-][d.]hh:mm:ss[.fffffff]
+TIMESPAN = re.compile(r"^(-)?(?:(\d+)\.)?(\d+):(\d+):(\d+)(?:\.(\d+))?$")
+
+def parse_timespan(value):
+	match = TIMESPAN.match(value or "")
+	if match is None:
+		return None
+	sign, days, hours, minutes, seconds, fraction = match.groups()
+	timespan = datetime.timedelta(days = int(days or 0), hours = int(hours), minutes = int(minutes),
+		seconds = int(seconds), microseconds = int((fraction or "0").ljust(6, "0")[:6]))
+	return -timespan if sign else timespan
+
+class MarketResponseWrapper(ResponseWrapper):
+
+	SUCCESS_STATUS = 200
+
+	def get_value(self, key):
+		body = self.get_json_body()
+		return body.get(key) if isinstance(body, dict) else None
+
+	def get_current_time(self):
+		current_time = self.get_value("currentTime")
+		return datetime.datetime.fromisoformat(current_time) if current_time else None
+
+	def get_time_until_next_open(self):
+		return parse_timespan(self.get_value("timeUntilNextOpen"))
+
+	def get_time_until_next_close(self):
+		return parse_timespan(self.get_value("timeUntilNextClose"))
+
+	def is_open(self):
+		"""Whether the market is open, also working out the answer from the times when isOpen is not set"""
+		if self.get_value("isOpen"):
+			return True
+		# the hosted API does not fill in isOpen, but the market is open when it closes before it next opens
+		until_open, until_close = self.get_time_until_next_open(), self.get_time_until_next_close()
+		if until_open is None or until_close is None:
+			return False
+		return datetime.timedelta(0) <= until_close < until_open
+
+	def get_message(self):
+		return self.get_value("message")
\ No newline at end of file
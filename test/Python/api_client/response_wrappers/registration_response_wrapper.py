@@ -3,22 +3,11 @@
 
 import json
 
-class RegistrationResponseWrapper:
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 201
-
-	def __init__(self, response):
-		self.response = response
-
-	def get_http_status(self):
-		return self.response.status_code
+class RegistrationResponseWrapper(ResponseWrapper):
 
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 201
 
 	def get_message(self):
 		try:
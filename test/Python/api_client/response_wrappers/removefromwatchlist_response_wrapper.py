@@ -4,19 +4,8 @@
 import json
 from pprint import pprint
 
-class RemoveFromWatchlistResponseWrapper():
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 204
+class RemoveFromWatchlistResponseWrapper(ResponseWrapper):
 
-	def __init__(self, response):
-		self.response = response
-
-	def get_http_status(self):
-		return self.response.status_code
-
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
\ No newline at end of file
+	SUCCESS_STATUS = 204
\ No newline at end of file
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from api_client.models import convert, to_plain
+
+UNDECODED = object()
+
+class ResponseWrapper:
+	"""Base of the response wrappers, decoding the JSON body once and caching it"""
+
+	SUCCESS_STATUS = 200
+	RELEASE_CONTENT = False
+
+	def __init__(self, response, release_content = None):
+		self.response = response
+		self.release_content = self.RELEASE_CONTENT if release_content is None else release_content
+		self.json_body = UNDECODED
+		# one body per model class, since each decodes the objects into its own type
+		self.model_bodies = {}
+
+	def get_http_status(self):
+		return self.response.status_code
+
+	def get_json_body(self):
+		# every accessor goes through here, so the payload is parsed at most once
+		if self.json_body is UNDECODED and self.model_bodies and self.release_content:
+			# the content went with decoding the models
+			self.json_body = to_plain(next(iter(self.model_bodies.values())))
+		if self.json_body is UNDECODED:
+			try:
+				body = self.response.json()
+			except ValueError:
+				body = None
+			self.json_body = body
+			if self.release_content:
+				self.release()
+		return self.json_body
+
+	def get_model_body(self, model):
+		"""Returns the JSON body with the objects of model (an api_client.models class) as models, decoded once per model
+
+		Unless get_json_body decoded the body first, the models are made while decoding, so the objects are never all
+		held as dicts as well.
+		"""
+		body = self.model_bodies.get(model, UNDECODED)
+		if body is UNDECODED:
+			if self.json_body is UNDECODED and not self.model_bodies:
+				try:
+					body = self.response.json(object_hook = model.object_hook)
+				except ValueError:
+					body = None
+				if self.release_content:
+					self.release()
+			else:
+				body = convert(self.get_json_body(), model.object_hook)
+			self.model_bodies[model] = body
+		return body
+
+	def release(self):
+		"""Drops the raw bytes of the response, leaving only the decoded body"""
+		self.response._content = b""
+		self.response._content_consumed = True
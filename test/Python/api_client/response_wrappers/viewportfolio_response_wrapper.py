@@ -4,22 +4,12 @@
 import json
 from pprint import pprint
 
-class ViewPortfolioResponseWrapper():
+from api_client.models import PositionInfo
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
-
-	def get_http_status(self):
-		return self.response.status_code
+class ViewPortfolioResponseWrapper(ResponseWrapper):
 
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 200
 
 	def get_id(self):
 		return self.get_json_body()["id"]
@@ -33,3 +23,6 @@ class ViewPortfolioResponseWrapper():
 	def get_positions(self):
 		positions = self.get_json_body()["positions"]
 		return positions
+
+	def get_position_infos(self):
+		return self.get_model_body(PositionInfo)["positions"]
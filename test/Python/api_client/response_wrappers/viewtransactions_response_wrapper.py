@@ -4,26 +4,19 @@
 import json
 from pprint import pprint
 
-class ViewTransactionsResponseWrapper():
+from api_client.models import TransactionInfo
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
-
-	def get_http_status(self):
-		return self.response.status_code
+class ViewTransactionsResponseWrapper(ResponseWrapper):
 
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 200
 
 	def get_items(self):
 		return self.get_json_body()["items"]
 
+	def get_transaction_infos(self):
+		return self.get_model_body(TransactionInfo)["items"]
+
 	def get_page_number(self):
 		return self.get_json_body()["pageNumber"]
 
@@ -4,22 +4,11 @@
 import json
 from pprint import pprint
 
-class ViewWatchlistResponseWrapper():
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
 
-	SUCCESS_STATUS = 200
-
-	def __init__(self, response):
-		self.response = response
+class ViewWatchlistResponseWrapper(ResponseWrapper):
 
-	def get_http_status(self):
-		return self.response.status_code
-
-	def get_json_body(self):
-		try:
-			body = self.response.json()
-		except ValueError:
-			body = None
-		return body
+	SUCCESS_STATUS = 200
 
 	def get_id(self):
 		return self.get_json_body()["id"]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import collections
+import itertools
+import json
+import os
+import struct
+
+import numpy as np
+
+# magic, version, number of shares, grams and postings, and the size of the UTF-8 JSON text of shares and grams
+HEADER = struct.Struct("<8sIIIII")
+MAGIC = b"IASHARES"
+VERSION = 1
+# every substring of a name up to this length is indexed, so shorter terms are answered by one posting list
+GRAM = 3
+OFFSET_DTYPE = np.dtype("<u4")
+
+def get_position_dtype(count):
+	return np.dtype("<u2") if count <= 1 << 16 else np.dtype("<u4")
+
+def read_shares(path):
+	"""Reads (symbol, name, industry) tuples from Shares.json or an ASX listing like ASX_symbols.json"""
+	with open(path, encoding = "utf-8-sig") as shares_file:
+		items = json.load(shares_file)
+
+	shares = []
+	for item in items:
+		symbol = item.get("Symbol") or item.get("symbol")
+		name = item.get("Name") or item.get("companyName")
+		industry = item.get("Industry") or item.get("industry")
+		shares.append((symbol, name, industry))
+	return shares
+
+def read_share_files(paths):
+	"""Reads the shares of several files, keeping the first share of each symbol"""
+	shares = []
+	symbols = set()
+	for path in paths:
+		for share in read_shares(path):
+			if share[0] not in symbols:
+				symbols.add(share[0])
+				shares.append(share)
+	return shares
+
+def get_grams(text):
+	return {text[start:start + length] for length in range(1, GRAM + 1) for start in range(len(text) - length + 1)}
+
+def align(size):
+	return -size % 4
+
+class ShareIndex:
+	"""Answers share searches from an index of symbols and of the substrings of names, ranked like FindShares
+
+	Exact symbol matches come first, then shares whose name contains the term, each in the order of the share list;
+	both ignore case. The index serialises to a compact file which loads without rebuilding it.
+	"""
+
+	def __init__(self, shares, grams = None, offsets = None, postings = None, symbol_order = None):
+		self.shares = [tuple(share) for share in shares]
+		if grams is None:
+			grams, offsets, postings = self.build_postings()
+			symbol_order = np.array(sorted(range(len(self.shares)), key = lambda position: self.shares[position][0]
+				.upper()), dtype = get_position_dtype(len(self.shares)))
+		self.grams = grams
+		self.gram_positions = {gram: number for number, gram in enumerate(grams)}
+		self.offsets = offsets
+		self.bounds = offsets.tolist()
+		self.postings = postings
+		self.symbol_order = symbol_order
+		self.names = [None if name is None else name.upper() for _, name, _ in self.shares]
+		self.named = [position for position, name in enumerate(self.names) if name is not None]
+		self.symbols = collections.defaultdict(list)
+		for position, (symbol, _, _) in enumerate(self.shares):
+			self.symbols[symbol.upper()].append(position)
+		self.sorted_positions = symbol_order.tolist()
+		self.sorted_symbols = [self.shares[position][0].upper() for position in self.sorted_positions]
+
+	@classmethod
+	def from_json(cls, *paths):
+		"""Indexes the shares of Shares.json or ASX listing files, keeping the first share of each symbol"""
+		return cls(read_share_files(paths))
+
+	def build_postings(self):
+		positions = collections.defaultdict(list)
+		for position, (_, name, _) in enumerate(self.shares):
+			if name is not None:
+				for gram in get_grams(name.upper()):
+					positions[gram].append(position)
+		grams = sorted(positions)
+		offsets = np.zeros(len(grams) + 1, dtype = OFFSET_DTYPE)
+		offsets[1:] = np.cumsum([len(positions[gram]) for gram in grams])
+		postings = np.array([position for gram in grams for position in positions[gram]],
+			dtype = get_position_dtype(len(self.shares)))
+		return grams, offsets, postings
+
+	def __len__(self):
+		return len(self.shares)
+
+	def get_bounds(self, gram):
+		number = self.gram_positions.get(gram)
+		if number is None:
+			return 0, 0
+		return self.bounds[number], self.bounds[number + 1]
+
+	def find_name_positions(self, term):
+		"""Positions of the shares whose upper case name contains term, in order, checked lazily past short terms"""
+		if not term:
+			return self.named
+		if len(term) <= GRAM:
+			start, end = self.get_bounds(term)
+			return self.postings[start:end].tolist()
+		# the rarest gram of the term gives the fewest candidates to check
+		start, end = min((self.get_bounds(gram) for gram in get_grams(term) if len(gram) == GRAM),
+			key = lambda bounds: bounds[1] - bounds[0])
+		names = self.names
+		return (position for position in self.postings[start:end].tolist() if term in names[position])
+
+	def find_shares(self, search_term, industry = None, limit = None):
+		"""Returns the (symbol, name, industry) of the shares matching search_term, or of all shares if it is None"""
+		if search_term is None:
+			positions = range(len(self.shares))
+		else:
+			term = search_term.upper()
+			symbol_positions = self.symbols.get(term, [])
+			positions = itertools.chain(symbol_positions, (position for position in self.find_name_positions(term)
+				if position not in symbol_positions))
+		shares = (self.shares[position] for position in positions)
+		if industry is not None:
+			shares = (share for share in shares if share[2] == industry)
+		return list(itertools.islice(shares, limit))
+
+	def complete_symbol(self, prefix, limit = None):
+		"""Returns the shares whose symbol starts with prefix, ignoring case, in the order of the symbols"""
+		prefix = prefix.upper()
+		shares = []
+		number = bisect.bisect_left(self.sorted_symbols, prefix)
+		while number < len(self.sorted_symbols) and self.sorted_symbols[number].startswith(prefix):
+			if limit is not None and len(shares) >= limit:
+				break
+			shares.append(self.shares[self.sorted_positions[number]])
+			number += 1
+		return shares
+
+	def save(self, path):
+		text = json.dumps([self.shares, self.grams], ensure_ascii = False, separators = (",", ":")).encode("utf-8")
+		temporary_path = path + ".tmp"
+		with open(temporary_path, "wb") as index_file:
+			index_file.write(HEADER.pack(MAGIC, VERSION, len(self.shares), len(self.grams), len(self.postings),
+				len(text)))
+			index_file.write(text)
+			index_file.write(b"\0" * align(HEADER.size + len(text)))
+			index_file.write(self.offsets.tobytes())
+			index_file.write(self.symbol_order.tobytes())
+			index_file.write(self.postings.tobytes())
+		os.replace(temporary_path, path)
+
+	@classmethod
+	def load(cls, path):
+		with open(path, "rb") as index_file:
+			content = index_file.read()
+		if len(content) < HEADER.size:
+			raise ValueError("{0} is not a version {1} share index".format(path, VERSION))
+		magic, version, share_count, gram_count, posting_count, text_size = HEADER.unpack_from(content)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError("{0} is not a version {1} share index".format(path, VERSION))
+
+		shares, grams = json.loads(content[HEADER.size:HEADER.size + text_size].decode("utf-8"))
+		offset = HEADER.size + text_size + align(HEADER.size + text_size)
+		position_dtype = get_position_dtype(share_count)
+		arrays = {}
+		for name, dtype, count in (("offsets", OFFSET_DTYPE, gram_count + 1), ("symbol_order", position_dtype,
+			share_count), ("postings", position_dtype, posting_count)):
+			arrays[name] = np.frombuffer(content, dtype = dtype, count = count, offset = offset)
+			offset += count * dtype.itemsize
+		return cls(shares, grams, **arrays)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import concurrent.futures
+import datetime
+import decimal
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from .pagination import MAX_PAGE_NUMBER, MAX_PAGE_SIZE, iter_pages
+
+FORMAT = "InvestorAPI transactions 1"
+# TransactionType of the API, in the order of its values
+TRANSACTION_TYPES = ("Transfer", "Commission", "Buy", "Sell")
+# amounts and balances are stored as integers of 1e-8 dollars, which holds every commission the settings give
+SCALE_DIGITS = 8
+SCALE = 10 ** SCALE_DIGITS
+# one file per column, appended to in place
+COLUMN_DTYPES = collections.OrderedDict([("timestamp", np.dtype("<i8")), ("type", np.dtype("u1")),
+	("description", np.dtype("<u4")), ("amount", np.dtype("<i8")), ("balance", np.dtype("<i8"))])
+DESCRIPTIONS_FILE = "descriptions.jsonl"
+STATE_FILE = "state.json"
+ACCOUNT_ID = re.compile(r"^[A-Za-z0-9-]+$")
+DEFAULT_THREADS = 4
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds = 1)
+
+# UTC datetime64[us] timestamps, uint8 indexes into TRANSACTION_TYPES, uint32 indexes into descriptions, and amounts
+# and balances in units of 1 / SCALE dollars
+TransactionColumns = collections.namedtuple("TransactionColumns", ["timestamps", "types", "descriptions", "amounts",
+	"balances", "dictionary"])
+
+def parse_timestamp(text):
+	"""Microseconds since the epoch of an ISO timestamp in UTC, with or without its Z or offset"""
+	timestamp = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+	if timestamp.tzinfo is not None:
+		timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo = None)
+	return (timestamp - EPOCH) // MICROSECOND
+
+def format_timestamp(microseconds):
+	return (EPOCH + microseconds * MICROSECOND).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def to_scaled(value):
+	# through the shortest decimal of the float, so 0.1 becomes exactly 10000000
+	return int(decimal.Decimal(repr(value)).scaleb(SCALE_DIGITS).to_integral_value(decimal.ROUND_HALF_EVEN))
+
+def get_type_code(transaction_type):
+	if isinstance(transaction_type, int):
+		return transaction_type
+	try:
+		return TRANSACTION_TYPES.index(transaction_type)
+	except ValueError:
+		raise ValueError("Unknown transaction type: {0}".format(transaction_type))
+
+def encode_item(item):
+	"""A transaction of the API as (timestamp, type, description, amount, balance), with the description a string"""
+	return (parse_timestamp(item["timestampUtc"]), get_type_code(item["type"]), item["description"] or "",
+		to_scaled(item["amount"]), to_scaled(item["balance"]))
+
+class TransactionStore:
+	"""Keeps the transactions of accounts on disk in columns of fixed types, and syncs them incrementally
+
+	Each account has a directory holding a file per column, the dictionary of its descriptions as JSON lines, and a
+	state file with the number of rows. A sync asks only for the transactions from the last stored timestamp on and
+	appends the new ones to the columns; the state is replaced last, so an interrupted sync leaves the rows it counted.
+	Transactions stay once stored, even after the account is reset.
+	"""
+
+	def __init__(self, root, client = None, page_size = MAX_PAGE_SIZE):
+		if client is None:
+			from .api_facade import ApiFacade
+			client = ApiFacade.get_default_client()
+		self.root = root
+		self.client = client
+		self.page_size = page_size
+		self.lock = threading.Lock()
+		self.path_locks = {}
+
+	def get_directory(self, account_id):
+		if not ACCOUNT_ID.match(str(account_id)):
+			raise ValueError("Invalid account id: {0}".format(account_id))
+		return os.path.join(self.root, str(account_id).lower())
+
+	def get_path_lock(self, path):
+		with self.lock:
+			return self.path_locks.setdefault(path, threading.Lock())
+
+	def read_state(self, directory):
+		try:
+			with open(os.path.join(directory, STATE_FILE)) as state_file:
+				state = json.load(state_file)
+		except FileNotFoundError:
+			return {"format": FORMAT, "scale": SCALE, "rows": 0, "descriptions": 0, "descriptionsSize": 0}
+		if state.get("format") != FORMAT or state.get("scale") != SCALE:
+			raise ValueError("{0} is not a transactions directory of format {1}".format(directory, FORMAT))
+		return state
+
+	def write_state(self, directory, state):
+		temporary_path = os.path.join(directory, STATE_FILE + ".tmp")
+		with open(temporary_path, "w") as state_file:
+			json.dump(state, state_file)
+		os.replace(temporary_path, os.path.join(directory, STATE_FILE))
+
+	def read_column(self, directory, name, rows):
+		if not rows:
+			return np.empty(0, dtype = COLUMN_DTYPES[name])
+		return np.memmap(os.path.join(directory, name + ".col"), dtype = COLUMN_DTYPES[name], mode = "r",
+			shape = (rows,))
+
+	def read_dictionary(self, directory, state):
+		if not state["descriptions"]:
+			return []
+		with open(os.path.join(directory, DESCRIPTIONS_FILE), "rb") as descriptions_file:
+			content = descriptions_file.read(state["descriptionsSize"])
+		return [json.loads(line) for line in content.splitlines()]
+
+	def get_transaction_columns(self, account_id, start = None, end = None):
+		"""Returns the stored transactions from start up to but excluding end (datetime64 or ISO strings, in UTC),
+		oldest first"""
+		directory = self.get_directory(account_id)
+		state = self.read_state(directory)
+		columns = [self.read_column(directory, name, state["rows"]) for name in COLUMN_DTYPES]
+		first, last = 0, state["rows"]
+		if start is not None:
+			first = np.searchsorted(columns[0], np.datetime64(start, "us").astype(np.int64))
+		if end is not None:
+			last = np.searchsorted(columns[0], np.datetime64(end, "us").astype(np.int64))
+		columns = [column[first:last] for column in columns]
+		columns[0] = columns[0].view("datetime64[us]")
+		return TransactionColumns(*columns, self.read_dictionary(directory, state))
+
+	def get_tail(self, directory, state, dictionary):
+		"""The stored rows at the last stored timestamp, which a sync from that timestamp gets again"""
+		timestamps = self.read_column(directory, "timestamp", state["rows"])
+		if not len(timestamps):
+			return None, []
+		last_timestamp = int(timestamps[-1])
+		first = int(np.searchsorted(timestamps, last_timestamp))
+		columns = [self.read_column(directory, name, state["rows"])[first:] for name in COLUMN_DTYPES]
+		return last_timestamp, [(int(timestamp), int(transaction_type), dictionary[description], int(amount),
+			int(balance)) for timestamp, transaction_type, description, amount, balance in zip(*columns)]
+
+	def fetch(self, token, account_id, start_timestamp):
+		"""Returns the encoded transactions from start_timestamp on, oldest first
+
+		The API serves at most MAX_PAGE_NUMBER pages, newest first, so a longer history is fetched in windows, each
+		ending at the oldest timestamp of the one before.
+		"""
+		start_date = None if start_timestamp is None else format_timestamp(start_timestamp)
+		end_timestamp = None
+		windows = []
+		while True:
+			fetch_page = lambda page_number, page_size: self.client.get_transactions(token, account_id, page_number,
+				page_size, start_date, None if end_timestamp is None else format_timestamp(end_timestamp))
+			window = []
+			total = None
+			for page in iter_pages(fetch_page, self.page_size):
+				if total is None:
+					total = page.get_total_row_count()
+				window.extend(encode_item(item) for item in page.get_items())
+			window.reverse()
+			if windows:
+				# this window has every transaction at the end timestamp, and the one before began with some of them
+				windows[-1] = remove_seen(windows[-1], [row for row in window if row[0] == end_timestamp])
+			windows.append(window)
+			if total <= MAX_PAGE_NUMBER * self.page_size or not window:
+				break
+			if window[0][0] == end_timestamp:
+				raise RuntimeError("More than {0} transactions of account {1} share the timestamp {2}".format(
+					MAX_PAGE_NUMBER * self.page_size, account_id, format_timestamp(end_timestamp)))
+			end_timestamp = window[0][0]
+		rows = []
+		for window in reversed(windows):
+			rows.extend(window)
+		return rows
+
+	def append(self, directory, state, dictionary, rows):
+		codes = {description: code for code, description in enumerate(dictionary)}
+		new_descriptions = []
+		for row in rows:
+			if row[2] not in codes:
+				codes[row[2]] = len(codes)
+				new_descriptions.append(row[2])
+
+		os.makedirs(directory, exist_ok = True)
+		columns = list(zip(*rows))
+		columns[2] = [codes[description] for description in columns[2]]
+		for (name, dtype), values in zip(COLUMN_DTYPES.items(), columns):
+			# rows past the stored count were left by an interrupted sync and are written over
+			with open(os.path.join(directory, name + ".col"), "ab") as column_file:
+				column_file.truncate(state["rows"] * dtype.itemsize)
+				column_file.write(np.array(values, dtype = dtype).tobytes())
+		content = "".join(json.dumps(description) + "\n" for description in new_descriptions).encode("utf-8")
+		with open(os.path.join(directory, DESCRIPTIONS_FILE), "ab") as descriptions_file:
+			descriptions_file.truncate(state["descriptionsSize"])
+			descriptions_file.write(content)
+
+		state = dict(state, rows = state["rows"] + len(rows), descriptions = len(codes),
+			descriptionsSize = state["descriptionsSize"] + len(content))
+		self.write_state(directory, state)
+		return state
+
+	def sync(self, token, account_id):
+		"""Appends the transactions of an account which are not stored yet, returning how many there were"""
+		directory = self.get_directory(account_id)
+		with self.get_path_lock(directory):
+			state = self.read_state(directory)
+			dictionary = self.read_dictionary(directory, state)
+			last_timestamp, tail = self.get_tail(directory, state, dictionary)
+			rows = remove_seen(self.fetch(token, account_id, last_timestamp), tail)
+			if rows:
+				self.append(directory, state, dictionary, rows)
+			return len(rows)
+
+	def sync_user(self, token):
+		"""Syncs every account of a user, returning the rows appended per account id"""
+		details = self.client.view_details(token)
+		if details.get_http_status() != details.SUCCESS_STATUS:
+			raise RuntimeError("Could not get the accounts: HTTP{0}".format(details.get_http_status()))
+		return {account["id"]: self.sync(token, account["id"]) for account in details.get_accounts()}
+
+	def sync_users(self, tokens, threads = DEFAULT_THREADS):
+		"""Syncs the accounts of many users from threads, returning the rows appended per account id"""
+		counts = {}
+		with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+			for user_counts in executor.map(self.sync_user, tokens):
+				counts.update(user_counts)
+		return counts
+
+def remove_seen(rows, seen):
+	"""Drops the rows which are among seen, all at the timestamp rows start with, counting repeats
+
+	The API orders transactions by timestamp alone, so rows sharing one can come in any order.
+	"""
+	if not seen:
+		return rows
+	remaining = collections.Counter(seen)
+	kept = []
+	for position, row in enumerate(rows):
+		if row[0] != seen[0][0]:
+			return kept + rows[position:]
+		if remaining[row]:
+			remaining[row] -= 1
+		else:
+			kept.append(row)
+	return kept
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from api_client.price_store import PriceStore
+from .engine import CLOSE, NEXT_OPEN, run_backtest
+from .strategies import breakout, moving_average_crossover, parameter_grid
+
+def parse_range(text):
+	"""Reads start:stop:step (stop included) or a comma-separated list of integers"""
+	if ":" in text:
+		start, stop, step = (int(value) for value in (text.split(":") + ["1"])[:3])
+		return list(range(start, stop + 1, step))
+	return [int(value) for value in text.split(",")]
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m backtester",
+		description = "Backtests a strategy over stored price bars for every combination of its parameters, "
+			"filling orders by the trading rules of the API.")
+	parser.add_argument("directory", help = "price store directory, e.g. written by stand_in_server.synthetic_market")
+	parser.add_argument("symbol")
+	parser.add_argument("--interval", default = "1d")
+	parser.add_argument("--start", help = "first bar, ISO date or time in UTC")
+	parser.add_argument("--end", help = "bars before this ISO date or time in UTC")
+	parser.add_argument("--strategy", choices = ("crossover", "breakout"), default = "crossover")
+	parser.add_argument("--fast", type = parse_range, default = parse_range("5:50:5"),
+		help = "fast moving average windows of the crossover, start:stop:step or a list")
+	parser.add_argument("--slow", type = parse_range, default = parse_range("20:200:10"),
+		help = "slow moving average windows of the crossover")
+	parser.add_argument("--lookback", type = parse_range, default = parse_range("10:120:5"),
+		help = "channel lengths of the breakout")
+	parser.add_argument("--quantity", type = parse_range, default = [1000], help = "shares to hold")
+	parser.add_argument("--fill", choices = (NEXT_OPEN, CLOSE), default = NEXT_OPEN)
+	parser.add_argument("--top", type = int, default = 10, help = "parameter sets to list")
+	args = parser.parse_args(argv)
+
+	columns = PriceStore(args.directory).get_price_columns(args.symbol.upper(), args.interval,
+		args.start, args.end)
+	if len(columns.close) < 2:
+		parser.error("no {0} bars of {1} in {2}".format(args.interval, args.symbol, args.directory))
+
+	started = time.perf_counter()
+	if args.strategy == "crossover":
+		grid = parameter_grid(fast = args.fast, slow = args.slow, quantity = args.quantity)
+		keep = grid["fast"] < grid["slow"]
+		grid = {name: values[keep] for name, values in grid.items()}
+		targets = moving_average_crossover(columns, grid["fast"], grid["slow"], grid["quantity"])
+	else:
+		grid = parameter_grid(lookback = args.lookback, quantity = args.quantity)
+		targets = breakout(columns, grid["lookback"], grid["quantity"])
+	backtest = run_backtest(columns, targets, fill = args.fill)
+	elapsed = time.perf_counter() - started
+
+	print("{0} {1} bars of {2} from {3} to {4}, {5} parameter sets in {6:.2f} s".format(len(columns.close),
+		args.interval, args.symbol.upper(), columns.timestamps[0], columns.timestamps[-1], len(targets), elapsed))
+	names = list(grid)
+	print("".join("{0:>10}".format(name) for name in names) + "{0:>12}{1:>12}{2:>8}{3:>10}{4:>14}".format("return",
+		"drawdown", "trades", "rejected", "commissions"))
+	for row in np.argsort(-backtest.total_return, kind = "stable")[:args.top]:
+		print("".join("{0:>10}".format(grid[name][row]) for name in names) + "{0:>11.1%}{1:>12.1%}{2:>8}{3:>10}"
+			"{4:>14,.2f}".format(backtest.total_return[row], backtest.max_drawdown[row], backtest.trades[row],
+			backtest.rejected[row], backtest.commissions[row]))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+
+import numpy as np
+
+from stand_in_server import domain
+
+# orders for bar t are filled at the open of bar t + 1, or at the close of bar t itself
+NEXT_OPEN = "next_open"
+CLOSE = "close"
+# bars further apart than this belong to different sessions, so intraday bars find the previous day's close
+DEFAULT_SESSION_GAP = np.timedelta64(4, "h")
+# bars marked to market at once between trades, bounding the sets x bars equity block
+TRACKING_CHUNK = 512
+# Account.BuyShares and SellShares reject prices below this
+MINIMUM_PRICE = 0.001
+
+TradingRules = collections.namedtuple("TradingRules", ["initial_balance", "buy_commissions", "sell_commissions"])
+DEFAULT_RULES = TradingRules(domain.INITIAL_BALANCE, domain.DEFAULT_BUY_COMMISSIONS, domain.DEFAULT_SELL_COMMISSIONS)
+
+# one element per parameter set; equity_curve is None unless it was asked for
+Backtest = collections.namedtuple("Backtest", ["balance", "position", "average_price", "equity", "total_return",
+	"max_drawdown", "trades", "rejected", "commissions", "equity_curve"])
+
+def minimum_step_sizes(prices):
+	"""domain.minimum_step_size of every price"""
+	return np.where(prices <= 0.10, 0.001, np.where(prices <= 2.00, 0.005, 0.01))
+
+def get_commission_table(commissions):
+	"""Breaks the amounts into pieces over which domain.get_commission is constant, for look_up_commissions
+
+	Piece 2i is the open interval below edge i and piece 2i + 1 the edge itself, so inclusive bounds stay exact.
+	"""
+	edges = sorted({float(bound) for commission_range in commissions.fixed + commissions.percentage
+		for bound in (commission_range.min, commission_range.max)})
+	points = [edges[0] - 1]
+	for number, edge in enumerate(edges):
+		points.append(edge)
+		points.append((edge + edges[number + 1]) / 2 if number + 1 < len(edges) else edge + 1)
+
+	def get_value(commission_ranges, amount):
+		for commission_range in commission_ranges:
+			if float(commission_range.min) <= amount <= float(commission_range.max):
+				return float(commission_range.value)
+		return np.nan
+
+	values = np.array([(get_value(commissions.fixed, point), get_value(commissions.percentage, point))
+		for point in points])
+	return np.array(edges), values
+
+def look_up_commissions(table, amounts):
+	"""The fixed and percentage commissions of every amount, one row each; NaN where the server rejects the order"""
+	edges, values = table
+	pieces = np.searchsorted(edges, amounts)
+	exact = edges[np.minimum(pieces, len(edges) - 1)] == amounts
+	return values[2 * pieces + exact]
+
+def fill_forward(prices):
+	"""Carries the last price over the NaN of null bars, and the first price back over the bars before it"""
+	prices = np.asarray(prices, dtype = np.float64)
+	valid = ~np.isnan(prices)
+	if valid.all() or not valid.any():
+		return prices
+	sources = np.maximum.accumulate(np.where(valid, np.arange(len(prices)), 0))
+	sources[:np.argmax(valid)] = np.argmax(valid)
+	return prices[sources]
+
+def get_previous_closes(columns, session_gap = DEFAULT_SESSION_GAP):
+	"""The close of the previous session at every bar, which sets the price step of its quotes
+
+	The first session has no previous close, so its own first open stands in.
+	"""
+	timestamps = np.asarray(columns.timestamps)
+	session_starts = np.ones(len(timestamps), dtype = bool)
+	session_starts[1:] = np.diff(timestamps) > session_gap
+	session_numbers = np.cumsum(session_starts) - 1
+	last_bars = np.append(np.flatnonzero(session_starts)[1:] - 1, len(timestamps) - 1)
+	session_closes = fill_forward(columns.close)[last_bars]
+	previous = np.concatenate(([fill_forward(columns.open)[0]], session_closes[:-1]))
+	return previous[session_numbers]
+
+def run_backtest(columns, targets, rules = DEFAULT_RULES, fill = NEXT_OPEN, session_gap = DEFAULT_SESSION_GAP,
+	record_equity = False):
+	"""Trades one symbol towards targets[set, bar] shares for every parameter set at once
+
+	At each bar every set orders the difference between its target and its position. The order is filled as
+	Account.BuyShares and SellShares fill it: at the ask or bid, one price step from the last price, less the fixed
+	and percentage commissions of the trade amount. Orders the server would reject are skipped: prices below
+	MINIMUM_PRICE, amounts outside every commission range, buys costing more than the balance, and sells of more shares
+	than are held. Money is float64 rather than decimal, so balances agree with the server's to about a millionth of a
+	cent.
+	"""
+	targets = np.atleast_2d(np.asarray(targets, dtype = np.int64))
+	set_count, bar_count = targets.shape
+	if bar_count != len(columns.close):
+		raise ValueError("Expected targets for {0} bars; got {1}.".format(len(columns.close), bar_count))
+	if fill not in (NEXT_OPEN, CLOSE):
+		raise ValueError("The fill must be '{0}' or '{1}'.".format(NEXT_OPEN, CLOSE))
+
+	# null bars are marked to market at the last close; orders at a null price are rejected, as NaN fails every check
+	closes = fill_forward(columns.close)
+	steps = minimum_step_sizes(get_previous_closes(columns, session_gap))
+	if fill == NEXT_OPEN:
+		# the target of bar t is filled at the open of bar t + 1, so bar t + 1 trades towards it
+		last_prices = np.asarray(columns.open, dtype = np.float64)
+		targets = np.concatenate((np.zeros((set_count, 1), dtype = targets.dtype), targets[:, :-1]), axis = 1)
+	else:
+		last_prices = np.asarray(columns.close, dtype = np.float64)
+	buy_table = get_commission_table(rules.buy_commissions)
+	sell_table = get_commission_table(rules.sell_commissions)
+	changed = np.empty(bar_count, dtype = bool)
+	changed[0] = targets[:, 0].any()
+	changed[1:] = (targets[:, 1:] != targets[:, :-1]).any(axis = 0)
+
+	initial_balance = float(rules.initial_balance)
+	balance = np.full(set_count, initial_balance)
+	position = np.zeros(set_count, dtype = np.int64)
+	average_price = np.zeros(set_count)
+	trades = np.zeros(set_count, dtype = np.int64)
+	rejected = np.zeros(set_count, dtype = np.int64)
+	commissions = np.zeros(set_count)
+	peak = balance.copy()
+	max_drawdown = np.zeros(set_count)
+	equity_curve = np.empty((set_count, bar_count)) if record_equity else None
+
+	def track(start, end):
+		"""Marks the equity to the closes of bars start to end - 1, over which no set traded"""
+		for chunk_start in range(start, end, TRACKING_CHUNK):
+			chunk_end = min(end, chunk_start + TRACKING_CHUNK)
+			equity = balance[:, np.newaxis] + position[:, np.newaxis] * closes[np.newaxis, chunk_start:chunk_end]
+			peaks = np.maximum(np.maximum.accumulate(equity, axis = 1), peak[:, np.newaxis])
+			np.maximum(max_drawdown, (1 - equity / peaks).max(axis = 1), out = max_drawdown)
+			peak[:] = peaks[:, -1]
+			if record_equity:
+				equity_curve[:, chunk_start:chunk_end] = equity
+
+	# only bars where a target changed, or an order was rejected and is tried again, can trade
+	tracked = 0
+	pending = False
+	changed = changed.tolist()
+	for bar in range(bar_count):
+		if not (changed[bar] or pending):
+			continue
+		track(tracked, bar)
+		tracked = bar
+
+		rows = np.flatnonzero(targets[:, bar] != position)
+		if not len(rows):
+			pending = False
+			continue
+		orders = targets[rows, bar] - position[rows]
+		buying = orders > 0
+		quantity = np.abs(orders)
+		price = last_prices[bar] + np.where(buying, steps[bar], -steps[bar])
+		amount = quantity * price
+		rates = np.where(buying[:, np.newaxis], look_up_commissions(buy_table, amount),
+			look_up_commissions(sell_table, amount))
+		fees = amount * rates[:, 1] / 100 + rates[:, 0]
+
+		# comparisons with NaN fees are false, rejecting amounts no commission range covers
+		valid = np.where(buying, amount + fees <= balance[rows],
+			(fees - amount <= balance[rows]) & (quantity <= position[rows]))
+		# prices are on the 0.001 grid, so rounding keeps float error from rejecting a bid of exactly the minimum
+		valid &= np.round(price, 3) >= MINIMUM_PRICE
+		rejected[rows[~valid]] += 1
+		pending = not valid.all()
+		rows, buying, orders, amount, fees = rows[valid], buying[valid], orders[valid], amount[valid], fees[valid]
+
+		held = position[rows]
+		# a position opened afresh takes the same formula with nothing held, and a closed one starts over at zero
+		average_price[rows] = np.where(buying, (held * average_price[rows] + amount + fees)
+			/ np.maximum(held + orders, 1), np.where(held + orders, average_price[rows], 0.0))
+		balance[rows] -= np.where(buying, amount, -amount) + fees
+		position[rows] += orders
+		trades[rows] += 1
+		commissions[rows] += fees
+	track(tracked, bar_count)
+
+	equity = balance + position * closes[-1]
+	return Backtest(balance, position, average_price, equity, equity / initial_balance - 1, max_drawdown, trades,
+		rejected, commissions, equity_curve)
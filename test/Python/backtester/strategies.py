@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import itertools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def parameter_grid(**values):
+	"""Every combination of the given values, as one array per parameter with an element per set"""
+	names = list(values)
+	combinations = list(itertools.product(*(values[name] for name in names)))
+	return {name: np.array([combination[number] for combination in combinations])
+		for number, name in enumerate(names)}
+
+def moving_averages(closes, windows):
+	"""Simple moving averages of closes for each window, NaN until a window is full; one row per window"""
+	closes = np.asarray(closes, dtype = np.float64)
+	sums = np.concatenate(([0.0], np.cumsum(closes)))
+	averages = np.full((len(windows), len(closes)), np.nan)
+	for row, window in enumerate(windows):
+		if 0 < window <= len(closes):
+			averages[row, window - 1:] = (sums[window:] - sums[:-window]) / window
+	return averages
+
+def moving_average_crossover(columns, fast, slow, quantity):
+	"""Holds quantity shares while the fast moving average is above the slow one, for every (fast, slow) set"""
+	fast, slow = np.asarray(fast), np.asarray(slow)
+	windows, inverse = np.unique(np.concatenate((fast, slow)), return_inverse = True)
+	# each window is averaged once however many sets share it
+	averages = moving_averages(columns.close, windows)
+	fast_averages, slow_averages = averages[inverse[:len(fast)]], averages[inverse[len(fast):]]
+	with np.errstate(invalid = "ignore"):
+		holding = fast_averages > slow_averages
+	return np.where(holding, np.asarray(quantity).reshape(-1, 1), 0)
+
+def breakout(columns, lookback, quantity):
+	"""Buys quantity shares on a close above the highest high of the last lookback bars and sells on one below the
+	lowest low, for every lookback"""
+	highs = np.asarray(columns.high, dtype = np.float64)
+	lows = np.asarray(columns.low, dtype = np.float64)
+	closes = np.asarray(columns.close, dtype = np.float64)
+	lookback = np.asarray(lookback)
+	targets = np.zeros((len(lookback), len(closes)), dtype = np.int64)
+	quantity = np.broadcast_to(np.asarray(quantity), lookback.shape)
+	for row, window in enumerate(lookback):
+		if not 0 < window < len(closes):
+			continue
+		# the channel of the bars before each bar, from bar window on
+		upper = sliding_window_view(highs[:-1], window).max(axis = 1)
+		lower = sliding_window_view(lows[:-1], window).min(axis = 1)
+		signals = np.zeros(len(closes))
+		signals[window:] = np.where(closes[window:] > upper, 1.0, np.where(closes[window:] < lower, 0.0, np.nan))
+		signals[:window] = 0.0
+		# carries the last signal forward over the bars without one
+		filled = np.where(np.isnan(signals), 0, np.arange(len(signals)))
+		np.maximum.accumulate(filled, out = filled)
+		targets[row] = signals[filled] * quantity[row]
+	return targets
+
+def buy_and_hold(columns, quantity):
+	return np.broadcast_to(np.asarray(quantity).reshape(-1, 1), (np.size(quantity), len(columns.close)))
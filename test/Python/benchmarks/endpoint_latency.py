@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import collections
+import datetime
+import json
+import math
+import statistics
+import sys
+import time
+
+from api_client.api_client import ApiClient
+from api_client.config import get_base_url
+from load_generator.stats import percentile
+
+BASELINE_FORMAT = "InvestorAPI latency baseline 1"
+PASSWORD = "Bench7mark!"
+SYMBOLS = ("CBA", "BHP", "WBC")
+SUMMARY_PERCENTILES = (("p50", 50.0), ("p90", 90.0), ("p99", 99.0))
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_P99_THRESHOLD = 0.5
+# differences below this many seconds are noise however large they are relatively, e.g. on a local server
+DEFAULT_MIN_DELTA = 0.001
+
+class BenchmarkUser:
+	"""The registered user every operation runs as, with its account, watchlist and order nonces"""
+
+	def __init__(self, run_id):
+		self.run_id = run_id
+		self.display_name = "Bench{0}".format(run_id)
+		self.email = "bench.{0}@test.com".format(run_id)
+		self.token = None
+		self.account_id = None
+		self.watchlist_id = None
+		self.last_nonce = 0
+
+	def next_nonce(self):
+		self.last_nonce = max(self.last_nonce + 1, int(time.time()))
+		return self.last_nonce
+
+	def get_email(self, number):
+		return "bench.{0}.{1}@test.com".format(self.run_id, number)
+
+	def set_up(self, client):
+		client.register_user(self.display_name, self.email, PASSWORD)
+		self.token = client.authenticate_user(self.email, PASSWORD).get_token()
+		details = client.view_details(self.token)
+		if details.get_http_status() != details.SUCCESS_STATUS:
+			raise RuntimeError("Could not set up the benchmark user at {0}: HTTP {1}".format(client.base_url,
+				details.get_http_status()))
+		self.account_id = details.get_main_account_id()
+		self.watchlist_id = details.get_main_watchlist_id()
+
+	def tear_down(self, client):
+		if self.token is not None:
+			client.delete_user(self.token)
+
+# Each operation times run(client, user, prepared), where prepared is what its untimed setup(client, user, number)
+# returned; its untimed teardown(client, user, prepared) undoes what run changed where the next call needs it.
+Operation = collections.namedtuple("Operation", ["name", "run", "setup", "teardown"])
+
+def no_setup(client, user, number):
+	return number
+
+def no_teardown(client, user, prepared):
+	pass
+
+def delete_registered(client, user, email):
+	client.delete_user(client.authenticate_user(email, PASSWORD).get_token())
+
+def register_and_authenticate(client, user, number):
+	email = user.get_email(number)
+	client.register_user(user.display_name, email, PASSWORD)
+	return client.authenticate_user(email, PASSWORD).get_token()
+
+def add_symbol(client, user, number):
+	symbol = SYMBOLS[number % len(SYMBOLS)]
+	client.add_to_watchlist(user.token, user.watchlist_id, symbol)
+	return symbol
+
+def remove_symbol(client, user, symbol):
+	client.remove_from_watchlist(user.token, user.watchlist_id, symbol)
+
+def buy_one(client, user, number):
+	client.buy_share(user.token, user.account_id, SYMBOLS[0], 1, user.next_nonce())
+
+OPERATIONS = [
+	Operation("register_user", lambda client, user, email: client.register_user(user.display_name, email, PASSWORD),
+		lambda client, user, number: user.get_email(number), delete_registered),
+	Operation("authenticate_user", lambda client, user, prepared: client.authenticate_user(user.email, PASSWORD),
+		no_setup, no_teardown),
+	Operation("delete_user", lambda client, user, token: client.delete_user(token), register_and_authenticate,
+		no_teardown),
+	Operation("view_details", lambda client, user, prepared: client.view_details(user.token), no_setup, no_teardown),
+	Operation("get_current_quotes", lambda client, user, prepared: client.get_current_quotes(user.token,
+		list(SYMBOLS)), no_setup, no_teardown),
+	Operation("buy_share", lambda client, user, prepared: client.buy_share(user.token, user.account_id, SYMBOLS[0],
+		1, user.next_nonce()), no_setup, no_teardown),
+	Operation("sell_share", lambda client, user, prepared: client.sell_share(user.token, user.account_id, SYMBOLS[0],
+		1, user.next_nonce()), buy_one, no_teardown),
+	Operation("get_watchlist", lambda client, user, prepared: client.get_watchlist(user.token, user.watchlist_id),
+		no_setup, no_teardown),
+	Operation("add_to_watchlist", lambda client, user, number: client.add_to_watchlist(user.token, user.watchlist_id,
+		SYMBOLS[number % len(SYMBOLS)]), no_setup,
+		lambda client, user, number: remove_symbol(client, user, SYMBOLS[number % len(SYMBOLS)])),
+	Operation("remove_from_watchlist", lambda client, user, symbol: client.remove_from_watchlist(user.token,
+		user.watchlist_id, symbol), add_symbol, no_teardown),
+	Operation("get_historical_prices", lambda client, user, prepared: client.get_historical_prices(user.token,
+		SYMBOLS[0], interval = "1d", date_range = "1y"), no_setup, no_teardown),
+	Operation("get_portfolio", lambda client, user, prepared: client.get_portfolio(user.token, user.account_id),
+		no_setup, no_teardown),
+	Operation("get_transactions", lambda client, user, prepared: client.get_transactions(user.token,
+		user.account_id), no_setup, no_teardown),
+	Operation("get_leaderboard", lambda client, user, prepared: client.get_leaderboard(user.token), no_setup,
+		no_teardown),
+	Operation("reset_account", lambda client, user, prepared: client.reset_account(user.token, user.account_id),
+		no_setup, no_teardown),
+	Operation("edit_user", lambda client, user, number: client.edit_user(user.token,
+		"{0}{1}".format(user.display_name, number % 2), user.email), no_setup, no_teardown),
+	Operation("get_fundamentals", lambda client, user, prepared: client.get_fundamentals(user.token, SYMBOLS[0]),
+		no_setup, no_teardown),
+	Operation("get_dividends", lambda client, user, prepared: client.get_dividends(user.token, SYMBOLS[0]),
+		no_setup, no_teardown),
+]
+OPERATIONS_BY_NAME = collections.OrderedDict((operation.name, operation) for operation in OPERATIONS)
+
+def get_operations(names = None):
+	if not names:
+		return list(OPERATIONS)
+	unknown = [name for name in names if name not in OPERATIONS_BY_NAME]
+	if unknown:
+		raise ValueError("Unknown operations {0}; expected some of {1}.".format(", ".join(unknown),
+			", ".join(OPERATIONS_BY_NAME)))
+	return [OPERATIONS_BY_NAME[name] for name in names]
+
+def time_operation(client, user, operation, number):
+	"""Returns the seconds one call took and its error, None if it returned the expected status"""
+	prepared = operation.setup(client, user, number)
+	started = time.perf_counter()
+	try:
+		response = operation.run(client, user, prepared)
+	except Exception as error:
+		return time.perf_counter() - started, type(error).__name__
+	latency = time.perf_counter() - started
+	operation.teardown(client, user, prepared)
+	if response.get_http_status() != response.SUCCESS_STATUS:
+		return latency, "HTTP {0}".format(response.get_http_status())
+	return latency, None
+
+def summarise(rounds, errors):
+	"""Statistics of the successful latencies of an operation, pooled over the rounds"""
+	latencies = sorted(latency for round_latencies in rounds for latency in round_latencies)
+	round_medians = [statistics.median(round_latencies) for round_latencies in rounds if round_latencies]
+	summary = {
+		"samples": len(latencies),
+		"errors": sum(errors.values()),
+		"errorBreakdown": dict(errors.most_common()),
+		"mean": statistics.fmean(latencies) if latencies else None,
+		"stdev": statistics.stdev(latencies) if len(latencies) > 1 else None,
+		"min": latencies[0] if latencies else None,
+		"max": latencies[-1] if latencies else None,
+		# how much the median moves between rounds, a guide to the threshold this server needs
+		"p50Spread": (max(round_medians) - min(round_medians)) / statistics.median(round_medians)
+			if len(round_medians) > 1 else None
+	}
+	for name, percent in SUMMARY_PERCENTILES:
+		summary[name] = percentile(latencies, percent)
+	return summary
+
+def run_benchmark(base_url = None, operations = None, warmup = 5, count = 20, repeat = 5, progress = None):
+	"""Times every operation count times in each of repeat rounds, after warmup untimed calls each
+
+	Within a round each operation runs its calls back to back; spreading the calls of an operation over rounds keeps
+	a slow moment of the server from landing on a single operation.
+	"""
+	operations = operations or list(OPERATIONS)
+	base_url = get_base_url(base_url)
+	user = BenchmarkUser(int(time.time() * 1000))
+	latencies = {operation.name: [] for operation in operations}
+	errors = {operation.name: collections.Counter() for operation in operations}
+	number = 0
+	started = time.perf_counter()
+	with ApiClient(base_url = base_url) as client:
+		user.set_up(client)
+		try:
+			for operation in operations:
+				for _ in range(warmup):
+					time_operation(client, user, operation, number)
+					number += 1
+			for round_number in range(repeat):
+				for operation in operations:
+					round_latencies = []
+					for _ in range(count):
+						latency, error = time_operation(client, user, operation, number)
+						number += 1
+						if error is None:
+							round_latencies.append(latency)
+						else:
+							errors[operation.name][error] += 1
+					latencies[operation.name].append(round_latencies)
+				if progress is not None:
+					progress(round_number + 1, repeat)
+		finally:
+			user.tear_down(client)
+
+	return {
+		"format": BASELINE_FORMAT,
+		"baseUrl": base_url,
+		"created": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+		"settings": {"warmup": warmup, "count": count, "repeat": repeat},
+		"elapsed": time.perf_counter() - started,
+		"operations": collections.OrderedDict((operation.name, summarise(latencies[operation.name],
+			errors[operation.name])) for operation in operations)
+	}
+
+def save_results(results, path):
+	with open(path, "w") as baseline_file:
+		json.dump(results, baseline_file, indent = 2)
+
+def load_baseline(path):
+	with open(path) as baseline_file:
+		baseline = json.load(baseline_file)
+	if baseline.get("format") != BASELINE_FORMAT:
+		raise ValueError("{0} is not a latency baseline".format(path))
+	return baseline
+
+Comparison = collections.namedtuple("Comparison", ["operation", "metric", "baseline", "current", "change",
+	"regressed"])
+
+def compare(baseline, results, threshold = DEFAULT_THRESHOLD, p99_threshold = DEFAULT_P99_THRESHOLD,
+	min_delta = DEFAULT_MIN_DELTA):
+	"""Compares the p50 and p99 of every operation in both; a regression is slower by more than the threshold
+	fraction and by more than min_delta seconds"""
+	comparisons = []
+	for name, summary in results["operations"].items():
+		reference = baseline["operations"].get(name)
+		if reference is None:
+			continue
+		for metric, limit in (("p50", threshold), ("p99", p99_threshold)):
+			before, after = reference.get(metric), summary.get(metric)
+			if before is None or after is None:
+				continue
+			change = (after - before) / before if before > 0 else math.inf
+			regressed = change > limit and after - before > min_delta
+			comparisons.append(Comparison(name, metric, before, after, change, regressed))
+	return comparisons
+
+def format_milliseconds(value):
+	return "-" if value is None else "{0:.2f}".format(value * 1000)
+
+def format_results(results):
+	columns = ["samples", "errors", "mean", "stdev", "min", "p50", "p90", "p99", "max", "spread"]
+	lines = ["{0} ({1} warm-up, {2} rounds of {3} calls per operation, {4:.1f} s)".format(results["baseUrl"],
+		results["settings"]["warmup"], results["settings"]["repeat"], results["settings"]["count"],
+		results["elapsed"])]
+	lines.append("{0:<24}".format("operation (ms)") + "".join("{0:>9}".format(column) for column in columns))
+	for name, summary in results["operations"].items():
+		values = [str(summary["samples"]), str(summary["errors"])]
+		values += [format_milliseconds(summary[column]) for column in ("mean", "stdev", "min", "p50", "p90", "p99",
+			"max")]
+		values.append("-" if summary["p50Spread"] is None else "{0:.0%}".format(summary["p50Spread"]))
+		lines.append("{0:<24}".format(name) + "".join("{0:>9}".format(value) for value in values))
+	return "\n".join(lines)
+
+def format_comparisons(comparisons):
+	lines = ["{0:<24}{1:>6}{2:>12}{3:>12}{4:>9}".format("operation (ms)", "", "baseline", "current", "change")]
+	for comparison in comparisons:
+		lines.append("{0:<24}{1:>6}{2:>12}{3:>12}{4:>+9.0%}{5}".format(comparison.operation, comparison.metric,
+			format_milliseconds(comparison.baseline), format_milliseconds(comparison.current), comparison.change,
+			"  REGRESSED" if comparison.regressed else ""))
+	return "\n".join(lines)
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m benchmarks.endpoint_latency",
+		description = "Times every InvestorAPI operation and compares its p50 and p99 latencies with a baseline.")
+	parser.add_argument("--base-url", help = "defaults to INVESTOR_API_BASE_URL, then the hosted API")
+	parser.add_argument("--operations", type = lambda text: text.split(","),
+		help = "comma-separated operations (default: all of {0})".format(", ".join(OPERATIONS_BY_NAME)))
+	parser.add_argument("--warmup", type = int, default = 5, help = "untimed calls per operation first")
+	parser.add_argument("--count", type = int, default = 20, help = "timed calls per operation and round")
+	parser.add_argument("--repeat", type = int, default = 5, help = "rounds through all the operations")
+	parser.add_argument("--baseline", metavar = "PATH", help = "fail if slower than this baseline")
+	parser.add_argument("--save", metavar = "PATH", help = "write the results as a new baseline")
+	parser.add_argument("--threshold", type = float, default = DEFAULT_THRESHOLD,
+		help = "allowed p50 slowdown as a fraction (default {0:g})".format(DEFAULT_THRESHOLD))
+	parser.add_argument("--p99-threshold", type = float, default = DEFAULT_P99_THRESHOLD,
+		help = "allowed p99 slowdown as a fraction (default {0:g})".format(DEFAULT_P99_THRESHOLD))
+	parser.add_argument("--min-delta", type = float, default = DEFAULT_MIN_DELTA * 1000,
+		help = "milliseconds of slowdown always allowed (default {0:g})".format(DEFAULT_MIN_DELTA * 1000))
+	args = parser.parse_args(argv)
+
+	try:
+		operations = get_operations(args.operations)
+		baseline = load_baseline(args.baseline) if args.baseline else None
+	except (OSError, ValueError) as error:
+		parser.error(str(error))
+
+	results = run_benchmark(args.base_url, operations, args.warmup, args.count, args.repeat,
+		progress = lambda done, total: print("Round {0}/{1}".format(done, total), file = sys.stderr, flush = True))
+	print(format_results(results))
+	if args.save:
+		save_results(results, args.save)
+
+	failed = any(summary["errors"] for summary in results["operations"].values())
+	if failed:
+		print("\nSome calls failed; see the errors column.")
+	if baseline is not None:
+		comparisons = compare(baseline, results, args.threshold, args.p99_threshold, args.min_delta / 1000)
+		print("\nCompared with {0} ({1}, {2})".format(args.baseline, baseline["baseUrl"], baseline["created"]))
+		if baseline["baseUrl"] != results["baseUrl"]:
+			print("The baseline was measured against another server.")
+		print(format_comparisons(comparisons))
+		regressions = [comparison for comparison in comparisons if comparison.regressed]
+		if regressions:
+			print("\n{0} regressions beyond the thresholds.".format(len(regressions)))
+			failed = True
+	return 1 if failed else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
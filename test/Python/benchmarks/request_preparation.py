@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import concurrent.futures
+import datetime
+import json
+import sys
+import time
+
+from requests import Request
+
+from api_client.api_client import ApiClient
+from api_client.config import get_base_url
+from api_client.request_extensions.buyshare_request import BuyShareRequest
+from api_client.request_extensions.currentquotes_request import CurrentQuotesRequest
+from api_client.request_extensions.historicalprices_request import HistoricalPricesRequest
+from api_client.request_extensions.registration_request import RegistrationRequest
+from api_client.request_extensions.viewdetails_request import ViewDetailsRequest
+from api_client.request_extensions.viewtransactions_request import ViewTransactionsRequest
+
+BASE_URL = "http://localhost:5000/api/1.0"
+TOKEN = "x" * 200
+
+# one request per endpoint shape: no parameters, query parameters, path and query parameters, and JSON bodies
+CASES = [
+	("view_details", lambda: ViewDetailsRequest(None, TOKEN, base_url = BASE_URL)),
+	("get_current_quotes", lambda: CurrentQuotesRequest(None, TOKEN, ["CBA", "BHP", "WBC"], base_url = BASE_URL)),
+	("get_historical_prices", lambda: HistoricalPricesRequest(None, TOKEN, "CBA", "2018-01-01T00:00:00Z", "1d", "1y",
+		base_url = BASE_URL)),
+	("get_transactions", lambda: ViewTransactionsRequest(None, TOKEN, "123456", 2, 50, datetime.date(2018, 1, 1),
+		base_url = BASE_URL)),
+	("buy_share", lambda: BuyShareRequest(None, TOKEN, "123456", "CBA", 100, base_url = BASE_URL, nonce = 1)),
+	("register_user", lambda: RegistrationRequest(None, "Benchmark", "benchmark@test.com", "12345678",
+		base_url = BASE_URL)),
+]
+
+def prepare_untemplated(request):
+	"""Prepares request the way the request classes did before templates, through requests.Request"""
+	template = request.TEMPLATE
+	url = request.base_url + template.path
+	for placeholder, value in zip(template.placeholders, request.get_path_values()):
+		url = url.replace(placeholder, str(value))
+	headers = dict(template.headers)
+	if template.authorized:
+		headers["Authorization"] = "Bearer " + str(request.token)
+	body = request.get_body()
+	data = None if body is None else json.dumps(body, ensure_ascii = False).encode("utf8")
+	return Request(template.method, url = url, headers = headers, params = request.get_params() or {},
+		data = data).prepare()
+
+def measure(function, count, repeat):
+	"""Returns the least CPU seconds per call over repeat runs of count calls"""
+	best = float("inf")
+	for _ in range(repeat):
+		started = time.process_time()
+		for _ in range(count):
+			function()
+		best = min(best, (time.process_time() - started) / count)
+	return best
+
+def run_preparation(count = 20000, repeat = 5):
+	"""Returns the CPU seconds per prepared request of each case, through requests.Request and through templates"""
+	results = []
+	for name, make_request in CASES:
+		untemplated = measure(lambda: prepare_untemplated(make_request()), count, repeat)
+		templated = measure(lambda: make_request().prepare(), count, repeat)
+		results.append({"endpoint": name, "untemplated": untemplated, "templated": templated})
+	return results
+
+def run_requests(base_url, requests, threads):
+	"""Sends requests get_current_quotes calls from threads threads, returning the client CPU per request"""
+	with ApiClient(base_url = base_url, pool_maxsize = threads) as client:
+		email = "benchmark{0}@test.com".format(int(time.time() * 1000))
+		client.register_user("Benchmark", email, "12345678")
+		token = client.authenticate_user(email, "12345678").get_token()
+		try:
+			with concurrent.futures.ThreadPoolExecutor(max_workers = threads) as executor:
+				started, started_cpu = time.perf_counter(), time.process_time()
+				statuses = list(executor.map(lambda number: client.get_current_quotes(token, "CBA").get_http_status(),
+					range(requests)))
+				elapsed, cpu = time.perf_counter() - started, time.process_time() - started_cpu
+		finally:
+			client.delete_user(token)
+	return {"requests": requests, "errors": sum(1 for status in statuses if status != 200), "elapsed": elapsed,
+		"rate": requests / elapsed, "cpu_per_request": cpu / requests}
+
+def format_results(results):
+	lines = ["{0:<24}{1:>16}{2:>16}{3:>10}".format("endpoint", "requests (us)", "template (us)", "speedup")]
+	for result in results:
+		lines.append("{0:<24}{1:>16.1f}{2:>16.1f}{3:>9.1f}x".format(result["endpoint"], result["untemplated"] * 1e6,
+			result["templated"] * 1e6, result["untemplated"] / result["templated"]))
+	return "\n".join(lines)
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m benchmarks.request_preparation",
+		description = "Measures the client CPU spent preparing each request, with and without request templates.")
+	parser.add_argument("--count", type = int, default = 20000, help = "requests prepared per run")
+	parser.add_argument("--repeat", type = int, default = 5, help = "runs per case, of which the fastest counts")
+	parser.add_argument("--send", type = int, metavar = "REQUESTS",
+		help = "also send this many quote requests and report the client CPU per request")
+	parser.add_argument("--threads", type = int, default = 8, help = "threads sending the requests")
+	parser.add_argument("--base-url", help = "server for --send, defaults to INVESTOR_API_BASE_URL")
+	args = parser.parse_args(argv)
+
+	print(format_results(run_preparation(args.count, args.repeat)))
+	if args.send:
+		result = run_requests(get_base_url(args.base_url), args.send, args.threads)
+		print("\n{0} requests ({1} errors) at {2:.0f}/s, {3:.1f}us of client CPU each".format(result["requests"],
+			result["errors"], result["rate"], result["cpu_per_request"] * 1e6))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from requests import Response
+
+from api_client.response_wrappers.currentquotes_response_wrapper import CurrentQuotesResponseWrapper
+from api_client.response_wrappers.viewtransactions_response_wrapper import ViewTransactionsResponseWrapper
+
+def make_quotes(count):
+	return [{"symbol": "S{0:04d}".format(number), "ask": 10.01 + number, "bid": 9.99 + number, "last": 10.0 + number,
+		"lastSize": 100 + number, "change": 0.01 * number, "changePercent": 0.1, "dayLow": 9.5 + number,
+		"dayHigh": 10.5 + number} for number in range(count)]
+
+def make_transactions(count):
+	return {"items": [{"timestampUtc": "2018-01-01T00:{0:02d}:{1:02d}.123Z".format(number // 60 % 60, number % 60),
+		"type": "Buy", "description": "Bought 10 CBA @ 73.10", "amount": -731.0 - number,
+		"balance": 100000.0 - number} for number in range(count)], "pageNumber": 1, "pageSize": count,
+		"totalPageCount": 1, "totalRowCount": count}
+
+def make_wrapper(wrapper_class, content):
+	response = Response()
+	response.status_code = 200
+	response.encoding = "utf-8"
+	response._content = content
+	return wrapper_class(response)
+
+def measure_decoding(wrapper_class, content, decode, repeat):
+	"""Returns the bytes kept by the decoded body and the least seconds decoding took over repeat runs"""
+	gc.collect()
+	tracemalloc.start()
+	body = decode(make_wrapper(wrapper_class, content))
+	kept = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del body
+
+	best = float("inf")
+	for _ in range(repeat):
+		wrapper = make_wrapper(wrapper_class, content)
+		started = time.perf_counter()
+		decode(wrapper)
+		best = min(best, time.perf_counter() - started)
+	return kept, best
+
+def measure_use(body, use, repeat):
+	best = float("inf")
+	for _ in range(repeat):
+		started = time.perf_counter()
+		use(body)
+		best = min(best, time.perf_counter() - started)
+	return best
+
+def run(quotes = 2000, transactions = 20000, repeat = 5):
+	"""Measures decoding quotes and transactions into dicts and into models, then using them"""
+	quotes_content = json.dumps(make_quotes(quotes)).encode("utf-8")
+	transactions_content = json.dumps(make_transactions(transactions)).encode("utf-8")
+	symbols = ["S{0:04d}".format(number) for number in range(quotes)]
+
+	def scan(quote_dicts, symbol):
+		# the lookup get_quote_by_symbol did before its index
+		for quote in quote_dicts:
+			if quote["symbol"] == symbol:
+				return quote
+		return None
+
+	results = []
+	for name, wrapper_class, content, decode_dicts, decode_models, use_dicts, use_models in [
+		("quotes", CurrentQuotesResponseWrapper, quotes_content, lambda wrapper: wrapper.get_all_quotes(),
+			lambda wrapper: wrapper.get_quotes(), lambda quote_dicts: [scan(quote_dicts, symbol) for symbol in symbols],
+			lambda quote_list: [quote_list.get(symbol) for symbol in symbols]),
+		("transactions", ViewTransactionsResponseWrapper, transactions_content, lambda wrapper: wrapper.get_items(),
+			lambda wrapper: wrapper.get_transaction_infos(), lambda items: sum(item["amount"] for item in items),
+			lambda items: sum(item.amount for item in items))]:
+		dicts_kept, dicts_decoding = measure_decoding(wrapper_class, content, decode_dicts, repeat)
+		models_kept, models_decoding = measure_decoding(wrapper_class, content, decode_models, repeat)
+		results.append({"case": name, "count": quotes if name == "quotes" else transactions,
+			"dictsKept": dicts_kept, "modelsKept": models_kept,
+			"dictsDecoding": dicts_decoding, "modelsDecoding": models_decoding,
+			"dictsUse": measure_use(decode_dicts(make_wrapper(wrapper_class, content)), use_dicts, repeat),
+			"modelsUse": measure_use(decode_models(make_wrapper(wrapper_class, content)), use_models, repeat)})
+	return results
+
+def format_results(results):
+	"""Quotes are used by looking every symbol up (models: QuoteList.get, dicts: a scan), transactions by a sum"""
+	lines = ["{0:<28}{1:>14}{2:>14}{3:>14}".format("", "kept (KiB)", "decoding (ms)", "use (ms)")]
+	for result in results:
+		for kind in ("dicts", "models"):
+			lines.append("{0:<28}{1:>14.0f}{2:>14.2f}{3:>14.2f}".format("{0} {1} {2}".format(result["count"],
+				result["case"], kind), result[kind + "Kept"] / 1024, result[kind + "Decoding"] * 1000,
+				result[kind + "Use"] * 1000))
+	return "\n".join(lines)
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m benchmarks.typed_models",
+		description = "Compares the memory and time of dict bodies with the typed models of api_client.models.")
+	parser.add_argument("--quotes", type = int, default = 2000)
+	parser.add_argument("--transactions", type = int, default = 20000)
+	parser.add_argument("--repeat", type = int, default = 5)
+	args = parser.parse_args(argv)
+	print(format_results(run(args.quotes, args.transactions, args.repeat)))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+from .user_pool import NAMESPACE_VARIABLE
+
+WORD_CHARACTER = re.compile(r"\w")
+
+def get_namespace():
+	return os.environ.get(NAMESPACE_VARIABLE, "")
+
+def namespaced(value, namespace = None):
+	"""Stamps the namespace over the last word characters of a display name or of an email's local part"""
+	namespace = get_namespace() if namespace is None else namespace
+	if not namespace or not isinstance(value, str):
+		return value
+
+	# only word characters are replaced, by word characters, so the length and validity of the value are kept
+	local, at, domain = value.rpartition("@")
+	if not at:
+		local, domain = value, ""
+	characters = list(local)
+	positions = [match.start() for match in WORD_CHARACTER.finditer(local)]
+	for position, character in zip(reversed(positions), reversed(namespace)):
+		characters[position] = character
+	return "".join(characters) + at + domain
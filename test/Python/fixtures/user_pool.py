@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import atexit
+import contextlib
+import os
+import random
+import threading
+
+from api_client.api_facade import ApiFacade
+
+NAMESPACE_VARIABLE = "INVESTOR_API_TEST_NAMESPACE"
+
+def run_concurrently(function, items, workers):
+	"""Calls function on every item from up to workers threads and returns the results in order"""
+	# plain threads rather than an executor, which refuses new work once the interpreter is exiting
+	results = [None] * len(items)
+	errors = []
+	positions = iter(range(len(items)))
+	lock = threading.Lock()
+
+	def work():
+		while True:
+			with lock:
+				position = next(positions, None)
+			if position is None:
+				return
+			try:
+				results[position] = function(items[position])
+			except Exception as error:
+				errors.append(error)
+
+	threads = [threading.Thread(target = work) for _ in range(max(1, min(workers, len(items))))]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	if errors:
+		raise errors[0]
+	return results
+
+class PooledUser:
+	"""Credentials, token and main account and watchlist of a provisioned test user"""
+
+	def __init__(self, display_name, email, password):
+		self.display_name = display_name
+		self.email = email
+		self.password = password
+		self.token = None
+		self.account_id = None
+		self.watchlist_id = None
+		self.used = False
+
+class UserPool:
+	"""Registers test users once per run and lends them out, so tests do not register and delete their own"""
+
+	PASSWORD = "Pool7est!"
+	DEFAULT_WORKERS = 8
+
+	def __init__(self, client = None, namespace = None, workers = DEFAULT_WORKERS):
+		self.client = client if client is not None else ApiFacade.get_default_client()
+		# display names and emails are unique on the server, so every pool gets its own namespace
+		self.namespace = namespace if namespace is not None else "{0:06x}".format(random.getrandbits(24))
+		self.workers = workers
+		self.lock = threading.Lock()
+		self.created = 0
+		self.users = []
+		self.free = []
+		self.discarded = []
+
+	def make_user(self):
+		with self.lock:
+			number = self.created
+			self.created += 1
+		return PooledUser("Pool{0}{1}".format(self.namespace, number),
+			"pool.{0}.{1}@test.com".format(self.namespace, number), self.PASSWORD)
+
+	def register(self, user):
+		registration_response = self.client.register_user(user.display_name, user.email, user.password)
+		if registration_response.get_http_status() != registration_response.SUCCESS_STATUS:
+			raise RuntimeError("Could not register pooled user {0}: HTTP{1} {2}".format(user.email,
+				registration_response.get_http_status(), registration_response.get_message()))
+
+		user.token = self.client.authenticate_user(user.email, user.password).get_token()
+		viewdetails_response = self.client.view_details(user.token)
+		user.account_id = viewdetails_response.get_main_account_id()
+		user.watchlist_id = viewdetails_response.get_main_watchlist_id()
+		with self.lock:
+			self.users.append(user)
+		return user
+
+	def provision(self, count):
+		"""Registers and authenticates count new users concurrently and adds them to the free users"""
+		new_users = [self.make_user() for _ in range(count)]
+		provisioned = run_concurrently(self.register, new_users, self.workers)
+		with self.lock:
+			self.free.extend(provisioned)
+		return provisioned
+
+	def acquire(self, reset = False):
+		"""Lends a user, resetting its account first if reset is set and an earlier test used it"""
+		with self.lock:
+			user = self.free.pop() if self.free else None
+		if user is None:
+			user = self.register(self.make_user())
+
+		if reset and user.used:
+			resetaccount_response = self.client.reset_account(user.token, user.account_id)
+			if resetaccount_response.get_http_status() != resetaccount_response.SUCCESS_STATUS:
+				self.release(user, discard = True)
+				raise RuntimeError("Could not reset the account of pooled user {0}: HTTP{1}".format(user.email,
+					resetaccount_response.get_http_status()))
+		user.used = True
+		return user
+
+	def release(self, user, discard = False):
+		"""Returns a user; discarded users (e.g. with a changed watchlist) are not lent again"""
+		with self.lock:
+			if discard:
+				self.discarded.append(user)
+			else:
+				self.free.append(user)
+
+	@contextlib.contextmanager
+	def user(self, reset = False, discard = False):
+		user = self.acquire(reset)
+		try:
+			yield user
+		finally:
+			self.release(user, discard)
+
+	def close(self):
+		"""Deletes every user the pool registered, concurrently"""
+		with self.lock:
+			users, self.users, self.free, self.discarded = self.users, [], [], []
+		run_concurrently(lambda user: self.client.delete_user(user.token), users, self.workers)
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_user_pool():
+	"""Returns the user pool shared by the whole test run, deleting its users when the run exits"""
+	global _default_pool
+	if _default_pool is None:
+		with _default_pool_lock:
+			if _default_pool is None:
+				_default_pool = UserPool(namespace = os.environ.get(NAMESPACE_VARIABLE))
+				atexit.register(_default_pool.close)
+	return _default_pool
+
+def close_user_pool():
+	"""Deletes the users of the shared pool now, for processes which exit without running atexit handlers"""
+	global _default_pool
+	with _default_pool_lock:
+		pool, _default_pool = _default_pool, None
+	if pool is not None:
+		atexit.unregister(pool.close)
+		pool.close()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import asyncio
+import json
+import sys
+
+from api_client.async_api_facade import AsyncApiFacade
+from . import scenarios
+from .runner import CLOSED_LOOP, OPEN_LOOP, CONSTANT_ARRIVALS, POISSON_ARRIVALS, LoadGenerator
+from .stats import format_report
+
+DEFAULT_DURATION = 30.0
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m load_generator",
+		description = "Runs a weighted mix of virtual users against the InvestorAPI and reports latency percentiles.")
+	parser.add_argument("--base-url", help = "defaults to INVESTOR_API_BASE_URL, then the hosted API")
+	parser.add_argument("--users", type = int, default = 10, help = "number of virtual users")
+	parser.add_argument("--duration", type = float,
+		help = "seconds of load (default {0:g} unless --requests is given)".format(DEFAULT_DURATION))
+	parser.add_argument("--requests", type = int, help = "number of requests after the setup")
+	parser.add_argument("--mode", choices = (CLOSED_LOOP, OPEN_LOOP), default = CLOSED_LOOP,
+		help = "closed: each user waits for its response; open: requests arrive at --rate")
+	parser.add_argument("--rate", type = float, help = "arrivals per second in the open-loop mode")
+	parser.add_argument("--arrivals", choices = (CONSTANT_ARRIVALS, POISSON_ARRIVALS), default = CONSTANT_ARRIVALS)
+	parser.add_argument("--mix", default = "default",
+		help = "one of {0}, or weighted actions such as get_current_quotes=5,buy_share=1 from {1}".format(
+			", ".join(sorted(scenarios.MIXES)), ", ".join(sorted(scenarios.ACTIONS))))
+	parser.add_argument("--think-time", type = float, default = 0.0,
+		help = "seconds each user waits between requests in the closed-loop mode")
+	parser.add_argument("--symbols", type = lambda text: text.upper().split(","),
+		default = list(scenarios.DEFAULT_SYMBOLS), help = "comma-separated symbols to quote and trade")
+	parser.add_argument("--connections", type = int, default = 100, help = "maximum open connections")
+	parser.add_argument("--timeout", type = float, help = "seconds before a request fails")
+	parser.add_argument("--max-in-flight", type = int, default = LoadGenerator.DEFAULT_MAX_IN_FLIGHT,
+		help = "open-loop arrivals beyond this many outstanding requests are dropped")
+	parser.add_argument("--seed", type = int)
+	parser.add_argument("--keep-users", action = "store_true", help = "do not delete the virtual users afterwards")
+	parser.add_argument("--json", metavar = "PATH", help = "also write the report as JSON, - for standard output")
+	args = parser.parse_args(argv)
+
+	if args.mode == OPEN_LOOP and not args.rate:
+		parser.error("--rate is required in the open-loop mode")
+	if args.duration is None and args.requests is None:
+		args.duration = DEFAULT_DURATION
+	try:
+		mix = scenarios.parse_mix(args.mix)
+	except ValueError as error:
+		parser.error(str(error))
+
+	facade = AsyncApiFacade(args.base_url, limit = args.connections, timeout = args.timeout)
+	generator = LoadGenerator(mix, users = args.users, duration = args.duration, requests = args.requests,
+		mode = args.mode, rate = args.rate, arrivals = args.arrivals, think_time = args.think_time,
+		symbols = args.symbols, seed = args.seed, keep_users = args.keep_users, max_in_flight = args.max_in_flight,
+		facade = facade)
+
+	async def run():
+		try:
+			return await generator.run()
+		finally:
+			await facade.close()
+
+	report = asyncio.run(run())
+
+	if args.json == "-":
+		json.dump(report, sys.stdout, indent = 2)
+		print()
+	else:
+		print(format_report(report))
+		if args.json:
+			with open(args.json, "w") as report_file:
+				json.dump(report, report_file, indent = 2)
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import random
+import time
+import uuid
+
+from api_client.async_api_facade import AsyncApiFacade
+from . import scenarios
+from .stats import PhaseStats
+
+CLOSED_LOOP = "closed"
+OPEN_LOOP = "open"
+CONSTANT_ARRIVALS = "constant"
+POISSON_ARRIVALS = "poisson"
+
+class LoadGenerator:
+	"""Drives a weighted mix of actions by virtual users against the API, in a closed or an open loop"""
+
+	DEFAULT_MAX_IN_FLIGHT = 10000
+
+	def __init__(self, mix, users = 10, duration = None, requests = None, mode = CLOSED_LOOP, rate = None,
+		arrivals = CONSTANT_ARRIVALS, think_time = 0.0, symbols = scenarios.DEFAULT_SYMBOLS, seed = None,
+		keep_users = False, max_in_flight = DEFAULT_MAX_IN_FLIGHT, facade = None, **facade_options):
+		if duration is None and requests is None:
+			raise ValueError("Either a duration or a number of requests is required.")
+		if mode not in (CLOSED_LOOP, OPEN_LOOP):
+			raise ValueError("The mode must be '{0}' or '{1}'.".format(CLOSED_LOOP, OPEN_LOOP))
+		if mode == OPEN_LOOP and not rate:
+			raise ValueError("The open-loop mode needs an arrival rate.")
+		if arrivals not in (CONSTANT_ARRIVALS, POISSON_ARRIVALS):
+			raise ValueError("The arrivals must be '{0}' or '{1}'.".format(CONSTANT_ARRIVALS, POISSON_ARRIVALS))
+		if users < 1:
+			raise ValueError("At least one virtual user is required.")
+
+		self.actions = [scenarios.ACTIONS[name] for name in mix]
+		self.weights = [mix[name] for name in mix]
+		self.users = users
+		self.duration = duration
+		self.requests = requests
+		self.mode = mode
+		self.rate = rate
+		self.arrivals = arrivals
+		self.think_time = think_time
+		self.symbols = list(symbols)
+		self.random = random.Random(seed)
+		self.keep_users = keep_users
+		self.max_in_flight = max_in_flight
+		self.facade = facade if facade is not None else AsyncApiFacade(**facade_options)
+		self.owns_facade = facade is None
+
+		self.run_id = uuid.UUID(int = self.random.getrandbits(128)).hex[:8]
+		self.virtual_users = [scenarios.VirtualUser(self.run_id, number) for number in range(users)]
+		self.phases = {name: PhaseStats(name) for name in ("setup", "load", "teardown")}
+		self.issued = 0
+		self.deadline = None
+
+	async def execute(self, phase, action, user, scheduled = None):
+		started = time.perf_counter() if scheduled is None else scheduled
+		try:
+			endpoint, response = await action(self.facade, user, self.random, self.symbols)
+		except Exception as error:
+			phase.record(action.__name__, time.perf_counter() - started, type(error).__name__)
+			return False
+
+		status = response.get_http_status()
+		error = None if status == response.SUCCESS_STATUS else "HTTP{0}".format(status)
+		phase.record(endpoint, time.perf_counter() - started, error)
+		return error is None
+
+	async def run_phase(self, phase, coroutines):
+		started = time.perf_counter()
+		await asyncio.gather(*coroutines)
+		phase.elapsed = time.perf_counter() - started
+
+	async def set_up(self, user):
+		for action in scenarios.SETUP_ACTIONS:
+			if not await self.execute(self.phases["setup"], action, user):
+				return
+
+	async def tear_down(self, user):
+		if user.token is not None:
+			await self.execute(self.phases["teardown"], scenarios.delete_user, user)
+
+	def choose_action(self):
+		return self.random.choices(self.actions, self.weights)[0]
+
+	def is_finished(self):
+		if self.requests is not None and self.issued >= self.requests:
+			return True
+		return self.deadline is not None and time.perf_counter() >= self.deadline
+
+	async def run_virtual_user(self, user):
+		while not self.is_finished():
+			self.issued += 1
+			await self.execute(self.phases["load"], self.choose_action(), user)
+			if self.think_time:
+				await asyncio.sleep(self.think_time)
+
+	async def run_closed_loop(self, users):
+		await asyncio.gather(*[self.run_virtual_user(user) for user in users])
+
+	async def run_open_loop(self, users):
+		phase = self.phases["load"]
+		in_flight = set()
+		arrival = time.perf_counter()
+		while not self.is_finished():
+			delay = arrival - time.perf_counter()
+			if delay > 0:
+				await asyncio.sleep(delay)
+
+			self.issued += 1
+			if len(in_flight) >= self.max_in_flight:
+				phase.dropped += 1
+			else:
+				user = users[self.issued % len(users)]
+				# latency counts from the scheduled arrival, so a slow server cannot hide its own queueing
+				task = asyncio.ensure_future(self.execute(phase, self.choose_action(), user, arrival))
+				in_flight.add(task)
+				task.add_done_callback(in_flight.discard)
+
+			if self.arrivals == POISSON_ARRIVALS:
+				arrival += self.random.expovariate(self.rate)
+			else:
+				arrival += 1.0 / self.rate
+
+		if in_flight:
+			await asyncio.wait(in_flight)
+
+	async def run(self):
+		"""Sets up the virtual users, applies the load and returns the report as a dictionary"""
+		try:
+			await self.run_phase(self.phases["setup"], [self.set_up(user) for user in self.virtual_users])
+			users = [user for user in self.virtual_users if user.account_id is not None]
+			if users:
+				started = time.perf_counter()
+				if self.duration is not None:
+					self.deadline = started + self.duration
+				if self.mode == OPEN_LOOP:
+					await self.run_open_loop(users)
+				else:
+					await self.run_closed_loop(users)
+				self.phases["load"].elapsed = time.perf_counter() - started
+
+			if not self.keep_users:
+				await self.run_phase(self.phases["teardown"], [self.tear_down(user) for user in self.virtual_users])
+		finally:
+			if self.owns_facade:
+				await self.facade.close()
+		return self.get_report()
+
+	def get_report(self):
+		return {
+			"mode": self.mode,
+			"users": self.users,
+			"baseUrl": self.facade.base_url,
+			"rate": self.rate,
+			"arrivals": self.arrivals if self.mode == OPEN_LOOP else None,
+			"mix": {action.__name__: weight for action, weight in zip(self.actions, self.weights)},
+			"phases": {name: phase.to_dict() for name, phase in self.phases.items()}
+		}
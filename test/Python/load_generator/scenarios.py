@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+DEFAULT_SYMBOLS = ("BHP", "CBA", "TLS", "WOW", "ANZ", "NAB", "WBC", "CSL", "WES", "RIO")
+PASSWORD = "Load7est!"
+
+class VirtualUser:
+	"""State of one simulated player: credentials, token, main account and the shares it holds"""
+
+	def __init__(self, run_id, number):
+		self.number = number
+		self.display_name = "Load{0}{1}".format(run_id, number)
+		self.email = "load.{0}.{1}@test.com".format(run_id, number)
+		self.password = PASSWORD
+		self.token = None
+		self.account_id = None
+		self.positions = {}
+		self.last_nonce = 0
+		# orders on one account must reach the server in nonce order
+		self.order_lock = asyncio.Lock()
+
+	def next_nonce(self):
+		self.last_nonce = max(self.last_nonce + 1, int(time.time()))
+		return self.last_nonce
+
+async def register_user(facade, user, random, symbols):
+	return "register_user", await facade.register_user(user.display_name, user.email, user.password)
+
+async def authenticate_user(facade, user, random, symbols):
+	response = await facade.authenticate_user(user.email, user.password)
+	if response.get_http_status() == response.SUCCESS_STATUS:
+		user.token = response.get_token()
+	return "authenticate_user", response
+
+async def view_details(facade, user, random, symbols):
+	response = await facade.view_details(user.token)
+	if response.get_http_status() == response.SUCCESS_STATUS:
+		user.account_id = response.get_main_account_id()
+	return "view_details", response
+
+async def get_current_quotes(facade, user, random, symbols):
+	chosen = random.sample(symbols, random.randint(1, min(5, len(symbols))))
+	return "get_current_quotes", await facade.get_current_quotes(user.token, chosen)
+
+async def buy_share(facade, user, random, symbols):
+	symbol = random.choice(symbols)
+	quantity = random.randint(1, 10)
+	async with user.order_lock:
+		response = await facade.buy_share(user.token, user.account_id, symbol, quantity, user.next_nonce())
+	if response.get_http_status() == response.SUCCESS_STATUS:
+		user.positions[symbol] = user.positions.get(symbol, 0) + quantity
+	return "buy_share", response
+
+async def sell_share(facade, user, random, symbols):
+	held = sorted(symbol for symbol, quantity in user.positions.items() if quantity > 0)
+	if not held:
+		# nothing to sell yet, so the virtual user buys instead
+		return await buy_share(facade, user, random, symbols)
+
+	symbol = random.choice(held)
+	quantity = random.randint(1, user.positions[symbol])
+	async with user.order_lock:
+		response = await facade.sell_share(user.token, user.account_id, symbol, quantity, user.next_nonce())
+	if response.get_http_status() == response.SUCCESS_STATUS:
+		user.positions[symbol] -= quantity
+	return "sell_share", response
+
+async def get_portfolio(facade, user, random, symbols):
+	return "get_portfolio", await facade.get_portfolio(user.token, user.account_id)
+
+async def get_transactions(facade, user, random, symbols):
+	return "get_transactions", await facade.get_transactions(user.token, user.account_id)
+
+async def get_leaderboard(facade, user, random, symbols):
+	return "get_leaderboard", await facade.get_leaderboard(user.token)
+
+async def delete_user(facade, user, random, symbols):
+	return "delete_user", await facade.delete_user(user.token)
+
+ACTIONS = {action.__name__: action for action in (authenticate_user, view_details, get_current_quotes,
+	buy_share, sell_share, get_portfolio, get_transactions, get_leaderboard)}
+
+SETUP_ACTIONS = (register_user, authenticate_user, view_details)
+
+MIXES = {
+	"default": {"view_details": 1, "get_current_quotes": 6, "buy_share": 2, "sell_share": 2,
+		"get_portfolio": 3, "get_transactions": 1, "get_leaderboard": 1, "authenticate_user": 1},
+	"trader": {"get_current_quotes": 4, "buy_share": 4, "sell_share": 4, "get_portfolio": 2, "get_transactions": 1},
+	"browser": {"view_details": 2, "get_current_quotes": 8, "get_portfolio": 2, "get_leaderboard": 3,
+		"authenticate_user": 1}
+}
+
+def parse_mix(text):
+	"""Reads a named mix or a weighted list such as get_current_quotes=5,buy_share=1"""
+	if text in MIXES:
+		return dict(MIXES[text])
+
+	mix = {}
+	for item in text.split(","):
+		name, separator, weight = item.strip().partition("=")
+		if name not in ACTIONS:
+			raise ValueError("Unknown action '{0}'; expected a mix ({1}) or actions from {2}.".format(
+				name, ", ".join(sorted(MIXES)), ", ".join(sorted(ACTIONS))))
+		try:
+			mix[name] = float(weight) if separator else 1.0
+		except ValueError:
+			raise ValueError("The weight of '{0}' is not a number.".format(name))
+		if mix[name] < 0:
+			raise ValueError("The weight of '{0}' cannot be negative.".format(name))
+
+	if sum(mix.values()) <= 0:
+		raise ValueError("The mix needs at least one action with a positive weight.")
+	return mix
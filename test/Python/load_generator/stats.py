@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import math
+from array import array
+
+PERCENTILES = (("p50", 50.0), ("p90", 90.0), ("p99", 99.0), ("p99.9", 99.9))
+
+def percentile(sorted_values, percent):
+	"""Nearest-rank percentile of an ascending sequence"""
+	if not sorted_values:
+		return None
+	# rounding first keeps e.g. 99.9% of 1000 values at rank 999 despite the binary fraction
+	rank = int(math.ceil(round(percent * len(sorted_values) / 100.0, 9)))
+	return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+class EndpointStats:
+	"""Latencies in seconds and error counts of one endpoint"""
+
+	def __init__(self, name):
+		self.name = name
+		self.latencies = array("d")
+		self.errors = collections.Counter()
+
+	def record(self, latency, error = None):
+		self.latencies.append(latency)
+		if error is not None:
+			self.errors[error] += 1
+
+	def summary(self, elapsed):
+		latencies = sorted(self.latencies)
+		count = len(latencies)
+		summary = {
+			"requests": count,
+			"errors": sum(self.errors.values()),
+			"throughput": count / elapsed if elapsed > 0 else None,
+			"mean": sum(latencies) / count if count else None,
+			"max": latencies[-1] if count else None
+		}
+		for name, percent in PERCENTILES:
+			summary[name] = percentile(latencies, percent)
+		summary["errorBreakdown"] = dict(self.errors.most_common())
+		return summary
+
+class PhaseStats:
+	"""Per-endpoint statistics of one phase of a run"""
+
+	def __init__(self, name):
+		self.name = name
+		self.endpoints = collections.OrderedDict()
+		self.elapsed = 0.0
+		self.dropped = 0
+
+	def record(self, endpoint, latency, error = None):
+		stats = self.endpoints.get(endpoint)
+		if stats is None:
+			stats = self.endpoints[endpoint] = EndpointStats(endpoint)
+		stats.record(latency, error)
+
+	def get_total(self):
+		total = EndpointStats("total")
+		for stats in self.endpoints.values():
+			total.latencies.extend(stats.latencies)
+			total.errors.update(stats.errors)
+		return total
+
+	def to_dict(self):
+		return {
+			"elapsed": self.elapsed,
+			"dropped": self.dropped,
+			"endpoints": {name: stats.summary(self.elapsed) for name, stats in self.endpoints.items()},
+			"total": self.get_total().summary(self.elapsed)
+		}
+
+def format_milliseconds(value):
+	return "-" if value is None else "{0:.1f}".format(value * 1000)
+
+def format_report(report):
+	"""Renders the dictionary of a load report as fixed-width text tables"""
+	columns = ["requests", "req/s", "errors", "mean"] + [name for name, percent in PERCENTILES] + ["max"]
+	lines = ["Mode: {0}, users: {1}, base URL: {2}".format(report["mode"], report["users"], report["baseUrl"])]
+
+	for phase_name, phase in report["phases"].items():
+		if not phase["endpoints"]:
+			continue
+		lines.append("")
+		title = "{0} ({1:.2f} s)".format(phase_name.capitalize(), phase["elapsed"])
+		if phase["dropped"]:
+			title += ", {0} arrivals dropped over the in-flight limit".format(phase["dropped"])
+		lines.append(title)
+		lines.append("{0:<24}".format("endpoint (ms)") + "".join("{0:>10}".format(column) for column in columns))
+
+		rows = list(phase["endpoints"].items()) + [("total", phase["total"])]
+		for name, summary in rows:
+			values = [str(summary["requests"]), "{0:.1f}".format(summary["throughput"] or 0), str(summary["errors"]),
+				format_milliseconds(summary["mean"])]
+			values += [format_milliseconds(summary[percentile_name]) for percentile_name, percent in PERCENTILES]
+			values.append(format_milliseconds(summary["max"]))
+			lines.append("{0:<24}".format(name) + "".join("{0:>10}".format(value) for value in values))
+
+		errors = [(name, error, count) for name, summary in rows[:-1]
+			for error, count in summary["errorBreakdown"].items()]
+		if errors:
+			lines.append("Errors:")
+			lines.extend("  {0:<22}{1:<28}{2:>8}".format(name, error, count) for name, error, count in errors)
+	return "\n".join(lines)
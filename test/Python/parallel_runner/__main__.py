@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import sys
+
+from .runner import (SUCCESS, FAILURE, ERROR, SKIPPED, EXPECTED_FAILURE, UNEXPECTED_SUCCESS, ParallelRunner,
+	discover, format_report, was_successful)
+
+PROGRESS_MARKS = {SUCCESS: ".", FAILURE: "F", ERROR: "E", SKIPPED: "s", EXPECTED_FAILURE: "x", UNEXPECTED_SUCCESS: "u"}
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m parallel_runner",
+		description = "Runs the discovered test cases, including every ddt data set, over a pool of worker processes.")
+	parser.add_argument("tests", nargs = "*", help = "test ids to run instead of discovering them, "
+		"e.g. test_user_registration or test_buy_share.BuyShareTestCase")
+	parser.add_argument("-j", "--workers", type = int, help = "worker processes (default: the number of cores)")
+	parser.add_argument("-s", "--start-directory", default = ".", help = "directory to start discovery")
+	parser.add_argument("-p", "--pattern", default = "test*.py", help = "pattern to match test files")
+	parser.add_argument("-t", "--top-level-directory", help = "top level directory of the project")
+	parser.add_argument("--batch-size", type = int, default = ParallelRunner.DEFAULT_BATCH_SIZE,
+		help = "cases of one class a worker takes at a time")
+	parser.add_argument("--no-buffer", action = "store_true",
+		help = "let the cases write to the console instead of keeping their output for the failures")
+	parser.add_argument("-v", "--verbose", action = "store_true", help = "print every case as it finishes")
+	parser.add_argument("--json", metavar = "PATH", help = "also write the merged results as JSON")
+	args = parser.parse_args(argv)
+
+	if args.tests:
+		tests = args.tests
+	else:
+		tests = discover(args.start_directory, args.pattern, args.top_level_directory)
+
+	def progress(record):
+		if args.verbose:
+			sys.stderr.write("{0} ... {1}\n".format(record["description"], record["outcome"]))
+		else:
+			sys.stderr.write(PROGRESS_MARKS[record["outcome"]])
+		sys.stderr.flush()
+
+	try:
+		runner = ParallelRunner(args.workers, batch_size = args.batch_size, buffer = not args.no_buffer,
+			progress = progress)
+	except ValueError as error:
+		parser.error(str(error))
+	report = runner.run(tests)
+
+	sys.stderr.write("\n")
+	sys.stderr.write(format_report(report) + "\n")
+	if args.json:
+		with open(args.json, "w") as report_file:
+			json.dump(report, report_file, indent = 2)
+	return 0 if was_successful(report) else 1
+
+if __name__ == "__main__":
+	sys.exit(main())
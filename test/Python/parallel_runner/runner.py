@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import queue
+import random
+import time
+import unittest
+
+from fixtures.user_pool import NAMESPACE_VARIABLE, close_user_pool
+
+SUCCESS = "ok"
+FAILURE = "FAIL"
+ERROR = "ERROR"
+SKIPPED = "skipped"
+EXPECTED_FAILURE = "expected failure"
+UNEXPECTED_SUCCESS = "unexpected success"
+
+NAMESPACE_CHARACTERS = "0123456789abcdefghijklmnopqrstuvwxyz"
+MAX_WORKERS = len(NAMESPACE_CHARACTERS) ** 2
+SEPARATOR = "-" * 70
+
+class RecordingResult(unittest.TestResult):
+	"""Keeps a picklable record of every outcome instead of the test objects"""
+
+	def __init__(self):
+		super().__init__()
+		self.records = []
+		self.started = None
+
+	def startTest(self, test):
+		super().startTest(test)
+		self.started = time.perf_counter()
+
+	def record(self, test, outcome, details = None):
+		duration = time.perf_counter() - self.started if self.started is not None else 0.0
+		self.records.append({"id": test.id(), "description": str(test), "outcome": outcome,
+			"details": details, "duration": duration})
+		self.started = None
+
+	def addSuccess(self, test):
+		super().addSuccess(test)
+		self.record(test, SUCCESS)
+
+	def addFailure(self, test, err):
+		super().addFailure(test, err)
+		self.record(test, FAILURE, self.failures[-1][1])
+
+	def addError(self, test, err):
+		super().addError(test, err)
+		self.record(test, ERROR, self.errors[-1][1])
+
+	def addSkip(self, test, reason):
+		super().addSkip(test, reason)
+		self.record(test, SKIPPED, reason)
+
+	def addExpectedFailure(self, test, err):
+		super().addExpectedFailure(test, err)
+		self.record(test, EXPECTED_FAILURE)
+
+	def addUnexpectedSuccess(self, test):
+		super().addUnexpectedSuccess(test)
+		self.record(test, UNEXPECTED_SUCCESS)
+
+def iter_cases(suite):
+	for test in suite:
+		if isinstance(test, unittest.TestSuite):
+			yield from iter_cases(test)
+		else:
+			yield test
+
+def discover(start_dir = ".", pattern = "test*.py", top_level_dir = None):
+	"""Lists the cases unittest would run, with every ddt data set as a separate case"""
+	return list(iter_cases(unittest.TestLoader().discover(start_dir, pattern, top_level_dir)))
+
+def make_batches(test_ids, batch_size):
+	"""Splits the cases into batches of consecutive cases from the same class, keeping the discovery order"""
+	batches = []
+	for test_id in test_ids:
+		class_name = test_id.rsplit(".", 1)[0]
+		if batches and len(batches[-1]) < batch_size and batches[-1][-1].rsplit(".", 1)[0] == class_name:
+			batches[-1].append(test_id)
+		else:
+			batches.append([test_id])
+	return batches
+
+def make_namespaces(workers, run_tag = None):
+	"""Gives every worker a namespace of the same length, unique within the run and very likely across runs"""
+	if not 1 <= workers <= MAX_WORKERS:
+		raise ValueError("workers must be between 1 and {0}".format(MAX_WORKERS))
+	if run_tag is None:
+		run_tag = "".join(random.choice(NAMESPACE_CHARACTERS) for _ in range(2))
+	base = len(NAMESPACE_CHARACTERS)
+	# the worker number comes last, as short values only keep the end of the namespace
+	return [run_tag + NAMESPACE_CHARACTERS[number // base] + NAMESPACE_CHARACTERS[number % base]
+		for number in range(workers)]
+
+def work(number, namespace, tasks, results, buffer):
+	"""Runs batches of cases in a worker process whose test users all carry the worker's namespace"""
+	os.environ[NAMESPACE_VARIABLE] = namespace
+	loader = unittest.TestLoader()
+	try:
+		for batch_number, test_ids in iter(tasks.get, None):
+			results.put(("started", number, batch_number, None))
+			result = RecordingResult()
+			result.buffer = buffer
+			try:
+				loader.loadTestsFromNames(test_ids).run(result)
+			except Exception as error:
+				result.records.extend({"id": test_id, "description": test_id, "outcome": ERROR,
+					"details": repr(error), "duration": 0.0} for test_id in test_ids)
+			results.put(("finished", number, batch_number, result.records))
+	finally:
+		# worker processes exit without running atexit handlers, so the pooled users are deleted here
+		close_user_pool()
+		results.put(("exited", number, None, None))
+
+class ParallelRunner:
+	"""Distributes test cases over worker processes, each with its own user namespace, and merges the results"""
+
+	DEFAULT_BATCH_SIZE = 4
+	POLL_INTERVAL = 1.0
+
+	def __init__(self, workers = None, batch_size = DEFAULT_BATCH_SIZE, buffer = True, run_tag = None, progress = None):
+		self.workers = workers or os.cpu_count() or 1
+		self.batch_size = batch_size
+		self.buffer = buffer
+		self.namespaces = make_namespaces(self.workers, run_tag)
+		self.progress = progress
+
+	def run(self, tests):
+		"""Runs test cases (or names of tests to load) and returns the report as a dictionary"""
+		started = time.perf_counter()
+		local_records = []
+		test_ids = []
+		for test in tests:
+			if isinstance(test, str):
+				test_ids.extend(case.id() for case in iter_cases(unittest.TestLoader().loadTestsFromName(test)))
+			elif type(test).__module__ == "unittest.loader":
+				# modules which failed to import cannot be loaded by name again, so their errors are reported here
+				result = RecordingResult()
+				test.run(result)
+				local_records.extend(result.records)
+			else:
+				test_ids.append(test.id())
+
+		batches = make_batches(test_ids, self.batch_size)
+		batch_records = self.run_batches(batches)
+		records = local_records + [record for number in range(len(batches)) for record in batch_records[number]]
+
+		counts = dict.fromkeys((SUCCESS, FAILURE, ERROR, SKIPPED, EXPECTED_FAILURE, UNEXPECTED_SUCCESS), 0)
+		for record in records:
+			counts[record["outcome"]] += 1
+		return {"workers": len(self.namespaces), "namespaces": self.namespaces,
+			"elapsed": time.perf_counter() - started, "tests": len(records), "counts": counts, "results": records}
+
+	def run_batches(self, batches):
+		context = multiprocessing.get_context("spawn")
+		tasks, results = context.Queue(), context.Queue()
+		for batch in enumerate(batches):
+			tasks.put(batch)
+		workers = min(len(self.namespaces), len(batches))
+		for _ in range(workers):
+			tasks.put(None)
+
+		# fresh interpreters, so the shared client and user pool of every worker are created inside it; not daemonic,
+		# as a worker running the runner's own tests starts workers of its own
+		processes = [context.Process(target = work, args = (number, self.namespaces[number], tasks, results,
+			self.buffer)) for number in range(workers)]
+		try:
+			for process in processes:
+				process.start()
+
+			batch_records = {}
+			running = {}
+			exited = set()
+			while len(exited) < workers:
+				try:
+					event, number, batch_number, records = results.get(timeout = self.POLL_INTERVAL)
+				except queue.Empty:
+					for number, process in enumerate(processes):
+						if number not in exited and not process.is_alive() and results.empty():
+							self.lose_batch(batches, batch_records, running.pop(number, None), process.exitcode)
+							exited.add(number)
+					continue
+
+				if event == "started":
+					running[number] = batch_number
+				elif event == "finished":
+					running.pop(number, None)
+					batch_records[batch_number] = records
+					if self.progress is not None:
+						for record in records:
+							self.progress(record)
+				else:
+					exited.add(number)
+
+			for process in processes:
+				process.join()
+		finally:
+			# workers are left running only when the run was interrupted
+			for process in processes:
+				if process.is_alive():
+					process.terminate()
+					process.join()
+		for batch_number in range(len(batches)):
+			# batches left over after every worker died
+			if batch_number not in batch_records:
+				self.lose_batch(batches, batch_records, batch_number, None)
+		return batch_records
+
+	def lose_batch(self, batches, batch_records, batch_number, exitcode):
+		if batch_number is None:
+			return
+		details = "The worker process exited with code {0} while running this case".format(exitcode)
+		records = [{"id": test_id, "description": test_id, "outcome": ERROR, "details": details, "duration": 0.0}
+			for test_id in batches[batch_number]]
+		batch_records[batch_number] = records
+		if self.progress is not None:
+			for record in records:
+				self.progress(record)
+
+def was_successful(report):
+	counts = report["counts"]
+	return counts[FAILURE] == 0 and counts[ERROR] == 0 and counts[UNEXPECTED_SUCCESS] == 0
+
+def format_report(report):
+	"""Renders a merged report the way unittest's text runner does"""
+	lines = []
+	for record in report["results"]:
+		if record["outcome"] in (FAILURE, ERROR):
+			lines += ["=" * 70, "{0}: {1}".format(record["outcome"], record["description"]), SEPARATOR,
+				record["details"].rstrip("\n"), ""]
+	lines.append(SEPARATOR)
+	lines.append("Ran {0} test{1} in {2:.3f}s on {3} worker{4}".format(report["tests"],
+		"" if report["tests"] == 1 else "s", report["elapsed"], report["workers"], "" if report["workers"] == 1 else "s"))
+	lines.append("")
+
+	counts = report["counts"]
+	details = ["{0}={1}".format(name, counts[outcome]) for name, outcome in (("failures", FAILURE),
+		("errors", ERROR), ("skipped", SKIPPED), ("expected failures", EXPECTED_FAILURE),
+		("unexpected successes", UNEXPECTED_SUCCESS)) if counts[outcome]]
+	status = "OK" if was_successful(report) else "FAILED"
+	lines.append("{0} ({1})".format(status, ", ".join(details)) if details else status)
+	return "\n".join(lines)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import asyncio
+import random
+import sys
+
+from api_client.async_api_facade import AsyncApiFacade
+from .provisioner import DEFAULT_SYMBOLS, DEFAULT_TRADES, PASSWORD, Checkpoint, Provisioner
+
+def parse_trades(text):
+	low, separator, high = text.partition("-")
+	low, high = int(low), int(high) if separator else int(low)
+	if low < 0 or high < low:
+		raise argparse.ArgumentTypeError("expected a number of orders or a range such as 5-30")
+	return [low, high]
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m provisioning",
+		description = "Registers and seeds many users with random trading histories, resuming from a checkpoint.")
+	parser.add_argument("checkpoint", help = "JSON-lines progress file, created if it does not exist")
+	parser.add_argument("--users", type = int, help = "seed users 0 to USERS - 1 (those already seeded are skipped)")
+	parser.add_argument("--clean-up", action = "store_true", help = "delete every user of the checkpoint instead")
+	parser.add_argument("--base-url", help = "defaults to INVESTOR_API_BASE_URL, then the hosted API")
+	parser.add_argument("--concurrency", type = int, default = Provisioner.DEFAULT_CONCURRENCY,
+		help = "users provisioned at the same time")
+	parser.add_argument("--trades", type = parse_trades, default = list(DEFAULT_TRADES),
+		help = "orders per user, e.g. 5-30 (new checkpoints only)")
+	parser.add_argument("--symbols", type = lambda text: text.upper().split(","), default = list(DEFAULT_SYMBOLS),
+		help = "comma-separated symbols to trade (new checkpoints only)")
+	parser.add_argument("--seed", type = int, help = "seed of the trading histories (new checkpoints only)")
+	parser.add_argument("--timeout", type = float, default = 60.0, help = "seconds before a request fails")
+	parser.add_argument("--retries", type = int, default = Provisioner.DEFAULT_RETRIES,
+		help = "retries of requests failing without a response")
+	args = parser.parse_args(argv)
+
+	if args.users is None and not args.clean_up:
+		parser.error("either --users or --clean-up is required")
+
+	settings = {"namespace": "{0:06x}".format(random.getrandbits(24)), "password": PASSWORD,
+		"seed": args.seed if args.seed is not None else random.getrandbits(32), "trades": args.trades,
+		"symbols": args.symbols}
+	try:
+		checkpoint = Checkpoint.open(args.checkpoint, settings)
+	except (OSError, ValueError) as error:
+		parser.error(str(error))
+
+	def progress(done, elapsed):
+		if done % 1000 == 0:
+			print("{0} users in {1:.0f} s ({2:.0f}/s)".format(done, elapsed, done / elapsed), file = sys.stderr,
+				flush = True)
+
+	async def run(provisioner):
+		async with provisioner.facade:
+			if args.clean_up:
+				return await provisioner.clean_up()
+			return await provisioner.provision(args.users)
+
+	with checkpoint:
+		if checkpoint.stages:
+			print("Resuming {0}: {1} users recorded".format(args.checkpoint, len(checkpoint.stages)), file = sys.stderr)
+		facade = AsyncApiFacade(args.base_url, limit = args.concurrency, timeout = args.timeout)
+		provisioner = Provisioner(facade, checkpoint, args.concurrency, args.retries, progress)
+		elapsed = asyncio.run(run(provisioner))
+
+	counts = provisioner.counts
+	if args.clean_up:
+		print("Deleted {0} users in {1:.1f} s".format(counts["deleted"], elapsed))
+	else:
+		print("Seeded {0} users ({1} resumed) with {2} orders ({3} failed) in {4:.1f} s, {5} requests".format(
+			counts["seeded"], counts["resumed"], counts["orders"], counts["failed orders"], elapsed, counts["requests"]))
+	if provisioner.errors:
+		print("{0} users failed and are left for the next run:".format(sum(provisioner.errors.values())))
+		for error, count in provisioner.errors.most_common():
+			print("  {0:<60}{1:>8}".format(error, count))
+		return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import collections
+import json
+import os
+import random
+import time
+
+import aiohttp
+
+CHECKPOINT_FORMAT = "InvestorAPI provisioning 1"
+PASSWORD = "Seed7est!"
+DEFAULT_SYMBOLS = ("BHP", "CBA", "TLS", "WOW", "ANZ", "NAB", "WBC", "CSL", "WES", "RIO", "QBE", "AMP", "ORG", "WPL",
+	"SUN", "TCL", "GMG", "SCG", "NCM", "FMG")
+DEFAULT_TRADES = (5, 30)
+SELL_PROBABILITY = 0.35
+MAX_QUANTITY = 300
+
+SEEDED = "seeded"
+FAILED = "failed"
+DELETED = "deleted"
+
+# connection failures and timeouts, which are retried; responses with an error status are not
+TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+def make_history(generator, symbols, trades = DEFAULT_TRADES):
+	"""Returns (side, symbol, quantity) orders: buys of log-uniform sizes, and sells of part of what was bought"""
+	held = {}
+	orders = []
+	for _ in range(generator.randint(*trades)):
+		if held and generator.random() < SELL_PROBABILITY:
+			symbol = generator.choice(sorted(held))
+			quantity = generator.randint(1, held[symbol])
+			held[symbol] -= quantity
+			if not held[symbol]:
+				del held[symbol]
+			orders.append(("Sell", symbol, quantity))
+		else:
+			symbol = generator.choice(symbols)
+			quantity = max(1, int(MAX_QUANTITY ** generator.random()))
+			held[symbol] = held.get(symbol, 0) + quantity
+			orders.append(("Buy", symbol, quantity))
+	return orders
+
+class Checkpoint:
+	"""Progress of a provisioning run, appended as JSON lines so an interrupted run can resume where it stopped
+
+	The first line holds the settings of the run, later lines the stage each user reached and the user counts asked
+	for. A line torn by the interruption is ignored.
+	"""
+
+	def __init__(self, path, settings):
+		self.path = path
+		self.settings = settings
+		self.stages = {}
+		self.count = 0
+		self.file = None
+
+	@classmethod
+	def open(cls, path, settings):
+		"""Opens the checkpoint at path, or starts one with settings if there is none; its own settings win"""
+		if os.path.exists(path) and os.path.getsize(path):
+			checkpoint = cls.load(path)
+			cls.drop_torn_line(path)
+		else:
+			checkpoint = cls(path, dict(settings, format = CHECKPOINT_FORMAT))
+			with open(path, "w") as checkpoint_file:
+				checkpoint_file.write(json.dumps(checkpoint.settings) + "\n")
+		checkpoint.file = open(path, "a")
+		return checkpoint
+
+	@classmethod
+	def load(cls, path):
+		with open(path) as checkpoint_file:
+			settings = json.loads(checkpoint_file.readline())
+			if settings.get("format") != CHECKPOINT_FORMAT:
+				raise ValueError("{0} is not a provisioning checkpoint".format(path))
+			checkpoint = cls(path, settings)
+			for line in checkpoint_file:
+				try:
+					record = json.loads(line)
+				except ValueError:
+					continue
+				if "count" in record:
+					checkpoint.count = max(checkpoint.count, record["count"])
+				else:
+					checkpoint.stages[record["user"]] = record["stage"]
+		return checkpoint
+
+	@staticmethod
+	def drop_torn_line(path):
+		"""Cuts off a last line without its newline, which later lines would otherwise be appended to"""
+		with open(path, "rb+") as checkpoint_file:
+			content = checkpoint_file.read()
+			if not content.endswith(b"\n"):
+				checkpoint_file.truncate(content.rfind(b"\n") + 1)
+
+	def write(self, record):
+		self.file.write(json.dumps(record) + "\n")
+		# flushed per line, so an interruption loses at most the users in flight
+		self.file.flush()
+
+	def record_count(self, count):
+		if count > self.count:
+			self.count = count
+			self.write({"count": count})
+
+	def record(self, number, stage, **details):
+		self.stages[number] = stage
+		self.write(dict(details, user = number, stage = stage))
+
+	def close(self):
+		if self.file is not None:
+			self.file.close()
+			self.file = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+class Provisioner:
+	"""Registers, authenticates and seeds numbered users with random trading histories, and deletes them again
+
+	User n of a checkpoint always gets the same name, email and history, so a resumed run carries on with the users
+	the interrupted one had not finished. A user found already registered had its history cut short, so its account
+	is reset and seeded again.
+	"""
+
+	DEFAULT_CONCURRENCY = 100
+	DEFAULT_RETRIES = 2
+
+	def __init__(self, facade, checkpoint, concurrency = DEFAULT_CONCURRENCY, retries = DEFAULT_RETRIES,
+		progress = None):
+		self.facade = facade
+		self.checkpoint = checkpoint
+		self.namespace = checkpoint.settings["namespace"]
+		self.password = checkpoint.settings.get("password", PASSWORD)
+		self.seed = checkpoint.settings.get("seed")
+		self.trades = tuple(checkpoint.settings.get("trades", DEFAULT_TRADES))
+		self.symbols = list(checkpoint.settings.get("symbols", DEFAULT_SYMBOLS))
+		self.concurrency = concurrency
+		self.retries = retries
+		self.progress = progress
+		self.counts = collections.Counter()
+		self.errors = collections.Counter()
+
+	def get_credentials(self, number):
+		return ("Seed{0}{1}".format(self.namespace, number), "seed.{0}.{1}@test.com".format(self.namespace, number))
+
+	def get_history(self, number):
+		return make_history(random.Random("{0}:{1}:{2}".format(self.namespace, self.seed, number)), self.symbols,
+			self.trades)
+
+	async def call(self, operation, *args):
+		for attempt in range(self.retries + 1):
+			self.counts["requests"] += 1
+			try:
+				return await operation(*args)
+			except TRANSIENT_ERRORS:
+				if attempt == self.retries:
+					raise
+				self.counts["retries"] += 1
+				await asyncio.sleep(0.1 * 2 ** attempt)
+
+	async def authenticate(self, email):
+		"""Returns the token of a user, or None if the user is not registered"""
+		response = await self.call(self.facade.authenticate_user, email, self.password)
+		if response.get_http_status() != response.SUCCESS_STATUS:
+			return None
+		return response.get_token()
+
+	async def seed_user(self, number):
+		display_name, email = self.get_credentials(number)
+		registration = await self.call(self.facade.register_user, display_name, email, self.password)
+		token = await self.authenticate(email)
+		if token is None:
+			raise RuntimeError("Could not register user {0}: HTTP {1}".format(number,
+				registration.get_http_status()))
+		details = await self.call(self.facade.view_details, token)
+		account_id = details.get_main_account_id()
+
+		if registration.get_http_status() != registration.SUCCESS_STATUS:
+			# registered by an interrupted run, which may have placed some of the orders
+			reset = await self.call(self.facade.reset_account, token, account_id)
+			self.counts["resumed"] += 1
+			if reset.get_http_status() != reset.SUCCESS_STATUS:
+				raise RuntimeError("Could not reset the account of user {0}: HTTP {1}".format(number,
+					reset.get_http_status()))
+
+		orders = self.get_history(number)
+		failed = 0
+		# accounts start over at nonce 0 when they are opened or reset
+		for nonce, (side, symbol, quantity) in enumerate(orders, 1):
+			place_order = self.facade.buy_share if side == "Buy" else self.facade.sell_share
+			response = await self.call(place_order, token, account_id, symbol, quantity, nonce)
+			if response.get_http_status() != response.SUCCESS_STATUS:
+				failed += 1
+		self.counts["orders"] += len(orders)
+		self.counts["failed orders"] += failed
+		self.checkpoint.record(number, SEEDED, orders = len(orders), failed = failed)
+		self.counts[SEEDED] += 1
+
+	async def delete_user(self, number):
+		display_name, email = self.get_credentials(number)
+		token = await self.authenticate(email)
+		if token is not None:
+			response = await self.call(self.facade.delete_user, token)
+			if response.get_http_status() != response.SUCCESS_STATUS:
+				raise RuntimeError("Could not delete user {0}: HTTP {1}".format(number, response.get_http_status()))
+			self.counts[DELETED] += 1
+		self.checkpoint.record(number, DELETED)
+
+	async def run(self, work, numbers):
+		"""Runs work(number) for every number from concurrency workers, recording the users which failed"""
+		numbers = iter(numbers)
+		done = 0
+		started = time.perf_counter()
+
+		async def worker():
+			nonlocal done
+			for number in numbers:
+				try:
+					await work(number)
+				except Exception as error:
+					self.checkpoint.record(number, FAILED, error = str(error) or type(error).__name__)
+					self.errors[str(error) if isinstance(error, RuntimeError) else type(error).__name__] += 1
+				done += 1
+				if self.progress is not None:
+					self.progress(done, time.perf_counter() - started)
+
+		await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+		return time.perf_counter() - started
+
+	async def provision(self, count):
+		"""Seeds users 0 to count - 1 which are not seeded yet and returns the seconds it took"""
+		self.checkpoint.record_count(count)
+		stages = self.checkpoint.stages
+		return await self.run(self.seed_user, [number for number in range(count) if stages.get(number) != SEEDED])
+
+	async def clean_up(self):
+		"""Deletes every user the checkpoint asked for which is not deleted yet, including unfinished ones"""
+		stages = self.checkpoint.stages
+		return await self.run(self.delete_user, [number for number in range(self.checkpoint.count)
+			if stages.get(number) != DELETED])
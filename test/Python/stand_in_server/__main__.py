@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import subprocess
+import sys
+
+from api_client.config import BASE_URL_VARIABLE
+from .services import InvestorService
+from .server import StandInServer
+from .synthetic_market import SyntheticMarketData
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m stand_in_server",
+		description = "Runs a local stand-in for the InvestorAPI, optionally only for the duration of a command.")
+	parser.add_argument("--host", default = "127.0.0.1")
+	parser.add_argument("--port", type = int, default = 5000, help = "0 picks a free port")
+	parser.add_argument("--strict-passwords", action = "store_true",
+		help = "require a digit, a lower case, an upper case and a special character like the API")
+	parser.add_argument("--leaderboard-interval", type = float, default = InvestorService.DEFAULT_LEADERBOARD_INTERVAL,
+		help = "seconds between leader board recalculations")
+	parser.add_argument("--seed", type = int,
+		help = "serve seeded synthetic market data (see stand_in_server.synthetic_market) instead of the default")
+	parser.add_argument("--verbose", action = "store_true", help = "log every request")
+	parser.add_argument("command", nargs = argparse.REMAINDER,
+		help = "command to run with {0} pointing at the server, e.g. -- python -m unittest discover"
+			.format(BASE_URL_VARIABLE))
+	args = parser.parse_args(argv)
+
+	market_data = None if args.seed is None else SyntheticMarketData(seed = args.seed)
+	server = StandInServer(args.host, args.port, market_data, verbose = args.verbose,
+		strict_passwords = args.strict_passwords, leaderboard_interval = args.leaderboard_interval)
+
+	command = args.command[1:] if args.command[:1] == ["--"] else args.command
+	if command:
+		with server:
+			environment = dict(os.environ)
+			environment[BASE_URL_VARIABLE] = server.base_url
+			return subprocess.call(command, env = environment)
+
+	server.bind()
+	print("Serving the InvestorAPI stand-in at {0}".format(server.base_url), flush = True)
+	try:
+		server.httpd.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.httpd.server_close()
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
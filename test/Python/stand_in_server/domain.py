@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+import datetime
+import decimal
+import hashlib
+import itertools
+import re
+import uuid
+
+INITIAL_BALANCE = decimal.Decimal(1000000)
+DEFAULT_WATCHLIST_SYMBOLS = ("BHP", "CBA", "TLS", "WOW")
+
+class ValidationError(Exception):
+	"""Request failed validation; reported as HTTP 400"""
+
+class InvalidTradeError(Exception):
+	"""Order cannot be executed; reported as HTTP 400"""
+
+class EntityNotFoundError(Exception):
+	"""Entity does not exist or belongs to another user; reported as HTTP 404"""
+
+	@classmethod
+	def for_entity(cls, entity_name, entity_id):
+		return cls("{0} with id '{1}' does not exists.".format(entity_name, entity_id))
+
+class UniqueConstraintError(Exception):
+	"""Write would violate a unique index of the database; reported as HTTP 500"""
+
+CommissionRange = collections.namedtuple("CommissionRange", ["min", "max", "value"])
+Commissions = collections.namedtuple("Commissions", ["fixed", "percentage"])
+
+DEFAULT_BUY_COMMISSIONS = Commissions(
+	fixed = [CommissionRange(decimal.Decimal(0), decimal.Decimal(100000000), decimal.Decimal(50))],
+	percentage = [CommissionRange(decimal.Decimal(0), decimal.Decimal(100000000), decimal.Decimal(1))])
+
+DEFAULT_SELL_COMMISSIONS = Commissions(
+	fixed = [CommissionRange(decimal.Decimal(0), decimal.Decimal(100000000), decimal.Decimal(50))],
+	percentage = [CommissionRange(decimal.Decimal(0), decimal.Decimal(100000000), decimal.Decimal("0.25"))])
+
+def minimum_step_size(price):
+	if price <= decimal.Decimal("0.10"):
+		return decimal.Decimal("0.001")
+	if price <= decimal.Decimal("2.00"):
+		return decimal.Decimal("0.005")
+	return decimal.Decimal("0.01")
+
+def number_of_decimals(price):
+	if price <= decimal.Decimal("2.00"):
+		return 3
+	return 2
+
+def round_decimal(value, decimals):
+	# Math.Round in .NET rounds half to even by default
+	return value.quantize(decimal.Decimal(1).scaleb(-decimals), rounding = decimal.ROUND_HALF_EVEN)
+
+def format_number(value, decimals):
+	"""Formats like the .NET N format specifier"""
+	return "{0:,.{1}f}".format(value, decimals)
+
+def get_commission(commission_ranges, amount):
+	for commission_range in commission_ranges:
+		if commission_range.min <= amount <= commission_range.max:
+			return commission_range.value
+
+	maximum = max(commission_range.max for commission_range in commission_ranges)
+	if amount > maximum:
+		raise InvalidTradeError("The amount exceeds the permitted maximum of ${0}.".format(format_number(maximum, 2)))
+	raise InvalidTradeError("No commission range found for amount ${0}.".format(format_number(amount, 2)))
+
+def gravatar_url(email):
+	digest = hashlib.md5(email.lower().encode("utf-8")).hexdigest()
+	return "http://www.gravatar.com/avatar/{0}.jpg?d=identicon".format(digest)
+
+def hash_password(password, salt = None):
+	if salt is None:
+		salt = uuid.uuid4().hex
+	return salt + "$" + hashlib.sha256((salt + password).encode("utf-8")).hexdigest()
+
+def verify_password(password, hashed_password):
+	salt = hashed_password.split("$", 1)[0]
+	return hash_password(password, salt) == hashed_password
+
+def check_password_strength(password, numeric = 1, lower_case = 1, upper_case = 1, special = 1):
+	numeric_matches = len(re.findall("[0-9]", password))
+	lower_case_matches = len(re.findall("[a-z]", password))
+	upper_case_matches = len(re.findall("[A-Z]", password))
+	special_matches = len(password) - numeric_matches - lower_case_matches - upper_case_matches
+
+	if (numeric_matches < numeric or lower_case_matches < lower_case or
+		upper_case_matches < upper_case or special_matches < special):
+		raise ValidationError("The password must have at least {0} numeric, {1} lower case, "
+			"{2} upper case, and {3} special character(s).".format(numeric, lower_case, upper_case, special))
+
+class User:
+	def __init__(self, display_name, email, hashed_password, level = "Investor"):
+		self.id = uuid.uuid4()
+		self.display_name = display_name
+		self.email = email
+		self.hashed_password = hashed_password
+		self.level = level
+		self.account_ids = []
+		self.watchlist_ids = []
+
+	@property
+	def gravatar_url(self):
+		return gravatar_url(self.email)
+
+class Position:
+	def __init__(self, symbol, quantity, price, brokerage_fees):
+		self.symbol = symbol
+		self.quantity = quantity
+		self.average_price = (quantity * price + brokerage_fees) / quantity
+
+	def buy(self, additional_quantity, price, brokerage_fees):
+		total = self.quantity * self.average_price + additional_quantity * price + brokerage_fees
+		self.average_price = total / (self.quantity + additional_quantity)
+		self.quantity += additional_quantity
+
+	def sell(self, quantity):
+		self.quantity -= quantity
+
+Transaction = collections.namedtuple("Transaction",
+	["sequence", "timestamp_utc", "type", "description", "amount", "balance"])
+
+class Account:
+	"""Mirrors the trading rules of the Account entity of the API"""
+
+	# orders transactions written within the same clock tick
+	_sequence = itertools.count()
+
+	def __init__(self, user_id, name, initial_balance = INITIAL_BALANCE):
+		self.id = uuid.uuid4()
+		self.user_id = user_id
+		self.name = name
+		self.reset(initial_balance, "Account opened")
+
+	def reset(self, initial_balance, transaction_name):
+		self.last_nonce = 0
+		self.positions = collections.OrderedDict()
+		self.transactions = []
+		self.add_transaction("Transfer", transaction_name, initial_balance, initial_balance)
+		self.balance = initial_balance
+
+	def add_transaction(self, transaction_type, description, amount, balance):
+		self.transactions.append(Transaction(next(self._sequence), datetime.datetime.utcnow(),
+			transaction_type, description, amount, balance))
+
+	def check_nonce(self, nonce):
+		# the nonce is only taken once the order trades, as AccountService saves the account only then
+		if nonce <= self.last_nonce:
+			raise InvalidTradeError("The nonce value is invalid. It might indicate a duplicate order.")
+
+	def buy_shares(self, symbol, quantity, price, commissions, nonce):
+		self.check_nonce(nonce)
+
+		amount = quantity * price
+		fixed_commission_amount = get_commission(commissions.fixed, amount)
+		percentage_commission = get_commission(commissions.percentage, amount)
+		percentage_commission_amount = amount * percentage_commission / 100
+		total_fees = percentage_commission_amount + fixed_commission_amount
+		total_amount = amount + total_fees
+
+		if total_amount > self.balance:
+			raise InvalidTradeError("The total amount of the transaction exceeds the current account balance by ${0}."
+				.format(format_number(total_amount - self.balance, 2)))
+
+		position = self.positions.get(symbol)
+		if position is not None:
+			position.buy(quantity, price, total_fees)
+		else:
+			self.positions[symbol] = Position(symbol, quantity, price, total_fees)
+
+		self.balance -= amount
+		self.add_transaction("Buy", "Purchased {0} shares of {1} for ${2} each"
+			.format(quantity, symbol, format_number(price, 3)), -amount, self.balance)
+		self.balance -= percentage_commission_amount
+		self.add_transaction("Commission", "Commission {0}%".format(format_number(percentage_commission, 2)),
+			-percentage_commission_amount, self.balance)
+		self.balance -= fixed_commission_amount
+		self.add_transaction("Commission", "Commission", -fixed_commission_amount, self.balance)
+		self.last_nonce = nonce
+
+	def sell_shares(self, symbol, quantity, price, commissions, nonce):
+		self.check_nonce(nonce)
+
+		amount = quantity * price
+		fixed_commission_amount = get_commission(commissions.fixed, amount)
+		percentage_commission = get_commission(commissions.percentage, amount)
+		percentage_commission_amount = amount * percentage_commission / 100
+		total_fees = percentage_commission_amount + fixed_commission_amount
+		total_amount = total_fees - amount
+
+		if total_amount > self.balance:
+			raise InvalidTradeError("The total amount of the transction exceeds the current account balance by ${0}."
+				.format(format_number(total_amount - self.balance, 2)))
+
+		position = self.positions.get(symbol)
+		if position is None or position.quantity < quantity:
+			raise InvalidTradeError("You cannot sell {0} shares of {1} because the current position is only {2}."
+				.format(quantity, symbol, 0 if position is None else position.quantity))
+
+		position.sell(quantity)
+		if position.quantity == 0:
+			del self.positions[symbol]
+
+		self.balance += amount
+		self.add_transaction("Sell", "Sold {0} shares of {1} for ${2} each"
+			.format(quantity, symbol, format_number(price, 3)), amount, self.balance)
+		self.balance -= percentage_commission_amount
+		self.add_transaction("Commission", "Commission {0}%".format(format_number(percentage_commission, 2)),
+			-percentage_commission_amount, self.balance)
+		self.balance -= fixed_commission_amount
+		self.add_transaction("Commission", "Commission", -fixed_commission_amount, self.balance)
+		self.last_nonce = nonce
+
+class Watchlist:
+	def __init__(self, user_id, name, symbols):
+		self.id = uuid.uuid4()
+		self.user_id = user_id
+		self.name = name
+		self.symbols = list(symbols)
+
+	def add_share(self, symbol):
+		if symbol not in self.symbols:
+			self.symbols.append(symbol)
+
+	def remove_share(self, symbol):
+		if symbol in self.symbols:
+			self.symbols.remove(symbol)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import functools
+
+try:
+	from zoneinfo import ZoneInfo
+	TIME_ZONE = ZoneInfo("Australia/Sydney")
+except Exception:
+	# no tz database available; ignore daylight saving rather than fail
+	TIME_ZONE = datetime.timezone(datetime.timedelta(hours = 10), "AEST")
+
+OPENING_TIME = datetime.time(10, 0)
+CLOSING_TIME = datetime.time(16, 0)
+
+def easter_sunday(year):
+	g = year % 19
+	c = year // 100
+	h = (c - c // 4 - (8 * c + 13) // 25 + 19 * g + 15) % 30
+	i = h - (h // 28) * (1 - (h // 28) * (29 // (h + 1)) * ((21 - g) // 11))
+	day = i - ((year + year // 4 + i + 2 - c + c // 4) % 7) + 28
+	month = 3
+	if day > 31:
+		month += 1
+		day -= 31
+	return datetime.date(year, month, day)
+
+def skip_weekend(date):
+	while date.weekday() >= 5:
+		date += datetime.timedelta(days = 1)
+	return date
+
+def nearest_monday(date):
+	# Tuesday to Thursday go back, Friday to Sunday go forward
+	offsets = [0, -1, -2, -3, 3, 2, 1]
+	return date + datetime.timedelta(days = offsets[date.weekday()])
+
+def next_monday(date):
+	return date + datetime.timedelta(days = (7 - date.weekday()) % 7)
+
+@functools.lru_cache(maxsize = None)
+def public_holidays(year):
+	"""Returns the ASX public holidays of a year, as computed by AsxMarketInfoProvider"""
+	easter = easter_sunday(year)
+	christmas_day = skip_weekend(datetime.date(year, 12, 25))
+	boxing_day = skip_weekend(datetime.date(year, 12, 26))
+	if christmas_day == boxing_day:
+		boxing_day += datetime.timedelta(days = 1)
+
+	return frozenset([
+		skip_weekend(datetime.date(year, 1, 1)),
+		skip_weekend(datetime.date(year, 1, 26)),
+		easter - datetime.timedelta(days = 2),
+		easter,
+		easter + datetime.timedelta(days = 1),
+		skip_weekend(datetime.date(year, 4, 25)),
+		nearest_monday(datetime.date(year, 6, 9)),
+		next_monday(datetime.date(year, 10, 1)),
+		christmas_day,
+		boxing_day
+	])
+
+def is_trading_day(date):
+	return date.weekday() < 5 and date not in public_holidays(date.year)
+
+def previous_trading_day(date):
+	date -= datetime.timedelta(days = 1)
+	while not is_trading_day(date):
+		date -= datetime.timedelta(days = 1)
+	return date
+
+def next_trading_day(date):
+	date += datetime.timedelta(days = 1)
+	while not is_trading_day(date):
+		date += datetime.timedelta(days = 1)
+	return date
+
+def local_time(time = None):
+	if time is None:
+		time = datetime.datetime.now(datetime.timezone.utc)
+	return time.astimezone(TIME_ZONE)
+
+def opening_time(date):
+	return datetime.datetime.combine(date, OPENING_TIME, TIME_ZONE)
+
+def closing_time(date):
+	return datetime.datetime.combine(date, CLOSING_TIME, TIME_ZONE)
+
+def is_market_open(time = None):
+	time = local_time(time)
+	date = time.date()
+	return is_trading_day(date) and opening_time(date) < time <= closing_time(date)
+
+def get_market(time = None):
+	"""Returns the current time, whether the market is open and the time until the next open and close"""
+	time = local_time(time)
+	date = time.date()
+
+	opening_date = date
+	if not is_trading_day(date) or opening_time(date) < time:
+		opening_date = next_trading_day(date)
+
+	closing_date = date
+	if not is_trading_day(date) or closing_time(date) < time:
+		closing_date = next_trading_day(date)
+
+	return (time, is_market_open(time), opening_time(opening_date) - time,
+		closing_time(closing_date) - time)
+
+def session_dates(end_date, count):
+	"""Returns the last count trading days up to and including end_date, oldest first"""
+	dates = []
+	date = end_date if is_trading_day(end_date) else previous_trading_day(end_date)
+	while len(dates) < count:
+		dates.append(date)
+		date = previous_trading_day(date)
+	dates.reverse()
+	return dates
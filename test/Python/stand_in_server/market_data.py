@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import decimal
+import functools
+import hashlib
+import math
+import os
+
+from api_client.share_index import ShareIndex, read_share_files, read_shares
+
+from . import market_calendar
+from .domain import minimum_step_size, number_of_decimals, round_decimal
+
+SHARES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, os.pardir,
+	"src", "Providers", "InvestorApi.Asx", "Resources", "Shares.json")
+ASX_SYMBOLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+	"data", "current_quotes", "ASX_symbols.json")
+
+# default interval per range, as accepted by the SharesController
+INTERVALS = {
+	"1d": "2m",
+	"5d": "15m",
+	"1mo": "1h",
+	"3mo": "1d",
+	"6mo": "1d",
+	"ytd": "1d",
+	"1y": "1wk",
+	"2y": "1wk",
+	"5y": "1mo",
+	"10y": "1mo",
+	"max": "1mo"
+}
+
+RANGE_DAYS = {"1mo": 30, "3mo": 91, "6mo": 182, "1y": 365, "2y": 730, "5y": 1826, "10y": 3652, "max": 7305}
+INTRADAY_MINUTES = {"2m": 2, "15m": 15, "1h": 60}
+MAXIMUM_INTRADAY_SESSIONS = 60
+SESSION_MINUTES = 360
+PATH_STEP_MINUTES = 2
+
+def load_shares(path = None):
+	"""Loads the share universe; by default the server's Shares.json plus the ASX listing of the test data"""
+	if path is not None:
+		return read_shares(path)
+
+	# quotes come from Yahoo, which knows more symbols than the server's own share list
+	return read_share_files(path for path in (SHARES_FILE, ASX_SYMBOLS_FILE) if os.path.exists(path))
+
+def noise(*key):
+	"""Deterministic pseudo-random value in [-1, 1) for a key"""
+	digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size = 8).digest()
+	return int.from_bytes(digest, "little") / 2 ** 63 - 1
+
+def to_decimal(value, decimals):
+	return round_decimal(decimal.Decimal(repr(value)), decimals)
+
+class MarketData:
+	"""Deterministic synthetic quotes, prices, dividends and fundamentals for the ASX universe"""
+
+	def __init__(self, shares = None):
+		if shares is None:
+			shares = load_shares()
+		self.shares = shares
+		self.share_index = {symbol: (symbol, name, industry) for symbol, name, industry in shares}
+		self.search_index = None
+		self.get_close = functools.lru_cache(maxsize = 1 << 16)(self.get_close)
+		self.get_session_path = functools.lru_cache(maxsize = 1 << 12)(self.get_session_path)
+
+	def noise(self, *key):
+		return noise(*key)
+
+	def get_share_info(self, symbol):
+		return self.share_index.get(symbol)
+
+	def get_search_index(self):
+		# built on the first search, which most servers never get
+		if self.search_index is None:
+			self.search_index = ShareIndex(self.shares)
+		return self.search_index
+
+	def find_shares(self, search_term):
+		"""Returns exact symbol matches first, then shares whose name contains the term"""
+		return self.get_search_index().find_shares(search_term)
+
+	def get_base_price(self, symbol):
+		# log-uniform between 2 cents and 120 dollars
+		u = (noise(symbol, "base") + 1) / 2
+		return math.exp(math.log(0.02) + u * (math.log(120) - math.log(0.02)))
+
+	def get_close(self, symbol, date):
+		day = date.toordinal()
+		phase = noise(symbol, "phase") * math.pi
+		log_price = (math.log(self.get_base_price(symbol))
+			+ 0.25 * math.sin(2 * math.pi * day / 365.25 + phase)
+			+ 0.08 * math.sin(2 * math.pi * day / 29 + 2 * phase)
+			+ 0.015 * noise(symbol, day))
+		return math.exp(log_price)
+
+	def get_previous_close(self, symbol, date):
+		return self.get_close(symbol, market_calendar.previous_trading_day(date))
+
+	def get_day_range(self, symbol, date):
+		previous_close = self.get_previous_close(symbol, date)
+		close = self.get_close(symbol, date)
+		open_price = previous_close * (1 + 0.004 * noise(symbol, date.toordinal(), "open"))
+		spread = max(open_price, close) * 0.012 * abs(noise(symbol, date.toordinal(), "range"))
+		return (open_price, max(open_price, close) + spread, min(open_price, close) - spread, close)
+
+	def get_volume(self, symbol, *key):
+		average = 10 ** (4 + 3 * (self.noise(symbol, "volume") + 1) / 2)
+		return int(average * (1 + 0.5 * self.noise(symbol, *key)))
+
+	def get_session_path(self, symbol, date):
+		"""Prices every two minutes from the open to the close, kept within the day's range"""
+		open_price, high, low, close = self.get_day_range(symbol, date)
+		steps = SESSION_MINUTES // PATH_STEP_MINUTES
+		path = []
+		for step in range(steps + 1):
+			trend = open_price + (close - open_price) * step / steps
+			wobble = (high - low) * 0.5 * noise(symbol, date.toordinal(), step) * math.sin(math.pi * step / steps)
+			path.append(min(high, max(low, trend + wobble)))
+		return path
+
+	def get_quote_date(self, time):
+		"""Returns the trading day a quote is based on and the minutes traded so far"""
+		date = time.date()
+		if market_calendar.is_trading_day(date):
+			if time >= market_calendar.closing_time(date):
+				return (date, SESSION_MINUTES)
+			if time > market_calendar.opening_time(date):
+				minutes = (time - market_calendar.opening_time(date)).total_seconds() // 60
+				return (date, int(minutes))
+		return (market_calendar.previous_trading_day(date), SESSION_MINUTES)
+
+	def get_quote(self, symbol, time = None):
+		if symbol not in self.share_index:
+			return None
+
+		time = market_calendar.local_time(time)
+		date, minutes = self.get_quote_date(time)
+		path = self.get_session_path(symbol, date)[:minutes // PATH_STEP_MINUTES + 1]
+
+		previous_close = to_decimal(self.get_previous_close(symbol, date), 3)
+		decimals = number_of_decimals(previous_close)
+		last = to_decimal(path[-1], decimals)
+		change = round_decimal(last - previous_close, decimals)
+		change_percent = round_decimal(change / previous_close * 100, 2)
+		step = minimum_step_size(previous_close)
+
+		return {
+			"symbol": symbol,
+			"ask": last + step,
+			"bid": last - step,
+			"last": last,
+			"lastSize": self.get_volume(symbol, date.toordinal(), minutes) // 100,
+			"change": change,
+			"changePercent": change_percent,
+			"dayLow": to_decimal(min(path), decimals),
+			"dayHigh": to_decimal(max(path), decimals)
+		}
+
+	def get_quotes(self, symbols, time = None):
+		quotes = {}
+		for symbol in symbols:
+			quote = self.get_quote(symbol, time)
+			if quote is not None:
+				quotes[symbol] = quote
+		return quotes
+
+	def get_session_dates(self, date_range, end_time):
+		end_date = end_time.date()
+		if date_range == "1d":
+			return market_calendar.session_dates(end_date, 1)
+		if date_range == "5d":
+			return market_calendar.session_dates(end_date, 5)
+
+		if date_range == "ytd":
+			start_date = datetime.date(end_date.year, 1, 1)
+		else:
+			start_date = end_date - datetime.timedelta(days = RANGE_DAYS[date_range])
+
+		dates = []
+		date = start_date
+		while date <= end_date:
+			if market_calendar.is_trading_day(date):
+				dates.append(date)
+			date += datetime.timedelta(days = 1)
+		return dates
+
+	def get_price_history(self, symbol, end_time, date_range, interval):
+		"""Returns bars as dicts with the t, o, h, l, c and v keys of the Price model"""
+		if symbol not in self.share_index:
+			return None
+
+		end_time = market_calendar.local_time(end_time)
+		dates = self.get_session_dates(date_range, end_time)
+
+		if interval in INTRADAY_MINUTES:
+			return self.get_intraday_bars(symbol, dates[-MAXIMUM_INTRADAY_SESSIONS:],
+				INTRADAY_MINUTES[interval], end_time)
+
+		bars = [self.get_daily_bar(symbol, date) for date in dates]
+		if interval == "1wk":
+			return self.merge_bars(bars, lambda date: date.isocalendar()[:2])
+		if interval == "1mo":
+			return self.merge_bars(bars, lambda date: (date.year, date.month))
+		return [bar for date, bar in bars]
+
+	def get_intraday_bars(self, symbol, dates, minutes, end_time):
+		bars = []
+		for date in dates:
+			opening_time = market_calendar.opening_time(date)
+			path = self.get_session_path(symbol, date)
+			for start in range(0, SESSION_MINUTES, minutes):
+				timestamp = opening_time + datetime.timedelta(minutes = start)
+				if timestamp > end_time:
+					return bars
+				end = min(start + minutes, SESSION_MINUTES)
+				prices = path[start // PATH_STEP_MINUTES:end // PATH_STEP_MINUTES + 1]
+				bars.append(self.make_bar(timestamp, prices[0], max(prices), min(prices), prices[-1],
+					self.get_volume(symbol, date.toordinal(), start)))
+		return bars
+
+	def get_daily_bar(self, symbol, date):
+		open_price, high, low, close = self.get_day_range(symbol, date)
+		return (date, self.make_bar(market_calendar.opening_time(date), open_price, high, low, close,
+			self.get_volume(symbol, date.toordinal()) * 50))
+
+	def merge_bars(self, bars, period_of):
+		merged = []
+		previous_period = None
+		for date, bar in bars:
+			period = period_of(date)
+			if period != previous_period:
+				merged.append(dict(bar))
+				previous_period = period
+			else:
+				current = merged[-1]
+				current["h"] = max(current["h"], bar["h"])
+				current["l"] = min(current["l"], bar["l"])
+				current["c"] = bar["c"]
+				current["v"] += bar["v"]
+		return merged
+
+	@staticmethod
+	def make_bar(timestamp, open_price, high, low, close, volume):
+		return {
+			"t": timestamp.isoformat(),
+			"o": to_decimal(open_price, 3),
+			"h": to_decimal(high, 3),
+			"l": to_decimal(low, 3),
+			"c": to_decimal(close, 3),
+			"v": volume
+		}
+
+	def get_dividends(self, symbol, date_range, today = None):
+		if symbol not in self.share_index:
+			return None
+		if today is None:
+			today = market_calendar.local_time().date()
+
+		try:
+			years = int(date_range[:-1])
+		except ValueError:
+			years = 25
+
+		# roughly a third of the universe pays no dividends
+		if self.noise(symbol, "dividends") < -0.33:
+			return []
+
+		dividend_yield = 0.02 + 0.02 * (self.noise(symbol, "yield") + 1)
+		offset = int(20 * (self.noise(symbol, "offset") + 1))
+		dividends = []
+		for year in range(today.year - years, today.year + 1):
+			for month in (3, 9):
+				date = datetime.date(year, month, 1) + datetime.timedelta(days = offset)
+				if today.replace(year = today.year - years) <= date <= today:
+					value = self.get_close(symbol, date) * dividend_yield / 2
+					dividends.append({"date": date.isoformat(), "value": to_decimal(value, 3)})
+		return dividends
+
+	def get_fundamentals(self, symbol, today = None):
+		share = self.share_index.get(symbol)
+		if share is None:
+			return None
+		if today is None:
+			today = market_calendar.local_time().date()
+
+		date = today if market_calendar.is_trading_day(today) else market_calendar.previous_trading_day(today)
+		previous_close = self.get_previous_close(symbol, date)
+		closes = [self.get_close(symbol, date - datetime.timedelta(days = days)) for days in range(0, 365, 7)]
+		shares_outstanding = int(10 ** (7 + 2 * (self.noise(symbol, "shares") + 1)))
+		earnings_share = previous_close / (12 + 8 * (self.noise(symbol, "pe") + 1))
+		book_value = previous_close / (1 + 2 * (self.noise(symbol, "pb") + 1))
+
+		fundamentals = {
+			"symbol": share[0],
+			"name": share[1],
+			"industry": share[2],
+			"marketCap": int(previous_close * shares_outstanding),
+			"previousClose": to_decimal(previous_close, 3),
+			"bookValue": to_decimal(book_value, 3),
+			"priceBook": to_decimal(previous_close / book_value, 2),
+			"peRatio": to_decimal(previous_close / earnings_share, 2),
+			"earningsShare": to_decimal(earnings_share, 3),
+			"beta": to_decimal(1 + 0.6 * self.noise(symbol, "beta"), 2),
+			"change52Weeks": to_decimal(closes[0] / closes[-1] - 1, 4),
+			"low52Weeks": to_decimal(min(closes), 3),
+			"high52Weeks": to_decimal(max(closes), 3),
+			"movingAverage200Days": to_decimal(sum(closes[:29]) / 29, 3),
+			"movingAverage50Days": to_decimal(sum(closes[:8]) / 8, 3),
+			"averageDailyVolume": self.get_volume(symbol, "average") * 50
+		}
+
+		dividends = self.get_dividends(symbol, "1y", today)
+		if dividends:
+			fundamentals["exDividendDate"] = dividends[-1]["date"]
+
+		# the API omits null values
+		return {key: value for key, value in fundamentals.items() if value is not None}
@@ -0,0 +1,408 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import decimal
+import json
+import re
+import sys
+import threading
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from . import market_calendar, tokens, validation
+from .domain import EntityNotFoundError, InvalidTradeError, UniqueConstraintError, ValidationError
+from .market_data import INTERVALS, MarketData
+from .services import InvestorService, page_of
+
+API_PREFIX = "/api/1.0"
+GUID = r"(?P<{0}>[0-9A-Fa-f]{{8}}-[0-9A-Fa-f]{{4}}-[0-9A-Fa-f]{{4}}-[0-9A-Fa-f]{{4}}-[0-9A-Fa-f]{{12}})"
+SEGMENT = r"(?P<{0}>[^/]+)"
+
+# (method, path, handler, requires a token); ASP.NET matches routes case-insensitively
+ROUTES = [
+	("POST", "/token", "login", False),
+	("GET", "/users", "get_user", True),
+	("POST", "/users", "create_user", False),
+	("PUT", "/users", "edit_user", True),
+	("DELETE", "/users", "delete_user", True),
+	("GET", "/accounts/" + GUID.format("account_id"), "get_account_details", True),
+	("PUT", "/accounts/" + GUID.format("account_id"), "reset_account", True),
+	("GET", "/accounts/" + GUID.format("account_id") + "/transactions", "list_transactions", True),
+	("POST", "/accounts/" + GUID.format("account_id") + "/orders", "place_order", True),
+	("GET", "/commissions/buy", "get_buy_commissions", True),
+	("GET", "/commissions/sell", "get_sell_commissions", True),
+	("GET", "/leaderBoard", "get_leaderboard", True),
+	("GET", "/markets/" + SEGMENT.format("symbol"), "get_market", True),
+	("GET", "/shares", "find_shares", True),
+	("GET", "/shares/quotes", "get_quotes", True),
+	("GET", "/shares/" + SEGMENT.format("symbol") + "/prices", "get_prices", True),
+	("GET", "/shares/" + SEGMENT.format("symbol") + "/dividends", "get_dividends", True),
+	("GET", "/shares/" + SEGMENT.format("symbol") + "/fundamentals", "get_fundamentals", True),
+	("GET", "/watchlists/" + GUID.format("watchlist_id"), "get_watchlist_details", True),
+	("POST", "/watchlists/" + GUID.format("watchlist_id") + "/shares", "add_share", True),
+	("DELETE", "/watchlists/" + GUID.format("watchlist_id") + "/shares/" + SEGMENT.format("symbol"),
+		"remove_share", True)
+]
+
+INVALID_BODY = object()
+
+COMPILED_ROUTES = [(method, re.compile(re.escape(API_PREFIX) + path + "/?", re.IGNORECASE), handler, authorize)
+	for method, path, handler, authorize in ROUTES]
+
+class HttpError(Exception):
+	"""Ends a request with a status code and no body"""
+
+	def __init__(self, status):
+		super().__init__(status)
+		self.status = status
+
+def format_timespan(value):
+	"""Formats a timedelta like Json.NET serializes a TimeSpan"""
+	sign = "-" if value < datetime.timedelta(0) else ""
+	value = abs(value)
+	hours, remainder = divmod(value.seconds, 3600)
+	minutes, seconds = divmod(remainder, 60)
+	text = "{0:02d}:{1:02d}:{2:02d}".format(hours, minutes, seconds)
+	if value.days:
+		text = "{0}.{1}".format(value.days, text)
+	if value.microseconds:
+		text = "{0}.{1:06d}0".format(text, value.microseconds)
+	return sign + text
+
+def json_default(value):
+	if isinstance(value, decimal.Decimal):
+		# adding zero turns a negative zero into zero
+		return float(value) + 0.0
+	if isinstance(value, uuid.UUID):
+		return str(value)
+	raise TypeError("Object of type {0} is not JSON serializable".format(type(value).__name__))
+
+def require_min_length(name, value, min_length):
+	if len(value) < min_length:
+		raise ValidationError("The field {0} must be a string or array type with a minimum length of '{1}'."
+			.format(name, min_length))
+
+class RequestHandler(BaseHTTPRequestHandler):
+	"""Serves the InvestorAPI routes from the InvestorService of the server"""
+
+	protocol_version = "HTTP/1.1"
+	server_version = "InvestorApiStandIn/1.0"
+	disable_nagle_algorithm = True
+
+	def do_GET(self):
+		self.dispatch()
+
+	def do_POST(self):
+		self.dispatch()
+
+	def do_PUT(self):
+		self.dispatch()
+
+	def do_DELETE(self):
+		self.dispatch()
+
+	def log_message(self, format, *args):
+		if self.server.verbose:
+			super().log_message(format, *args)
+
+	def dispatch(self):
+		url = urlsplit(self.path)
+		self.query = dict(reversed(parse_qsl(url.query)))
+		self.body = self.read_body()
+
+		try:
+			handler, arguments = self.route(url.path)
+			if handler is None:
+				raise HttpError(404)
+			status, payload = handler(**arguments)
+			self.send_json(status, payload)
+		except HttpError as error:
+			self.send_json(error.status, None)
+		except (ValidationError, InvalidTradeError) as error:
+			self.send_json(400, {"message": str(error)})
+		except EntityNotFoundError as error:
+			self.send_json(404, {"message": str(error)})
+		except UniqueConstraintError as error:
+			self.send_json(500, {"message": str(error)})
+		except Exception:
+			traceback.print_exc(file = sys.stderr)
+			self.send_json(500, None)
+
+	def route(self, path):
+		method_allowed = False
+		for method, pattern, handler, authorize in COMPILED_ROUTES:
+			match = pattern.fullmatch(path)
+			if match is None:
+				continue
+			if method != self.command:
+				method_allowed = True
+				continue
+
+			arguments = {key: unquote(value) for key, value in match.groupdict().items()}
+			for key in ("account_id", "watchlist_id"):
+				if key in arguments:
+					arguments[key] = uuid.UUID(arguments[key])
+			if authorize:
+				arguments["user_id"] = self.authorize()
+			return (getattr(self, handler), arguments)
+
+		if method_allowed:
+			raise HttpError(405)
+		return (None, None)
+
+	def authorize(self):
+		header = self.headers.get("Authorization", "")
+		scheme, _, token = header.partition(" ")
+		claims = tokens.verify(token.strip()) if scheme.lower() == "bearer" else None
+		if claims is None:
+			raise HttpError(401)
+		try:
+			return uuid.UUID(claims["sub"])
+		except (KeyError, ValueError):
+			raise HttpError(401)
+
+	def read_body(self):
+		length = int(self.headers.get("Content-Length") or 0)
+		if length == 0:
+			return None
+		content = self.rfile.read(length)
+		try:
+			return json.loads(content.decode("utf-8-sig"))
+		except ValueError:
+			return INVALID_BODY
+
+	def model(self, fields):
+		if self.body is INVALID_BODY:
+			raise ValidationError("The request body is not valid JSON.")
+		return validation.validate_model(self.body, fields)
+
+	def send_json(self, status, payload):
+		if payload is None:
+			content = b""
+		else:
+			content = json.dumps(payload, default = json_default, ensure_ascii = False).encode("utf-8")
+
+		self.send_response(status)
+		if status == 401:
+			self.send_header("WWW-Authenticate", "Bearer")
+		if content:
+			self.send_header("Content-Type", "application/json; charset=utf-8")
+		self.send_header("Content-Length", str(len(content)))
+		self.end_headers()
+		if content:
+			self.wfile.write(content)
+
+	@property
+	def service(self):
+		return self.server.service
+
+	def login(self):
+		body = self.model(validation.LOGIN)
+		if len(body["password"]) < 8:
+			raise HttpError(401)
+		user = self.service.login(body["email"], body["password"])
+		if user is None:
+			raise HttpError(401)
+		access_token = tokens.issue(user.id, user.display_name, user.email, user.level == "Administrator")
+		return (200, {"accessToken": access_token, "expires": tokens.EXPIRATION})
+
+	def get_user(self, user_id):
+		user = self.service.get_user_info(user_id)
+		if user is None:
+			raise HttpError(404)
+		return (200, user)
+
+	def create_user(self):
+		body = self.model(validation.CREATE_USER)
+		self.service.register_user(body["displayName"], body["email"], body["password"])
+		return (201, None)
+
+	def edit_user(self, user_id):
+		body = self.model(validation.EDIT_USER)
+		self.service.edit_user(user_id, body["displayName"], body["email"])
+		return (204, None)
+
+	def delete_user(self, user_id):
+		self.service.delete_user(user_id)
+		return (204, None)
+
+	def get_account_details(self, user_id, account_id):
+		return (200, self.service.get_account_details(user_id, account_id))
+
+	def reset_account(self, user_id, account_id):
+		self.service.reset_account(user_id, account_id)
+		return (201, None)
+
+	def list_transactions(self, user_id, account_id):
+		page_number = validation.parse_int_query(self.query, "pageNumber", 1, 1000)
+		page_size = validation.parse_int_query(self.query, "pageSize", 1, 100)
+		start_date = validation.parse_date_query(self.query, "startDate")
+		end_date = validation.parse_date_query(self.query, "endDate")
+		return (200, self.service.list_transactions(user_id, account_id, start_date, end_date,
+			page_number or 1, page_size or 100))
+
+	def place_order(self, user_id, account_id):
+		order = self.model(validation.PLACE_ORDER)
+		if order["side"] not in ("Buy", "Sell"):
+			raise HttpError(400)
+		self.service.place_order(user_id, account_id, order["side"], order["symbol"], order["quantity"],
+			order["nonce"])
+		return (200, self.service.get_account_details(user_id, account_id))
+
+	@staticmethod
+	def get_commissions(commissions):
+		return {
+			"fixed": [commission_range._asdict() for commission_range in commissions.fixed],
+			"percentage": [commission_range._asdict() for commission_range in commissions.percentage]
+		}
+
+	def get_buy_commissions(self, user_id):
+		return (200, self.get_commissions(self.service.buy_commissions))
+
+	def get_sell_commissions(self, user_id):
+		return (200, self.get_commissions(self.service.sell_commissions))
+
+	def get_leaderboard(self, user_id):
+		page_number = validation.parse_int_query(self.query, "pageNumber", 1, 1000)
+		page_size = validation.parse_int_query(self.query, "pageSize", 1, 100)
+		return (200, self.service.get_leaderboard(user_id, page_number or 1, page_size or 100))
+
+	def get_market(self, user_id, symbol):
+		require_min_length("symbol", symbol, 3)
+		if symbol.upper() != "ASX":
+			raise HttpError(404)
+		current_time, is_open, time_until_next_open, time_until_next_close = market_calendar.get_market()
+		return (200, {
+			"currentTime": current_time.isoformat(),
+			"isOpen": is_open,
+			"timeUntilNextOpen": format_timespan(time_until_next_open),
+			"timeUntilNextClose": format_timespan(time_until_next_close)
+		})
+
+	def find_shares(self, user_id):
+		search_term = self.query.get("searchTerm")
+		if not search_term:
+			raise ValidationError("The searchTerm field is required.")
+		page_number = validation.parse_int_query(self.query, "pageNumber", 1, 1000)
+		page_size = validation.parse_int_query(self.query, "pageSize", 1, 100)
+
+		shares = [{"symbol": symbol, "name": name, "industry": industry}
+			for symbol, name, industry in self.server.market_data.find_shares(search_term)]
+		for share in shares:
+			if share["industry"] is None:
+				del share["industry"]
+		return (200, page_of(shares, page_number or 1, page_size or 100))
+
+	def get_quotes(self, user_id):
+		symbols = self.query.get("symbols")
+		if symbols is None:
+			raise ValidationError("The symbols field is required.")
+		require_min_length("symbols", symbols, 3)
+		items = [symbol.strip().upper() for symbol in re.split("[,;]", symbols) if symbol.strip()]
+		return (200, list(self.server.market_data.get_quotes(items).values()))
+
+	def get_prices(self, user_id, symbol):
+		require_min_length("symbol", symbol, 3)
+		date_range = self.query.get("range")
+		if not date_range:
+			raise ValidationError("The range field is required.")
+		if date_range not in INTERVALS:
+			raise ValidationError("Invalid range specified.")
+		interval = self.query.get("interval")
+		if interval is None:
+			interval = INTERVALS[date_range]
+		elif interval not in INTERVALS.values():
+			raise ValidationError("Invalid interval specified.")
+
+		end_time = validation.parse_date_query(self.query, "endTime")
+		if end_time is not None:
+			end_time = end_time.replace(tzinfo = datetime.timezone.utc)
+
+		prices = self.server.market_data.get_price_history(symbol.upper(), end_time, date_range, interval)
+		if prices is None:
+			raise HttpError(404)
+		return (200, {"range": date_range, "interval": interval, "prices": prices})
+
+	def get_dividends(self, user_id, symbol):
+		require_min_length("symbol", symbol, 3)
+		dividends = self.server.market_data.get_dividends(symbol.upper(), self.query.get("range") or "max")
+		if dividends is None:
+			raise HttpError(404)
+		return (200, dividends)
+
+	def get_fundamentals(self, user_id, symbol):
+		require_min_length("symbol", symbol, 3)
+		fundamentals = self.server.market_data.get_fundamentals(symbol.upper())
+		if fundamentals is None:
+			raise HttpError(404)
+		return (200, fundamentals)
+
+	def get_watchlist_details(self, user_id, watchlist_id):
+		return (200, self.service.get_watchlist_details(user_id, watchlist_id))
+
+	def add_share(self, user_id, watchlist_id):
+		body = self.model(validation.ADD_SHARE_TO_WATCHLIST)
+		self.service.add_share(user_id, watchlist_id, body["symbol"])
+		return (201, None)
+
+	def remove_share(self, user_id, watchlist_id, symbol):
+		self.service.remove_share(user_id, watchlist_id, symbol)
+		return (204, None)
+
+class StandInHTTPServer(ThreadingHTTPServer):
+	"""Threaded HTTP/1.1 server with a backlog sized for load tests"""
+
+	daemon_threads = True
+	request_queue_size = 1024
+
+	def __init__(self, server_address, service, market_data, verbose = False):
+		self.service = service
+		self.market_data = market_data
+		self.verbose = verbose
+		super().__init__(server_address, RequestHandler)
+
+class StandInServer:
+	"""Runs the stand-in InvestorAPI on a background thread, by default on a free local port"""
+
+	def __init__(self, host = "127.0.0.1", port = 0, market_data = None, verbose = False, **service_options):
+		if market_data is None:
+			market_data = MarketData()
+		self.host = host
+		self.port = port
+		self.market_data = market_data
+		self.service = InvestorService(market_data, **service_options)
+		self.verbose = verbose
+		self.httpd = None
+		self.thread = None
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, *args):
+		self.stop()
+
+	@property
+	def base_url(self):
+		return "http://{0}:{1}{2}".format(self.host, self.port, API_PREFIX)
+
+	def bind(self):
+		self.httpd = StandInHTTPServer((self.host, self.port), self.service, self.market_data, self.verbose)
+		self.port = self.httpd.server_address[1]
+
+	def start(self):
+		self.bind()
+		self.thread = threading.Thread(target = self.httpd.serve_forever, name = "stand-in-server", daemon = True)
+		self.thread.start()
+
+	def stop(self):
+		if self.httpd is not None:
+			self.httpd.shutdown()
+			self.httpd.server_close()
+			self.httpd = None
+		if self.thread is not None:
+			self.thread.join()
+			self.thread = None
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import threading
+import time
+
+from . import domain
+from .domain import EntityNotFoundError, UniqueConstraintError
+
+def list_result(items, page_number, page_size, total_row_count):
+	return {
+		"items": items,
+		"pageNumber": page_number,
+		"pageSize": page_size,
+		"totalPageCount": int(math.ceil(total_row_count / page_size)),
+		"totalRowCount": total_row_count
+	}
+
+def page_of(items, page_number, page_size):
+	start = (page_number - 1) * page_size
+	return list_result(items[start:start + page_size], page_number, page_size, len(items))
+
+class InvestorService:
+	"""In-memory users, accounts and watchlists behind the user, account, watchlist and leader board services"""
+
+	DEFAULT_LEADERBOARD_INTERVAL = 5.0
+
+	def __init__(self, market_data, strict_passwords = False, leaderboard_interval = DEFAULT_LEADERBOARD_INTERVAL,
+		buy_commissions = domain.DEFAULT_BUY_COMMISSIONS, sell_commissions = domain.DEFAULT_SELL_COMMISSIONS):
+		self.market_data = market_data
+		self.strict_passwords = strict_passwords
+		self.leaderboard_interval = leaderboard_interval
+		self.buy_commissions = buy_commissions
+		self.sell_commissions = sell_commissions
+
+		self.lock = threading.RLock()
+		self.users = {}
+		self.user_ids_by_email = {}
+		self.user_ids_by_display_name = {}
+		self.accounts = {}
+		self.watchlists = {}
+		self.leaderboard = []
+		self.leaderboard_time = None
+
+	def get_user(self, user_id):
+		user = self.users.get(user_id)
+		if user is None:
+			raise EntityNotFoundError.for_entity("User", user_id)
+		return user
+
+	def get_account(self, user_id, account_id):
+		account = self.accounts.get(account_id)
+		if account is None or account.user_id != user_id:
+			raise EntityNotFoundError.for_entity("Account", account_id)
+		return account
+
+	def get_watchlist(self, user_id, watchlist_id):
+		watchlist = self.watchlists.get(watchlist_id)
+		if watchlist is None or watchlist.user_id != user_id:
+			raise EntityNotFoundError.for_entity("Watchlist", watchlist_id)
+		return watchlist
+
+	def check_unique(self, display_name, email, user_id = None):
+		# the database enforces both indexes; the API surfaces violations as HTTP 500
+		if self.user_ids_by_email.get(email, user_id) != user_id:
+			raise UniqueConstraintError("duplicate key value violates unique constraint \"Users_Email_Unique\"")
+		if self.user_ids_by_display_name.get(display_name, user_id) != user_id:
+			raise UniqueConstraintError("duplicate key value violates unique constraint \"Users_DisplayName_Unique\"")
+
+	def register_user(self, display_name, email, password):
+		if self.strict_passwords:
+			domain.check_password_strength(password)
+		hashed_password = domain.hash_password(password)
+
+		with self.lock:
+			self.check_unique(display_name, email)
+			user = domain.User(display_name, email, hashed_password)
+			self.users[user.id] = user
+			self.user_ids_by_email[email] = user.id
+			self.user_ids_by_display_name[display_name] = user.id
+
+			account = domain.Account(user.id, "Default Account")
+			self.accounts[account.id] = account
+			user.account_ids.append(account.id)
+
+			watchlist = domain.Watchlist(user.id, "Default Watchlist", domain.DEFAULT_WATCHLIST_SYMBOLS)
+			self.watchlists[watchlist.id] = watchlist
+			user.watchlist_ids.append(watchlist.id)
+		return user.id
+
+	def login(self, email, password):
+		with self.lock:
+			user = self.users.get(self.user_ids_by_email.get(email))
+		if user is None or user.level == "Friend":
+			return None
+		if not domain.verify_password(password, user.hashed_password):
+			return None
+		return user
+
+	def get_user_info(self, user_id):
+		with self.lock:
+			user = self.users.get(user_id)
+			if user is None:
+				return None
+			return {
+				"id": user.id,
+				"email": user.email,
+				"displayName": user.display_name,
+				"gravatarUrl": user.gravatar_url,
+				"level": user.level,
+				"accounts": [self.get_account_info(self.accounts[account_id]) for account_id in user.account_ids],
+				"watchlists": [{"id": watchlist_id, "name": self.watchlists[watchlist_id].name}
+					for watchlist_id in user.watchlist_ids]
+			}
+
+	def edit_user(self, user_id, display_name, email):
+		with self.lock:
+			user = self.get_user(user_id)
+			display_name = user.display_name if display_name is None else display_name
+			email = user.email if email is None else email
+			if display_name.strip() == "" or email.strip() == "":
+				raise domain.ValidationError("The string value of '{0}' cannot be empty or contains only whitespace "
+					"characters.".format("displayName" if display_name.strip() == "" else "email"))
+
+			self.check_unique(display_name, email, user.id)
+			del self.user_ids_by_email[user.email]
+			del self.user_ids_by_display_name[user.display_name]
+			user.display_name = display_name
+			user.email = email
+			self.user_ids_by_email[email] = user.id
+			self.user_ids_by_display_name[display_name] = user.id
+
+	def delete_user(self, user_id):
+		with self.lock:
+			user = self.get_user(user_id)
+			del self.users[user.id]
+			del self.user_ids_by_email[user.email]
+			del self.user_ids_by_display_name[user.display_name]
+			for account_id in user.account_ids:
+				del self.accounts[account_id]
+			for watchlist_id in user.watchlist_ids:
+				del self.watchlists[watchlist_id]
+
+	@staticmethod
+	def get_account_info(account):
+		return {"id": account.id, "name": account.name, "balance": account.balance}
+
+	def get_account_details(self, user_id, account_id):
+		with self.lock:
+			account = self.get_account(user_id, account_id)
+			positions = [(position.symbol, position.quantity, position.average_price)
+				for position in account.positions.values()]
+			details = self.get_account_info(account)
+
+		quotes = self.market_data.get_quotes([symbol for symbol, quantity, average_price in positions])
+		details["positions"] = []
+		for symbol, quantity, average_price in positions:
+			share = self.market_data.get_share_info(symbol)
+			quote = quotes.get(symbol)
+			if share is None or quote is None:
+				continue
+			details["positions"].append({
+				"symbol": symbol,
+				"name": share[1],
+				"quantity": quantity,
+				"averagePrice": average_price,
+				"lastPrice": quote["last"],
+				"change": quote["change"],
+				"changePercent": quote["changePercent"]
+			})
+		return details
+
+	def reset_account(self, user_id, account_id):
+		with self.lock:
+			account = self.get_account(user_id, account_id)
+			account.reset(domain.INITIAL_BALANCE, "Account reset")
+
+	def list_transactions(self, user_id, account_id, start_date, end_date, page_number, page_size):
+		with self.lock:
+			account = self.get_account(user_id, account_id)
+			transactions = [transaction for transaction in account.transactions
+				if (start_date is None or transaction.timestamp_utc >= start_date)
+				and (end_date is None or transaction.timestamp_utc <= end_date)]
+
+		# newest first, as the repository orders by timestamp descending
+		transactions.reverse()
+		result = page_of(transactions, page_number, page_size)
+		result["items"] = [{
+			"timestampUtc": transaction.timestamp_utc.isoformat() + "Z",
+			"type": transaction.type,
+			"description": transaction.description,
+			"amount": transaction.amount,
+			"balance": transaction.balance
+		} for transaction in result["items"]]
+		return result
+
+	def place_order(self, user_id, account_id, side, symbol, quantity, nonce):
+		quote = self.market_data.get_quote(symbol.upper())
+		if quote is None:
+			raise EntityNotFoundError("Share with symbol '{0}' not found.".format(symbol))
+
+		with self.lock:
+			account = self.get_account(user_id, account_id)
+			if side == "Buy":
+				account.buy_shares(quote["symbol"], quantity, quote["ask"], self.buy_commissions, nonce)
+			else:
+				account.sell_shares(quote["symbol"], quantity, quote["bid"], self.sell_commissions, nonce)
+
+	def get_watchlist_details(self, user_id, watchlist_id):
+		with self.lock:
+			watchlist = self.get_watchlist(user_id, watchlist_id)
+			symbols = list(watchlist.symbols)
+			details = {"id": watchlist.id, "name": watchlist.name}
+
+		quotes = self.market_data.get_quotes(symbols)
+		details["shares"] = [{
+			"symbol": symbol,
+			"name": self.market_data.get_share_info(symbol)[1],
+			"lastPrice": quotes[symbol]["last"],
+			"change": quotes[symbol]["change"],
+			"changePercent": quotes[symbol]["changePercent"]
+		} for symbol in symbols if symbol in quotes]
+		return details
+
+	def add_share(self, user_id, watchlist_id, symbol):
+		with self.lock:
+			self.get_watchlist(user_id, watchlist_id).add_share(symbol)
+
+	def remove_share(self, user_id, watchlist_id, symbol):
+		with self.lock:
+			self.get_watchlist(user_id, watchlist_id).remove_share(symbol)
+
+	def load_leaderboard(self):
+		"""Recalculates the leader board, which the API does on a timer"""
+		with self.lock:
+			users = [(user.id, user.display_name, user.gravatar_url,
+				[(account.balance, [(position.symbol, position.quantity) for position in account.positions.values()])
+					for account in (self.accounts[account_id] for account_id in user.account_ids)])
+				for user in self.users.values()]
+
+		symbols = set(symbol for user in users for balance, positions in user[3] for symbol, quantity in positions)
+		quotes = self.market_data.get_quotes(symbols)
+
+		leaderboard = []
+		for user_id, display_name, gravatar_url, accounts in users:
+			total_account_value = max(balance + sum(quantity * quotes[symbol]["last"]
+				for symbol, quantity in positions if symbol in quotes) for balance, positions in accounts)
+			profit = total_account_value - domain.INITIAL_BALANCE
+			profit_percent = profit / domain.INITIAL_BALANCE * 100
+			leaderboard.append((user_id, display_name, gravatar_url, total_account_value, profit, profit_percent))
+
+		leaderboard.sort(key = lambda user: user[5], reverse = True)
+		self.leaderboard = leaderboard
+		self.leaderboard_time = time.monotonic()
+
+	def get_leaderboard(self, user_id, page_number, page_size):
+		if self.leaderboard_time is None or time.monotonic() - self.leaderboard_time >= self.leaderboard_interval:
+			self.load_leaderboard()
+
+		result = page_of(self.leaderboard, page_number, page_size)
+		rank = (page_number - 1) * page_size
+		items = []
+		for leaderboard_user_id, display_name, gravatar_url, total_account_value, profit, profit_percent in result["items"]:
+			rank += 1
+			items.append({
+				"rank": rank,
+				"isCurrentUser": leaderboard_user_id == user_id,
+				"displayName": display_name,
+				"gravatarUrl": gravatar_url,
+				"totalAccountValue": total_account_value,
+				"profit": profit,
+				"profitPercent": profit_percent
+			})
+		result["items"] = items
+		return result
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import collections
+import datetime
+import functools
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from api_client.price_store import BAR_DTYPE, HEADER, MAGIC, VERSION
+from . import market_calendar
+from .market_data import INTRADAY_MINUTES, PATH_STEP_MINUTES, SESSION_MINUTES, MarketData, load_shares, noise
+
+# the series of every symbol starts here, so a day's prices do not depend on the range asked for
+EPOCH = datetime.date(1990, 1, 2)
+TRADING_DAYS_PER_YEAR = 252
+STEPS = SESSION_MINUTES // PATH_STEP_MINUTES
+# share of the daily variance which comes from the market as a whole
+MARKET_VARIANCE = 0.3
+
+DailySeries = collections.namedtuple("DailySeries", ["ordinals", "open", "high", "low", "close", "volume"])
+IntradayPaths = collections.namedtuple("IntradayPaths", ["ordinals", "prices", "volumes"])
+
+def mix(values):
+	"""The splitmix64 finaliser, applied element-wise to uint64 values"""
+	values = values + np.uint64(0x9E3779B97F4A7C15)
+	values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+	values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+	return values ^ (values >> np.uint64(31))
+
+def get_stream(*key):
+	digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size = 8).digest()
+	return np.uint64(int.from_bytes(digest, "little"))
+
+def uniforms(stream, counters):
+	"""Uniform values in [0, 1) addressed by counter, so any element can be drawn without the ones before it"""
+	bits = mix(stream ^ mix(np.asarray(counters, dtype = np.uint64)))
+	return (bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+def normals(stream, counters):
+	counters = np.asarray(counters, dtype = np.uint64) * np.uint64(2)
+	radius = np.sqrt(-2.0 * np.log1p(-uniforms(stream, counters)))
+	return radius * np.cos(2.0 * math.pi * uniforms(stream, counters + np.uint64(1)))
+
+def round_to_ticks(prices):
+	"""Rounds prices to the ASX price steps of AsxMarketInfoProvider.GetMinimumStepSize"""
+	prices = np.asarray(prices, dtype = np.float64)
+	ticks = np.where(prices <= 0.10, 0.001, np.where(prices <= 2.00, 0.005, 0.01))
+	return np.maximum(np.round(np.round(prices / ticks) * ticks, 3), 0.001)
+
+@functools.lru_cache(maxsize = 8)
+def get_trading_days(end):
+	"""Returns the ordinals and the UTC opening times of the trading days from EPOCH up to end"""
+	dates = [EPOCH + datetime.timedelta(days = days) for days in range((end - EPOCH).days + 1)]
+	dates = [date for date in dates if market_calendar.is_trading_day(date)]
+	ordinals = np.array([date.toordinal() for date in dates], dtype = np.int64)
+	opening_times = np.array([int(market_calendar.opening_time(date).timestamp()) for date in dates],
+		dtype = np.int64)
+	return ordinals, opening_times
+
+class SyntheticMarketData(MarketData):
+	"""Seeded market data with mean-reverting daily prices, intraday paths through each day's range and ASX ticks
+
+	Every value is drawn from counter-based streams keyed by the seed, the symbol and the day, so the data of a
+	symbol and day is the same however much of the universe or history is generated. It can be served by the
+	stand-in server (StandInServer(market_data = ...)) or written out with write_market.
+	"""
+
+	DEFAULT_CACHE_SIZE = 256
+
+	def __init__(self, shares = None, seed = 0, end = None, cache_size = DEFAULT_CACHE_SIZE):
+		super().__init__(shares)
+		self.seed = seed
+		if end is None:
+			end = datetime.date(datetime.date.today().year + 2, 1, 1)
+		self.end = end
+		self.get_daily_series = functools.lru_cache(maxsize = cache_size)(self.get_daily_series)
+
+	def noise(self, *key):
+		return noise(self.seed, *key)
+
+	def get_uniform(self, symbol, name):
+		return (self.noise(symbol, name) + 1) / 2
+
+	def get_daily_volatility(self, symbol):
+		base_price = self.get_base_price(symbol)
+		# penny stocks move more
+		annual = 0.15 + 0.3 * self.get_uniform(symbol, "volatility") + (0.25 if base_price < 0.5 else 0.0)
+		return annual / math.sqrt(TRADING_DAYS_PER_YEAR)
+
+	def get_base_price(self, symbol):
+		# log-uniform between 2 cents and 120 dollars
+		u = self.get_uniform(symbol, "base")
+		return math.exp(math.log(0.02) + u * (math.log(120) - math.log(0.02)))
+
+	def get_daily_series(self, symbol):
+		"""Returns the daily bars of a symbol from EPOCH up to end, rounded to ticks"""
+		ordinals, opening_times = get_trading_days(self.end)
+		counters = ordinals.astype(np.uint64)
+		volatility = self.get_daily_volatility(symbol)
+		# as reported by get_fundamentals
+		beta = 1 + 0.6 * self.noise(symbol, "beta")
+
+		shocks = volatility * (math.sqrt(MARKET_VARIANCE) * beta * normals(get_stream(self.seed, "market"), counters)
+			+ math.sqrt(1 - MARKET_VARIANCE) * normals(get_stream(self.seed, symbol, "close"), counters))
+		# the log price reverts to the base price with a half-life of one to four years
+		half_life = TRADING_DAYS_PER_YEAR * (1 + 3 * self.get_uniform(symbol, "half-life"))
+		persistence = 0.5 ** (1 / half_life)
+		steps = np.arange(len(ordinals), dtype = np.float64)
+		deviations = persistence ** steps * np.cumsum(shocks * persistence ** -steps)
+		log_close = math.log(self.get_base_price(symbol)) + deviations
+
+		log_previous_close = np.concatenate(([log_close[0]], log_close[:-1]))
+		log_open = log_previous_close + 0.25 * volatility * normals(get_stream(self.seed, symbol, "open"), counters)
+		log_high = np.maximum(log_open, log_close) + 0.5 * volatility * np.abs(
+			normals(get_stream(self.seed, symbol, "high"), counters))
+		log_low = np.minimum(log_open, log_close) - 0.5 * volatility * np.abs(
+			normals(get_stream(self.seed, symbol, "low"), counters))
+
+		# the averageDailyVolume of get_fundamentals
+		average_volume = 50 * 10 ** (4 + 3 * self.get_uniform(symbol, "volume"))
+		volume = (average_volume * np.exp(0.4 * normals(get_stream(self.seed, symbol, "volume"), counters)
+			- 0.08)).astype(np.int64)
+		return DailySeries(ordinals, round_to_ticks(np.exp(log_open)), round_to_ticks(np.exp(log_high)),
+			round_to_ticks(np.exp(log_low)), round_to_ticks(np.exp(log_close)), volume)
+
+	def get_day_index(self, symbol, date):
+		"""Returns the series and the index of the last trading day up to date"""
+		series = self.get_daily_series(symbol)
+		index = int(np.searchsorted(series.ordinals, date.toordinal(), side = "right")) - 1
+		return series, min(max(index, 0), len(series.ordinals) - 1)
+
+	def get_close(self, symbol, date):
+		series, index = self.get_day_index(symbol, date)
+		return float(series.close[index])
+
+	def get_day_range(self, symbol, date):
+		series, index = self.get_day_index(symbol, date)
+		return (float(series.open[index]), float(series.high[index]), float(series.low[index]),
+			float(series.close[index]))
+
+	def get_intraday_paths(self, symbol, first, last):
+		"""Returns the prices every two minutes and the volume between them, for the trading days first to last"""
+		series = self.get_daily_series(symbol)
+		start, stop = np.searchsorted(series.ordinals, [first, last + 1])
+		ordinals = series.ordinals[start:stop]
+		log_open, log_high, log_low, log_close = (np.log(values[start:stop])[:, None]
+			for values in (series.open, series.high, series.low, series.close))
+
+		# a Brownian bridge from the open to the close
+		counters = ordinals.astype(np.uint64)[:, None] * np.uint64(STEPS) + np.arange(STEPS, dtype = np.uint64)
+		walk = np.cumsum(normals(get_stream(self.seed, symbol, "intraday"), counters), axis = 1)
+		walk = np.concatenate((np.zeros((len(ordinals), 1)), walk), axis = 1)
+		fraction = np.arange(STEPS + 1) / STEPS
+		bridge = walk - fraction * walk[:, -1:]
+		scale = self.get_daily_volatility(symbol) / math.sqrt(STEPS)
+		path = log_open + (log_close - log_open) * fraction + bridge * scale
+
+		# stretched above the open and close to reach the high, and below them to reach the low
+		upper, lower = np.maximum(log_open, log_close), np.minimum(log_open, log_close)
+		maximum, minimum = path.max(axis = 1, keepdims = True), path.min(axis = 1, keepdims = True)
+		with np.errstate(divide = "ignore", invalid = "ignore"):
+			path = np.where(path > upper, upper + (path - upper) * (log_high - upper) / (maximum - upper), path)
+			path = np.where(path < lower, lower - (lower - path) * (lower - log_low) / (lower - minimum), path)
+		# exactly, also on the rare days which never trade beyond the open and close
+		rows = np.arange(len(ordinals))
+		highest = np.argmax(path[:, 1:-1], axis = 1) + 1
+		path[rows, highest] = np.where(log_high[:, 0] > upper[:, 0], log_high[:, 0], path[rows, highest])
+		lowest = np.argmin(path[:, 1:-1], axis = 1) + 1
+		path[rows, lowest] = np.where(log_low[:, 0] < lower[:, 0], log_low[:, 0], path[rows, lowest])
+		prices = np.clip(round_to_ticks(np.exp(path)), series.low[start:stop, None], series.high[start:stop, None])
+
+		# most of the volume trades near the open and the close
+		profile = 1 + 1.5 * ((np.arange(STEPS) - (STEPS - 1) / 2) / ((STEPS - 1) / 2)) ** 2
+		weights = profile * np.exp(0.5 * normals(get_stream(self.seed, symbol, "intraday volume"), counters))
+		cumulative = np.floor(np.cumsum(weights, axis = 1) / weights.sum(axis = 1, keepdims = True)
+			* series.volume[start:stop, None])
+		cumulative[:, -1] = series.volume[start:stop]
+		volumes = np.diff(cumulative, axis = 1, prepend = 0).astype(np.int64)
+		return IntradayPaths(ordinals, prices, volumes)
+
+	def get_session_path(self, symbol, date):
+		ordinal = date.toordinal()
+		paths = self.get_intraday_paths(symbol, ordinal, ordinal)
+		if len(paths.ordinals) == 0:
+			open_price, high, low, close = self.get_day_range(symbol, date)
+			return [close] * (STEPS + 1)
+		return paths.prices[0].tolist()
+
+	def get_daily_bar(self, symbol, date):
+		series, index = self.get_day_index(symbol, date)
+		open_price, high, low, close = self.get_day_range(symbol, date)
+		return (date, self.make_bar(market_calendar.opening_time(date), open_price, high, low, close,
+			int(series.volume[index])))
+
+	def get_intraday_bars(self, symbol, dates, minutes, end_time):
+		if not dates:
+			return []
+		paths = self.get_intraday_paths(symbol, dates[0].toordinal(), dates[-1].toordinal())
+		bars = []
+		for row, ordinal in enumerate(paths.ordinals.tolist()):
+			date = datetime.date.fromordinal(ordinal)
+			opening_time = market_calendar.opening_time(date)
+			for start, prices, volume in iter_intraday_bars(paths.prices[row], paths.volumes[row], minutes):
+				timestamp = opening_time + datetime.timedelta(minutes = start)
+				if timestamp > end_time:
+					return bars
+				bars.append(self.make_bar(timestamp, float(prices[0]), float(prices.max()), float(prices.min()),
+					float(prices[-1]), int(volume)))
+		return bars
+
+def iter_intraday_bars(prices, volumes, minutes):
+	"""Yields the start minute, path prices and volume of each bar of a session"""
+	for start in range(0, SESSION_MINUTES, minutes):
+		end = min(start + minutes, SESSION_MINUTES)
+		yield (start, prices[start // PATH_STEP_MINUTES:end // PATH_STEP_MINUTES + 1],
+			volumes[start // PATH_STEP_MINUTES:end // PATH_STEP_MINUTES].sum())
+
+def make_intraday_bars(paths, opening_times, minutes):
+	"""Aggregates intraday paths into price store bars of the given minutes"""
+	starts = list(range(0, SESSION_MINUTES, minutes))
+	bars = np.empty((len(paths.ordinals), len(starts)), dtype = BAR_DTYPE)
+	for column, start in enumerate(starts):
+		end = min(start + minutes, SESSION_MINUTES)
+		prices = paths.prices[:, start // PATH_STEP_MINUTES:end // PATH_STEP_MINUTES + 1]
+		bars["t"][:, column] = opening_times + start * 60
+		bars["o"][:, column] = prices[:, 0]
+		bars["h"][:, column] = prices.max(axis = 1)
+		bars["l"][:, column] = prices.min(axis = 1)
+		bars["c"][:, column] = prices[:, -1]
+		bars["v"][:, column] = paths.volumes[:, start // PATH_STEP_MINUTES:end // PATH_STEP_MINUTES].sum(axis = 1)
+	return bars.reshape(-1)
+
+def write_bars(path, bars):
+	"""Writes bars in the file format of api_client.price_store.PriceStore"""
+	os.makedirs(os.path.dirname(path), exist_ok = True)
+	temporary_path = path + ".tmp"
+	with open(temporary_path, "wb") as bars_file:
+		bars_file.write(HEADER.pack(MAGIC, VERSION, BAR_DTYPE.itemsize, time.time()))
+		bars_file.write(bars.tobytes())
+	os.replace(temporary_path, path)
+
+def write_symbol(market, directory, symbol, start, end, intervals, chunk_days = 250):
+	"""Writes the bars of one symbol, a chunk of sessions at a time, returning the number of bars written"""
+	series = market.get_daily_series(symbol)
+	ordinals, opening_times = get_trading_days(market.end)
+	first, stop = np.searchsorted(ordinals, [start.toordinal(), end.toordinal() + 1])
+	written = 0
+	for interval in intervals:
+		path = os.path.join(directory, symbol, interval + ".bars")
+		if interval == "1d":
+			bars = np.empty(stop - first, dtype = BAR_DTYPE)
+			bars["t"] = opening_times[first:stop]
+			for key, values in zip("ohlcv", (series.open, series.high, series.low, series.close, series.volume)):
+				bars[key] = values[first:stop]
+			write_bars(path, bars)
+			written += len(bars)
+			continue
+
+		chunks = []
+		for chunk_start in range(first, stop, chunk_days):
+			chunk_stop = min(chunk_start + chunk_days, stop)
+			paths = market.get_intraday_paths(symbol, int(ordinals[chunk_start]), int(ordinals[chunk_stop - 1]))
+			chunks.append(make_intraday_bars(paths, opening_times[chunk_start:chunk_stop], INTRADAY_MINUTES[interval]))
+		bars = np.concatenate(chunks) if chunks else np.empty(0, dtype = BAR_DTYPE)
+		write_bars(path, bars)
+		written += len(bars)
+	return written
+
+def write_market(market, directory, start, end, intervals = ("1d",), symbols = None, progress = None):
+	"""Writes price store bar files for each symbol and interval, and the quotes, dividends and fundamentals as of
+	the close of end as JSON files, returning the number of bars written"""
+	if symbols is None:
+		symbols = [share[0] for share in market.shares]
+	as_of = market_calendar.closing_time(end)
+	written = 0
+	quotes, dividends, fundamentals = [], {}, []
+	for number, symbol in enumerate(symbols, 1):
+		written += write_symbol(market, directory, symbol, start, end, intervals)
+		quotes.append(market.get_quote(symbol, as_of))
+		dividends[symbol] = market.get_dividends(symbol, "{0}y".format(end.year - start.year + 1), end)
+		fundamentals.append(market.get_fundamentals(symbol, end))
+		if progress is not None:
+			progress(number, len(symbols))
+
+	for name, value in (("quotes", quotes), ("dividends", dividends), ("fundamentals", fundamentals)):
+		with open(os.path.join(directory, name + ".json"), "w", encoding = "utf-8") as json_file:
+			json.dump(value, json_file, default = str)
+	return written
+
+def parse_date(text):
+	return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "python -m stand_in_server.synthetic_market",
+		description = "Writes seeded synthetic bars, quotes, dividends and fundamentals for the ASX universe.")
+	parser.add_argument("directory", help = "output directory, readable by api_client.price_store.PriceStore")
+	parser.add_argument("--seed", type = int, default = 0)
+	parser.add_argument("--start", type = parse_date, default = datetime.date(datetime.date.today().year - 5, 1, 1),
+		help = "first day, YYYY-MM-DD (default: five years ago)")
+	parser.add_argument("--end", type = parse_date, default = datetime.date.today(),
+		help = "last day, YYYY-MM-DD (default: today)")
+	parser.add_argument("--intervals", type = lambda text: text.split(","), default = ["1d"],
+		help = "comma-separated, from 1d, {0}".format(", ".join(INTRADAY_MINUTES)))
+	parser.add_argument("--symbols", type = lambda text: text.upper().split(","),
+		help = "comma-separated symbols (default: the whole universe)")
+	parser.add_argument("--shares", help = "JSON share list to use instead of the ASX universe")
+	args = parser.parse_args(argv)
+
+	unknown = [interval for interval in args.intervals if interval != "1d" and interval not in INTRADAY_MINUTES]
+	if unknown:
+		parser.error("unknown intervals: {0}".format(", ".join(unknown)))
+	if args.start < EPOCH or args.end < args.start:
+		parser.error("--start must be on or after {0} and not after --end".format(EPOCH))
+
+	market = SyntheticMarketData(load_shares(args.shares), seed = args.seed, end = max(args.end,
+		datetime.date.today()))
+	started = time.perf_counter()
+	def progress(number, count):
+		if number % 100 == 0 or number == count:
+			print("{0}/{1} symbols".format(number, count), file = sys.stderr, flush = True)
+	written = write_market(market, args.directory, args.start, args.end, args.intervals, args.symbols, progress)
+	print("Wrote {0} bars in {1:.1f}s".format(written, time.perf_counter() - started))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+
+ISSUER = "InvestorApi"
+INVESTOR_AUDIENCE = "Investor"
+ADMINISTRATOR_AUDIENCE = "Administrator"
+EXPIRATION = 7 * 24 * 60 * 60
+SIGNING_KEY_VARIABLE = "INVESTOR_API_STAND_IN_SIGNING_KEY"
+# the stand-in only verifies its own tokens, so a key of its own keeps them from passing anywhere else
+SIGNING_KEY = os.environ.get(SIGNING_KEY_VARIABLE, "").encode("utf-8") or os.urandom(32)
+
+HEADER = {"alg": "HS256", "typ": "JWT"}
+
+def encode_segment(data):
+	return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def decode_segment(segment):
+	return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+def sign(signing_input, key = SIGNING_KEY):
+	return encode_segment(hmac.new(key, signing_input, hashlib.sha256).digest())
+
+def issue(user_id, display_name, email, is_administrator = False, now = None, key = SIGNING_KEY):
+	"""Issues an HS256 token with the claims of JwtIssuer"""
+	if now is None:
+		now = int(time.time())
+	claims = {
+		"sub": str(user_id),
+		"unique_name": display_name,
+		"email": email,
+		"nbf": now,
+		"exp": now + EXPIRATION,
+		"iss": ISSUER,
+		"aud": ADMINISTRATOR_AUDIENCE if is_administrator else INVESTOR_AUDIENCE
+	}
+	signing_input = b".".join([
+		encode_segment(json.dumps(HEADER, separators = (",", ":")).encode("utf-8")),
+		encode_segment(json.dumps(claims, separators = (",", ":")).encode("utf-8"))
+	])
+	return (signing_input + b"." + sign(signing_input, key)).decode("ascii")
+
+def verify(token, now = None, key = SIGNING_KEY):
+	"""Returns the claims of a valid token, or None if it is malformed, forged or expired"""
+	if now is None:
+		now = int(time.time())
+	try:
+		signing_input, signature = token.encode("ascii").rsplit(b".", 1)
+		if not hmac.compare_digest(sign(signing_input, key), signature):
+			return None
+		claims = json.loads(decode_segment(signing_input.split(b".", 1)[1]))
+	except (ValueError, UnicodeError, IndexError):
+		return None
+
+	if claims.get("iss") != ISSUER or claims.get("aud") not in (INVESTOR_AUDIENCE, ADMINISTRATOR_AUDIENCE):
+		return None
+	if not claims.get("nbf", 0) <= now < claims.get("exp", 0):
+		return None
+	return claims
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import re
+
+from .domain import ValidationError
+
+EMAIL_ADDRESS = r"^\w+([-+.']\w+)*@\w+([-.]\w+)*\.\w+([-.]\w+)*$"
+ALPHA_NUMERIC = r"^[^~`^$#@%!'*\(\)<>=.;:]+$"
+SYMBOL = r"^[A-Za-z0-9]*$"
+
+class Field:
+	"""Validation attributes of one model property, checked in the order of DataAnnotations"""
+
+	def __init__(self, name, kind = str, required = False, min_length = None, max_length = None,
+		pattern = None, pattern_message = None, minimum = None, maximum = None, choices = None, default = None):
+		self.name = name
+		self.kind = kind
+		self.required = required
+		self.min_length = min_length
+		self.max_length = max_length
+		self.pattern = pattern
+		self.pattern_message = pattern_message
+		self.minimum = minimum
+		self.maximum = maximum
+		self.choices = choices
+		self.default = default
+
+	@property
+	def key(self):
+		return self.name[0].lower() + self.name[1:]
+
+	def convert(self, value):
+		if value is None:
+			return self.default
+		if self.choices is not None:
+			return self.convert_choice(value)
+		if self.kind is int:
+			if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+				raise self.invalid(value)
+			try:
+				return int(value)
+			except ValueError:
+				raise self.invalid(value)
+		if not isinstance(value, str):
+			raise self.invalid(value)
+		return value
+
+	def convert_choice(self, value):
+		# like the StringEnumConverter: names are case-insensitive, numbers are the ordinal
+		if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(self.choices):
+			return self.choices[value]
+		if isinstance(value, str):
+			for choice in self.choices:
+				if choice.lower() == value.lower():
+					return choice
+		raise self.invalid(value)
+
+	def invalid(self, value):
+		return ValidationError("The value '{0}' is not valid for {1}.".format(value, self.name))
+
+	def validate(self, value):
+		if self.required and (value is None or (isinstance(value, str) and value.strip() == "")):
+			return "The {0} field is required.".format(self.name)
+		if isinstance(value, str):
+			if self.min_length is not None and len(value) < self.min_length:
+				return "The field {0} must be a string or array type with a minimum length of '{1}'.".format(
+					self.name, self.min_length)
+			if self.max_length is not None and len(value) > self.max_length:
+				return "The field {0} must be a string or array type with a maximum length of '{1}'.".format(
+					self.name, self.max_length)
+			if self.pattern is not None and value != "" and re.fullmatch(self.pattern, value) is None:
+				return self.pattern_message or "The field {0} must match the regular expression '{1}'.".format(
+					self.name, self.pattern)
+		if self.minimum is not None and value is not None and not self.minimum <= value <= self.maximum:
+			return "The field {0} must be between {1} and {2}.".format(self.name, self.minimum, self.maximum)
+		return None
+
+CREATE_USER = [
+	Field("DisplayName", required = True, min_length = 5, max_length = 30, pattern = ALPHA_NUMERIC),
+	Field("Email", required = True, pattern = EMAIL_ADDRESS, pattern_message = "The email address is invalid.",
+		max_length = 100),
+	Field("Password", required = True, min_length = 8, max_length = 30)
+]
+
+EDIT_USER = [
+	Field("DisplayName", min_length = 5, max_length = 30, pattern = ALPHA_NUMERIC),
+	Field("Email", pattern = EMAIL_ADDRESS, pattern_message = "The email address is invalid.", max_length = 100)
+]
+
+LOGIN = [
+	Field("Email", required = True),
+	Field("Password", required = True)
+]
+
+PLACE_ORDER = [
+	Field("Side", choices = ("Unknown", "Buy", "Sell"), default = "Unknown"),
+	Field("Symbol", required = True, min_length = 3, pattern = SYMBOL),
+	Field("Quantity", kind = int, minimum = 1, maximum = 100000000, default = 0),
+	Field("Nonce", kind = int, default = 0)
+]
+
+ADD_SHARE_TO_WATCHLIST = [
+	Field("Symbol", required = True, min_length = 2)
+]
+
+def validate_model(body, fields):
+	"""Binds a JSON object to the fields and raises the first validation error, as ModelStateValidationFilter"""
+	if not isinstance(body, dict):
+		raise ValidationError("A non-empty request body is required.")
+
+	# Json.NET binds property names case-insensitively
+	values = {key.lower(): value for key, value in body.items()}
+	model = {}
+	for field in fields:
+		value = field.convert(values.get(field.name.lower()))
+		message = field.validate(value)
+		if message is not None:
+			raise ValidationError(message)
+		model[field.key] = value
+	return model
+
+def parse_int_query(query, name, minimum, maximum):
+	value = query.get(name)
+	if value is None or value == "":
+		return None
+	try:
+		value = int(value)
+	except ValueError:
+		raise ValidationError("The value '{0}' is not valid for {1}.".format(value, name))
+	if not minimum <= value <= maximum:
+		raise ValidationError("The field {0} must be between {1} and {2}.".format(name, minimum, maximum))
+	return value
+
+def parse_date_query(query, name):
+	"""Parses an ISO 8601 date or time; times with an offset are converted to naive UTC"""
+	value = query.get(name)
+	if value is None or value == "":
+		return None
+	try:
+		parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+	except ValueError:
+		raise ValidationError("The value '{0}' is not valid for {1}.".format(value, name))
+	if parsed.tzinfo is not None:
+		parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo = None)
+	return parsed
@@ -6,23 +6,18 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
-
-displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
+from fixtures.user_pool import get_user_pool
 
 @ddt
 class AddToWatchlistTestCase(unittest.TestCase):
 	@classmethod
 	def setUpClass(cls):
-		global displayName, email, password
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		cls.token = authentication_response.get_token()
+		cls.user = get_user_pool().acquire()
 
 	@classmethod
 	def tearDownClass(cls):
-		# delete test user
-		deletion_response = ApiFacade.delete_user(cls.token)
+		# the watchlist has been changed, so the user is not lent again
+		get_user_pool().release(cls.user, discard = True)
 
 	def setUp(self):
 		pass
@@ -33,17 +28,11 @@ class AddToWatchlistTestCase(unittest.TestCase):
 	@file_data("data/current_quotes/single_symbol_success.json")
 	def test_add_to_watchlist_success(self, symbol):
 		"""A user can add a share to their watchlist"""
-		global displayName, email, password
-
 		expected_response_code = 201
 		symbol = symbol
 		
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		token = authentication_response.get_token()
-
-		# get watchlist id
-		viewdetails_response = ApiFacade.view_details(token)
-		watchlist_id = viewdetails_response.get_main_watchlist_id()
+		token = self.user.token
+		watchlist_id = self.user.watchlist_id
 
 		# add symbol to watchlist
 		addtowatchlist_response = ApiFacade.add_to_watchlist(token, watchlist_id, symbol)
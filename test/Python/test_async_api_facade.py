@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+
+from api_client import instrumentation
+from api_client.async_api_facade import AsyncApiFacade
+from stand_in_server.server import StandInServer
+
+class AsyncApiFacadeTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.stop()
+
+	def setUp(self):
+		self.events = []
+		self.hook = instrumentation.add_hook(self.events.append)
+
+	def tearDown(self):
+		instrumentation.remove_hook(self.hook)
+
+	def test_operations(self):
+		"""Every operation reaches its endpoint and comes back in the response wrapper of ApiClient"""
+		async def run():
+			responses = {}
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				email, password = "asyncfacade@test.com", "12345678"
+				responses["register_user"] = await facade.register_user("Async Facade", email, password)
+				responses["authenticate_user"] = await facade.authenticate_user(email, password)
+				token = responses["authenticate_user"].get_token()
+				responses["view_details"] = await facade.view_details(token)
+				account_id = responses["view_details"].get_main_account_id()
+				watchlist_id = responses["view_details"].get_main_watchlist_id()
+				responses["get_current_quotes"] = await facade.get_current_quotes(token, "CBA,BHP")
+				responses["buy_share"] = await facade.buy_share(token, account_id, "CBA", 10, 1)
+				responses["sell_share"] = await facade.sell_share(token, account_id, "CBA", 4, 2)
+				responses["add_to_watchlist"] = await facade.add_to_watchlist(token, watchlist_id, "WBC")
+				responses["get_watchlist"] = await facade.get_watchlist(token, watchlist_id)
+				responses["remove_from_watchlist"] = await facade.remove_from_watchlist(token, watchlist_id, "WBC")
+				responses["get_historical_prices"] = await facade.get_historical_prices(token, "CBA", interval = "1d",
+					date_range = "1mo")
+				responses["get_portfolio"] = await facade.get_portfolio(token, account_id)
+				responses["get_transactions"] = await facade.get_transactions(token, account_id, page_size = 2)
+				responses["get_leaderboard"] = await facade.get_leaderboard(token, page_size = 5)
+				responses["get_fundamentals"] = await facade.get_fundamentals(token, "CBA")
+				responses["get_dividends"] = await facade.get_dividends(token, "CBA")
+				responses["get_market"] = await facade.get_market(token)
+				responses["reset_account"] = await facade.reset_account(token, account_id)
+				responses["edit_user"] = await facade.edit_user(token, "Async Facade Edited", email)
+				responses["delete_user"] = await facade.delete_user(token)
+			return responses
+
+		responses = asyncio.run(run())
+
+		for name, response in responses.items():
+			self.assertEqual(response.get_http_status(), response.SUCCESS_STATUS,
+				msg = "Expected HTTP{0} from {1}; got HTTP{2}".format(response.SUCCESS_STATUS, name,
+				response.get_http_status()))
+		self.assertEqual(sorted(quote["symbol"] for quote in responses["get_current_quotes"].get_all_quotes()),
+			["BHP", "CBA"])
+		self.assertEqual([position["quantity"] for position in responses["get_portfolio"].get_json_body()["positions"]
+			if position["symbol"] == "CBA"], [6])
+		self.assertEqual(len(responses["get_transactions"].get_items()), 2)
+		self.assertGreater(len(responses["get_historical_prices"].get_price_columns().close), 0)
+		# every operation is reported to the instrumentation hooks under its own name
+		self.assertEqual([event.endpoint for event in self.events], list(responses))
+
+	def test_instrumentation(self):
+		"""Requests report their phases, with the connect time only on a new connection"""
+		async def run():
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				first = await facade.authenticate_user("nobody@test.com", "12345678")
+				await facade.authenticate_user("nobody@test.com", "12345678")
+				return first
+
+		first = asyncio.run(run())
+
+		new, reused = self.events
+		self.assertEqual((new.endpoint, new.method, new.status), ("authenticate_user", "POST", 401))
+		self.assertEqual(new.size, len(first.response.content))
+		self.assertIsNotNone(new.connect)
+		self.assertIsNone(new.tls)
+		self.assertLessEqual(new.connect + new.ttfb, new.total)
+		self.assertIsNone(reused.connect)
+		self.assertGreater(reused.ttfb, 0)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import decimal
+import unittest
+
+import numpy as np
+
+from api_client.price_columns import PriceColumns
+from backtester.engine import CLOSE, NEXT_OPEN, DEFAULT_RULES, TradingRules, get_previous_closes, run_backtest
+from backtester.strategies import breakout, buy_and_hold, moving_average_crossover, parameter_grid
+from stand_in_server import domain
+
+def make_columns(count, start_price, step, seed = 3):
+	"""Random daily bars on the price grid of the step"""
+	generator = np.random.default_rng(seed)
+	closes = np.maximum(np.round((start_price + np.cumsum(generator.normal(0, start_price / 50, count))) / step)
+		* step, step)
+	opens = np.maximum(np.round((closes + generator.normal(0, start_price / 100, count)) / step) * step, step)
+	highs = np.maximum(opens, closes) + step
+	lows = np.maximum(np.minimum(opens, closes) - step, step)
+	timestamps = np.datetime64("2017-01-03T23:00:00") + np.arange(count) * np.timedelta64(1, "D")
+	return PriceColumns(timestamps, opens, highs, lows, closes, np.full(count, 1000))
+
+def to_decimal(value):
+	return decimal.Decimal(repr(float(value)))
+
+def replay(columns, targets, rules = DEFAULT_RULES, fill = NEXT_OPEN):
+	"""Places the orders of every set with an Account, one at a time as the server would"""
+	previous_closes = get_previous_closes(columns)
+	results = []
+	for set_targets in np.atleast_2d(targets):
+		account = domain.Account(None, "Backtest", rules.initial_balance)
+		position, trades, rejected = 0, 0, 0
+		for bar in range(len(columns.close)):
+			if fill == NEXT_OPEN:
+				target, last = (set_targets[bar - 1] if bar else 0), columns.open[bar]
+			else:
+				target, last = set_targets[bar], columns.close[bar]
+			quantity = int(target) - position
+			if not quantity:
+				continue
+			step = domain.minimum_step_size(to_decimal(previous_closes[bar]))
+			price = to_decimal(last) + (step if quantity > 0 else -step)
+			# Account.BuyShares and SellShares validate the price before trading
+			if price < decimal.Decimal("0.001"):
+				rejected += 1
+				continue
+			try:
+				if quantity > 0:
+					account.buy_shares("CBA", quantity, price, rules.buy_commissions, account.last_nonce + 1)
+				else:
+					account.sell_shares("CBA", -quantity, price, rules.sell_commissions, account.last_nonce + 1)
+			except domain.InvalidTradeError:
+				rejected += 1
+				continue
+			position += quantity
+			trades += 1
+		held = account.positions.get("CBA")
+		results.append((account.balance, position, held.average_price if held else decimal.Decimal(0), trades,
+			rejected))
+	return results
+
+class BacktesterTestCase(unittest.TestCase):
+	def assert_matches_account(self, columns, targets, rules = DEFAULT_RULES, fill = NEXT_OPEN):
+		backtest = run_backtest(columns, targets, rules, fill)
+		for row, (balance, position, average_price, trades, rejected) in enumerate(replay(columns, targets, rules,
+			fill)):
+			self.assertAlmostEqual(backtest.balance[row], float(balance), places = 6)
+			self.assertEqual(backtest.position[row], position)
+			self.assertAlmostEqual(backtest.average_price[row], float(average_price), places = 6)
+			self.assertEqual(backtest.trades[row], trades)
+			self.assertEqual(backtest.rejected[row], rejected)
+		return backtest
+
+	def test_strategies_match_account(self):
+		for start_price, step in ((60.0, 0.01), (1.2, 0.005), (0.05, 0.001)):
+			columns = make_columns(400, start_price, step)
+			quantity = int(20000 / start_price)
+			grid = parameter_grid(fast = [3, 5, 10], slow = [20, 40], quantity = [quantity, 3 * quantity])
+			for fill in (NEXT_OPEN, CLOSE):
+				backtest = self.assert_matches_account(columns,
+					moving_average_crossover(columns, grid["fast"], grid["slow"], grid["quantity"]), fill = fill)
+				self.assertTrue((backtest.trades > 0).all())
+				self.assert_matches_account(columns, breakout(columns, [5, 20, 50], quantity), fill = fill)
+
+	def test_rejected_orders_are_retried(self):
+		columns = make_columns(60, 50.0, 0.01)
+		targets = np.zeros((3, 60), dtype = np.int64)
+		# buys of more than the balance, and sells of more than the position; filled from the next bar on
+		targets[0, 10:] = 30000
+		targets[1, 10:20] = 100
+		targets[1, 20:] = -50
+		targets[2, 5:] = 10000
+		targets[2, 30:] = 40000
+		backtest = self.assert_matches_account(columns, targets)
+		self.assertEqual(backtest.rejected[0], 49)
+		self.assertEqual(backtest.position[0], 0)
+		self.assertEqual(backtest.rejected[1], 39)
+		self.assertEqual(backtest.position[1], 100)
+		self.assertEqual(backtest.position[2], 10000)
+		self.assertGreater(backtest.rejected[2], 0)
+
+	def test_amounts_outside_commission_ranges_are_rejected(self):
+		commissions = domain.Commissions(
+			fixed = [domain.CommissionRange(decimal.Decimal(0), decimal.Decimal(5000), decimal.Decimal(10)),
+				domain.CommissionRange(decimal.Decimal(5000), decimal.Decimal(50000), decimal.Decimal(30))],
+			percentage = [domain.CommissionRange(decimal.Decimal(0), decimal.Decimal(50000), decimal.Decimal("0.5"))])
+		rules = TradingRules(domain.INITIAL_BALANCE, commissions, commissions)
+		columns = make_columns(80, 50.0, 0.01)
+		backtest = self.assert_matches_account(columns, buy_and_hold(columns, [50, 200, 5000]), rules)
+		self.assertEqual(list(backtest.position), [50, 200, 0])
+		self.assertEqual(backtest.rejected[2], 79)
+
+	def test_prices_below_minimum_are_rejected(self):
+		columns = make_columns(6, 0.05, 0.001)
+		columns.open[:] = [0.005, 0.004, 0.001, 0.001, 0.002, 0.002]
+		targets = np.array([[1000, 0, 0, 0, 0, 0]])
+		# the sell at an open of 0.001 would fill at a bid of 0.000, so it waits for the open of 0.002
+		backtest = self.assert_matches_account(columns, targets)
+		self.assertEqual(backtest.rejected[0], 2)
+		self.assertEqual(backtest.position[0], 0)
+		self.assertEqual(backtest.trades[0], 2)
+
+	def test_null_bars(self):
+		"""Null bars are marked to market at the last close, and orders on them wait for the next price"""
+		columns = make_columns(6, 30.0, 0.01)
+		filled = make_columns(6, 30.0, 0.01)
+		columns.close[3] = np.nan
+		filled.close[3] = filled.close[2]
+		columns.open[2] = np.nan
+		targets = np.array([[0, 100, 100, 100, 0, 0]])
+		for fill in (NEXT_OPEN, CLOSE):
+			backtest = run_backtest(columns, targets, fill = fill, record_equity = True)
+			self.assertFalse(np.isnan(backtest.equity_curve).any())
+			self.assertFalse(np.isnan(backtest.max_drawdown).any())
+			self.assertEqual(backtest.trades[0], 2)
+		# the buy waits from the null open of bar 2 to bar 3
+		backtest = run_backtest(columns, targets, record_equity = True)
+		self.assertEqual(backtest.rejected[0], 1)
+		np.testing.assert_allclose(backtest.equity_curve[0, 3:], run_backtest(filled, np.array([[0, 0, 100, 100, 0,
+			0]]), record_equity = True).equity_curve[0, 3:])
+
+	def test_equity_and_drawdown(self):
+		columns = make_columns(200, 30.0, 0.01)
+		targets = moving_average_crossover(columns, [5, 10], [30, 50], 2000)
+		backtest = run_backtest(columns, targets, record_equity = True)
+		self.assertEqual(backtest.equity_curve.shape, (2, 200))
+		np.testing.assert_allclose(backtest.equity_curve[:, -1], backtest.equity)
+		peaks = np.maximum.accumulate(np.concatenate((np.full((2, 1), 1000000.0), backtest.equity_curve), axis = 1),
+			axis = 1)[:, 1:]
+		np.testing.assert_allclose(backtest.max_drawdown, (1 - backtest.equity_curve / peaks).max(axis = 1))
+		np.testing.assert_allclose(backtest.total_return, backtest.equity / 1000000.0 - 1)
+		self.assertIsNone(run_backtest(columns, targets).equity_curve)
+		np.testing.assert_allclose(run_backtest(columns, targets).max_drawdown, backtest.max_drawdown)
+
+	def test_parameter_grid(self):
+		grid = parameter_grid(fast = [5, 10], slow = [20, 30, 40], quantity = [100])
+		self.assertEqual(list(grid), ["fast", "slow", "quantity"])
+		self.assertEqual(list(grid["fast"]), [5, 5, 5, 10, 10, 10])
+		self.assertEqual(list(grid["slow"]), [20, 30, 40, 20, 30, 40])
+		columns = make_columns(100, 20.0, 0.01)
+		targets = moving_average_crossover(columns, grid["fast"], grid["slow"], grid["quantity"])
+		self.assertEqual(targets.shape, (6, 100))
+		# nothing is held until the slow average is full
+		self.assertFalse(targets[:, :19].any())
+		with self.assertRaises(ValueError):
+			run_backtest(columns, targets[:, 1:])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import gzip
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from api_client.api_client import ApiClient
+from api_client.cassette import (Cassette, RecordingSession, ReplaySession, UnrecordedRequestError,
+	constant_latency, lognormal_latency, make_key)
+from stand_in_server.server import API_PREFIX, StandInServer
+
+REPLAY_BASE_URL = "http://replay.invalid" + API_PREFIX
+
+class CassetteTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.directory = tempfile.TemporaryDirectory()
+		cls.path = os.path.join(cls.directory.name, "session.cassette")
+		cls.cassette = Cassette(cls.path)
+		displayName, email, password = ("Cassette", "cassette@test.com", "12345678")
+		with StandInServer() as server:
+			with ApiClient(RecordingSession(cls.cassette), base_url = server.base_url) as client:
+				client.register_user(displayName, email, password)
+				cls.token = client.authenticate_user(email, password).get_token()
+				account_id = client.view_details(cls.token).get_main_account_id()
+				for nonce in range(1, 4):
+					client.buy_share(cls.token, account_id, "CBA", 1, nonce = nonce)
+				cls.quotes = client.get_current_quotes(cls.token, "CBA,BHP")
+				cls.transactions = list(client.iter_transactions(cls.token, account_id, page_size = 2))
+				cls.account_id = account_id
+				client.delete_user(cls.token)
+				client.session.close()
+		cls.cassette.save()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.directory.cleanup()
+
+	def make_client(self, latency = None):
+		return ApiClient(ReplaySession(Cassette.load(self.path), latency), base_url = REPLAY_BASE_URL)
+
+	def test_replay(self):
+		"""Replayed responses are the recorded bytes, in the recorded order, without a server"""
+		with self.make_client() as client:
+			quotes = client.get_current_quotes("another token", "CBA,BHP")
+			self.assertEqual(quotes.response.content, self.quotes.response.content)
+			self.assertEqual(quotes.get_all_quotes(), self.quotes.get_all_quotes())
+			self.assertEqual(list(client.iter_transactions(self.token, self.account_id, page_size = 2)),
+				self.transactions)
+
+			balances = [client.buy_share(self.token, self.account_id, "CBA", 1).get_json_body()["balance"]
+				for _ in range(4)]
+			self.assertGreater(balances[0], balances[1])
+			self.assertGreater(balances[1], balances[2])
+			self.assertEqual(balances[3], balances[0])
+
+			with self.assertRaises(UnrecordedRequestError):
+				client.get_current_quotes(self.token, "WBC")
+			with self.assertRaises(requests.ConnectionError):
+				client.get_fundamentals(self.token, "CBA")
+
+	def test_byte_for_byte(self):
+		"""Saving a loaded cassette gives the same file"""
+		copy_path = os.path.join(self.directory.name, "copy.cassette")
+		Cassette.load(self.path).save(copy_path)
+		with open(self.path, "rb") as original, open(copy_path, "rb") as copy:
+			self.assertEqual(original.read(), copy.read())
+		self.assertEqual(len(Cassette.load(copy_path)), len(self.cassette))
+
+	def test_keys(self):
+		"""Keys ignore the host, token, query order, JSON key order and nonces"""
+		self.assertEqual(make_key("get", "http://a/api/x?b=2&a=1", b'{"y": 1, "x": "\xc3\xa9", "nonce": 5}'),
+			make_key("GET", "https://b/api/x?a=1&b=2", '{"x":"é","y":1,"nonce":6}'))
+		self.assertNotEqual(make_key("GET", "http://a/api/x?a=1"), make_key("GET", "http://a/api/x?a=2"))
+		self.assertNotEqual(make_key("POST", "http://a/api/x", b"{}"), make_key("POST", "http://a/api/y", b"{}"))
+
+	def test_no_passwords(self):
+		"""Passwords are left out of the keys, so a saved cassette does not contain them"""
+		with gzip.open(self.path, "rb") as cassette_file:
+			self.assertNotIn(b"12345678", cassette_file.read())
+		self.assertEqual(make_key("POST", "http://a/api/users/login", '{"email":"a@b.c","password":"secret"}'),
+			'POST /api/users/login {"email":"a@b.c"}')
+
+	def test_latency(self):
+		"""Injected latencies delay the responses; seeded distributions repeat"""
+		with self.make_client(constant_latency(0.05)) as client:
+			started = time.perf_counter()
+			client.get_current_quotes(self.token, "CBA,BHP")
+			self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+
+		first, second = lognormal_latency(0.01, 0.5, seed = 1), lognormal_latency(0.01, 0.5, seed = 1)
+		self.assertEqual([first(None) for _ in range(5)], [second(None) for _ in range(5)])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+import unittest
+
+from api_client.api_client import ApiClient
+from api_client.api_facade import ApiFacade
+from api_client.async_api_facade import AsyncApiFacade
+from api_client.concurrency_limiter import (DEFAULT_CLASS, UPSTREAM_CLASS, AimdLimit, AsyncConcurrencyLimiter,
+	ConcurrencyLimiter)
+from stand_in_server.server import StandInServer
+
+class FakeResponse:
+	def __init__(self, status):
+		self.status = status
+
+	def get_http_status(self):
+		return self.status
+
+class FakeServer:
+	"""Answers after delay seconds, with HTTP 503 while more than capacity calls are in flight"""
+
+	def __init__(self, capacity, delay = 0.002):
+		self.capacity = capacity
+		self.delay = delay
+		self.lock = threading.Lock()
+		self.in_flight = 0
+		self.most_in_flight = 0
+
+	def call(self):
+		with self.lock:
+			self.in_flight += 1
+			self.most_in_flight = max(self.most_in_flight, self.in_flight)
+			overloaded = self.in_flight > self.capacity
+		time.sleep(self.delay)
+		with self.lock:
+			self.in_flight -= 1
+		return FakeResponse(503 if overloaded else 200)
+
+class AimdLimitTestCase(unittest.TestCase):
+	def run_calls(self, limit, count, status = 200, latency = 0.01):
+		permits = [limit.start() for _ in range(count)]
+		for permit in permits:
+			limit.finish(permit, status, latency)
+
+	def test_additive_increase(self):
+		"""The limit grows by about one per round of healthy calls which used it"""
+		limit = AimdLimit(initial = 4, maximum = 6)
+		self.run_calls(limit, 4)
+		self.assertAlmostEqual(limit.limit, 4.71, places = 2)
+		for _ in range(20):
+			self.run_calls(limit, int(limit.limit))
+		self.assertEqual(limit.limit, 6)
+		# calls which leave room do not show the limit is too low
+		limit = AimdLimit(initial = 4)
+		for _ in range(10):
+			self.run_calls(limit, 1)
+		self.assertEqual(limit.limit, 4)
+
+	def test_multiplicative_decrease(self):
+		"""Overloads halve the limit once for the calls that were in flight together, down to the minimum"""
+		limit = AimdLimit(initial = 16, minimum = 3)
+		self.run_calls(limit, 8, status = 503)
+		self.assertEqual(limit.limit, 8)
+		self.assertEqual((limit.overloads, limit.backoffs), (8, 1))
+		self.run_calls(limit, 2, status = 429)
+		self.run_calls(limit, 2, status = None)
+		self.assertEqual(limit.limit, 3)
+		self.assertEqual(limit.backoffs, 3)
+		# client errors are healthy calls
+		self.run_calls(limit, 3, status = 404)
+		self.assertGreater(limit.limit, 3)
+		with self.assertRaises(ValueError):
+			AimdLimit(initial = 1, minimum = 2)
+
+	def test_latency_spikes(self):
+		"""Calls far slower than usual cut the limit; small or lasting slowdowns do not keep cutting it"""
+		limit = AimdLimit(initial = 10, maximum = 10)
+		self.run_calls(limit, 10, latency = 0.1)
+		self.run_calls(limit, 1, latency = 0.15)
+		self.assertEqual(limit.limit, 10)
+		self.run_calls(limit, 1, latency = 0.5)
+		self.assertEqual((limit.limit, limit.spikes), (5, 1))
+		self.run_calls(limit, 1, latency = 0.0501)
+		self.assertEqual(limit.backoffs, 1, msg = "Spikes must exceed min_latency_spike")
+		for _ in range(40):
+			self.run_calls(limit, 1, latency = 0.5)
+		self.assertGreater(limit.latency * limit.latency_tolerance, 0.5)
+		self.assertLess(limit.backoffs, 10)
+
+class ConcurrencyLimiterTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.stop()
+
+	def call_concurrently(self, limiter, endpoint, function, threads, calls):
+		def run():
+			for _ in range(calls):
+				limiter.call(endpoint, function)
+
+		workers = [threading.Thread(target = run) for _ in range(threads)]
+		for worker in workers:
+			worker.start()
+		for worker in workers:
+			worker.join()
+
+	def test_finds_the_capacity(self):
+		"""The limit climbs from its initial value and settles around what the server sustains"""
+		server = FakeServer(capacity = 6)
+		limiter = ConcurrencyLimiter({DEFAULT_CLASS: {"initial": 2, "maximum": 64}})
+		self.call_concurrently(limiter, "get_market", server.call, 24, 40)
+
+		stats = limiter.get_stats()[DEFAULT_CLASS]
+		self.assertEqual(stats["completed"], 960)
+		self.assertGreater(stats["backoffs"], 0)
+		self.assertGreater(stats["limit"], 2)
+		self.assertLess(stats["limit"], 16)
+		# each probe past the capacity fails the calls of about one round trip
+		self.assertLessEqual(server.most_in_flight, 10)
+		self.assertLess(stats["overloads"], 960 * 0.3)
+
+	def test_classes_are_limited_apart(self):
+		"""Slow upstream calls holding every place of their class do not hold back the others"""
+		limiter = ConcurrencyLimiter({DEFAULT_CLASS: {"initial": 2}, UPSTREAM_CLASS: {"initial": 1, "maximum": 1}})
+		release = threading.Event()
+		slow_started = threading.Semaphore(0)
+
+		def slow_call():
+			slow_started.release()
+			release.wait()
+			return FakeResponse(200)
+
+		slow = [threading.Thread(target = limiter.call, args = ("get_dividends", slow_call)) for _ in range(3)]
+		for thread in slow:
+			thread.start()
+		slow_started.acquire()
+		started = time.perf_counter()
+		for _ in range(10):
+			limiter.call("get_current_quotes", lambda: FakeResponse(200))
+		elapsed = time.perf_counter() - started
+
+		stats = limiter.get_stats()
+		self.assertEqual(stats[UPSTREAM_CLASS]["inFlight"], 1)
+		release.set()
+		for thread in slow:
+			thread.join()
+		self.assertLess(elapsed, 0.5)
+		self.assertEqual(stats[DEFAULT_CLASS]["completed"], 10)
+		self.assertEqual(limiter.get_stats()[UPSTREAM_CLASS]["completed"], 3)
+		with self.assertRaises(ValueError):
+			ConcurrencyLimiter(endpoint_classes = {"get_market": "missing"})
+
+	def test_api_client(self):
+		"""Every ApiClient call goes through the limiter, failed ones too"""
+		limiter = ConcurrencyLimiter()
+		with ApiClient(base_url = self.server.base_url, limiter = limiter) as client:
+			email, password = "limiter@test.com", "12345678"
+			client.register_user("Concurrency Limiter", email, password)
+			token = client.authenticate_user(email, password).get_token()
+			self.assertEqual(client.get_fundamentals(token, "CBA").get_http_status(), 200)
+			self.assertEqual(client.get_current_quotes(token, "CBA").get_http_status(), 200)
+			self.assertEqual(client.delete_user(token).get_http_status(), 204)
+
+		stats = limiter.get_stats()
+		self.assertEqual(stats[DEFAULT_CLASS]["completed"], 4)
+		self.assertEqual(stats[UPSTREAM_CLASS]["completed"], 1)
+		self.assertEqual(stats[DEFAULT_CLASS]["inFlight"], 0)
+
+	def test_api_facade(self):
+		"""Facade calls go through the limiter set on it, also after the base URL changes"""
+		state = (ApiFacade._default_client, ApiFacade._owns_default_client, ApiFacade._limiter)
+		ApiFacade._default_client, ApiFacade._owns_default_client = None, False
+		limiter = ConcurrencyLimiter()
+		try:
+			ApiFacade.set_base_url(self.server.base_url)
+			ApiFacade.set_limiter(limiter)
+			self.assertEqual(ApiFacade.authenticate_user("nobody@test.com", "12345678").get_http_status(), 401)
+			ApiFacade.set_base_url(self.server.base_url)
+			self.assertEqual(ApiFacade.authenticate_user("nobody@test.com", "12345678").get_http_status(), 401)
+			self.assertEqual(ApiFacade.get_dividends("invalid", "CBA").get_http_status(), 401)
+			ApiFacade.close_default_client()
+		finally:
+			ApiFacade._default_client, ApiFacade._owns_default_client, ApiFacade._limiter = state
+
+		stats = limiter.get_stats()
+		self.assertEqual(stats[DEFAULT_CLASS]["completed"], 2)
+		self.assertEqual(stats[UPSTREAM_CLASS]["completed"], 1)
+
+	def test_async_facade(self):
+		"""Coroutines sharing an AsyncApiFacade stay within the limit"""
+		server = FakeServer(capacity = 100)
+
+		async def call():
+			await asyncio.sleep(0.001)
+			return server.call()
+
+		async def run():
+			limiter = AsyncConcurrencyLimiter({DEFAULT_CLASS: {"initial": 3, "maximum": 3}})
+			await asyncio.gather(*[limiter.call("get_market", call) for _ in range(30)])
+			async with AsyncApiFacade(self.server.base_url, limiter = limiter) as facade:
+				response = await facade.authenticate_user("nobody@test.com", "12345678")
+			return limiter, response
+
+		limiter, response = asyncio.run(run())
+
+		self.assertEqual(response.get_http_status(), 401)
+		self.assertEqual(limiter.get_stats()[DEFAULT_CLASS]["completed"], 31)
+		self.assertLessEqual(server.most_in_flight, 3)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.namespace import namespaced
 
 @ddt
 class UserRegistrationTestCase(unittest.TestCase):
@@ -23,8 +24,8 @@ class UserRegistrationTestCase(unittest.TestCase):
 		"""A user can edit their profile with valid details"""
 		expected_messages = [None]
 		expected_response_code = 204
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		new_displayName, new_email = ("Edited John", "editedjohn@test.com")
+		displayName, email, password = (namespaced("John Doe"), namespaced("johndoe@test.com"), "12345678")
+		new_displayName, new_email = (namespaced("Edited John"), namespaced("editedjohn@test.com"))
 
 		register_response = ApiFacade.register_user(displayName, email, password)
 		authentication_response = ApiFacade.authenticate_user(email, password)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import endpoint_latency
+from stand_in_server.server import StandInServer
+
+class EndpointLatencyTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.stop()
+
+	def test_all_operations(self):
+		"""Every operation runs repeatedly without failing, and its baseline can be saved and loaded"""
+		results = endpoint_latency.run_benchmark(self.server.base_url, warmup = 1, count = 3, repeat = 2)
+		self.assertEqual(list(results["operations"]), list(endpoint_latency.OPERATIONS_BY_NAME))
+		for name, summary in results["operations"].items():
+			self.assertEqual((name, summary["errors"], summary["samples"]), (name, 0, 6))
+			self.assertLessEqual(summary["min"], summary["p50"])
+			self.assertLessEqual(summary["p50"], summary["p99"])
+			self.assertLessEqual(summary["p99"], summary["max"])
+
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "baseline.json")
+			endpoint_latency.save_results(results, path)
+			self.assertEqual(endpoint_latency.load_baseline(path), json.loads(json.dumps(results)))
+			with open(path, "w") as baseline_file:
+				json.dump({"operations": {}}, baseline_file)
+			with self.assertRaises(ValueError):
+				endpoint_latency.load_baseline(path)
+
+	def test_compare(self):
+		"""Only slowdowns beyond both the relative threshold and the minimum delta are regressions"""
+		baseline = {"operations": {"view_details": {"p50": 0.010, "p99": 0.020},
+			"get_leaderboard": {"p50": 0.0010, "p99": 0.0020}}}
+		results = {"operations": {"view_details": {"p50": 0.013, "p99": 0.025},
+			"get_leaderboard": {"p50": 0.0015, "p99": 0.0040}, "get_dividends": {"p50": 0.5, "p99": 0.9}}}
+
+		comparisons = endpoint_latency.compare(baseline, results, threshold = 0.2, p99_threshold = 0.5,
+			min_delta = 0.001)
+		self.assertEqual([(comparison.operation, comparison.metric, comparison.regressed)
+			for comparison in comparisons], [("view_details", "p50", True), ("view_details", "p99", False),
+			("get_leaderboard", "p50", False), ("get_leaderboard", "p99", True)])
+		self.assertAlmostEqual(comparisons[0].change, 0.3)
+
+	def test_unknown_operation(self):
+		with self.assertRaises(ValueError):
+			endpoint_latency.get_operations(["view_details", "get_everything"])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 
 TEST_USER = {
@@ -39,10 +40,10 @@ class CurrentQuotesTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire()
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	@file_data("data/current_quotes/single_symbol_success.json")
 	def test_get_single_quote_success(self, symbol):
@@ -50,11 +51,7 @@ class CurrentQuotesTestCase(unittest.TestCase):
 		no_of_quotes = 1
 		expected_keys_in_quote = ["symbol", "ask", "bid", "last", "lastSize", "change", "changePercent", "dayLow", "dayHigh"]
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		currentquotes_response = ApiFacade.get_current_quotes(authentication_response.get_token(), symbol)
-		deletion_response = ApiFacade.delete_user(authentication_response.get_token())
+		currentquotes_response = ApiFacade.get_current_quotes(self.user.token, symbol)
 
 		self.assertEqual(currentquotes_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}".format(expected_response_code, currentquotes_response.get_http_status()))
@@ -72,11 +69,7 @@ class CurrentQuotesTestCase(unittest.TestCase):
 		no_of_quotes = len(symbols)
 		expected_keys_in_quote = ["symbol", "ask", "bid", "last", "lastSize", "change", "changePercent", "dayLow", "dayHigh"]
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		currentquotes_response = ApiFacade.get_current_quotes(authentication_response.get_token(), symbols)
-		deletion_response = ApiFacade.delete_user(authentication_response.get_token())
+		currentquotes_response = ApiFacade.get_current_quotes(self.user.token, symbols)
 
 		self.assertEqual(currentquotes_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}".format(expected_response_code, currentquotes_response.get_http_status()))
@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 @ddt
 class HistoricalPricesTestCase(unittest.TestCase):
@@ -18,10 +19,10 @@ class HistoricalPricesTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire()
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	@file_data("data/current_quotes/single_symbol_success.json")
 	def test_get_historical_prices_success(self, symbol):
@@ -29,13 +30,8 @@ class HistoricalPricesTestCase(unittest.TestCase):
 		end_time, interval, date_range = (None, None, "1d")
 		expected_keys_in_item = ["range", "interval", "prices"]
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		historicalprices_response = ApiFacade.get_historical_prices(authentication_response.get_token(), 
+		historicalprices_response = ApiFacade.get_historical_prices(self.user.token, 
 			symbol, end_time, interval, date_range)
-		
-		deletion_response = ApiFacade.delete_user(authentication_response.get_token())
 
 		pprint(historicalprices_response.get_message())
 
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+import requests
+
+from api_client import instrumentation
+from api_client.api_client import ApiClient
+from api_client.instrumentation import HistogramSink, JsonLinesSink, PrometheusSink, RequestEvent
+from stand_in_server.server import StandInServer
+
+def make_event(endpoint, total, status = 200):
+	return RequestEvent(endpoint, "GET", "http://localhost/", status, 10 if status else None, None, None, None,
+		total / 2, total, None if status else "ConnectionError", 0.0)
+
+class InstrumentationTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Instrumented", "instrumented@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.events = []
+		self.hook = instrumentation.add_hook(self.events.append)
+
+	def tearDown(self):
+		instrumentation.remove_hook(self.hook)
+
+	def test_phases(self):
+		"""A new connection reports its DNS and connect times, a reused one only the time to first byte"""
+		with ApiClient(base_url = self.server.base_url) as client:
+			first = client.get_current_quotes(self.token, "CBA")
+			client.view_details(self.token)
+
+		new, reused = self.events
+		self.assertEqual((new.endpoint, new.method, new.status), ("get_current_quotes", "GET", 200))
+		self.assertEqual(new.size, len(first.response.content))
+		self.assertIsNotNone(new.dns)
+		self.assertIsNotNone(new.connect)
+		self.assertIsNone(new.tls)
+		self.assertLessEqual(new.dns + new.connect + new.ttfb, new.total)
+
+		self.assertEqual(reused.endpoint, "view_details")
+		self.assertIsNone(reused.dns)
+		self.assertIsNone(reused.connect)
+		self.assertGreater(reused.ttfb, 0)
+
+	def test_failed_request(self):
+		"""Requests failing without a response are reported with their error and still raise"""
+		listener = socket.socket()
+		listener.bind(("127.0.0.1", 0))
+		port = listener.getsockname()[1]
+		listener.close()
+
+		with ApiClient(base_url = "http://127.0.0.1:{0}/api".format(port)) as client:
+			with self.assertRaises(requests.ConnectionError):
+				client.view_details(self.token)
+		self.assertEqual(len(self.events), 1)
+		self.assertEqual((self.events[0].status, self.events[0].error), (None, "ConnectionError"))
+
+	def test_sinks(self):
+		"""Events go to a JSON-lines file and a Prometheus histogram"""
+		prometheus = instrumentation.add_hook(PrometheusSink())
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, "requests.jsonl")
+			with JsonLinesSink(path) as json_lines:
+				instrumentation.add_hook(json_lines)
+				try:
+					self.client.get_current_quotes(self.token, "CBA")
+					self.client.get_current_quotes("invalid", "CBA")
+				finally:
+					instrumentation.remove_hook(json_lines)
+					instrumentation.remove_hook(prometheus)
+			with open(path, encoding = "utf-8") as json_file:
+				lines = [json.loads(line) for line in json_file]
+
+		self.assertEqual([line["status"] for line in lines], [200, 401])
+		self.assertEqual(lines[0]["endpoint"], "get_current_quotes")
+		text = prometheus.render()
+		self.assertIn("investor_api_request_duration_seconds_bucket{endpoint=\"get_current_quotes\",le=\"+Inf\"} 2\n",
+			text)
+		self.assertIn("investor_api_request_duration_seconds_count{endpoint=\"get_current_quotes\"} 2\n", text)
+		self.assertIn("investor_api_responses_total{endpoint=\"get_current_quotes\",status=\"401\"} 1\n", text)
+
+	def test_histogram(self):
+		"""Percentiles are the upper bounds of their buckets, capped by the slowest call"""
+		histogram = HistogramSink(buckets = (0.01, 0.1, 1.0))
+		for total in (0.005, 0.02, 0.03, 0.05, 0.5):
+			histogram(make_event("get_leaderboard", total))
+		histogram(make_event("get_leaderboard", 3.0, status = None))
+
+		self.assertEqual(histogram.get_percentile("get_leaderboard", 10), 0.01)
+		self.assertEqual(histogram.get_percentile("get_leaderboard", 50), 0.1)
+		self.assertEqual(histogram.get_percentile("get_leaderboard", 99), 3.0)
+		summary = histogram.summary()["get_leaderboard"]
+		self.assertEqual((summary["count"], summary["errors"]), (6, 1))
+		self.assertAlmostEqual(summary["mean"], 3.605 / 6)
+
+if __name__ == "__main__":
+	unittest.main()
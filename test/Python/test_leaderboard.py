@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 @ddt
 class CurrentQuotesTestCase(unittest.TestCase):
@@ -18,21 +19,17 @@ class CurrentQuotesTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire()
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	def test_view_leaderboard_success(self):
 		expected_response_code = 200
 		expected_keys_in_leaderboard = ["items", "pageNumber", "pageSize", "totalPageCount", "totalRowCount"]
 		expected_keys_in_leaderboard_items = ["gravatarUrl", "rank", "displayName", "totalAccountValue", "profit", "profitPercent", "isCurrentUser"]
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		leaderboard_response = ApiFacade.get_leaderboard(authentication_response.get_token())
-		deletion_response = ApiFacade.delete_user(authentication_response.get_token())
+		leaderboard_response = ApiFacade.get_leaderboard(self.user.token)
 
 		self.assertEqual(leaderboard_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}".format(expected_response_code, leaderboard_response.get_http_status()))
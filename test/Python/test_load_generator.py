@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+
+from load_generator import scenarios
+from load_generator.runner import OPEN_LOOP, LoadGenerator
+from load_generator.stats import EndpointStats, percentile
+from stand_in_server.server import StandInServer
+
+class LoadGeneratorTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.stop()
+
+	def test_percentiles(self):
+		"""Percentiles use the nearest rank"""
+		values = list(range(1, 1001))
+
+		self.assertEqual(percentile(values, 50), 500)
+		self.assertEqual(percentile(values, 99.9), 999)
+		self.assertEqual(percentile(values, 100), 1000)
+		self.assertIsNone(percentile([], 50))
+
+	def test_endpoint_summary(self):
+		"""Summaries count the errors by kind"""
+		stats = EndpointStats("buy_share")
+		for latency, error in ((0.1, None), (0.2, "HTTP400"), (0.3, "HTTP400"), (0.4, "TimeoutError")):
+			stats.record(latency, error)
+		summary = stats.summary(2.0)
+
+		self.assertEqual(summary["requests"], 4)
+		self.assertEqual(summary["errors"], 3)
+		self.assertEqual(summary["throughput"], 2.0)
+		self.assertEqual(summary["errorBreakdown"], {"HTTP400": 2, "TimeoutError": 1})
+
+	def test_parse_mix(self):
+		"""A mix is either named or a list of weighted actions"""
+		self.assertEqual(scenarios.parse_mix("trader"), scenarios.MIXES["trader"])
+		self.assertEqual(scenarios.parse_mix("buy_share=3, sell_share"), {"buy_share": 3.0, "sell_share": 1.0})
+		with self.assertRaises(ValueError):
+			scenarios.parse_mix("buy_share=3,fly_away=1")
+		with self.assertRaises(ValueError):
+			scenarios.parse_mix("buy_share=0")
+
+	def test_closed_loop(self):
+		"""Virtual users trade without errors and are deleted afterwards"""
+		generator = LoadGenerator(scenarios.MIXES["trader"], users = 4, requests = 80, seed = 7,
+			base_url = self.server.base_url)
+		report = asyncio.run(generator.run())
+		phases = report["phases"]
+
+		self.assertEqual(phases["setup"]["total"]["requests"], 12)
+		self.assertEqual(phases["load"]["total"]["requests"], 80)
+		self.assertEqual(phases["load"]["total"]["errors"], 0, msg = "Expected no errors; got {0}".format(
+			{name: summary["errorBreakdown"] for name, summary in phases["load"]["endpoints"].items()}))
+		self.assertEqual(phases["teardown"]["endpoints"]["delete_user"]["requests"], 4)
+		self.assertEqual(len(self.server.service.users), 0)
+
+	def test_open_loop(self):
+		"""Requests arrive at the given rate"""
+		generator = LoadGenerator(scenarios.MIXES["browser"], users = 2, requests = 40, mode = OPEN_LOOP, rate = 200,
+			base_url = self.server.base_url)
+		report = asyncio.run(generator.run())
+		load = report["phases"]["load"]
+
+		self.assertEqual(load["total"]["requests"], 40)
+		self.assertGreaterEqual(load["elapsed"], 39 / 200.0)
+		self.assertEqual(load["total"]["errors"], 0)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+
+from requests import Response
+
+from api_client.api_client import ApiClient
+from api_client.models import LeaderBoardUser, PositionInfo, Quote, QuoteList, TransactionInfo
+from api_client.response_wrappers.currentquotes_response_wrapper import CurrentQuotesResponseWrapper
+from api_client.response_wrappers.viewtransactions_response_wrapper import ViewTransactionsResponseWrapper
+from stand_in_server.server import StandInServer
+
+def make_response(body):
+	response = Response()
+	response.status_code = 200
+	response.encoding = "utf-8"
+	response._content = json.dumps(body).encode("utf-8")
+	return response
+
+class ModelsTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Models", "models@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+		cls.account_id = cls.client.view_details(cls.token).get_main_account_id()
+		for nonce, symbol in enumerate(("CBA", "BHP", "WBC"), 1):
+			cls.client.buy_share(cls.token, cls.account_id, symbol, 10, nonce = nonce)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def test_quotes(self):
+		"""Quote models hold the same values as the dicts and are found by symbol"""
+		response = self.client.get_current_quotes(self.token, ["CBA", "BHP", "WBC"])
+		quotes = response.get_quotes()
+
+		self.assertIsInstance(quotes, QuoteList)
+		self.assertEqual([quote.to_dict() for quote in quotes], response.get_all_quotes())
+		self.assertEqual(quotes.get_symbols(), ["CBA", "BHP", "WBC"])
+		self.assertEqual(quotes.get("BHP").last, response.get_quote_by_symbol("BHP")["last"])
+		self.assertEqual(quotes.get("BHP").day_high, response.get_quote_by_symbol("BHP")["dayHigh"])
+		self.assertIsNone(quotes.get("XYZ"))
+		self.assertIsNone(response.get_quote_by_symbol("XYZ"))
+		self.assertFalse(hasattr(quotes[0], "__dict__"))
+
+	def test_first_quote_wins(self):
+		"""With repeated symbols both lookups find the first quote, as the scan did"""
+		quotes = [{"symbol": "CBA", "ask": 1.0}, {"symbol": "CBA", "ask": 2.0}]
+		response = CurrentQuotesResponseWrapper(make_response(quotes))
+
+		self.assertEqual(response.get_quote_by_symbol("CBA")["ask"], 1.0)
+		self.assertEqual(response.get_quotes().get("CBA"), Quote("CBA", 1.0, None, None, None, None, None, None, None))
+
+	def test_positions_transactions_and_leaderboard(self):
+		"""Positions, transactions and leaderboard entries are models of their dicts, also when streamed"""
+		portfolio = self.client.get_portfolio(self.token, self.account_id)
+		self.assertEqual([PositionInfo.from_dict(position) for position in portfolio.get_positions()],
+			portfolio.get_position_infos())
+		self.assertEqual(portfolio.get_position_infos()[0].average_price, portfolio.get_positions()[0]["averagePrice"])
+
+		transactions = self.client.get_transactions(self.token, self.account_id)
+		streamed = list(self.client.iter_transactions(self.token, self.account_id, page_size = 2, typed = True))
+		self.assertEqual(streamed, [TransactionInfo.from_dict(item) for item in transactions.get_items()])
+		self.assertEqual(streamed, transactions.get_transaction_infos())
+
+		users = list(self.client.iter_leaderboard(self.token, page_size = 1, typed = True))
+		self.assertTrue(all(isinstance(user, LeaderBoardUser) for user in users))
+		self.assertEqual([user.rank for user in users], list(range(1, len(users) + 1)))
+		first_page = self.client.get_leaderboard(self.token).get_leaderboard_users()
+		self.assertEqual(first_page, users[:len(first_page)])
+
+	def test_released_content(self):
+		"""Models decoded straight from released content still leave the dict body available"""
+		body = {"items": [{"timestampUtc": "2018-01-01T00:00:00Z", "type": "Buy", "description": "Bought",
+			"amount": -10.5, "balance": 989.5}], "pageNumber": 1, "pageSize": 1, "totalPageCount": 1,
+			"totalRowCount": 1}
+		response = ViewTransactionsResponseWrapper(make_response(body), release_content = True)
+
+		self.assertEqual(response.get_transaction_infos()[0].balance, 989.5)
+		self.assertEqual(response.response.content, b"")
+		self.assertEqual(response.get_json_body(), body)
+		self.assertEqual(response.get_total_row_count(), 1)
+
+	def test_model_per_body(self):
+		"""Each model decodes the body into its own objects, whichever model came first"""
+		body = {"items": [{"timestampUtc": "2018-01-01T00:00:00Z", "type": "Buy", "description": "Bought",
+			"amount": -10.5, "balance": 989.5}], "pageNumber": 1, "pageSize": 1, "totalPageCount": 1,
+			"totalRowCount": 1}
+		for release_content in (False, True):
+			response = ViewTransactionsResponseWrapper(make_response(body), release_content = release_content)
+
+			self.assertEqual(response.get_model_body(PositionInfo)["items"], body["items"])
+			self.assertIsInstance(response.get_transaction_infos()[0], TransactionInfo)
+			self.assertIs(response.get_model_body(PositionInfo), response.get_model_body(PositionInfo))
+			self.assertEqual(response.get_json_body(), body)
+
+if __name__ == "__main__":
+	unittest.main()
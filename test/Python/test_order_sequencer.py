@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+import unittest
+
+from api_client.api_client import ApiClient
+from api_client.async_api_facade import AsyncApiFacade
+from api_client.order_sequencer import (BUY, AsyncOrderSequencer, OrderSequencer, get_clock_nonce,
+	is_nonce_rejection)
+from stand_in_server.server import StandInServer
+
+class DelayingClient:
+	"""Passes orders on to a client one at a time in nonce order, except the one with the given nonce, which is held
+	back for delay seconds; counts the orders in flight"""
+
+	def __init__(self, client, delayed_nonce = None, delay = 0.3, first_nonce = 1):
+		self.client = client
+		self.delayed_nonce = delayed_nonce
+		self.delay = delay
+		self.next_nonce = first_nonce
+		self.condition = threading.Condition()
+		self.in_flight = 0
+		self.most_in_flight = 0
+
+	def get_next_nonce(self):
+		if self.next_nonce == self.delayed_nonce:
+			self.next_nonce += 1
+		return self.next_nonce
+
+	def send(self, place_order, token, account_id, symbol, quantity, nonce):
+		with self.condition:
+			self.in_flight += 1
+			self.most_in_flight = max(self.most_in_flight, self.in_flight)
+		try:
+			if nonce == self.delayed_nonce:
+				time.sleep(self.delay)
+				return place_order(token, account_id, symbol, quantity, nonce)
+			with self.condition:
+				self.condition.wait_for(lambda: self.get_next_nonce() == nonce)
+				response = place_order(token, account_id, symbol, quantity, nonce)
+				self.next_nonce += 1
+				self.condition.notify_all()
+				return response
+		finally:
+			with self.condition:
+				self.in_flight -= 1
+
+	def buy_share(self, *args):
+		return self.send(self.client.buy_share, *args)
+
+	def sell_share(self, *args):
+		return self.send(self.client.sell_share, *args)
+
+class OrderSequencerTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Order Sequencer", "ordersequencer@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+		cls.account_id = cls.client.view_details(cls.token).get_main_account_id()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.client.reset_account(self.token, self.account_id)
+
+	def get_quantity(self, symbol):
+		positions = self.client.get_portfolio(self.token, self.account_id).get_json_body()["positions"]
+		return sum(position["quantity"] for position in positions if position["symbol"] == symbol)
+
+	def test_concurrent_threads(self):
+		"""Orders placed from many threads through one sequencer all trade"""
+		sequencer = OrderSequencer(self.token, self.account_id, self.client, first_nonce = 1, max_in_flight = 4)
+		responses = []
+
+		def trade():
+			for _ in range(5):
+				responses.append(sequencer.buy_share("CBA", 2))
+
+		threads = [threading.Thread(target = trade) for _ in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual([response.get_http_status() for response in responses], [200] * 40)
+		self.assertEqual(self.get_quantity("CBA"), 80)
+		self.assertEqual(sequencer.orders, 40)
+		self.assertEqual(sequencer.requests, 40 + sequencer.resubmits)
+
+	def test_overtaken_orders_are_resubmitted(self):
+		"""An order which reaches the server after a later nonce is sent again, and the window bounds the orders"""
+		# ahead of the clock, so the resubmitted order takes the next nonce in turn
+		first_nonce = get_clock_nonce() + 10 ** 9
+		client = DelayingClient(self.client, delayed_nonce = first_nonce, first_nonce = first_nonce)
+		sequencer = OrderSequencer(self.token, self.account_id, client, first_nonce = first_nonce, max_in_flight = 3)
+		responses = sequencer.place_orders([(BUY, "BHP", quantity) for quantity in range(1, 9)])
+
+		self.assertEqual([response.get_http_status() for response in responses], [200] * 8)
+		self.assertEqual(self.get_quantity("BHP"), 36)
+		self.assertEqual(sequencer.resubmits, 1)
+		self.assertEqual(sequencer.requests, 9)
+		self.assertEqual(client.most_in_flight, 3)
+
+	def test_other_rejections_are_returned(self):
+		"""Orders rejected for anything but the nonce are not sent again"""
+		sequencer = OrderSequencer(self.token, self.account_id, self.client, first_nonce = 1)
+		response = sequencer.sell_share("WBC", 10)
+
+		self.assertEqual(response.get_http_status(), 400)
+		self.assertFalse(is_nonce_rejection(response))
+		self.assertEqual(sequencer.requests, 1)
+		with self.assertRaises(ValueError):
+			sequencer.place_order("Hold", "WBC", 10)
+
+	def test_later_sequencer(self):
+		"""Nonces below those of a sequencer started later move up to the clock instead of counting up to them"""
+		first = OrderSequencer(self.token, self.account_id, self.client, first_nonce = 10)
+		self.assertEqual(OrderSequencer(self.token, self.account_id, self.client).buy_share("ANZ", 1)
+			.get_http_status(), 200)
+		response = first.buy_share("ANZ", 1)
+
+		self.assertEqual(response.get_http_status(), 200)
+		self.assertIn(first.resubmits, (1, 2))
+		# nonces from the time in milliseconds stay above the ones of earlier sessions
+		self.assertEqual(OrderSequencer(self.token, self.account_id, self.client).buy_share("ANZ", 1)
+			.get_http_status(), 200)
+
+	def test_resubmits_are_bounded(self):
+		"""Nonces below the last one the account took, even past the clock, are given up on after max_resubmits"""
+		self.assertEqual(self.client.buy_share(self.token, self.account_id, "ANZ", 1, get_clock_nonce() + 10 ** 9)
+			.get_http_status(), 200)
+		sequencer = OrderSequencer(self.token, self.account_id, self.client, first_nonce = 10, max_resubmits = 2)
+		response = sequencer.buy_share("ANZ", 1)
+
+		self.assertTrue(is_nonce_rejection(response))
+		self.assertEqual(sequencer.requests, 3)
+		self.assertEqual(sequencer.resubmits, 2)
+		sequencer = OrderSequencer(self.token, self.account_id, self.client)
+		self.assertTrue(is_nonce_rejection(sequencer.buy_share("ANZ", 1)))
+		self.assertEqual(sequencer.resubmits, OrderSequencer.DEFAULT_MAX_RESUBMITS)
+
+	def test_async_orders(self):
+		"""Coroutines sharing an AsyncOrderSequencer all trade"""
+		async def run():
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				sequencer = AsyncOrderSequencer(self.token, self.account_id, facade, first_nonce = 1,
+					max_in_flight = 5)
+				responses = await sequencer.place_orders([(BUY, "NAB", 3)] * 20)
+				responses.append(await sequencer.sell_share("NAB", 10))
+				return sequencer, responses
+
+		sequencer, responses = asyncio.run(run())
+
+		self.assertEqual([response.get_http_status() for response in responses], [200] * 21)
+		self.assertEqual(self.get_quantity("NAB"), 50)
+		self.assertEqual(sequencer.requests, 21 + sequencer.resubmits)
+
+if __name__ == "__main__":
+	unittest.main()
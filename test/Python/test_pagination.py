@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import itertools
+import json
+import threading
+import unittest
+
+from requests import Response
+
+from api_client.api_client import ApiClient
+from api_client.pagination import iter_items, iter_pages
+from api_client.response_wrappers.viewtransactions_response_wrapper import ViewTransactionsResponseWrapper
+from stand_in_server.server import StandInServer
+
+class FakePages:
+	"""Serves pages of numbers, recording which pages were asked for"""
+
+	def __init__(self, row_count):
+		self.row_count = row_count
+		self.requested = []
+		self.lock = threading.Lock()
+		self.condition = threading.Condition(self.lock)
+
+	def __call__(self, page_number, page_size):
+		with self.condition:
+			self.requested.append(page_number)
+			self.condition.notify_all()
+		items = list(range((page_number - 1) * page_size, min(page_number * page_size, self.row_count)))
+		response = Response()
+		response.status_code = 200
+		response.encoding = "utf-8"
+		response._content = json.dumps({"items": items, "pageNumber": page_number, "pageSize": page_size,
+			"totalPageCount": -(-self.row_count // page_size), "totalRowCount": self.row_count}).encode("utf-8")
+		return ViewTransactionsResponseWrapper(response)
+
+	def wait_for(self, count):
+		with self.condition:
+			return self.condition.wait_for(lambda: len(self.requested) >= count, timeout = 5)
+
+class PaginationTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		cls.tokens = []
+		for number in range(5):
+			displayName, email, password = ("Pages {0}".format(number), "pages{0}@test.com".format(number), "12345678")
+			cls.client.register_user(displayName, email, password)
+			cls.tokens.append(cls.client.authenticate_user(email, password).get_token())
+		cls.token = cls.tokens[0]
+		cls.account_id = cls.client.view_details(cls.token).get_main_account_id()
+		for nonce in range(1, 8):
+			cls.client.buy_share(cls.token, cls.account_id, "CBA", 1, nonce = nonce)
+
+	@classmethod
+	def tearDownClass(cls):
+		for token in cls.tokens:
+			cls.client.delete_user(token)
+		cls.client.close()
+		cls.server.stop()
+
+	def test_prefetch(self):
+		"""The next pages are requested while the caller is still on the current one"""
+		pages = FakePages(row_count = 25)
+		page_iterator = iter_pages(pages, page_size = 5, prefetch = 2)
+		next(page_iterator)
+		next(page_iterator)
+
+		self.assertTrue(pages.wait_for(4), msg = "Expected pages 3 and 4 to be requested; got {0}".format(pages.requested))
+		self.assertEqual(list(iter_items(FakePages(row_count = 25), page_size = 5, prefetch = 3)), list(range(25)))
+		self.assertEqual(list(iter_items(FakePages(row_count = 0), page_size = 5)), [])
+
+	def test_early_stop(self):
+		"""Stopping early leaves later pages alone"""
+		pages = FakePages(row_count = 1000)
+		items = iter_items(pages, page_size = 10, prefetch = 2)
+
+		self.assertEqual(list(itertools.islice(items, 15)), list(range(15)))
+		items.close()
+		self.assertLessEqual(max(pages.requested), 4)
+
+	def test_transactions(self):
+		"""Transactions stream in the same order as the pages, with the page size now sent to the server"""
+		transactions_response = self.client.get_transactions(self.token, self.account_id, page_number = 2, page_size = 4)
+		self.assertEqual(transactions_response.get_page_size(), 4)
+		self.assertEqual(transactions_response.get_page_number(), 2)
+
+		expected = []
+		for page_number in range(1, transactions_response.get_total_page_count() + 1):
+			expected.extend(self.client.get_transactions(self.token, self.account_id, page_number, 4).get_items())
+		streamed = list(self.client.iter_transactions(self.token, self.account_id, page_size = 4, prefetch = 3))
+
+		self.assertEqual(streamed, expected)
+		self.assertEqual(len(streamed), transactions_response.get_total_row_count())
+
+	def test_leaderboard(self):
+		"""Leaderboard entries stream in rank order, and failed pages raise"""
+		entries = list(self.client.iter_leaderboard(self.token, page_size = 2))
+
+		self.assertEqual([entry["rank"] for entry in entries], list(range(1, len(entries) + 1)))
+		self.assertEqual(len(entries), self.client.get_leaderboard(self.token).get_row_count())
+		with self.assertRaises(RuntimeError):
+			list(self.client.iter_leaderboard("invalid"))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import unittest
+from unittest import mock
+
+from api_client.config import BASE_URL_VARIABLE
+from fixtures.namespace import namespaced
+from parallel_runner.runner import FAILURE, SUCCESS, ParallelRunner, make_batches, make_namespaces
+from stand_in_server.server import StandInServer
+from stand_in_server.validation import EMAIL_ADDRESS
+
+SELF_TEST_VARIABLE = "PARALLEL_RUNNER_SELF_TEST"
+
+class ParallelRunnerTestCase(unittest.TestCase):
+	def test_namespaced_values_keep_length_and_validity(self):
+		"""Namespaced identities keep their length and whether they are valid, and differ between workers"""
+		values = ["johndoe@test.com", "天气@test.com", "John Doe", "天气天气天气天气", "johndoe@@test.com", "Joe", "   "]
+		first, second = make_namespaces(2, run_tag = "ab")
+
+		for value in values:
+			self.assertEqual(len(namespaced(value, first)), len(value))
+			self.assertEqual(bool(re.match(EMAIL_ADDRESS, namespaced(value, first))), bool(re.match(EMAIL_ADDRESS, value)))
+		for value in values[:4]:
+			self.assertNotEqual(namespaced(value, first), namespaced(value, second))
+		self.assertEqual(namespaced("johndoe@test.com", "ab01"), "johab01@test.com")
+		self.assertEqual(namespaced("   ", first), "   ")
+		self.assertIsNone(namespaced(None, first))
+
+	def test_no_namespace(self):
+		"""Values are left alone outside of a parallel run"""
+		with mock.patch.dict(os.environ, clear = True):
+			self.assertEqual(namespaced("johndoe@test.com"), "johndoe@test.com")
+
+	def test_batches(self):
+		"""Batches never mix classes and keep the discovery order"""
+		test_ids = ["a.A.test_1", "a.A.test_2", "a.A.test_3", "a.B.test_1", "b.A.test_1"]
+
+		self.assertEqual(make_batches(test_ids, 2),
+			[["a.A.test_1", "a.A.test_2"], ["a.A.test_3"], ["a.B.test_1"], ["b.A.test_1"]])
+		self.assertEqual(len(set(make_namespaces(1296))), 1296)
+		self.assertRaises(ValueError, make_namespaces, 1297)
+
+	def test_parallel_run(self):
+		"""Workers registering the same identities do not collide, and leave no users behind"""
+		with StandInServer() as server, mock.patch.dict(os.environ, {BASE_URL_VARIABLE: server.base_url,
+				SELF_TEST_VARIABLE: "1"}):
+			report = ParallelRunner(3, batch_size = 2).run(["test_user_registration.UserRegistrationTestCase",
+				"test_user_authentication", "test_buy_share", "test_parallel_runner.FailingTestCase.test_failure"])
+			users = len(server.service.users)
+
+		failures = [record for record in report["results"] if record["outcome"] != SUCCESS]
+		self.assertEqual([record["id"] for record in failures], ["test_parallel_runner.FailingTestCase.test_failure"])
+		self.assertEqual(failures[0]["outcome"], FAILURE)
+		self.assertIn("AssertionError", failures[0]["details"])
+		self.assertEqual(report["counts"][SUCCESS], report["tests"] - 1)
+		self.assertEqual(users, 0)
+
+class FailingTestCase(unittest.TestCase):
+	@unittest.skipUnless(os.environ.get(SELF_TEST_VARIABLE), "only run by test_parallel_run")
+	def test_failure(self):
+		self.fail("failed on purpose")
+
+if __name__ == "__main__":
+	unittest.main()
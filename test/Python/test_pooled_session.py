@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+
+from api_client.api_client import ApiClient
+from api_client.api_facade import ApiFacade
+from api_client.pooled_session import PooledSession
+
+class PooledSessionTestCase(unittest.TestCase):
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_host_pool_size(self):
+		"""A host-specific pool size takes precedence over the default pool size"""
+		host, pool_maxsize = ("investor-api.herokuapp.com", 50)
+
+		with PooledSession(pool_maxsize = 4, host_pool_sizes = {host: pool_maxsize}) as session:
+			host_adapter = session.get_adapter("https://" + host + "/api/1.0/users")
+			other_adapter = session.get_adapter("https://example.com/")
+
+			self.assertEqual(host_adapter._pool_maxsize, pool_maxsize,
+				msg = "Expected pool size {0}; got {1}".format(pool_maxsize, host_adapter._pool_maxsize))
+			self.assertEqual(other_adapter._pool_maxsize, 4,
+				msg = "Expected pool size {0}; got {1}".format(4, other_adapter._pool_maxsize))
+
+	def test_keep_alive_disabled(self):
+		"""A session without keep-alive asks the server to close every connection"""
+		with PooledSession(keep_alive = False) as session:
+			request = RequestStub()
+			session.get_adapter("https://example.com/").add_headers(request)
+
+			self.assertEqual(request.headers.get("Connection"), "close",
+				msg = "Expected Connection header [close]; got [{0}]".format(request.headers.get("Connection")))
+
+	def test_client_owns_session(self):
+		"""A client only closes the session it created itself"""
+		session = PooledSession()
+		with ApiClient(session = session) as client:
+			self.assertIs(client.session, session)
+			self.assertEqual(client.owns_session, False)
+		session.close()
+
+		with ApiClient() as client:
+			self.assertEqual(client.owns_session, True)
+
+	def test_facade_default_client(self):
+		"""The static facade always delegates to the same pooled client"""
+		self.assertIs(ApiFacade.get_default_client(), ApiFacade.get_default_client())
+
+	def test_facade_replaces_default_client(self):
+		"""Replacing the default client closes the one the facade made, and registers the close at exit once"""
+		state = (ApiFacade._default_client, ApiFacade._owns_default_client, ApiFacade._close_registered)
+		ApiFacade._default_client, ApiFacade._owns_default_client, ApiFacade._close_registered = None, False, False
+		try:
+			with mock.patch("atexit.register") as register, mock.patch.object(ApiClient, "close") as close:
+				ApiFacade.set_base_url("http://127.0.0.1:5000/api/1.0")
+				ApiFacade.set_base_url("http://127.0.0.1:5001/api/1.0")
+				self.assertEqual(close.call_count, 1)
+				own_client = ApiClient()
+				ApiFacade.set_default_client(own_client)
+				self.assertEqual(close.call_count, 2)
+				ApiFacade.set_base_url("http://127.0.0.1:5002/api/1.0")
+				ApiFacade.close_default_client()
+				self.assertEqual(close.call_count, 3)
+				self.assertEqual(register.call_count, 1)
+			own_client.close()
+		finally:
+			ApiFacade._default_client, ApiFacade._owns_default_client, ApiFacade._close_registered = state
+
+class RequestStub:
+	def __init__(self):
+		self.headers = {}
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from api_client.api_client import ApiClient
+from api_client.portfolio_valuation import value_portfolios
+from stand_in_server.server import StandInServer
+
+PORTFOLIOS = [
+	{"id": "a", "name": "Default Account", "balance": 1000, "positions": [
+		{"symbol": "CBA", "name": "CBA", "quantity": 10, "averagePrice": 70, "lastPrice": 80, "change": 1,
+			"changePercent": 1.27},
+		{"symbol": "BHP", "name": "BHP", "quantity": 100, "averagePrice": 30, "lastPrice": 27, "change": -0.5,
+			"changePercent": -1.82}
+	]},
+	{"id": "b", "name": "Default Account", "balance": 500, "positions": []},
+	{"id": "c", "name": "Default Account", "balance": 0, "positions": [
+		{"symbol": "XYZ", "name": "XYZ", "quantity": 5, "averagePrice": 2, "lastPrice": 4, "change": 0,
+			"changePercent": 0}
+	]}
+]
+
+class PortfolioValuationTestCase(unittest.TestCase):
+	def test_values_from_positions(self):
+		"""Values, P&L, weights and concentration come out per position and per account"""
+		accounts, positions = value_portfolios(PORTFOLIOS)
+
+		np.testing.assert_array_equal(positions.account_index, [0, 0, 2])
+		np.testing.assert_allclose(positions.market_value, [800, 2700, 20])
+		np.testing.assert_allclose(positions.unrealised, [100, -300, 10])
+		np.testing.assert_allclose(positions.unrealised_percent, [100 / 7, -10, 100])
+		np.testing.assert_allclose(positions.weight, [800 / 3500, 2700 / 3500, 1])
+
+		np.testing.assert_allclose(accounts.total_value, [4500, 500, 20])
+		np.testing.assert_allclose(accounts.unrealised, [-200, 0, 10])
+		np.testing.assert_allclose(accounts.day_change, [-40, 0, 0])
+		np.testing.assert_allclose(accounts.day_change_percent, [-4000 / 4540, 0, 0])
+		np.testing.assert_allclose(accounts.concentration, [(800 / 3500) ** 2 + (2700 / 3500) ** 2, 0, 1])
+		np.testing.assert_allclose(accounts.largest_weight, [2700 / 3500, 0, 1])
+		self.assertTrue(np.isnan(accounts.unrealised_percent[1]))
+
+	def test_values_from_quotes(self):
+		"""Newer quotes replace the prices, and positions without a quote are left out"""
+		quotes = [{"symbol": "CBA", "last": 90, "change": 2}, {"symbol": "BHP", "last": 30, "change": 0}]
+		accounts, positions = value_portfolios(PORTFOLIOS, quotes)
+
+		self.assertEqual(list(positions.symbol), ["CBA", "BHP"])
+		np.testing.assert_allclose(positions.market_value, [900, 3000])
+		np.testing.assert_allclose(accounts.positions_value, [3900, 0, 0])
+		np.testing.assert_allclose(accounts.day_change, [20, 0, 0])
+
+	def test_same_as_server(self):
+		"""The values agree with the portfolio the server reports"""
+		with StandInServer() as server, ApiClient(base_url = server.base_url) as client:
+			client.register_user("Valuation", "valuation@test.com", "12345678")
+			token = client.authenticate_user("valuation@test.com", "12345678").get_token()
+			account_id = client.view_details(token).get_main_account_id()
+			client.buy_share(token, account_id, "CBA", 10, nonce = 1)
+			client.buy_share(token, account_id, "WBC", 20, nonce = 2)
+			portfolio_response = client.get_portfolio(token, account_id)
+			quotes = client.get_current_quotes(token, "CBA,WBC").get_all_quotes()
+			client.delete_user(token)
+
+		accounts, positions = value_portfolios([portfolio_response], quotes)
+		expected = {position["symbol"]: position["quantity"] * position["lastPrice"]
+			for position in portfolio_response.get_positions()}
+
+		self.assertEqual(dict(zip(positions.symbol, positions.market_value)), expected)
+		self.assertAlmostEqual(accounts.total_value[0], portfolio_response.get_balance() + sum(expected.values()))
+
+if __name__ == "__main__":
+	unittest.main()
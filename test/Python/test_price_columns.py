@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+
+import numpy as np
+from requests import Response
+
+from api_client.price_columns import decode_price_columns, price_columns_from_points
+from api_client.response_wrappers.historicalprices_response_wrapper import HistoricalPricesResponseWrapper
+
+POINTS = [
+	{"t": "2017-10-16T10:00:00+11:00", "o": 30.5, "h": 31, "l": 30.25, "c": 30.75, "v": 1200},
+	{"t": "2017-10-16T10:02:00+11:00", "h": 31.5, "l": 30.5, "c": 31.25},
+	{"t": "2017-10-16T10:04:00+11:00", "o": None, "h": 31.5, "l": 31, "c": 31.5, "v": 80}
+]
+
+def make_wrapper(body):
+	response = Response()
+	response.status_code = 200
+	response.encoding = "utf-8"
+	response._content = json.dumps(body, separators = (",", ":")).encode("utf-8")
+	return HistoricalPricesResponseWrapper(response)
+
+class PriceColumnsTestCase(unittest.TestCase):
+	def assert_columns(self, columns):
+		expected_timestamps = np.array(["2017-10-15T23:00:00", "2017-10-15T23:02:00", "2017-10-15T23:04:00"],
+			dtype = "datetime64[s]")
+		np.testing.assert_array_equal(columns.timestamps, expected_timestamps)
+		np.testing.assert_array_equal(columns.open, [30.5, np.nan, np.nan])
+		np.testing.assert_array_equal(columns.high, [31, 31.5, 31.5])
+		np.testing.assert_array_equal(columns.close, [30.75, 31.25, 31.5])
+		np.testing.assert_array_equal(columns.volume, [1200, 0, 80])
+		self.assertEqual(columns.open.dtype, np.float64)
+		self.assertEqual(columns.volume.dtype, np.int64)
+
+	def test_decode_raw_body(self):
+		"""Bars with omitted and null values decode into aligned columns"""
+		wrapper = make_wrapper({"range": "1d", "interval": "2m", "prices": POINTS})
+
+		self.assert_columns(wrapper.get_price_columns())
+		self.assertIs(wrapper.get_price_columns(), wrapper.get_price_columns())
+
+	def test_decode_after_json_body(self):
+		"""Columns can still be built once the body has been decoded"""
+		wrapper = make_wrapper({"range": "1d", "interval": "2m", "prices": POINTS})
+		wrapper.get_json_body()
+
+		self.assert_columns(wrapper.get_price_columns())
+
+	def test_spacing_and_offsets(self):
+		"""Whitespace, negative offsets and UTC timestamps are accepted"""
+		content = (b'{"prices": [{"t": "2017-10-16T10:00:00-05:30", "o": 1.5, "h": 2, "l": 1, "c": 1.75, "v": 3}, '
+			b'{"t": "2017-10-16T10:00:00Z", "o": 1, "h": 1, "l": 1, "c": 1, "v": 4}]}')
+		columns = decode_price_columns(content)
+
+		np.testing.assert_array_equal(columns.timestamps,
+			np.array(["2017-10-16T15:30:00", "2017-10-16T10:00:00"], dtype = "datetime64[s]"))
+		np.testing.assert_array_equal(columns.open, [1.5, 1])
+
+	def test_pretty_printed_body(self):
+		"""Bodies with line breaks and indentation give the same columns"""
+		for indent in (2, "\t"):
+			content = json.dumps({"range": "1d", "interval": "2m", "prices": POINTS}, indent = indent).encode("utf-8")
+			self.assert_columns(decode_price_columns(content))
+		self.assert_columns(decode_price_columns(b'{"prices" : [ ' + b' , '.join(json.dumps(point)
+			.replace('": ', '" :  ').encode("utf-8") for point in POINTS) + b' ] }'))
+
+	def test_empty_and_error_bodies(self):
+		"""Empty histories give empty columns and error bodies none"""
+		columns = decode_price_columns(b'{"range":"1d","interval":"2m","prices":[]}')
+
+		self.assertEqual([len(column) for column in columns], [0] * 6)
+		self.assertIsNone(decode_price_columns(b'{"message":"Not found"}'))
+		self.assertIsNone(make_wrapper({"message": "Not found"}).get_price_columns())
+
+	def test_same_as_decoded_points(self):
+		"""Both decoding paths agree"""
+		points = [{"t": "2017-10-{0:02d}T10:00:00+11:00".format(day), "o": day + 0.125, "h": day + 0.5,
+			"l": day, "c": day + 0.25, "v": day * 1000} for day in range(1, 31)]
+		raw = make_wrapper({"prices": points}).get_price_columns()
+		decoded = price_columns_from_points(points)
+
+		for raw_column, decoded_column in zip(raw, decoded):
+			np.testing.assert_array_equal(raw_column, decoded_column)
+
+if __name__ == "__main__":
+	unittest.main()
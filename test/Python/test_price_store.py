@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from requests import Response
+
+from api_client.api_client import ApiClient
+from api_client.price_store import BAR_DTYPE, HEADER, PriceStore, get_tail_range
+from api_client.response_wrappers.historicalprices_response_wrapper import HistoricalPricesResponseWrapper
+from stand_in_server.server import StandInServer
+
+class RecordingClient:
+	"""Passes price requests on to a client, keeping their ranges"""
+
+	def __init__(self, client):
+		self.client = client
+		self.ranges = []
+
+	def get_historical_prices(self, token, symbol, end_time = None, interval = None, date_range = None):
+		self.ranges.append(date_range)
+		return self.client.get_historical_prices(token, symbol, end_time, interval, date_range)
+
+class FixedClient:
+	"""Answers every price request with the same body"""
+
+	def __init__(self, content):
+		self.content = content
+
+	def get_historical_prices(self, token, symbol, end_time = None, interval = None, date_range = None):
+		response = Response()
+		response.status_code = 200
+		response.encoding = "utf-8"
+		response._content = self.content
+		return HistoricalPricesResponseWrapper(response)
+
+class PriceStoreTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Price Store", "pricestore@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.root = tempfile.mkdtemp()
+		self.recording_client = RecordingClient(self.client)
+		self.store = PriceStore(self.root, self.recording_client)
+
+	def tearDown(self):
+		shutil.rmtree(self.root)
+
+	def test_tail_range(self):
+		"""Refreshes ask for the smallest range starting before the last stored bar"""
+		self.assertEqual(get_tail_range(3600), "5d")
+		self.assertEqual(get_tail_range(10 * 86400), "1mo")
+		self.assertEqual(get_tail_range(400 * 86400), "2y")
+		self.assertEqual(get_tail_range(20000 * 86400), "max")
+
+	def test_initial_download(self):
+		"""The first read downloads the history once and later reads come from the file"""
+		columns = self.store.get_historical_prices(self.token, "CBA", "1d")
+		again = self.store.get_historical_prices(self.token, "cba", "1d", start = columns.timestamps[-5])
+		expected = self.client.get_historical_prices(self.token, "CBA", interval = "1d", date_range = "max").get_price_columns()
+
+		self.assertEqual(self.recording_client.ranges, ["max"])
+		for stored_column, expected_column in zip(columns, expected):
+			np.testing.assert_array_equal(stored_column, expected_column)
+		np.testing.assert_array_equal(again.close, expected.close[-5:])
+		self.assertIsInstance(self.store.load("CBA", "1d"), np.memmap)
+		path = os.path.join(self.root, "CBA", "1d.bars")
+		self.assertEqual(os.path.getsize(path), HEADER.size + len(expected.close) * BAR_DTYPE.itemsize)
+
+	def test_tail_refresh(self):
+		"""Refreshes only request the missing tail and give the same bars as a full download"""
+		self.store.refresh(self.token, "BHP", "1wk", initial_range = "2y")
+		stored = np.array(self.store.load("BHP", "1wk"))
+		# drop the newest bar, as if the file had been written a week ago
+		with open(os.path.join(self.root, "BHP", "1wk.bars"), "r+b") as bars_file:
+			bars_file.truncate(HEADER.size + (len(stored) - 1) * BAR_DTYPE.itemsize)
+
+		self.store.refresh(self.token, "BHP", "1wk", force = True)
+		refreshed = np.array(self.store.load("BHP", "1wk"))
+
+		self.assertEqual(self.recording_client.ranges, ["2y", "1mo"])
+		np.testing.assert_array_equal(refreshed, stored)
+
+	def test_refresh_without_new_bars(self):
+		"""Responses without the last stored bar, or without prices, leave the stored bars as they are"""
+		self.store.refresh(self.token, "WBC", "1d", initial_range = "5d")
+		stored = np.array(self.store.load("WBC", "1d"))
+		self.assertGreater(len(stored), 1)
+
+		for content in [b'{"prices":[]}', b'{}', b'{"prices":[{"t":"2000-01-03T00:00:00Z","c":1.5}]}']:
+			store = PriceStore(self.root, FixedClient(content))
+			store.refresh(self.token, "WBC", "1d", force = True)
+			store.refresh(self.token, "WBC", "1d", force = True)
+			np.testing.assert_array_equal(np.array(store.load("WBC", "1d")), stored, err_msg = content.decode())
+
+	def test_invalid_symbol(self):
+		"""Symbols cannot point outside of the store"""
+		self.assertRaises(ValueError, self.store.load, "../CBA", "1d")
+		self.assertRaises(RuntimeError, self.store.refresh, self.token, "XYZ", "1d")
+
+if __name__ == "__main__":
+	unittest.main()
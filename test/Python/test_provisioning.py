@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+
+from api_client.api_client import ApiClient
+from api_client.async_api_facade import AsyncApiFacade
+from provisioning.provisioner import DELETED, FAILED, PASSWORD, SEEDED, Checkpoint, Provisioner, make_history
+from stand_in_server.server import StandInServer
+
+SETTINGS = {"namespace": "test", "password": PASSWORD, "seed": 3, "trades": [4, 8], "symbols": ["CBA", "BHP", "WBC"]}
+
+class ProvisioningTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "checkpoint.jsonl")
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def run_provisioner(self, method, *args):
+		async def run():
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				with Checkpoint.open(self.path, SETTINGS) as checkpoint:
+					provisioner = Provisioner(facade, checkpoint, concurrency = 4)
+					await getattr(provisioner, method)(*args)
+					return provisioner
+		return asyncio.run(run())
+
+	def get_transaction_count(self, provisioner, number):
+		token = self.client.authenticate_user(provisioner.get_credentials(number)[1], PASSWORD).get_token()
+		account_id = self.client.view_details(token).get_main_account_id()
+		return self.client.get_transactions(token, account_id).get_total_row_count()
+
+	def test_history(self):
+		"""Histories only sell what they bought before"""
+		for seed in range(20):
+			held = {}
+			orders = make_history(random.Random(seed), ["CBA", "BHP"], (10, 20))
+			self.assertTrue(10 <= len(orders) <= 20)
+			for side, symbol, quantity in orders:
+				held[symbol] = held.get(symbol, 0) + (quantity if side == "Buy" else -quantity)
+				self.assertGreaterEqual(held[symbol], 0)
+				self.assertGreater(quantity, 0)
+
+	def test_resume_and_clean_up(self):
+		"""A resumed run seeds only the unfinished users, redoing one an interruption left half seeded"""
+		provisioner = self.run_provisioner("provision", 6)
+		self.assertEqual(provisioner.counts[SEEDED], 6)
+		self.assertEqual(provisioner.counts["failed orders"], 0)
+		seeded_transactions = self.get_transaction_count(provisioner, 5)
+
+		# as if the run had stopped while seeding user 5, and before starting users 6 and 7
+		with open(self.path) as checkpoint_file:
+			lines = checkpoint_file.readlines()
+		with open(self.path, "w") as checkpoint_file:
+			checkpoint_file.writelines(line for line in lines if "\"user\": 5," not in line)
+			checkpoint_file.write("{\"user\": 4, \"sta")
+
+		provisioner = self.run_provisioner("provision", 8)
+		self.assertEqual((provisioner.counts[SEEDED], provisioner.counts["resumed"]), (3, 1))
+		self.assertFalse(provisioner.errors)
+		# the reset replaced the history with the same one
+		self.assertEqual(self.get_transaction_count(provisioner, 5), seeded_transactions)
+		checkpoint = Checkpoint.load(self.path)
+		self.assertEqual((checkpoint.count, set(checkpoint.stages.values())), (8, {SEEDED}))
+
+		provisioner = self.run_provisioner("clean_up")
+		self.assertEqual(provisioner.counts[DELETED], 8)
+		self.assertEqual(set(Checkpoint.load(self.path).stages.values()), {DELETED})
+		self.assertIsNone(self.client.authenticate_user(provisioner.get_credentials(0)[1], PASSWORD).get_token())
+
+	def test_failed_users(self):
+		"""Users which cannot be registered are recorded as failed and tried again by the next run"""
+		provisioner = self.run_provisioner("provision", 0)
+		display_name, email = provisioner.get_credentials(1)
+		# taken by someone else, with another password
+		self.client.register_user(display_name, email, "other password")
+
+		provisioner = self.run_provisioner("provision", 2)
+		self.assertEqual(provisioner.counts[SEEDED], 1)
+		self.assertEqual(sum(provisioner.errors.values()), 1)
+		self.assertEqual(Checkpoint.load(self.path).stages, {0: SEEDED, 1: FAILED})
+
+		self.client.delete_user(self.client.authenticate_user(email, "other password").get_token())
+		provisioner = self.run_provisioner("provision", 2)
+		self.assertEqual(provisioner.counts[SEEDED], 1)
+		self.run_provisioner("clean_up")
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import unittest
+
+from api_client.api_client import ApiClient
+from api_client.async_api_facade import AsyncApiFacade
+from api_client.quote_batcher import AsyncQuoteBatcher, QuoteBatcher, parse_symbols
+from stand_in_server.server import StandInServer
+
+SYMBOLS = ["CBA", "BHP", "WBC", "ANZ", "NAB", "TLS", "WOW", "CSL", "RIO"]
+
+class RecordingClient:
+	"""Passes calls on to a client, keeping the symbols of every request"""
+
+	def __init__(self, client):
+		self.client = client
+		self.sent = []
+
+	def get_current_quotes(self, token, symbols):
+		self.sent.append(symbols)
+		return self.client.get_current_quotes(token, symbols)
+
+class QuoteBatcherTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Quote Batcher", "quotebatcher@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def get_concurrently(self, batcher, calls):
+		responses = [None] * len(calls)
+		barrier = threading.Barrier(len(calls))
+
+		def call(position):
+			token, symbols = calls[position]
+			barrier.wait()
+			responses[position] = batcher.get_current_quotes(token, symbols)
+
+		threads = [threading.Thread(target = call, args = (position,)) for position in range(len(calls))]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		return responses
+
+	def test_concurrent_calls_are_merged(self):
+		"""Concurrent single-symbol lookups share requests and get only their own quotes back"""
+		client = RecordingClient(self.client)
+		batcher = QuoteBatcher(client, max_wait = 0.2)
+		calls = [(self.token, SYMBOLS[position % len(SYMBOLS)].lower()) for position in range(30)]
+		responses = self.get_concurrently(batcher, calls)
+
+		for (token, symbol), response in zip(calls, responses):
+			self.assertEqual(response.get_http_status(), 200)
+			self.assertEqual([quote["symbol"] for quote in response.get_all_quotes()], [symbol.upper()])
+		self.assertLess(len(client.sent), 5, msg = "Expected a few requests; got {0}".format(len(client.sent)))
+		self.assertEqual(batcher.calls, 30)
+
+	def test_max_batch_size(self):
+		"""Batches never hold more symbols than the maximum"""
+		client = RecordingClient(self.client)
+		batcher = QuoteBatcher(client, max_batch_size = 3, max_wait = 0.2)
+		responses = self.get_concurrently(batcher, [(self.token, [symbol]) for symbol in SYMBOLS])
+
+		self.assertTrue(all(len(symbols) <= 3 for symbols in client.sent))
+		self.assertGreaterEqual(len(client.sent), 3)
+		self.assertEqual(sorted(response.get_all_quotes()[0]["symbol"] for response in responses), sorted(SYMBOLS))
+
+	def test_errors_are_shared_per_token(self):
+		"""Tokens are never mixed, and short symbol strings are still rejected by the server"""
+		batcher = QuoteBatcher(self.client, max_wait = 0.1)
+		valid, invalid = self.get_concurrently(batcher, [(self.token, "CBA"), ("invalid", "CBA")])
+
+		self.assertEqual(valid.get_http_status(), 200)
+		self.assertEqual(invalid.get_http_status(), 401)
+		self.assertEqual(batcher.get_current_quotes(self.token, "A").get_http_status(), 400)
+		self.assertEqual(parse_symbols(" cba;bhp,,CBA "), ["CBA", "BHP"])
+
+	def test_async_calls_are_merged(self):
+		"""Coroutines on one event loop share requests too"""
+		async def run():
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				client = RecordingClient(facade)
+				batcher = AsyncQuoteBatcher(client, max_wait = 0.05)
+				responses = await asyncio.gather(*[batcher.get_current_quotes(self.token, symbol)
+					for symbol in SYMBOLS * 3])
+				return client.sent, responses
+
+		sent, responses = asyncio.run(run())
+
+		self.assertEqual(len(sent), 1)
+		self.assertEqual(sorted(sent[0]), sorted(SYMBOLS))
+		self.assertEqual([response.get_all_quotes()[0]["symbol"] for response in responses], SYMBOLS * 3)
+
+	def test_cancelled_leader(self):
+		"""Callers sharing the batch of a cancelled leader get an error instead of waiting for ever"""
+		async def run():
+			async with AsyncApiFacade(self.server.base_url) as facade:
+				batcher = AsyncQuoteBatcher(facade, max_wait = 0.5)
+				leader = asyncio.ensure_future(batcher.get_current_quotes(self.token, "CBA"))
+				await asyncio.sleep(0)
+				follower = asyncio.ensure_future(batcher.get_current_quotes(self.token, "BHP"))
+				await asyncio.sleep(0)
+				leader.cancel()
+				results = await asyncio.wait_for(asyncio.gather(leader, follower, return_exceptions = True), 1)
+				return results, await batcher.get_current_quotes(self.token, "WBC")
+
+		(leader, follower), response = asyncio.run(run())
+
+		self.assertIsInstance(leader, asyncio.CancelledError)
+		self.assertIsInstance(follower, RuntimeError)
+		self.assertEqual(response.get_all_quotes()[0]["symbol"], "WBC")
+
+if __name__ == "__main__":
+	unittest.main()
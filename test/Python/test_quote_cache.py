@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import json
+import time
+import unittest
+
+from requests import Response
+
+from api_client.api_client import ApiClient
+from api_client.quote_cache import QuoteCache
+from api_client.response_wrappers.market_response_wrapper import MarketResponseWrapper, parse_timespan
+from stand_in_server import market_calendar
+from stand_in_server.server import StandInServer
+
+OPEN_MARKET = {"isOpen": False, "timeUntilNextOpen": "18:00:00", "timeUntilNextClose": "02:00:00"}
+CLOSED_MARKET = {"isOpen": False, "timeUntilNextOpen": "1.10:00:00", "timeUntilNextClose": "1.16:00:00"}
+
+def make_market_response(body):
+	response = Response()
+	response.status_code = 200
+	response.encoding = "utf-8"
+	response._content = json.dumps(body).encode("utf-8")
+	return MarketResponseWrapper(response)
+
+class FakeClock:
+	def __init__(self):
+		self.now = 1000.0
+
+	def __call__(self):
+		return self.now
+
+class CountingClient:
+	"""Passes calls on to a client, counting them and answering /markets with a fixed status"""
+
+	def __init__(self, client, market):
+		self.client = client
+		self.market = market
+		self.calls = []
+
+	def get_market(self, token, symbol = "ASX"):
+		self.calls.append(("get_market", symbol))
+		return make_market_response(self.market)
+
+	def get_current_quotes(self, token, symbols):
+		self.calls.append(("get_current_quotes", tuple(symbols)))
+		return self.client.get_current_quotes(token, symbols)
+
+	def get_fundamentals(self, token, symbol):
+		self.calls.append(("get_fundamentals", symbol))
+		return self.client.get_fundamentals(token, symbol)
+
+	def count(self, name):
+		return sum(1 for call_name, argument in self.calls if call_name == name)
+
+class QuoteCacheTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Quote Cache", "quotecache@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def make_cache(self, market, **options):
+		self.clock = FakeClock()
+		self.counting_client = CountingClient(self.client, market)
+		return QuoteCache(self.counting_client, clock = self.clock, **options)
+
+	def test_market_status(self):
+		"""The market is open when it closes before it next opens, even without isOpen"""
+		self.assertTrue(make_market_response(OPEN_MARKET).is_open())
+		self.assertFalse(make_market_response(CLOSED_MARKET).is_open())
+		self.assertTrue(make_market_response(dict(CLOSED_MARKET, isOpen = True)).is_open())
+		self.assertEqual(parse_timespan("-1.02:03:04.5000000"), -datetime.timedelta(days = 1, hours = 2, minutes = 3,
+			seconds = 4.5))
+
+		market_response = self.client.get_market(self.token)
+		self.assertEqual(market_response.get_http_status(), 200)
+		self.assertEqual(market_response.is_open(), market_calendar.is_market_open())
+		self.assertEqual(self.client.get_market(self.token, "NYSE").get_http_status(), 404)
+
+	def test_short_ttl_while_open(self):
+		"""While the market trades, quotes are served for the TTL, then stale while they are refreshed"""
+		cache = self.make_cache(OPEN_MARKET, open_ttl = 10, stale_ttl = 30)
+		first = cache.get_current_quotes(self.token, "cba,bhp")
+		self.clock.now += 5
+		second = cache.get_current_quotes(self.token, ["BHP", "CBA", "XYZ"])
+
+		self.assertEqual([quote["symbol"] for quote in first.get_all_quotes()], ["CBA", "BHP"])
+		self.assertEqual([quote["symbol"] for quote in second.get_all_quotes()], ["BHP", "CBA"])
+		self.assertEqual(self.counting_client.calls[1:], [("get_current_quotes", ("CBA", "BHP")),
+			("get_current_quotes", ("XYZ",))])
+
+		self.clock.now += 10
+		stale = cache.get_current_quotes(self.token, "CBA")
+		self.assertEqual(stale.get_quote_by_symbol("CBA")["symbol"], "CBA")
+		for _ in range(100):
+			if not cache.refreshing:
+				break
+			time.sleep(0.01)
+		self.assertEqual(self.counting_client.calls[-1], ("get_current_quotes", ("CBA",)))
+
+		self.clock.now += 100
+		cache.get_current_quotes(self.token, "BHP")
+		self.assertEqual(self.counting_client.count("get_current_quotes"), 4)
+
+	def test_held_until_open(self):
+		"""While the market is closed, entries are kept until the next open"""
+		cache = self.make_cache(CLOSED_MARKET, open_ttl = 10, stale_ttl = 0)
+		cache.get_current_quotes(self.token, "CBA")
+		fundamentals = cache.get_fundamentals(self.token, "cba")
+		self.clock.now += 33 * 3600
+
+		self.assertIs(cache.get_fundamentals(self.token, "CBA"), fundamentals)
+		cache.get_current_quotes(self.token, "CBA")
+		self.assertEqual(self.counting_client.count("get_current_quotes"), 1)
+		self.assertEqual(self.counting_client.count("get_fundamentals"), 1)
+		self.assertEqual(self.counting_client.count("get_market"), 1)
+
+		self.clock.now += 2 * 3600
+		cache.get_current_quotes(self.token, "CBA")
+		self.assertEqual(self.counting_client.count("get_current_quotes"), 2)
+		self.assertEqual(self.counting_client.count("get_market"), 2)
+
+	def test_bounded_size(self):
+		"""The least recently used entries are dropped first, and errors are not cached"""
+		cache = self.make_cache(OPEN_MARKET, max_entries = 3)
+		for symbol in ("CBA", "BHP", "WBC", "CBA", "ANZ"):
+			cache.get_current_quotes(self.token, symbol)
+
+		self.assertEqual(list(cache.entries), [("quotes", "WBC"), ("quotes", "CBA"), ("quotes", "ANZ")])
+		self.assertEqual(cache.get_current_quotes("invalid", "NAB").get_http_status(), 401)
+		self.assertEqual(len(cache.entries), 3)
+		self.assertEqual((cache.hits, cache.misses), (1, 5))
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import json
+import unittest
+
+from requests import Request
+
+from api_client.request_extensions.addtowatchlist_request import AddToWatchlistRequest
+from api_client.request_extensions.currentquotes_request import CurrentQuotesRequest
+from api_client.request_extensions.deletion_request import DeletionRequest
+from api_client.request_extensions.registration_request import RegistrationRequest
+from api_client.request_extensions.removefromwatchlist_request import RemoveFromWatchlistRequest
+from api_client.request_extensions.viewtransactions_request import ViewTransactionsRequest
+from api_client.request_template import RequestTemplate
+from benchmarks.request_preparation import run_preparation
+
+BASE_URL = "http://localhost:5000/api/1.0"
+
+def prepare(method, path, headers, params = None, body = None):
+	data = None if body is None else json.dumps(body, ensure_ascii = False).encode("utf8")
+	return Request(method, url = BASE_URL + path, headers = headers, params = params, data = data).prepare()
+
+class RequestTemplateTestCase(unittest.TestCase):
+	def assertSamePrepared(self, prepared, expected):
+		self.assertEqual((prepared.method, prepared.url, prepared.body), (expected.method, expected.url, expected.body))
+		self.assertEqual(list(prepared.headers.items()), list(expected.headers.items()))
+
+	def test_same_as_requests(self):
+		"""Templates prepare the same method, URL, headers and body as requests.Request"""
+		self.assertSamePrepared(CurrentQuotesRequest(None, "token", ["CBA", "BHP"], base_url = BASE_URL).prepare(),
+			prepare("GET", "/shares/quotes", {"Content-Type": "application/json", "charset": "UTF-8",
+			"Authorization": "Bearer token"}, {"symbols": "CBA,BHP"}))
+		self.assertSamePrepared(ViewTransactionsRequest(None, "token", 7, page_size = 10,
+			start_date = datetime.date(2018, 1, 2), base_url = BASE_URL).prepare(),
+			prepare("GET", "/accounts/7/transactions", {"Content-Type": "application/json",
+			"Authorization": "Bearer token"}, {"pageSize": 10, "startDate": "2018-01-02"}))
+		self.assertSamePrepared(RegistrationRequest(None, "Zoë", "zoe+1@test.com", "12345678",
+			base_url = BASE_URL).prepare(), prepare("POST", "/users", {"Content-Type": "application/json",
+			"charset": "UTF-8"}, body = {"displayName": "Zoë", "email": "zoe+1@test.com", "password": "12345678"}))
+		self.assertSamePrepared(AddToWatchlistRequest(None, "token", 3, "CBA", base_url = BASE_URL).prepare(),
+			prepare("POST", "/watchlists/3/shares", {"Content-Type": "application/json",
+			"Authorization": "Bearer token"}, body = {"symbol": "CBA"}))
+		self.assertSamePrepared(DeletionRequest(None, "token", base_url = BASE_URL).prepare(), prepare("DELETE",
+			"/users", {"Content-Type": "application/json", "charset": "UTF-8", "Authorization": "Bearer token"}))
+
+	def test_path_values(self):
+		"""Path values are quoted as a single segment and the static parts are kept once per base URL"""
+		request = RemoveFromWatchlistRequest(None, "token", "a/b", "C D", base_url = BASE_URL + "/")
+		self.assertEqual(request.url, BASE_URL + "/watchlists/a%2Fb/shares/C%20D")
+		self.assertIn(BASE_URL, RemoveFromWatchlistRequest.TEMPLATE.url_formats)
+		self.assertNotIn(BASE_URL + "/", RemoveFromWatchlistRequest.TEMPLATE.url_formats)
+
+		template = RequestTemplate("GET", "/odd/{braces}/ID")
+		self.assertEqual(template.prepare(BASE_URL, path_values = (5,), params = {"unused": None}).url,
+			BASE_URL + "/odd/{braces}/5")
+
+	def test_benchmark(self):
+		"""The microbenchmark measures both ways of preparing every case"""
+		results = run_preparation(count = 100, repeat = 1)
+		self.assertIn("buy_share", [result["endpoint"] for result in results])
+		for result in results:
+			self.assertGreater(result["untemplated"], 0)
+			self.assertGreater(result["templated"], 0)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 class ResetAccountTestCase(unittest.TestCase):
 	@classmethod
@@ -17,10 +18,10 @@ class ResetAccountTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire(reset = True)
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	def test_reset_account_success(self):
 		"""An authenticated user can reset their account"""
@@ -28,14 +29,8 @@ class ResetAccountTestCase(unittest.TestCase):
 		symbol = "DDD" 
 		quantity = 100
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		token = authentication_response.get_token()
-
-		# get account id
-		viewdetails_response = ApiFacade.view_details(token)
-		account_id = viewdetails_response.get_main_account_id()
+		token = self.user.token
+		account_id = self.user.account_id
 
 		# buy shares first
 		buyshare_response = ApiFacade.buy_share(token, account_id, symbol, int(quantity))
@@ -43,7 +38,6 @@ class ResetAccountTestCase(unittest.TestCase):
 		resetaccount_response = ApiFacade.reset_account(token, account_id)
 		updatedportfolio_response = ApiFacade.get_portfolio(token, account_id)
 		
-		deletion_response = ApiFacade.delete_user(token)
 
 		self.assertEqual(resetaccount_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}"
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+from unittest import mock
+
+from requests import Response
+
+from api_client.response_wrappers.response_wrapper import ResponseWrapper
+from api_client.response_wrappers.buyshare_response_wrapper import BuyShareResponseWrapper
+from api_client.response_wrappers.viewdetails_response_wrapper import ViewDetailsResponseWrapper
+
+def make_response(content, status_code = 200):
+	response = Response()
+	response.status_code = status_code
+	response.encoding = "utf-8"
+	response._content = content
+	return response
+
+class ResponseWrapperTestCase(unittest.TestCase):
+	def test_body_is_decoded_once(self):
+		"""Accessors share one decoded body"""
+		details = {"id": "1", "email": "a@test.com", "accounts": [{"id": "2"}], "watchlists": [{"id": "3"}]}
+		response = make_response(json.dumps(details).encode("utf-8"))
+
+		with mock.patch.object(Response, "json", autospec = True, side_effect = Response.json) as decode:
+			wrapper = ViewDetailsResponseWrapper(response)
+			values = (wrapper.get_id(), wrapper.get_email(), wrapper.get_main_account_id(),
+				wrapper.get_main_watchlist_id())
+
+		self.assertEqual(values, ("1", "a@test.com", "2", "3"))
+		self.assertEqual(decode.call_count, 1, msg = "Expected {0} decode; got {1}".format(1, decode.call_count))
+
+	def test_invalid_body(self):
+		"""A body which is not JSON decodes to None, once"""
+		response = make_response(b"")
+
+		with mock.patch.object(Response, "json", autospec = True, side_effect = Response.json) as decode:
+			wrapper = ResponseWrapper(response)
+			self.assertIsNone(wrapper.get_json_body())
+			self.assertIsNone(wrapper.get_json_body())
+
+		self.assertEqual(decode.call_count, 1)
+
+	def test_release_content(self):
+		"""Released responses keep only the decoded body"""
+		wrapper = BuyShareResponseWrapper(make_response(b'{"balance": 10.5, "positions": []}'), release_content = True)
+
+		self.assertEqual(wrapper.get_balance(), 10.5)
+		self.assertEqual(wrapper.get_positions(), [])
+		self.assertEqual(wrapper.response.content, b"")
+
+	def test_content_is_kept_by_default(self):
+		"""The raw bytes stay available unless released"""
+		wrapper = ResponseWrapper(make_response(b'{"message": "ok"}'))
+
+		self.assertEqual(wrapper.get_json_body(), {"message": "ok"})
+		self.assertEqual(wrapper.response.content, b'{"message": "ok"}')
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from api_client.share_index import ShareIndex
+from stand_in_server.market_data import MarketData
+
+SHARES = [("IJH", "ISHARES S&P MID-CAP ETF", None), ("MOQ", "MOQ LIMITED", "Software & Services"),
+	("ONT", "1300 SMILES LIMITED", "Health Care Equipment & Services"), ("LIM", "BANK OF LIMA", "Banks"),
+	("CBA", "COMMONWEALTH BANK OF AUSTRALIA.", "Banks"), ("XNN", None, None), ("BNK", "Bank Of Queensland", "Banks")]
+
+def scan(shares, search_term, industry = None):
+	"""The linear search of AsxShareInfoProvider.FindShares"""
+	symbol_matches = [share for share in shares if search_term is None or share[0].upper() == search_term.upper()]
+	name_matches = [share for share in shares if search_term is None
+		or share[1] is not None and search_term.upper() in share[1].upper()]
+	matches = symbol_matches + [share for share in name_matches if share not in symbol_matches]
+	return [share for share in matches if industry is None or share[2] == industry]
+
+class ShareIndexTestCase(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_ranking(self):
+		"""Exact symbol matches come first, then name matches, each in the order of the share list"""
+		index = ShareIndex(SHARES)
+		self.assertEqual([share[0] for share in index.find_shares("lim")], ["LIM", "MOQ", "ONT"])
+		self.assertEqual([share[0] for share in index.find_shares("Bank")], ["LIM", "CBA", "BNK"])
+		self.assertEqual([share[0] for share in index.find_shares("bank of", industry = "Banks", limit = 2)],
+			["LIM", "CBA"])
+		self.assertEqual(index.find_shares("XNN"), [("XNN", None, None)])
+		self.assertEqual(index.find_shares("LIMITED ETF"), [])
+		self.assertEqual(index.find_shares(None, industry = "Banks"), scan(SHARES, None, "Banks"))
+		for term in ["", "a", "Q", "li", "1300", "s&p mid", "OF ", "BANK OF QUEENSLAND", "ZZZZ"]:
+			self.assertEqual(index.find_shares(term), scan(SHARES, term), msg = term)
+
+	def test_asx_universe(self):
+		"""The server's share search gives the results of the linear scan over the whole ASX universe"""
+		market_data = MarketData()
+		for term in ["cba", "BHP", "a", "Li", "LIMITED", "bank", "group ltd", "mining", "1300", "ES L", "zzzz"]:
+			self.assertEqual(market_data.find_shares(term), scan(market_data.shares, term), msg = term)
+		self.assertEqual(market_data.get_search_index().find_shares("resources", industry = "Energy"),
+			scan(market_data.shares, "resources", "Energy"))
+
+	def test_save_and_load(self):
+		"""A saved index loads without rebuilding and answers the same"""
+		index = ShareIndex(SHARES)
+		path = os.path.join(self.directory, "shares.idx")
+		index.save(path)
+		loaded = ShareIndex.load(path)
+
+		self.assertEqual(len(loaded), len(SHARES))
+		self.assertEqual(loaded.shares, index.shares)
+		for term in ["lim", "Bank", "a", "of queensland", "XNN"]:
+			self.assertEqual(loaded.find_shares(term), index.find_shares(term))
+		self.assertEqual(loaded.complete_symbol("l"), index.complete_symbol("l"))
+		with open(path, "r+b") as index_file:
+			index_file.write(b"NOTINDEX")
+		with self.assertRaises(ValueError):
+			ShareIndex.load(path)
+
+	def test_complete_symbol(self):
+		"""Symbols starting with a prefix come in alphabetical order"""
+		index = ShareIndex(SHARES)
+		self.assertEqual([share[0] for share in index.complete_symbol("b")], ["BNK"])
+		self.assertEqual([share[0] for share in index.complete_symbol("")], sorted(share[0] for share in SHARES))
+		self.assertEqual([share[0] for share in index.complete_symbol("", limit = 2)], ["BNK", "CBA"])
+		self.assertEqual(index.complete_symbol("ZZ"), [])
+
+if __name__ == "__main__":
+	unittest.main()
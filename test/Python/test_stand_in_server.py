@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from api_client.api_client import ApiClient
+from api_client.async_api_facade import AsyncApiFacade
+from api_client.config import BASE_URL_VARIABLE, DEFAULT_BASE_URL, get_base_url
+from api_client.request_extensions.viewdetails_request import ViewDetailsRequest
+from stand_in_server.server import StandInServer
+
+class StandInServerTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		displayName, email, password = ("Stand In", "standin@test.com", "12345678")
+		self.client.register_user(displayName, email, password)
+		self.token = self.client.authenticate_user(email, password).get_token()
+		self.account_id = self.client.view_details(self.token).get_main_account_id()
+
+	def tearDown(self):
+		self.client.delete_user(self.token)
+
+	def test_base_url_resolution(self):
+		"""An explicit base URL wins over the environment, which wins over the hosted API"""
+		with mock.patch.dict(os.environ, {BASE_URL_VARIABLE: "http://localhost:5000/api/1.0/"}):
+			self.assertEqual(get_base_url(), "http://localhost:5000/api/1.0")
+			self.assertEqual(get_base_url("http://example.com/api/1.0"), "http://example.com/api/1.0")
+
+			request = ViewDetailsRequest(None, "token")
+			self.assertEqual(request.url, "http://localhost:5000/api/1.0/users",
+				msg = "Expected URL [{0}]; got [{1}]".format("http://localhost:5000/api/1.0/users", request.url))
+
+		with mock.patch.dict(os.environ, clear = True):
+			self.assertEqual(get_base_url(), DEFAULT_BASE_URL)
+
+	def test_buy_charges_commissions(self):
+		"""A purchase writes the trade, the percentage and the fixed commission transactions"""
+		quote = self.client.get_current_quotes(self.token, "ANZ").get_all_quotes()[0]
+		buyshare_response = self.client.buy_share(self.token, self.account_id, "ANZ", 100)
+
+		amount = 100 * quote["ask"]
+		expected_balance = round(1000000 - amount - amount * 0.01 - 50, 2)
+		self.assertEqual(buyshare_response.get_http_status(), 200,
+			msg = "Expected HTTP{0}; got HTTP{1}".format(200, buyshare_response.get_http_status()))
+		self.assertAlmostEqual(buyshare_response.get_json_body()["balance"], expected_balance, places = 2,
+			msg = "Expected balance {0}; got {1}".format(expected_balance, buyshare_response.get_json_body()["balance"]))
+
+		items = self.client.get_transactions(self.token, self.account_id).get_items()
+		descriptions = [item["description"] for item in items]
+		self.assertEqual(descriptions[:2], ["Commission", "Commission 1.00%"],
+			msg = "Expected newest transactions first; got {0}".format(descriptions))
+		self.assertEqual(len(items), 4, msg = "Expected {0} transactions; got {1}".format(4, len(items)))
+
+	def test_sell_more_than_position(self):
+		"""A user cannot sell more shares than they hold"""
+		expected_messages = ["You cannot sell 10 shares of BHP because the current position is only 0."]
+
+		sellshare_response = self.client.sell_share(self.token, self.account_id, "BHP", 10)
+
+		self.assertEqual(sellshare_response.get_http_status(), 400,
+			msg = "Expected HTTP{0}; got HTTP{1}".format(400, sellshare_response.get_http_status()))
+		self.assertIn(sellshare_response.get_json_body()["message"], expected_messages)
+
+	def test_rejected_order_keeps_nonce(self):
+		"""A rejected order leaves the last nonce, so the order can be sent again with the same nonce"""
+		self.assertEqual(self.client.buy_share(self.token, self.account_id, "CBA", 10, 1).get_http_status(), 200)
+		self.assertEqual(self.client.sell_share(self.token, self.account_id, "BHP", 10, 2).get_http_status(), 400)
+		self.assertEqual(self.client.sell_share(self.token, self.account_id, "CBA", 5, 2).get_http_status(), 200)
+
+		buyshare_response = self.client.buy_share(self.token, self.account_id, "CBA", 5, 2)
+		self.assertEqual(buyshare_response.get_http_status(), 400)
+		self.assertIn("nonce value is invalid", buyshare_response.get_json_body()["message"])
+
+	def test_reset_account(self):
+		"""Resetting an account restores the balance and leaves a single transfer"""
+		self.client.buy_share(self.token, self.account_id, "CBA", 10)
+		resetaccount_response = self.client.reset_account(self.token, self.account_id)
+		portfolio = self.client.get_portfolio(self.token, self.account_id).get_json_body()
+		items = self.client.get_transactions(self.token, self.account_id).get_items()
+
+		self.assertEqual(resetaccount_response.get_http_status(), 201,
+			msg = "Expected HTTP{0}; got HTTP{1}".format(201, resetaccount_response.get_http_status()))
+		self.assertEqual(portfolio["balance"], 1000000)
+		self.assertEqual(portfolio["positions"], [])
+		self.assertEqual([item["description"] for item in items], ["Account reset"])
+
+	def test_unknown_share(self):
+		"""Prices of a symbol outside the ASX universe are not found"""
+		historicalprices_response = self.client.get_historical_prices(self.token, "ZZZZ", date_range = "1d")
+
+		self.assertEqual(historicalprices_response.get_http_status(), 404,
+			msg = "Expected HTTP{0}; got HTTP{1}".format(404, historicalprices_response.get_http_status()))
+
+	def test_async_facade(self):
+		"""The coroutine facade can drive the stand-in with concurrent requests"""
+		async def view_details(count):
+			async with AsyncApiFacade(base_url = self.server.base_url, limit = 10) as facade:
+				return await asyncio.gather(*[facade.view_details(self.token) for _ in range(count)])
+
+		responses = asyncio.run(view_details(50))
+		statuses = set(response.get_http_status() for response in responses)
+		self.assertEqual(statuses, {200}, msg = "Expected only HTTP200; got {0}".format(statuses))
+
+if __name__ == "__main__":
+	unittest.main()
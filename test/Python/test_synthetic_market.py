@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import datetime
+import decimal
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from api_client.api_client import ApiClient
+from api_client.price_store import PriceStore
+from stand_in_server import market_calendar
+from stand_in_server.domain import minimum_step_size
+from stand_in_server.server import StandInServer
+from stand_in_server.synthetic_market import SyntheticMarketData, round_to_ticks, write_market
+
+SHARES = [("CBA", "COMMONWEALTH BANK OF AUSTRALIA.", "Banks"), ("BHP", "BHP BILLITON LIMITED", "Materials"),
+	("1PG", "1-PAGE LIMITED", "Software & Services"), ("AJL", "AJ LUCAS GROUP", "Energy")]
+
+def assert_on_ticks(test_case, prices):
+	ticks = np.array([float(minimum_step_size(decimal.Decimal(repr(float(price))))) for price in prices])
+	test_case.assertTrue(np.allclose(np.round(prices / ticks) * ticks, prices, rtol = 0, atol = 1e-9))
+
+class SyntheticMarketTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.market = SyntheticMarketData(SHARES, seed = 7)
+		cls.server = StandInServer(market_data = cls.market)
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Synthetic", "synthetic@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def test_seeded(self):
+		"""The same seed gives the same data, and each day is the same however much is generated"""
+		same, other = SyntheticMarketData(SHARES, seed = 7), SyntheticMarketData(SHARES, seed = 8)
+		self.assertTrue(np.array_equal(same.get_daily_series("CBA").close, self.market.get_daily_series("CBA").close))
+		self.assertFalse(np.array_equal(other.get_daily_series("CBA").close, self.market.get_daily_series("CBA").close))
+
+		ordinals = self.market.get_daily_series("BHP").ordinals[-300:-200]
+		batch = self.market.get_intraday_paths("BHP", ordinals[0], ordinals[-1])
+		single = same.get_intraday_paths("BHP", ordinals[50], ordinals[50])
+		self.assertTrue(np.array_equal(batch.prices[50], single.prices[0]))
+		self.assertTrue(np.array_equal(batch.volumes[50], single.volumes[0]))
+
+	def test_consistent_bars(self):
+		"""Prices are on ASX ticks, and the intraday paths run from the open to the close through the day's range"""
+		self.assertEqual(round_to_ticks([0.0994, 0.1004, 1.9974, 2.004, 35.126]).tolist(),
+			[0.099, 0.1, 1.995, 2.0, 35.13])
+		for symbol, name, industry in SHARES:
+			series = self.market.get_daily_series(symbol)
+			last = slice(-600, -400)
+			paths = self.market.get_intraday_paths(symbol, series.ordinals[last][0], series.ordinals[last][-1])
+			assert_on_ticks(self, paths.prices[::40].ravel())
+			self.assertTrue(np.array_equal(paths.prices[:, 0], series.open[last]))
+			self.assertTrue(np.array_equal(paths.prices[:, -1], series.close[last]))
+			self.assertTrue(np.array_equal(paths.prices.max(axis = 1), series.high[last]))
+			self.assertTrue(np.array_equal(paths.prices.min(axis = 1), series.low[last]))
+			self.assertTrue(np.array_equal(paths.volumes.sum(axis = 1), series.volume[last]))
+
+	def test_served(self):
+		"""The stand-in serves the synthetic quotes and bars"""
+		quote = self.client.get_current_quotes(self.token, "BHP").get_quote_by_symbol("BHP")
+		self.assertAlmostEqual(quote["ask"] - quote["last"], float(minimum_step_size(
+			decimal.Decimal(repr(self.market.get_previous_close("BHP", datetime.date.today()))))))
+
+		today = datetime.date.today()
+		prices = self.client.get_historical_prices(self.token, "CBA", interval = "1d", date_range = "3mo")
+		closes = prices.get_price_columns().close
+		expected = [self.market.get_close("CBA", date) for date in self.market.get_session_dates("3mo",
+			datetime.datetime.combine(today, datetime.time(23, 0)))]
+		self.assertEqual(closes.tolist()[:-1], expected[:len(closes) - 1])
+
+	def test_files(self):
+		"""Written bars can be read by the price store and match the served history"""
+		directory = tempfile.mkdtemp()
+		try:
+			start, end = datetime.date(2017, 1, 1), datetime.date(2017, 6, 30)
+			written = write_market(self.market, directory, start, end, ("1d", "15m"), ["CBA", "AJL"])
+			store = PriceStore(directory, self.client)
+			daily = store.get_price_columns("CBA", "1d")
+			intraday = store.get_price_columns("AJL", "15m")
+
+			self.assertEqual(written, 2 * (len(daily.timestamps) + len(intraday.timestamps)))
+			self.assertEqual(len(intraday.timestamps), 24 * len(daily.timestamps))
+			self.assertEqual(daily.close[-1], self.market.get_close("CBA", end))
+			# the ASX opens on the evening before in UTC
+			self.assertEqual(int(daily.timestamps[0].astype(np.int64)),
+				int(market_calendar.opening_time(datetime.date(2017, 1, 3)).timestamp()))
+			with open(os.path.join(directory, "fundamentals.json"), encoding = "utf-8") as fundamentals_file:
+				self.assertEqual([item["symbol"] for item in json.load(fundamentals_file)], ["CBA", "AJL"])
+		finally:
+			shutil.rmtree(directory)
+
+if __name__ == "__main__":
+	unittest.main()
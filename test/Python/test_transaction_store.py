@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from api_client.api_client import ApiClient
+from api_client.transaction_store import (COLUMN_DTYPES, SCALE, TRANSACTION_TYPES, TransactionStore, encode_item,
+	format_timestamp, parse_timestamp, remove_seen, to_scaled)
+from stand_in_server.server import StandInServer
+
+class RecordingClient:
+	"""Passes calls on to a client, keeping the start and end dates of the transaction requests"""
+
+	def __init__(self, client):
+		self.client = client
+		self.start_dates = []
+		self.end_dates = []
+
+	def get_transactions(self, token, account_id, page_number = None, page_size = None, start_date = None,
+		end_date = None):
+		self.start_dates.append(start_date)
+		self.end_dates.append(end_date)
+		return self.client.get_transactions(token, account_id, page_number, page_size, start_date, end_date)
+
+	def view_details(self, token):
+		return self.client.view_details(token)
+
+class TransactionStoreTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+		displayName, email, password = ("Transaction Store", "transactionstore@test.com", "12345678")
+		cls.client.register_user(displayName, email, password)
+		cls.token = cls.client.authenticate_user(email, password).get_token()
+		cls.account_id = cls.client.view_details(cls.token).get_main_account_id()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.delete_user(cls.token)
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.client.reset_account(self.token, self.account_id)
+		self.nonce = 0
+		self.root = tempfile.mkdtemp()
+		self.recording_client = RecordingClient(self.client)
+		self.store = TransactionStore(self.root, self.recording_client)
+
+	def tearDown(self):
+		shutil.rmtree(self.root)
+
+	def trade(self, count):
+		"""Places count orders, each writing three transactions"""
+		for number in range(count):
+			self.nonce += 1
+			if number % 2 == 0:
+				self.client.buy_share(self.token, self.account_id, "CBA", 10 + number, self.nonce)
+			else:
+				self.client.sell_share(self.token, self.account_id, "CBA", 5, self.nonce)
+
+	def assert_matches_api(self, account_id = None):
+		"""The stored transactions equal those of the API, oldest first"""
+		account_id = account_id or self.account_id
+		items = list(self.client.iter_transactions(self.token, account_id))[::-1]
+		columns = self.store.get_transaction_columns(account_id)
+		stored = [(int(timestamp), int(transaction_type), columns.dictionary[description], int(amount), int(balance))
+			for timestamp, transaction_type, description, amount, balance in zip(columns.timestamps.astype(np.int64),
+			columns.types, columns.descriptions, columns.amounts, columns.balances)]
+		self.assertEqual(stored, [encode_item(item) for item in items])
+		return columns
+
+	def test_incremental_sync(self):
+		"""Later syncs ask for the transactions from the last stored one and append only the new ones"""
+		self.assertEqual(self.store.sync(self.token, self.account_id), 1)
+		self.trade(4)
+		self.assertEqual(self.store.sync(self.token, self.account_id), 12)
+		self.assertEqual(self.store.sync(self.token, self.account_id), 0)
+
+		columns = self.assert_matches_api()
+		self.assertEqual(self.recording_client.start_dates[0], None)
+		self.assertEqual(self.recording_client.start_dates[-1], format_timestamp(int(columns.timestamps[-1]
+			.astype(np.int64))))
+		self.assertEqual(TRANSACTION_TYPES[columns.types[0]], "Transfer")
+		self.assertEqual(columns.amounts[0], 1000000 * SCALE)
+		self.assertEqual([TRANSACTION_TYPES[code] for code in columns.types[1:4]], ["Buy", "Commission", "Commission"])
+		self.assertTrue(np.all(np.diff(columns.balances[1:]) == columns.amounts[2:]))
+		# repeated descriptions share one dictionary entry
+		self.assertEqual(columns.dictionary.count("Commission"), 1)
+		self.assertEqual(len(self.store.get_transaction_columns(self.account_id, start = columns.timestamps[1])
+			.amounts), 12)
+
+	def test_files_are_appended(self):
+		"""A sync writes only past the stored rows, over anything an interrupted sync left there"""
+		self.trade(2)
+		self.store.sync(self.token, self.account_id)
+		directory = self.store.get_directory(self.account_id)
+		paths = [os.path.join(directory, name + ".col") for name in COLUMN_DTYPES]
+		with open(paths[0], "rb") as column_file:
+			stored_timestamps = column_file.read()
+		for path in paths:
+			with open(path, "ab") as column_file:
+				column_file.write(b"\xff" * 5)
+
+		self.trade(3)
+		self.assertEqual(self.store.sync(self.token, self.account_id), 9)
+		with open(paths[0], "rb") as column_file:
+			self.assertTrue(column_file.read().startswith(stored_timestamps))
+		for (name, dtype), path in zip(COLUMN_DTYPES.items(), paths):
+			self.assertEqual(os.path.getsize(path), 16 * dtype.itemsize)
+		self.assert_matches_api()
+
+	def test_reset_keeps_history(self):
+		"""Transactions stay after the account is reset, and its new ones are added"""
+		self.trade(2)
+		self.store.sync(self.token, self.account_id)
+		self.client.reset_account(self.token, self.account_id)
+		self.assertEqual(self.store.sync_user(self.token), {self.account_id: 1})
+		self.assertEqual(len(self.store.get_transaction_columns(self.account_id).amounts), 8)
+
+	def test_long_histories_are_fetched_in_windows(self):
+		"""Histories longer than the API serves are fetched in windows without gaps or repeats"""
+		self.trade(6)
+		with mock.patch("api_client.pagination.MAX_PAGE_NUMBER", 2), \
+			mock.patch("api_client.transaction_store.MAX_PAGE_NUMBER", 2):
+			store = TransactionStore(self.root, self.recording_client, page_size = 3)
+			self.assertEqual(store.sync(self.token, self.account_id), 19)
+			self.trade(5)
+			self.assertEqual(store.sync(self.token, self.account_id), 15)
+		self.assertGreater(len(set(self.recording_client.end_dates)), 2)
+		self.assert_matches_api()
+
+	def test_encoding(self):
+		self.assertEqual(to_scaled(0.1), 10000000)
+		self.assertEqual(to_scaled(-1.2345678), -123456780)
+		self.assertEqual(to_scaled(999999.99999999), 99999999999999)
+		self.assertEqual(parse_timestamp("1970-01-01T00:00:01.5Z"), 1500000)
+		self.assertEqual(parse_timestamp("1970-01-01T10:00:01.5+10:00"), 1500000)
+		self.assertEqual(parse_timestamp(format_timestamp(1234567890123456)), 1234567890123456)
+		rows = [(1, "a"), (1, "b"), (1, "a"), (2, "a")]
+		self.assertEqual(remove_seen(rows, [(1, "a"), (1, "b")]), [(1, "a"), (2, "a")])
+		self.assertEqual(remove_seen(rows, []), rows)
+		with self.assertRaises(ValueError):
+			self.store.get_directory("../accounts")
+
+if __name__ == "__main__":
+	unittest.main()
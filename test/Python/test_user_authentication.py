@@ -3,6 +3,7 @@
 
 import unittest
 from api_client.api_facade import ApiFacade
+from fixtures.namespace import namespaced
 
 class UserAuthenticationTestCase(unittest.TestCase):
 
@@ -14,6 +15,8 @@ class UserAuthenticationTestCase(unittest.TestCase):
 
 	@classmethod
 	def setUpClass(self):
+		self.TEST_USER = dict(self.TEST_USER, displayName = namespaced(self.TEST_USER["displayName"]),
+			email = namespaced(self.TEST_USER["email"]))
 		ApiFacade.register_user(self.TEST_USER["displayName"], self.TEST_USER["email"], self.TEST_USER["password"])
 
 	def setUp(self):
@@ -50,7 +53,7 @@ class UserAuthenticationTestCase(unittest.TestCase):
 		"""A user cannot sign in with an empty password"""
 		expected_response_code = 400
 		expected_messages = ["The Password field is required."]
-		response_wrapper = ApiFacade.authenticate_user("johndoe@test.com", "")
+		response_wrapper = ApiFacade.authenticate_user(self.TEST_USER["email"], "")
 
 		response_status_match = response_wrapper.get_http_status() == expected_response_code
 		response_body_match = response_wrapper.get_message() in expected_messages
@@ -86,7 +89,7 @@ class UserAuthenticationTestCase(unittest.TestCase):
 		"""A user cannot sign in with an incorrect password"""
 		expected_response_code = 401
 		expected_messages = [None]
-		response_wrapper = ApiFacade.authenticate_user("johndoe@test.com", "wwwwwwww")
+		response_wrapper = ApiFacade.authenticate_user(self.TEST_USER["email"], "wwwwwwww")
 
 		response_status_match = response_wrapper.get_http_status() == expected_response_code
 		response_body_match = response_wrapper.get_message() in expected_messages
@@ -108,7 +111,9 @@ class UserAuthenticationTestCase(unittest.TestCase):
 
 	@classmethod
 	def tearDownClass(cls):
-		pass
+		# namespaced runs use new identities every time, so the user is not left behind
+		authentication_response = ApiFacade.authenticate_user(cls.TEST_USER["email"], cls.TEST_USER["password"])
+		ApiFacade.delete_user(authentication_response.get_token())
 
 if __name__ == "__main__":
 	unittest.main()
\ No newline at end of file
@@ -3,6 +3,7 @@
 
 import unittest
 from api_client.api_facade import ApiFacade
+from fixtures.namespace import namespaced
 
 class UserDeletionTestCase(unittest.TestCase):
 
@@ -19,7 +20,7 @@ class UserDeletionTestCase(unittest.TestCase):
 	def test_deletion_success(self):
 		"""An authenticated user can delete their user account"""
 		expected_response_code = 204
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
+		displayName, email, password = (namespaced("John Doe"), namespaced("johndoe@test.com"), "12345678")
 		registration_response = ApiFacade.register_user(displayName, email, password)
 		authentication_response = ApiFacade.authenticate_user(email, password)
 		deletion_response = ApiFacade.delete_user(authentication_response.get_token())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from api_client.api_client import ApiClient
+from fixtures.user_pool import UserPool
+from stand_in_server.server import StandInServer
+
+class UserPoolTestCase(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = StandInServer()
+		cls.server.start()
+		cls.client = ApiClient(base_url = cls.server.base_url)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.client.close()
+		cls.server.stop()
+
+	def setUp(self):
+		self.pool = UserPool(self.client, namespace = "test")
+
+	def tearDown(self):
+		self.pool.close()
+
+	def test_users_are_reused(self):
+		"""A released user is lent again instead of registering another"""
+		with self.pool.user() as user:
+			first_email = user.email
+			self.assertEqual(self.client.view_details(user.token).get_email(), user.email)
+		with self.pool.user() as user:
+			self.assertEqual(user.email, first_email)
+
+		self.assertEqual(len(self.server.service.users), 1)
+
+	def test_reset_on_acquire(self):
+		"""Accounts used by earlier tests can be reset before they are lent again"""
+		with self.pool.user() as user:
+			self.client.buy_share(user.token, user.account_id, "CBA", 10)
+		with self.pool.user(reset = True) as user:
+			portfolio = self.client.get_portfolio(user.token, user.account_id)
+
+		self.assertEqual(portfolio.get_balance(), 1000000)
+		self.assertEqual(portfolio.get_positions(), [])
+
+	def test_discarded_users(self):
+		"""Discarded users are not lent again but still deleted"""
+		with self.pool.user(discard = True) as user:
+			discarded_email = user.email
+		with self.pool.user() as user:
+			self.assertNotEqual(user.email, discarded_email)
+
+		self.pool.close()
+		self.assertEqual(len(self.server.service.users), 0)
+
+	def test_provision(self):
+		"""Users are provisioned concurrently with unique names"""
+		users = self.pool.provision(12)
+
+		self.assertEqual(len(set(user.email for user in users)), 12)
+		self.assertTrue(all(user.token and user.account_id and user.watchlist_id for user in users))
+		self.assertEqual(len(self.server.service.users), 12)
+
+if __name__ == "__main__":
+	unittest.main()
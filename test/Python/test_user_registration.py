@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.namespace import namespaced
 
 @ddt
 class UserRegistrationTestCase(unittest.TestCase):
@@ -22,6 +23,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/success.json")
 	def test_registration_success(self, displayName, email, password):
 		"""A new user can register with valid details"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [None]
 		expected_response_code = 201
 
@@ -42,6 +44,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/displayNameIsEmpty.json")
 	def test_registration_displayNameIsEmpty(self, displayName, email, password):
 		"""A new user cannot register with an empty displayName"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = ["The DisplayName field is required."]
 		expected_response_code = 400
 
@@ -62,6 +65,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/emailIsEmpty.json")
 	def test_registration_emailIsEmpty(self, displayName, email, password):
 		"""A new user cannot register with an empty email"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = ["The Email field is required."]
 		expected_response_code = 400
 
@@ -82,6 +86,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/passwordIsEmpty.json")
 	def test_registration_passwordIsEmpty(self, displayName, email, password):
 		"""A new user cannot register with an empty password"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = ["The Password field is required."]
 		expected_response_code = 400
 
@@ -102,6 +107,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/displayNameIsTooShort.json")
 	def test_registration_displayNameIsTooShort(self, displayName, email, password):
 		"""A new user cannot register with a displayName of less than 5 characters"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [
 			"The field DisplayName must be a string or array type with a minimum length of '5'.",
 			"The DisplayName field is required."
@@ -125,6 +131,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/passwordIsTooShort.json")
 	def test_registration_passwordIsTooShort(self, displayName, email, password):
 		"""A new user cannot register with a password of less than 8 characters"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [
 			"The field Password must be a string or array type with a minimum length of '8'.",
 			"The Password field is required."
@@ -148,6 +155,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/displayNameIsTooLong.json")
 	def test_registration_displayNameIsTooLong(self, displayName, email, password):
 		"""A new user cannot register with a displayName of more than 30 characters"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [
 			"The field DisplayName must be a string or array type with a maximum length of '30'.",
 			"The DisplayName field is required."
@@ -171,6 +179,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/passwordIsTooLong.json")
 	def test_registration_passwordIsTooLong(self, displayName, email, password):
 		"""A new user cannot register with a password of more than 30 characters"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [
 			"The field Password must be a string or array type with a maximum length of '30'.",
 			"The Password field is required."
@@ -194,6 +203,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/emailIsTooLong.json")
 	def test_registration_emailIsTooLong(self, displayName, email, password):
 		"""A new user cannot register with an email of more than 100 characters"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = [
 			"The field Email must be a string or array type with a maximum length of '100'.",
 			"The email address is invalid."
@@ -217,6 +227,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/emailIsInvalid.json")
 	def test_registration_emailIsInvalid(self, displayName, email, password):
 		"""A new user cannot register with an invalid email"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = ["The email address is invalid."]
 		expected_response_code = 400
 
@@ -237,6 +248,7 @@ class UserRegistrationTestCase(unittest.TestCase):
 	@file_data("data/registration/displayNameIsNotAlphaNumeric.json")
 	def test_registration_displayNameIsNotAlphaNumeric(self, displayName, email, password):
 		"""A new user cannot register with a non-alphanumeric displayName"""
+		displayName, email = namespaced(displayName), namespaced(email)
 		expected_messages = ["""The field DisplayName must match the regular expression '^[^~`^$#@%!'*\\(\\)<>=.;:]+$'."""]
 		expected_response_code = 400
 
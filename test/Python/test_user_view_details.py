@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.namespace import namespaced
 
 TEST_USER = {
 			"displayName": "John Doe", 
@@ -51,7 +52,7 @@ class UserViewDetailsTestCase(unittest.TestCase):
 	def test_viewDetails_success(self):
 		"""An authenticated user can view their user account details"""
 		expected_response_code = 200
-		displayName, email, password, level = ("John Doe", "johndoe@test.com", "12345678", "Investor")
+		displayName, email, password, level = (namespaced("John Doe"), namespaced("johndoe@test.com"), "12345678", "Investor")
 		number_of_accounts, number_of_watchlists = (1, 1)
 
 		registration_response = ApiFacade.register_user(displayName, email, password)
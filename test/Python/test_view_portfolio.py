@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 class ViewPortfolioTestCase(unittest.TestCase):
 	@classmethod
@@ -17,10 +18,10 @@ class ViewPortfolioTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire()
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	def test_view_portfolio_success(self):
 		"""An authenticated user can sell shares that they own"""
@@ -29,20 +30,12 @@ class ViewPortfolioTestCase(unittest.TestCase):
 		symbol = "DDD" 
 		quantity = 100
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		token = authentication_response.get_token()
-
-		# get account id
-		viewdetails_response = ApiFacade.view_details(token)
-		account_id = viewdetails_response.get_main_account_id()
+		token = self.user.token
+		account_id = self.user.account_id
 
 		# buy shares first
 		portfolio_response = ApiFacade.get_portfolio(token, account_id)
 
-		deletion_response = ApiFacade.delete_user(token)
-
 		self.assertEqual(portfolio_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}"
 			.format(expected_response_code, portfolio_response.get_http_status()))
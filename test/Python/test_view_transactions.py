@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 class ViewTransactionsTestCase(unittest.TestCase):
 	@classmethod
@@ -17,10 +18,10 @@ class ViewTransactionsTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire(reset = True)
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	def test_view_transactions_success(self):
 		"""An authenticated user can sell shares that they own"""
@@ -29,14 +30,8 @@ class ViewTransactionsTestCase(unittest.TestCase):
 		symbol = "DDD" 
 		quantity = 100
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		token = authentication_response.get_token()
-
-		# get account id
-		viewdetails_response = ApiFacade.view_details(token)
-		account_id = viewdetails_response.get_main_account_id()
+		token = self.user.token
+		account_id = self.user.account_id
 
 		# buy a share
 		buyshare_response = ApiFacade.buy_share(token, account_id, symbol, quantity)
@@ -45,8 +40,6 @@ class ViewTransactionsTestCase(unittest.TestCase):
 		transactions_response = ApiFacade.get_transactions(token, account_id, page_number = None, 
 			page_size = None, start_date = None, end_date = None)
 
-		deletion_response = ApiFacade.delete_user(token)
-
 		self.assertEqual(transactions_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}"
 			.format(expected_response_code, transactions_response.get_http_status()))
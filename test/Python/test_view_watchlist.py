@@ -6,6 +6,7 @@ from pprint import pprint
 from third_party.ddt.ddt import ddt, data, file_data, unpack
 
 from api_client.api_facade import ApiFacade
+from fixtures.user_pool import get_user_pool
 
 @ddt
 class ViewWatchlistTestCase(unittest.TestCase):
@@ -18,29 +19,21 @@ class ViewWatchlistTestCase(unittest.TestCase):
 		pass
 
 	def setUp(self):
-		pass
+		self.user = get_user_pool().acquire()
 
 	def tearDown(self):
-		pass
+		get_user_pool().release(self.user)
 
 	def test_get_watchlist_success(self):
 		expected_response_code = 200
 		expected_keys_in_share = ["symbol", "name", "lastPrice", "change", "changePercent"]
 		
-		displayName, email, password = ("John Doe", "johndoe@test.com", "12345678")
-		registration_response = ApiFacade.register_user(displayName, email, password)
-		authentication_response = ApiFacade.authenticate_user(email, password)
-		token = authentication_response.get_token()
-
-		# get watchlist id
-		viewdetails_response = ApiFacade.view_details(token)
-		watchlist_id = viewdetails_response.get_main_watchlist_id()
+		token = self.user.token
+		watchlist_id = self.user.watchlist_id
 
 		# buy shares first
 		viewwatchlist_response = ApiFacade.get_watchlist(token, watchlist_id)
 
-		deletion_response = ApiFacade.delete_user(token)
-
 		self.assertEqual(viewwatchlist_response.get_http_status(), expected_response_code, 
 			msg = "Expected HTTP{0}; got HTTP{1}"
 			.format(expected_response_code, viewwatchlist_response.get_http_status()))